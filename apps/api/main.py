@@ -1,7 +1,143 @@
-from fastapi import FastAPI
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+# Add core library to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from core.streaming.jobs import JobStore, JobRunner, TERMINAL_STATUSES
+from core.telemetry import configure_from_env
+
+# Metrics and tracing are opt-in via EDI_TELEMETRY=otel
+configure_from_env()
+
+DATA_DIR = os.environ.get("EDI_API_DATA_DIR", os.path.join(tempfile.gettempdir(), "edi-api"))
+SPOOL_DIR = os.path.join(DATA_DIR, "uploads")
+# /jobs/from-path only accepts files under this directory; unset disables it
+INPUT_DIR = os.environ.get("EDI_API_INPUT_DIR")
+# Upload bytes are buffered and written to the spool file in blocks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+os.makedirs(SPOOL_DIR, exist_ok=True)
+job_store = JobStore(os.path.join(DATA_DIR, "jobs.db"))
+job_runner = JobRunner(job_store, max_workers=int(os.environ.get("EDI_API_WORKERS", "0")) or None,
+                       spool_dir=SPOOL_DIR)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_runner.start()
+    yield
+    job_runner.stop(timeout=5)
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+class PathJobRequest(BaseModel):
+    path: str
+    validate_results: bool = True
 
-app = FastAPI()
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: Request, validate: bool = True):
+    """Submit an EDI file as the raw request body; it is spooled to disk in chunks."""
+    upload_path = os.path.join(SPOOL_DIR, f"{uuid.uuid4().hex}.edi")
+    size = 0
+    try:
+        # File and database work runs in the thread pool to keep the event loop free
+        handle = await run_in_threadpool(open, upload_path, "wb")
+        try:
+            buffer = bytearray()
+            async for chunk in request.stream():
+                buffer += chunk
+                if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                    await run_in_threadpool(handle.write, buffer)
+                    size += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(handle.write, buffer)
+                size += len(buffer)
+        finally:
+            await run_in_threadpool(handle.close)
+
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Request body is empty")
+        job = await run_in_threadpool(job_store.create_job, upload_path, validate=validate)
+    except BaseException:
+        # Empty, interrupted or failed uploads leave nothing behind in the spool
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+        raise
+
+    job_runner.notify()
+    return job
+
+
+@app.post("/jobs/from-path", status_code=202)
+def submit_path_job(body: PathJobRequest):
+    """Submit a file that is already on the server's local disk, under EDI_API_INPUT_DIR."""
+    if not INPUT_DIR:
+        raise HTTPException(status_code=403, detail="Submitting server paths is disabled; set EDI_API_INPUT_DIR")
+
+    base_dir = os.path.realpath(INPUT_DIR)
+    path = os.path.realpath(os.path.join(base_dir, body.path))
+    if os.path.commonpath([base_dir, path]) != base_dir:
+        raise HTTPException(status_code=403, detail=f"Path is outside the input directory: {body.path}")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"File not found: {body.path}")
+
+    job = job_store.create_job(path, validate=body.validate_results)
+    job_runner.notify()
+    return job
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_store.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, interval: float = Query(1.0, gt=0)):
+    """Stream job progress as server-sent events until the job finishes."""
+    if job_store.get_job(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    async def event_stream():
+        while True:
+            job = job_store.get_job(job_id)
+            event = "done" if job["status"] in TERMINAL_STATUSES else "progress"
+            yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+            if event == "done":
+                break
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/jobs/{job_id}/results")
+def get_job_results(job_id: str, kind: str = "transactions",
+                    page: int = Query(1, ge=1), page_size: int = Query(100, ge=1, le=1000)):
+    try:
+        return job_store.get_results(job_id, kind=kind, page=page, page_size=page_size)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
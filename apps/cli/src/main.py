@@ -15,13 +15,21 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from core.plugins.api import PluginManager, plugin_registry
 from core.validation.engine import ValidationEngine
 from core.validation.yaml_loader import YamlValidationLoader
+from core.telemetry import configure_from_env
+
+# Metrics and tracing are opt-in via EDI_TELEMETRY=otel
+configure_from_env()
 
 # Initialize plugin system
 plugin_manager = PluginManager()
 plugin_manager.load_builtin_plugins()
 
-def parse_edi_content(edi_content: str, schema_name: str):
-    """Parse EDI content using plugin-based parser system."""
+def parse_edi_content(edi_content: str, schema_name: str, profiler=None):
+    """Parse EDI content using plugin-based parser system.
+    
+    When a HandlerProfiler is given, 835 content is parsed with per-handler
+    profiling enabled and timings accumulate into the profiler.
+    """
     # Convert EDI string to segments
     segments = []
     for line in edi_content.replace('~', '\n').strip().split('\n'):
@@ -31,6 +39,15 @@ def parse_edi_content(edi_content: str, schema_name: str):
     # Determine transaction code from schema name
     transaction_code = _extract_transaction_code(schema_name, segments)
     
+    if profiler is not None:
+        if transaction_code == "835":
+            from core.transactions.t835.parser import Parser835
+            parser = Parser835(segments)
+            parser.enable_profiling(profiler)
+            return parser.parse()
+        print(f"⚠️  Handler profiling is only available for 835; parsing {transaction_code} without it",
+              file=sys.stderr)
+    
     # Get parser plugin for transaction code
     parser_plugin = plugin_registry.get_parser_for_transaction(transaction_code)
     if not parser_plugin:
@@ -68,18 +85,49 @@ def _extract_transaction_code(schema_name: str, segments: List[List[str]]) -> st
     # Default fallback
     return schema_name
 
-def convert_command(input_file: str, output_format: str = "json", output_file: Optional[str] = None, schema: str = "x12-835-5010"):
-    """Convert an EDI file to another format (JSON or CSV)."""
+def print_profile_report(profiler):
+    """Print a handler profiling report to stderr."""
+    if profiler is not None and profiler.segments:
+        print("⏱️  Parser profile:", file=sys.stderr)
+        print(profiler.format_report(), file=sys.stderr)
+
+def _create_profiler(profile: bool):
+    if not profile:
+        return None
+    from core.base.profiling import HandlerProfiler
+    return HandlerProfiler()
+
+def convert_command(input_file: str, output_format: str = "json", output_file: Optional[str] = None, schema: str = "x12-835-5010",
+                    profile: bool = False, recover: bool = False, quarantine_file: Optional[str] = None):
+    """Convert an EDI file to another format (JSON, CSV or re-serialized X12)."""
+    profiler = _create_profiler(profile)
     try:
         if not os.path.exists(input_file):
             print(f"❌ Input file not found: {input_file}")
             return 1
+        
+        if recover:
+            result = _recover_edi_file(input_file, quarantine_file)
+        else:
+            with open(input_file, 'r') as f:
+                edi_content = f.read()
             
-        with open(input_file, 'r') as f:
-            edi_content = f.read()
-            
-        # Parse using new architecture
-        result = parse_edi_content(edi_content, schema)
+            # Parse using new architecture
+            result = parse_edi_content(edi_content, schema, profiler)
+            print_profile_report(profiler)
+        
+        if output_format == "x12":
+            if not result.interchanges:
+                print("❌ No interchanges found")
+                return 1
+            from core.streaming import write_x12
+            from core.emitter import EdiEmitter
+            if output_file:
+                write_x12(result, output_file)
+                print(f"✅ Output written to: {output_file}")
+            else:
+                print(EdiEmitter(result).to_x12(), end="")
+            return 0
         
         if output_format == "json":
             # Get the 835 transaction data if available
@@ -95,7 +143,7 @@ def convert_command(input_file: str, output_format: str = "json", output_file: O
             print("❌ CSV output not yet implemented for new parser architecture")
             return 1
         else:
-            print(f"❌ Unknown format: {output_format}. Supported formats: json")
+            print(f"❌ Unknown format: {output_format}. Supported formats: json, x12")
             return 1
 
         if output_file:
@@ -110,8 +158,27 @@ def convert_command(input_file: str, output_format: str = "json", output_file: O
         print(f"❌ Error: {e}")
         return 1
 
-def validate_command(input_file: str, schema: str = "x12-835-5010", verbose: bool = False, rules_file: str = None, rule_set: str = None):
+def _recover_edi_file(input_file: str, quarantine_file: Optional[str] = None):
+    """Parse a file transaction by transaction, quarantining broken ST/SE spans."""
+    from core.streaming.recovery import recover_file
+
+    recovery = recover_file(input_file, plugin_registry)
+    manifest = recovery.manifest
+    # Status goes to stderr so it never mixes with converted output on stdout
+    if manifest.spans:
+        print(f"⚠️  Recovered {recovery.transactions} transaction set(s); quarantined {len(manifest.spans)} "
+              f"span(s), {manifest.bytes_quarantined} bytes", file=sys.stderr)
+        for span in manifest.spans:
+            print(f"  bytes {span.start}-{span.end}: {span.reason}", file=sys.stderr)
+    if quarantine_file:
+        manifest.write(quarantine_file)
+        print(f"📝 Quarantine manifest written to: {quarantine_file}", file=sys.stderr)
+    return recovery.root
+
+def validate_command(input_file: str, schema: str = "x12-835-5010", verbose: bool = False, rules_file: str = None, rule_set: str = None,
+                     profile: bool = False):
     """Validate an EDI file against a schema."""
+    profiler = _create_profiler(profile)
     try:
         if not os.path.exists(input_file):
             print(f"❌ Input file not found: {input_file}")
@@ -121,7 +188,8 @@ def validate_command(input_file: str, schema: str = "x12-835-5010", verbose: boo
             edi_content = f.read()
             
         # Parse the EDI file using new architecture
-        result = parse_edi_content(edi_content, schema)
+        result = parse_edi_content(edi_content, schema, profiler)
+        print_profile_report(profiler)
         
         # Basic validation - check if file was parsed successfully
         if not result.interchanges:
@@ -328,12 +396,16 @@ def validate_command(input_file: str, schema: str = "x12-835-5010", verbose: boo
         print(f"❌ Validation failed: {e}")
         return 1
 
-def inspect_command(input_file: str, segments: Optional[str] = None):
+def inspect_command(input_file: str, segments: Optional[str] = None, envelope: bool = False,
+                    as_json: bool = False):
     """Inspect an EDI file and extract specific segments or show structure."""
     try:
         if not os.path.exists(input_file):
             print(f"❌ Input file not found: {input_file}")
             return 1
+        
+        if envelope:
+            return inspect_envelope(input_file, as_json)
             
         with open(input_file, 'r') as f:
             edi_content = f.read()
@@ -375,6 +447,352 @@ def inspect_command(input_file: str, segments: Optional[str] = None):
         print(f"❌ Error inspecting file: {e}")
         return 1
 
+def inspect_envelope(input_file: str, as_json: bool = False):
+    """Show the ISA/GS/ST envelope structure and control-number issues without parsing."""
+    from core.streaming.envelope import scan_envelopes
+
+    scan = scan_envelopes(input_file)
+    if as_json:
+        print(json.dumps(scan.to_dict(), indent=2))
+        return 0 if scan.is_consistent else 1
+
+    print("✉️  EDI Envelope Structure:")
+    print("=" * 50)
+    for interchange in scan.interchanges:
+        print(f"ISA {interchange.control_number}  {interchange.sender_qualifier}:{interchange.sender_id} → "
+              f"{interchange.receiver_qualifier}:{interchange.receiver_id}  "
+              f"bytes {interchange.start}-{interchange.end}")
+        for group in interchange.groups:
+            codes = ", ".join(f"{code} x{count}" for code, count in sorted(group.transaction_codes.items()))
+            print(f"  GS {group.control_number}  {group.functional_id} {group.version}  "
+                  f"{group.transaction_count} transaction sets ({codes})  bytes {group.start}-{group.end}")
+
+    print(f"\n{scan.segment_count} segments, {scan.transaction_count} transaction sets, "
+          f"{scan.bytes_scanned} bytes")
+    if scan.is_consistent:
+        print("✅ Envelope control numbers and counts are consistent")
+        return 0
+
+    print(f"❌ {len(scan.issues)} envelope issue(s):")
+    for issue in scan.issues:
+        print(f"  [{issue.code}] byte {issue.start}: {issue.message}")
+    return 1
+
+def split_command(input_file: str, output_dir: str, by: str = "transaction", max_size: Optional[str] = None,
+                  control_start: int = 1):
+    """Split an EDI file by transaction, payee, payer or size, regenerating control numbers."""
+    from core.streaming.partition import split_file, parse_size
+
+    try:
+        if not os.path.exists(input_file):
+            print(f"❌ Input file not found: {input_file}")
+            return 1
+        
+        max_bytes = parse_size(max_size) if max_size else None
+        written = split_file(input_file, output_dir, by=by, max_bytes=max_bytes, control_start=control_start)
+        print(f"✂️  Split {input_file} by {by} into {len(written)} file(s) in {output_dir}")
+        for output in written:
+            print(f"  {os.path.basename(output.path)}: {output.transactions} transaction set(s), "
+                  f"{output.bytes} bytes, ISA13 {', '.join(output.control_numbers)}")
+        return 0
+    
+    except Exception as e:
+        print(f"❌ Error splitting file: {e}")
+        return 1
+
+def merge_command(input_files: List[str], output_file: str, control_start: int = 1):
+    """Merge the transaction sets of several EDI files into one file."""
+    from core.streaming.partition import merge_files
+
+    try:
+        for input_file in input_files:
+            if not os.path.exists(input_file):
+                print(f"❌ Input file not found: {input_file}")
+                return 1
+        
+        written = merge_files(input_files, output_file, control_start=control_start)
+        print(f"🔗 Merged {len(input_files)} file(s) into {output_file}: {written.interchanges} interchange(s), "
+              f"{written.groups} group(s), {written.transactions} transaction set(s)")
+        return 0
+    
+    except Exception as e:
+        print(f"❌ Error merging files: {e}")
+        return 1
+
+def ack_command(input_file: str, output_file: Optional[str] = None, rules_files: Optional[List[str]] = None,
+                ta1: str = "errors", report_accepted: bool = True, control_start: int = 1,
+                schema_file: Optional[str] = None):
+    """Generate 999/TA1 acknowledgments for an EDI file in a single parsing pass."""
+    from core.pipeline import Pipeline, ParseStage, ValidateStage, AcknowledgeStage
+
+    try:
+        if not os.path.exists(input_file):
+            print(f"❌ Input file not found: {input_file}")
+            return 1
+        
+        acknowledge = AcknowledgeStage(output=output_file, ta1=ta1, report_accepted=report_accepted,
+                                       control_start=control_start, schema=schema_file)
+        stages = [ParseStage()]
+        if rules_files:
+            stages.append(ValidateStage(rules_files=rules_files))
+        stages.append(acknowledge)
+        Pipeline(stages).run_file(input_file)
+        
+        summary = acknowledge.collector.summary()
+        # The summary goes to stderr when the acknowledgments are written to stdout
+        print(f"📨 Acknowledged {summary['transactions']} transaction set(s) in {summary['groups']} group(s): "
+              f"{summary['accepted']} accepted, {summary['rejected']} rejected"
+              + (f" → {output_file}" if output_file else ""),
+              file=sys.stdout if output_file else sys.stderr)
+        return 1 if summary["rejected"] else 0
+    
+    except Exception as e:
+        print(f"❌ Error acknowledging file: {e}")
+        return 1
+
+def diff_command(old_file: str, new_file: str, as_json: bool = False, output_file: Optional[str] = None,
+                 claims_only: bool = False):
+    """Compare two EDI files claim by claim and report changed, added and removed claims."""
+    from core.streaming.diff import EdiDiff
+
+    try:
+        for input_file in (old_file, new_file):
+            if not os.path.exists(input_file):
+                print(f"❌ Input file not found: {input_file}")
+                return 2
+        
+        diff = EdiDiff(old_file, new_file, include_transactions=not claims_only)
+        handle = open(output_file, "w") if output_file else sys.stdout
+        try:
+            for difference in diff:
+                if as_json or output_file:
+                    handle.write(json.dumps(difference.to_dict()) + "\n")
+                    continue
+                status_icons = {"changed": "✏️ ", "added": "➕", "removed": "➖"}
+                label = f"claim {difference.claim_id}" if difference.kind == "claim" \
+                    else f"transaction {difference.key[0]}"
+                print(f"{status_icons[difference.status]} {difference.status} {label}")
+                for delta in difference.deltas:
+                    print(f"    {delta.location}: {delta.old!r} → {delta.new!r}")
+        finally:
+            if output_file:
+                handle.close()
+        
+        summary = diff.summary()
+        claims = summary["claims"]
+        print(f"🔍 Compared {claims['compared']} claim(s): {claims['changed']} changed, "
+              f"{claims['added']} added, {claims['removed']} removed",
+              file=sys.stderr if as_json and not output_file else sys.stdout)
+        # Exit codes follow diff(1): 0 when identical, 1 when different, 2 on errors
+        differences = sum(counts[status] for counts in (claims, summary["transactions"])
+                          for status in ("changed", "added", "removed"))
+        return 1 if differences else 0
+    
+    except Exception as e:
+        print(f"❌ Error comparing files: {e}")
+        return 2
+
+def dedup_command(input_files: List[str], index_file: str, check_only: bool = False, as_json: bool = False):
+    """Check 835 files for claims and payments already received and index the new ones."""
+    from core.dedup import FingerprintIndex, find_duplicates
+
+    try:
+        for input_file in input_files:
+            if not os.path.exists(input_file):
+                print(f"❌ Input file not found: {input_file}")
+                return 2
+        
+        duplicates = 0
+        with FingerprintIndex(index_file) as index:
+            for input_file in input_files:
+                found = find_duplicates(input_file, index, record=not check_only)
+                duplicates += len(found)
+                for duplicate in found:
+                    if as_json:
+                        print(json.dumps(dict(duplicate.to_dict(), file=input_file)))
+                        continue
+                    print(f"🔁 {input_file}: duplicate {duplicate.kind} {duplicate.reference} "
+                          f"(first seen in {duplicate.first_seen.source or 'unknown'} at {duplicate.first_seen.seen_at})")
+            stats = index.stats()
+        
+        print(f"🔍 Checked {len(input_files)} file(s): {duplicates} duplicate(s); "
+              f"{stats['fingerprints']} fingerprint(s) indexed",
+              file=sys.stderr if as_json else sys.stdout)
+        return 1 if duplicates else 0
+    
+    except Exception as e:
+        print(f"❌ Error checking duplicates: {e}")
+        return 2
+
+def reconcile_command(store_file: str, claim_files: List[str], remit_files: List[str],
+                      output_file: Optional[str] = None, open_file: Optional[str] = None):
+    """Index submitted 837P claims and reconcile 835 remittances against them."""
+    from core.healthcare.reconciliation import ClaimStore, index_claims, reconcile_remittance
+
+    try:
+        for input_file in claim_files + remit_files:
+            if not os.path.exists(input_file):
+                print(f"❌ Input file not found: {input_file}")
+                return 1
+        
+        handle = open(output_file, "w") if output_file else None
+        try:
+            with ClaimStore(store_file) as store:
+                for claim_file in claim_files:
+                    count = index_claims(claim_file, store)
+                    print(f"📥 Indexed {count} claim(s) from {claim_file}")
+                
+                def report(result):
+                    if handle:
+                        handle.write(json.dumps(dict(result.to_dict(), remittance=remit_file)) + "\n")
+                
+                for remit_file in remit_files:
+                    summary = reconcile_remittance(remit_file, store, on_result=report)
+                    print(f"💰 {remit_file}: {summary['remitted']} claim(s) — {summary['paid']} paid, "
+                          f"{summary['partially_paid']} partially paid, {summary['denied']} denied, "
+                          f"{summary['reversed']} reversed, {summary['unmatched']} unmatched")
+                
+                if open_file:
+                    with open(open_file, "w") as f:
+                        for claim in store.open_claims():
+                            f.write(json.dumps(claim.to_dict()) + "\n")
+                
+                counts = store.counts()
+        finally:
+            if handle:
+                handle.close()
+        
+        print(f"📊 Submitted claims: {counts['open']} open, {counts['paid']} paid, "
+              f"{counts['partially_paid']} partially paid, {counts['denied']} denied")
+        return 0
+    
+    except Exception as e:
+        print(f"❌ Error reconciling claims: {e}")
+        return 1
+
+def analytics_command(input_files: List[str], group_by: Optional[str] = None, as_of: Optional[str] = None,
+                      workers: Optional[int] = None, output_file: Optional[str] = None):
+    """Aggregate payment summaries, adjustment reasons and aging over 835 files."""
+    from datetime import date
+    from core.healthcare.analytics import GROUP_BY_OPTIONS, aggregate_files
+
+    try:
+        for input_file in input_files:
+            if not os.path.exists(input_file):
+                print(f"❌ Input file not found: {input_file}")
+                return 1
+        if group_by is not None and group_by not in GROUP_BY_OPTIONS:
+            print(f"❌ --group-by must be one of: {', '.join(GROUP_BY_OPTIONS)}")
+            return 1
+        
+        reference = date.fromisoformat(as_of) if as_of else None
+        analytics = aggregate_files(input_files, group_by=group_by, as_of=reference, max_workers=workers)
+        report = json.dumps(analytics.to_dict(), indent=2)
+        if output_file:
+            with open(output_file, "w") as f:
+                f.write(report + "\n")
+            summary = analytics.total().payments
+            print(f"📊 Aggregated {summary.total_claims} claim(s) from {len(input_files)} file(s) into {output_file}")
+        else:
+            print(report)
+        return 0
+    
+    except Exception as e:
+        print(f"❌ Error aggregating remittances: {e}")
+        return 1
+
+def codeset_command(csv_file: str, output_file: str, name: str = "", code_column: str = "code",
+                    description_column: str = "description", has_header: bool = True):
+    """Compile a CSV code list into a memory-mapped code set index."""
+    from core.codesets import compile_csv
+
+    try:
+        if not os.path.exists(csv_file):
+            print(f"❌ Input file not found: {csv_file}")
+            return 1
+        
+        if not has_header:
+            code_column, description_column = int(code_column), int(description_column)
+        count = compile_csv(csv_file, output_file, name, code_column=code_column,
+                            description_column=description_column, has_header=has_header)
+        print(f"📚 Compiled {count} code(s) from {csv_file} into {output_file}")
+        return 0
+    
+    except Exception as e:
+        print(f"❌ Error compiling code set: {e}")
+        return 1
+
+def watch_command(input_dirs: List[str], output_dir: str, error_dir: str, workers: int = 4,
+                  queue_size: int = 16, patterns: Optional[List[str]] = None, state_file: Optional[str] = None,
+                  use_polling: bool = False, interval: float = 1.0, validate: bool = True):
+    """Watch inbound directories and ingest completed EDI files as they land."""
+    from core.streaming.watcher import WatchConfig, WatchDaemon
+
+    def report(outcome):
+        status_icons = {"processed": "✅", "invalid": "⚠️", "failed": "❌"}
+        icon = status_icons.get(outcome.status, "•")
+        print(f"{icon} {os.path.basename(outcome.path)}: {outcome.status}, "
+              f"{outcome.transaction_count} transaction(s) in {outcome.elapsed_seconds:.2f}s")
+
+    try:
+        config = WatchConfig(
+            input_dirs=input_dirs,
+            output_dir=output_dir,
+            error_dir=error_dir,
+            state_path=state_file,
+            patterns=patterns or ["*"],
+            max_workers=workers,
+            queue_size=queue_size,
+            validate=validate,
+            use_polling=use_polling,
+            poll_interval=interval,
+        )
+        daemon = WatchDaemon(config, on_complete=report)
+        print(f"👀 Watching {', '.join(input_dirs)} (outputs: {output_dir}, errors: {error_dir})")
+        daemon.run()
+        return 0
+    except KeyboardInterrupt:
+        print("🛑 Watcher stopped")
+        return 0
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+def pipeline_command(input_file: str, config_file: Optional[str] = None, output_file: Optional[str] = None,
+                     show_stats: bool = False):
+    """Run a configured parse/validate/transform/emit pipeline over an EDI file."""
+    from core.pipeline import load_pipeline, default_pipeline
+
+    try:
+        if not os.path.exists(input_file):
+            print(f"❌ Input file not found: {input_file}")
+            return 1
+        
+        if config_file:
+            if not os.path.exists(config_file):
+                print(f"❌ Pipeline config not found: {config_file}")
+                return 1
+            pipeline = load_pipeline(config_file, output=output_file)
+        else:
+            pipeline = default_pipeline(output=output_file)
+        
+        stats = pipeline.run_file(input_file)
+        
+        if show_stats:
+            # Stats go to stderr so they never mix with JSON lines on stdout
+            print(f"📊 {stats.items} transaction(s), {stats.failed} failed, "
+                  f"{stats.wall_seconds:.3f}s", file=sys.stderr)
+            for stage in stats.stages:
+                print(f"  {stage.name:<20} x{stage.concurrency}  {stage.throughput:>10.1f}/s  "
+                      f"avg {stage.average_latency_ms:.3f} ms  util {stage.utilization:.0%}  "
+                      f"errors {stage.errors}", file=sys.stderr)
+        
+        return 1 if stats.failed else 0
+    
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
 def print_help():
     """Print help information."""
     print("""
@@ -383,26 +801,86 @@ EDI CLI - A modern toolkit for working with EDI files
 Usage: edi <command> [arguments]
 
 Commands:
-  convert <input_file> [--to json] [--out output_file] [--schema x12-835-5010|x12-837p-5010]
-    Convert an EDI file to another format (JSON)
+  convert <input_file> [--to json|x12] [--out output_file] [--schema x12-835-5010|x12-837p-5010] [--profile]
+          [--recover [--quarantine manifest.json]]
+    Convert an EDI file to another format (JSON), or parse and write it back as normalized X12;
+    --recover skips broken ST/SE spans and records their byte ranges in a quarantine manifest
     
-  validate <input_file> [--schema x12-835-5010|x12-837p-5010] [--verbose] [--rules file.yml] [--rule-set <rule_set>]
+  validate <input_file> [--schema x12-835-5010|x12-837p-5010] [--verbose] [--rules file.yml] [--rule-set <rule_set>] [--profile]
     Validate an EDI file against a schema with custom validation rules
     
-  inspect <input_file> [--segments NM1,CLP]
-    Inspect an EDI file and extract specific segments or show structure
+  inspect <input_file> [--segments NM1,CLP] [--envelope [--json]]
+    Inspect an EDI file and extract specific segments or show structure;
+    --envelope scans only ISA/GS/ST envelopes and reports control-number mismatches
     
+  pipeline <input_file> [--config pipeline.yml] [--out output.jsonl] [--stats]
+    Run a configured parse → validate → transform → emit pipeline, one JSON line per transaction
+
+  split <input_file> --out <dir> [--by transaction|payee|payer|size] [--max-size 50mb] [--control-start 1]
+    Split a file into one interchange per transaction, payee (N1*PE), payer (N1*PR) or size limit
+
+  merge <input_file> [<input_file> ...] --out <output_file> [--control-start 1]
+    Merge the transaction sets of several files, regenerating ISA/GS/ST control numbers
+
+  ack <input_file> [--out ack.edi] [--rules file.yml] [--ta1 errors|always|never] [--errors-only] [--control-start 1]
+      [--schema-file schemas/x12/835.json]
+    Generate 999 implementation acknowledgments (and TA1s) in the same pass that parses the file;
+    --schema-file also checks element types, lengths and code values (IK4)
+
+  diff <old_file> <new_file> [--json] [--out diff.jsonl] [--claims-only]
+    Compare two files claim by claim in a single streaming pass, aligning claims by CLP01/CLP07 and
+    transactions by ST02; reports changed, added and removed claims with field-level deltas
+
+  dedup <input_file> [<input_file> ...] --index dedup.db [--check-only] [--json]
+    Flag 835 claims and payments (TRN trace numbers) already seen in earlier files and add the new ones
+    to a persistent fingerprint index; --check-only leaves the index unchanged
+
+  reconcile --store claims.db [--claims <837_file>]... [--remits <835_file>]... [--out results.jsonl]
+            [--open open.jsonl]
+    Index submitted 837P claims by CLM01 and match 835 claims to them by CLP01, reporting each remitted
+    claim as paid, partially paid, denied, reversed or unmatched; --open writes claims still awaiting payment
+
+  analytics <input_file> [<input_file> ...] [--group-by payer|payee] [--as-of 2024-03-31] [--workers 8]
+            [--out report.json]
+    Aggregate payment summaries, adjustment reason histograms and claim aging over 835 files,
+    one streaming pass per file in parallel worker processes
+
+  codeset <csv_file> --out <name>.csi [--name carc] [--code-column code] [--description-column description]
+          [--no-header]
+    Compile a CSV code list (CARC, RARC, CPT, HCPCS, ICD-10, ...) into a memory-mapped index;
+    indexes named <name>.csi in $EDI_CODESET_DIR are used for code validation and descriptions
+
+  watch <input_dir> [<input_dir> ...] --out <dir> --errors <dir> [--workers 4] [--queue-size 16]
+        [--pattern "*.edi"] [--state watch.db] [--poll] [--interval 1.0] [--no-validate]
+    Watch directories and parse, validate and emit completed files as they arrive
+
   help
     Show this help message
 
 Examples:
   edi convert sample-835.edi --to json --schema 835
   edi convert sample-837.edi --to json --schema 837p
+  edi convert corrected-837.edi --to x12 --schema 837p --out resubmit.edi
   edi validate sample-835.edi --rule-set basic --verbose
   edi validate sample-837.edi --schema 837p --rule-set basic --verbose
   edi validate sample-835.edi --rule-set hipaa --verbose
   edi validate sample.edi --rules custom-rules.yml
   edi inspect sample.edi --segments BPR,CLP
+  edi inspect inbound.x12 --envelope --json
+  edi convert slow-payer.edi --out /dev/null --profile
+  edi convert corrupted-835.edi --to x12 --recover --quarantine corrupted.quarantine.json --out good.edi
+  edi pipeline large-835.edi --config pipeline.yml --stats
+  edi split big-835.edi --by payee --out split/
+  edi merge split/*.edi --out merged.edi
+  edi ack inbound-837.edi --rules custom-rules.yml --out inbound.999
+  edi ack remit.835 --schema-file shared/schemas/x12/835.json --errors-only
+  edi diff original.835 resubmitted.835
+  edi diff original.835 resubmitted.835 --claims-only --out changes.jsonl
+  edi dedup inbound/*.835 --index remits.dedup
+  edi reconcile --store claims.db --claims outbound.837 --remits inbound.835 --out results.jsonl
+  edi analytics remits/2024-03/*.835 --group-by payer --as-of 2024-03-31 --out march.json
+  edi codeset carc.csv --out /etc/edi/codesets/carc.csi --code-column Code --description-column Description
+  edi watch /data/inbound --out /data/outbound --errors /data/rejected --workers 8
 
 Supported Transaction Sets:
   835: Healthcare Claim Payment/Advice (ERA)
@@ -438,6 +916,9 @@ def main():
         output_format = "json"
         output_file = None
         schema = "x12-835-5010"
+        profile = False
+        recover = False
+        quarantine_file = None
         
         # Parse additional arguments
         i = 3
@@ -451,10 +932,19 @@ def main():
             elif sys.argv[i] == "--schema" and i + 1 < len(sys.argv):
                 schema = sys.argv[i + 1]
                 i += 2
+            elif sys.argv[i] == "--profile":
+                profile = True
+                i += 1
+            elif sys.argv[i] == "--recover":
+                recover = True
+                i += 1
+            elif sys.argv[i] == "--quarantine" and i + 1 < len(sys.argv):
+                quarantine_file = sys.argv[i + 1]
+                i += 2
             else:
                 i += 1
         
-        return convert_command(input_file, output_format, output_file, schema)
+        return convert_command(input_file, output_format, output_file, schema, profile, recover, quarantine_file)
     
     elif command == "validate":
         if len(sys.argv) < 3:
@@ -466,6 +956,7 @@ def main():
         verbose = False
         rules_file = None
         rule_set = None
+        profile = False
         
         # Parse additional arguments
         i = 3
@@ -482,10 +973,13 @@ def main():
             elif sys.argv[i] == "--rule-set" and i + 1 < len(sys.argv):
                 rule_set = sys.argv[i + 1]
                 i += 2
+            elif sys.argv[i] == "--profile":
+                profile = True
+                i += 1
             else:
                 i += 1
         
-        return validate_command(input_file, schema, verbose, rules_file, rule_set)
+        return validate_command(input_file, schema, verbose, rules_file, rule_set, profile)
     
     elif command == "inspect":
         if len(sys.argv) < 3:
@@ -494,6 +988,8 @@ def main():
         
         input_file = sys.argv[2]
         segments = None
+        envelope = False
+        as_json = False
         
         # Parse additional arguments
         i = 3
@@ -501,10 +997,374 @@ def main():
             if sys.argv[i] == "--segments" and i + 1 < len(sys.argv):
                 segments = sys.argv[i + 1]
                 i += 2
+            elif sys.argv[i] == "--envelope":
+                envelope = True
+                i += 1
+            elif sys.argv[i] == "--json":
+                as_json = True
+                i += 1
             else:
                 i += 1
         
-        return inspect_command(input_file, segments)
+        return inspect_command(input_file, segments, envelope, as_json)
+    
+    elif command == "pipeline":
+        if len(sys.argv) < 3:
+            print("❌ pipeline requires an input file")
+            return 1
+        
+        input_file = sys.argv[2]
+        config_file = None
+        output_file = None
+        show_stats = False
+        
+        # Parse additional arguments
+        i = 3
+        while i < len(sys.argv):
+            if sys.argv[i] == "--config" and i + 1 < len(sys.argv):
+                config_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--stats":
+                show_stats = True
+                i += 1
+            else:
+                i += 1
+        
+        return pipeline_command(input_file, config_file, output_file, show_stats)
+    
+    elif command == "watch":
+        input_dirs = []
+        output_dir = None
+        error_dir = None
+        workers = 4
+        queue_size = 16
+        patterns = []
+        state_file = None
+        use_polling = False
+        interval = 1.0
+        validate = True
+        
+        # Parse additional arguments
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_dir = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--errors" and i + 1 < len(sys.argv):
+                error_dir = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--workers" and i + 1 < len(sys.argv):
+                workers = int(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--queue-size" and i + 1 < len(sys.argv):
+                queue_size = int(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--pattern" and i + 1 < len(sys.argv):
+                patterns.append(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--state" and i + 1 < len(sys.argv):
+                state_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--interval" and i + 1 < len(sys.argv):
+                interval = float(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--poll":
+                use_polling = True
+                i += 1
+            elif sys.argv[i] == "--no-validate":
+                validate = False
+                i += 1
+            elif not sys.argv[i].startswith("--"):
+                input_dirs.append(sys.argv[i])
+                i += 1
+            else:
+                i += 1
+        
+        if not input_dirs or not output_dir or not error_dir:
+            print("❌ watch requires at least one input directory, --out and --errors")
+            return 1
+        
+        return watch_command(input_dirs, output_dir, error_dir, workers, queue_size, patterns,
+                             state_file, use_polling, interval, validate)
+    
+    elif command == "split":
+        if len(sys.argv) < 3:
+            print("❌ split requires an input file")
+            return 1
+        
+        input_file = sys.argv[2]
+        output_dir = None
+        by = "transaction"
+        max_size = None
+        control_start = 1
+        
+        # Parse additional arguments
+        i = 3
+        while i < len(sys.argv):
+            if sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_dir = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--by" and i + 1 < len(sys.argv):
+                by = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--max-size" and i + 1 < len(sys.argv):
+                max_size = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--control-start" and i + 1 < len(sys.argv):
+                control_start = int(sys.argv[i + 1])
+                i += 2
+            else:
+                i += 1
+        
+        if not output_dir:
+            print("❌ split requires --out <dir>")
+            return 1
+        if by == "size" and not max_size:
+            print("❌ split --by size requires --max-size")
+            return 1
+        
+        return split_command(input_file, output_dir, by, max_size, control_start)
+    
+    elif command == "ack":
+        if len(sys.argv) < 3:
+            print("❌ ack requires an input file")
+            return 1
+        
+        input_file = sys.argv[2]
+        output_file = None
+        rules_files = []
+        ta1 = "errors"
+        report_accepted = True
+        control_start = 1
+        schema_file = None
+        
+        # Parse additional arguments
+        i = 3
+        while i < len(sys.argv):
+            if sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--rules" and i + 1 < len(sys.argv):
+                rules_files.append(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--ta1" and i + 1 < len(sys.argv):
+                ta1 = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--control-start" and i + 1 < len(sys.argv):
+                control_start = int(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--schema-file" and i + 1 < len(sys.argv):
+                schema_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--errors-only":
+                report_accepted = False
+                i += 1
+            else:
+                i += 1
+        
+        if ta1 not in ("errors", "always", "never"):
+            print("❌ --ta1 must be errors, always or never")
+            return 1
+        
+        return ack_command(input_file, output_file, rules_files, ta1, report_accepted, control_start, schema_file)
+    
+    elif command == "merge":
+        input_files = []
+        output_file = None
+        control_start = 1
+        
+        # Parse additional arguments
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--control-start" and i + 1 < len(sys.argv):
+                control_start = int(sys.argv[i + 1])
+                i += 2
+            elif not sys.argv[i].startswith("--"):
+                input_files.append(sys.argv[i])
+                i += 1
+            else:
+                i += 1
+        
+        if not input_files or not output_file:
+            print("❌ merge requires at least one input file and --out <output_file>")
+            return 1
+        
+        return merge_command(input_files, output_file, control_start)
+    
+    elif command == "diff":
+        if len(sys.argv) < 4:
+            print("❌ diff requires two input files")
+            return 1
+        
+        old_file = sys.argv[2]
+        new_file = sys.argv[3]
+        as_json = False
+        output_file = None
+        claims_only = False
+        
+        # Parse additional arguments
+        i = 4
+        while i < len(sys.argv):
+            if sys.argv[i] == "--json":
+                as_json = True
+                i += 1
+            elif sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--claims-only":
+                claims_only = True
+                i += 1
+            else:
+                i += 1
+        
+        return diff_command(old_file, new_file, as_json, output_file, claims_only)
+    
+    elif command == "dedup":
+        input_files = []
+        index_file = None
+        check_only = False
+        as_json = False
+        
+        # Parse additional arguments
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i] == "--index" and i + 1 < len(sys.argv):
+                index_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--check-only":
+                check_only = True
+                i += 1
+            elif sys.argv[i] == "--json":
+                as_json = True
+                i += 1
+            elif not sys.argv[i].startswith("--"):
+                input_files.append(sys.argv[i])
+                i += 1
+            else:
+                i += 1
+        
+        if not input_files or not index_file:
+            print("❌ dedup requires at least one input file and --index <index_file>")
+            return 1
+        
+        return dedup_command(input_files, index_file, check_only, as_json)
+    
+    elif command == "reconcile":
+        store_file = None
+        claim_files = []
+        remit_files = []
+        output_file = None
+        open_file = None
+        
+        # Parse additional arguments
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i] == "--store" and i + 1 < len(sys.argv):
+                store_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--claims" and i + 1 < len(sys.argv):
+                claim_files.append(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--remits" and i + 1 < len(sys.argv):
+                remit_files.append(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--open" and i + 1 < len(sys.argv):
+                open_file = sys.argv[i + 1]
+                i += 2
+            else:
+                i += 1
+        
+        if not store_file:
+            print("❌ reconcile requires --store <store_file>")
+            return 1
+        
+        return reconcile_command(store_file, claim_files, remit_files, output_file, open_file)
+    
+    elif command == "analytics":
+        input_files = []
+        group_by = None
+        as_of = None
+        workers = None
+        output_file = None
+        
+        # Parse additional arguments
+        i = 2
+        while i < len(sys.argv):
+            if sys.argv[i] == "--group-by" and i + 1 < len(sys.argv):
+                group_by = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--as-of" and i + 1 < len(sys.argv):
+                as_of = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--workers" and i + 1 < len(sys.argv):
+                workers = int(sys.argv[i + 1])
+                i += 2
+            elif sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif not sys.argv[i].startswith("--"):
+                input_files.append(sys.argv[i])
+                i += 1
+            else:
+                i += 1
+        
+        if not input_files:
+            print("❌ analytics requires at least one input file")
+            return 1
+        
+        return analytics_command(input_files, group_by, as_of, workers, output_file)
+    
+    elif command == "codeset":
+        if len(sys.argv) < 3:
+            print("❌ codeset requires a CSV file")
+            return 1
+        
+        csv_file = sys.argv[2]
+        output_file = None
+        name = ""
+        code_column = "code"
+        description_column = "description"
+        has_header = True
+        
+        # Parse additional arguments
+        i = 3
+        while i < len(sys.argv):
+            if sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+                output_file = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--name" and i + 1 < len(sys.argv):
+                name = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--code-column" and i + 1 < len(sys.argv):
+                code_column = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--description-column" and i + 1 < len(sys.argv):
+                description_column = sys.argv[i + 1]
+                i += 2
+            elif sys.argv[i] == "--no-header":
+                has_header = False
+                i += 1
+            else:
+                i += 1
+        
+        if not output_file:
+            print("❌ codeset requires --out <output_file>")
+            return 1
+        if not has_header:
+            # Without a header, columns are given by position
+            code_column = "0" if code_column == "code" else code_column
+            description_column = "1" if description_column == "description" else description_column
+        
+        return codeset_command(csv_file, output_file, name, code_column, description_column, has_header)
     
     else:
         print(f"❌ Unknown command: {command}")
@@ -5,12 +5,13 @@ This module provides the core abstractions and base classes that all
 EDI transaction parsers and validators build upon.
 """
 
-from .parser import BaseParser
+from .parser import BaseParser, NodeListener
 from .edi_ast import EdiRoot, Interchange, FunctionalGroup, Transaction
 from .validation import ValidationRule, ValidationError, ValidationSeverity, ValidationCategory, BusinessRule
 
 __all__ = [
     'BaseParser',
+    'NodeListener',
     'EdiRoot',
     'Interchange', 
     'FunctionalGroup',
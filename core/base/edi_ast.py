@@ -25,6 +25,8 @@ class EdiRoot(Node):
     """Root node representing the complete EDI document."""
     def __init__(self):
         self.interchanges: List[Interchange] = []
+        # Structural errors the parser recovered from (not serialized)
+        self.errors: List[Any] = []
 
     def to_dict(self) -> Dict[str, Any]:
         return {"interchanges": [interchange.to_dict() for interchange in self.interchanges]}
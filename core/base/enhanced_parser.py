@@ -7,6 +7,7 @@ with the standardized error handling system.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Union
+from collections import Counter
 import logging
 
 from .parser import BaseParser
@@ -56,13 +57,11 @@ class EnhancedParser(BaseParser):
             Parsed transaction or None if parsing failed completely
         """
         try:
-            self.parse_context = (self.parse_context
-                                .segments(self.segments)
-                                .parser_name(self.__class__.__name__))
+            self.parse_context = self.parse_context.parser_name(self.__class__.__name__)
             
             return self.parse()
         except EDIError as e:
-            self.error_handler.handle_error(e, self.parse_context.build())
+            self.error_handler.handle_error(e, self._document_context())
             if not self.error_handler.should_continue(e):
                 return None
         except Exception as e:
@@ -71,12 +70,18 @@ class EnhancedParser(BaseParser):
                 f"Unexpected error during parsing: {str(e)}",
                 {"original_exception": str(e), "exception_type": type(e).__name__}
             )
-            self.error_handler.handle_error(edi_error, self.parse_context.build())
+            self.error_handler.handle_error(edi_error, self._document_context())
             if not self.error_handler.should_continue(edi_error):
                 return None
         
         return None
     
+    def _document_context(self) -> ParseErrorContext:
+        """Build the document-level context around the segment being parsed."""
+        return (self.parse_context
+                .segment_window(self.segments, min(self.current_index, max(len(self.segments) - 1, 0)))
+                .build())
+    
     def _handle_segment_error(self, segment: List[str], segment_index: int, 
                             error_message: str, element_position: Optional[int] = None) -> bool:
         """
@@ -92,8 +97,7 @@ class EnhancedParser(BaseParser):
             True if processing should continue, False otherwise
         """
         context = (create_parse_context()
-                  .segments(self.segments)
-                  .current_segment_index(segment_index)
+                  .segment_window(self.segments, segment_index)
                   .parser_name(self.__class__.__name__)
                   .operation("parse_segment")
                   .component(self.__class__.__name__))
@@ -203,7 +207,7 @@ class EnhancedParser(BaseParser):
                 control_number=""
             )
             
-            self.error_handler.handle_error(transaction_error, self.parse_context.build())
+            self.error_handler.handle_error(transaction_error, self._document_context())
             if not self.error_handler.should_continue(transaction_error):
                 return None
             elif self.strict_mode:
@@ -219,11 +223,11 @@ class EnhancedParser(BaseParser):
             Dictionary containing error statistics and details
         """
         if hasattr(self.error_handler, 'get_errors'):
+            # Bounded handlers return a sample but count every error
             errors = self.error_handler.get_errors()
             return {
-                'total_errors': len(errors),
-                'error_types': {type(e).__name__: sum(1 for err in errors if type(err) == type(e)) 
-                              for e in errors},
+                'total_errors': getattr(self.error_handler, 'error_count', len(errors)),
+                'error_types': dict(Counter(type(e).__name__ for e in errors)),
                 'has_fatal_errors': any(isinstance(e, (EDITransactionError, EDIParseError)) 
                                       for e in errors),
                 'errors': [e.to_dict() for e in errors]
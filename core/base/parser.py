@@ -13,6 +13,34 @@ from ..utils import get_element, safe_float, safe_int, format_edi_date, format_e
 logger = logging.getLogger(__name__)
 
 
+class NodeListener:
+    """
+    Receives parsed nodes as the parser closes them.
+
+    A node is closed when the segment that ends it is read: a service line
+    by the next SVC, a claim by the next CLP (or the end of its claim loop),
+    a transaction by its SE. Listeners see every node exactly once, in
+    document order, while the rest of the document is still unread, so they
+    can work in bounded memory. Parsers that do not emit node events simply
+    ignore the listener.
+    """
+
+    #: Set to True to receive every segment through on_segment
+    wants_segments: bool = False
+
+    def on_segment(self, segment: List[str], segment_index: int) -> None:
+        """Called for each segment before it is handled."""
+
+    def on_service(self, service: Any, claim: Any, path: str) -> None:
+        """Called when a service line is closed."""
+
+    def on_claim(self, claim: Any, path: str) -> None:
+        """Called when a claim (with all of its service lines) is closed."""
+
+    def on_transaction(self, transaction: Any, path: str) -> None:
+        """Called when a transaction set is closed."""
+
+
 class BaseParser(ABC):
     """
     Abstract base class for all EDI transaction parsers.
@@ -30,6 +58,7 @@ class BaseParser(ABC):
         """
         self.segments = segments
         self.current_index = 0
+        self.listener: Optional[NodeListener] = None
         
     @abstractmethod
     def parse(self) -> Any:
@@ -0,0 +1,147 @@
+"""
+Segment handler profiling.
+
+This module records call counts and cumulative time per segment ID and
+handler for dispatch-table parsers such as Parser835. Profiling works by
+replacing entries in the parser's handler map with timed wrappers, so a
+parser that is not profiled runs exactly the same code as before.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import time
+
+
+@dataclass
+class HandlerStats:
+    """Timing counters for one segment ID / handler pair."""
+    segment_id: str
+    handler: str
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1_000_000
+
+    @property
+    def mean_us(self) -> float:
+        return (self.total_ns / self.calls) / 1_000 if self.calls else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segment_id": self.segment_id,
+            "handler": self.handler,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 4),
+            "mean_us": round(self.mean_us, 3),
+            "max_us": round(self.max_ns / 1_000, 3),
+        }
+
+
+class HandlerProfiler:
+    """
+    Collect per-handler timings for a segment dispatcher.
+
+    Example:
+        profiler = HandlerProfiler()
+        handlers = profiler.wrap_handlers(parser.segment_handlers)
+        ...
+        print(profiler.format_report())
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns):
+        self.clock = clock
+        self._stats: Dict[Tuple[str, str], HandlerStats] = {}
+        self.wall_ns = 0
+        self.segments = 0
+
+    def stats_for(self, segment_id: str, handler_name: str) -> HandlerStats:
+        key = (segment_id, handler_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = HandlerStats(segment_id, handler_name)
+            self._stats[key] = stats
+        return stats
+
+    def wrap(self, segment_id: str, handler: Callable) -> Callable:
+        """Return a timed wrapper around a segment handler."""
+        stats = self.stats_for(segment_id, getattr(handler, "__name__", repr(handler)))
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                stats.calls += 1
+                stats.total_ns += elapsed
+                if elapsed > stats.max_ns:
+                    stats.max_ns = elapsed
+
+        timed.__name__ = stats.handler
+        timed.__wrapped__ = handler
+        return timed
+
+    def wrap_handlers(self, handlers: Dict[str, Callable]) -> Dict[str, Callable]:
+        """Return a copy of a dispatch table with every handler wrapped."""
+        return {segment_id: self.wrap(segment_id, handler) for segment_id, handler in handlers.items()}
+
+    def record(self, segment_id: str, handler_name: str, elapsed_ns: int):
+        """Record a timing measured outside a wrapped handler."""
+        stats = self.stats_for(segment_id, handler_name)
+        stats.calls += 1
+        stats.total_ns += elapsed_ns
+        if elapsed_ns > stats.max_ns:
+            stats.max_ns = elapsed_ns
+
+    def reset(self):
+        self._stats.clear()
+        self.wall_ns = 0
+        self.segments = 0
+
+    def handler_stats(self) -> List[HandlerStats]:
+        """Stats for every handler that was called, slowest first."""
+        return sorted((stats for stats in self._stats.values() if stats.calls),
+                      key=lambda stats: stats.total_ns, reverse=True)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build a structured profiling report.
+
+        ``dispatch_overhead_ms`` is the wall time not spent inside any
+        handler: segment iteration, dispatch lookups and error handling.
+        """
+        handlers = self.handler_stats()
+        handler_ns = sum(stats.total_ns for stats in handlers)
+        entries = []
+        for stats in handlers:
+            entry = stats.to_dict()
+            entry["share"] = round(stats.total_ns / handler_ns, 4) if handler_ns else 0.0
+            entries.append(entry)
+
+        return {
+            "segments": self.segments,
+            "wall_ms": round(self.wall_ns / 1_000_000, 4),
+            "handler_ms": round(handler_ns / 1_000_000, 4),
+            "dispatch_overhead_ms": round(max(self.wall_ns - handler_ns, 0) / 1_000_000, 4),
+            "handlers": entries,
+        }
+
+    def format_report(self, limit: Optional[int] = None) -> str:
+        """Render the report as a fixed-width table."""
+        report = self.report()
+        lines = [
+            f"Segments: {report['segments']}  wall: {report['wall_ms']:.3f} ms  "
+            f"handlers: {report['handler_ms']:.3f} ms  overhead: {report['dispatch_overhead_ms']:.3f} ms",
+            f"{'SEG':<5}{'HANDLER':<28}{'CALLS':>9}{'TOTAL ms':>12}{'MEAN us':>11}{'MAX us':>11}{'SHARE':>8}",
+        ]
+        for entry in report["handlers"][:limit]:
+            lines.append(
+                f"{entry['segment_id']:<5}{entry['handler']:<28}{entry['calls']:>9}"
+                f"{entry['total_ms']:>12.3f}{entry['mean_us']:>11.2f}{entry['max_us']:>11.2f}"
+                f"{entry['share']:>8.1%}"
+            )
+        return "\n".join(lines)
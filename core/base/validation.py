@@ -14,6 +14,9 @@ from pathlib import Path
 from datetime import datetime, date
 import logging
 
+from ..utils.dates import parse_date
+from ..utils.identifiers import is_valid_npi
+
 logger = logging.getLogger(__name__)
 
 
@@ -316,29 +319,12 @@ class ValidationEngine:
 # Built-in validation functions
 def validate_date_format(date_str: str, format_str: str = "%Y-%m-%d") -> bool:
     """Validate date format."""
-    try:
-        datetime.strptime(date_str, format_str)
-        return True
-    except:
-        return False
+    return parse_date(date_str, format_str) is not None
 
 
 def validate_npi(npi: str) -> bool:
     """Validate National Provider Identifier (NPI)."""
-    if not npi or len(npi) != 10 or not npi.isdigit():
-        return False
-    
-    # Luhn algorithm check
-    total = 0
-    for i, digit in enumerate(npi):
-        n = int(digit)
-        if i % 2 == 0:
-            n *= 2
-            if n > 9:
-                n = n // 10 + n % 10
-        total += n
-    
-    return total % 10 == 0
+    return bool(npi) and isinstance(npi, str) and is_valid_npi(npi)
 
 
 def validate_amount_format(amount: Union[str, float, int]) -> bool:
@@ -0,0 +1,38 @@
+"""
+External code sets.
+
+This module compiles code lists (CARC, RARC, CPT/HCPCS, ICD-10, provider
+taxonomy, ...) from CSV files into memory-mapped hash index files and
+resolves them by name for validation rules and transformations.
+"""
+
+from .index import CodeSetIndex, compile_codeset, compile_csv, normalize_code, read_csv_codes
+from .registry import (
+    CodeSetRegistry, get_codesets, set_codesets,
+    CARC, RARC, CPT, HCPCS, ICD10, TAXONOMY, CLAIM_STATUS, INDEX_SUFFIX, CODESET_DIR_VARIABLE
+)
+
+__all__ = [
+    # Index files
+    'CodeSetIndex',
+    'compile_codeset',
+    'compile_csv',
+    'normalize_code',
+    'read_csv_codes',
+
+    # Registry
+    'CodeSetRegistry',
+    'get_codesets',
+    'set_codesets',
+
+    # Names
+    'CARC',
+    'RARC',
+    'CPT',
+    'HCPCS',
+    'ICD10',
+    'TAXONOMY',
+    'CLAIM_STATUS',
+    'INDEX_SUFFIX',
+    'CODESET_DIR_VARIABLE'
+]
@@ -0,0 +1,47 @@
+"""
+Built-in code tables.
+
+These cover only the most common codes and are used to describe codes
+when no compiled code set is available.
+"""
+
+from typing import Dict, Mapping
+
+# Claim status codes (CLP02)
+CLAIM_STATUS_CODES: Dict[str, str] = {
+    "1": "Processed as Primary",
+    "2": "Processed as Secondary",
+    "3": "Processed as Tertiary",
+    "4": "Denied",
+    "5": "Pended",
+    "19": "Processed as Primary, Forwarded to Additional Payer(s)",
+    "20": "Processed as Secondary, Forwarded to Additional Payer(s)",
+    "21": "Processed as Tertiary, Forwarded to Additional Payer(s)",
+    "22": "Reversal of Previous Payment",
+    "23": "Not Our Claim, Forwarded to Additional Payer(s)",
+    "25": "Predetermination Pricing Only - No Payment"
+}
+
+# The most common Claim Adjustment Reason Codes (CAS02)
+ADJUSTMENT_REASON_CODES: Dict[str, str] = {
+    "1": "Deductible Amount",
+    "2": "Coinsurance Amount",
+    "3": "Co-payment Amount",
+    "4": "The procedure code is inconsistent with the modifier used",
+    "5": "The procedure code/bill type is inconsistent with the place of service",
+    "11": "The diagnosis is inconsistent with the procedure",
+    "12": "The diagnosis is inconsistent with the patient's age",
+    "13": "The diagnosis is inconsistent with the patient's gender",
+    "18": "Duplicate claim/service",
+    "29": "The time limit for filing has expired",
+    "50": "These are non-covered services because this is not deemed a 'medical necessity'",
+    "96": "Non-covered charge(s)",
+    "97": "The benefit for this service is included in the payment/allowance for another service/procedure",
+    "109": "Claim not covered by this payer/contractor",
+    "151": "Payment adjusted because the payer deems the information submitted does not support this many/frequency of services"
+}
+
+BUILTIN_CODESETS: Dict[str, Mapping[str, str]] = {
+    "claim_status": CLAIM_STATUS_CODES,
+    "carc": ADJUSTMENT_REASON_CODES,
+}
@@ -0,0 +1,238 @@
+"""
+Compiled, memory-mapped code-set index files.
+
+A code set (CARC, RARC, CPT, HCPCS, ICD-10, taxonomy, ...) is compiled
+once from a CSV file into an open-addressing hash table on disk.
+CodeSetIndex maps the file read-only, so opening it costs nothing, every
+lookup touches one or two slots, and the pages are shared through the OS
+page cache by every process that opens the same file.
+
+File layout (little-endian):
+
+    header   magic (8s), version (I), count (I), slots (I), reserved (I),
+             records offset (Q), name (32s)
+    slots    ``slots`` x (hash (I), record offset (I)); offset 0 marks an
+             empty slot, and ``slots`` is a power of two at most half full
+    records  code length (B), code, description length (H), description,
+             all UTF-8
+"""
+
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+import csv
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+MAGIC = b"EDICSET1"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIIQ32s")
+_SLOT = struct.Struct("<II")
+_CODE_LENGTH = struct.Struct("<B")
+_DESCRIPTION_LENGTH = struct.Struct("<H")
+
+_MAX_CODE_BYTES = 255
+_MAX_DESCRIPTION_BYTES = 65535
+
+
+def normalize_code(code: str) -> str:
+    """
+    Canonical form of a code: trimmed, upper case, without dots.
+
+    ICD-10 lists often write ``E11.9`` while X12 carries ``E119``.
+    """
+    return code.strip().upper().replace(".", "")
+
+
+def _hash(code: bytes) -> int:
+    return zlib.crc32(code)
+
+
+def _column(header: Optional[list], column: Union[str, int]) -> int:
+    if isinstance(column, int):
+        return column
+    if header is None:
+        raise ValueError(f"Column {column!r} given by name but the CSV has no header")
+    names = [name.strip().lower() for name in header]
+    if column.lower() not in names:
+        raise ValueError(f"CSV has no column {column!r}; columns: {', '.join(header)}")
+    return names.index(column.lower())
+
+
+def read_csv_codes(path: str, code_column: Union[str, int] = "code",
+                   description_column: Union[str, int, None] = "description",
+                   has_header: bool = True, encoding: str = "utf-8-sig") -> Iterator[Tuple[str, str]]:
+    """
+    Yield ``(code, description)`` pairs from a CSV file.
+
+    Args:
+        path: CSV file
+        code_column: Column name (with a header) or index of the code
+        description_column: Column name or index of the description, or None
+        has_header: Whether the first row names the columns
+        encoding: File encoding; the default strips a UTF-8 byte order mark
+    """
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, None) if has_header else None
+        code_index = _column(header, code_column)
+        description_index = None if description_column is None else _column(header, description_column)
+        for row in reader:
+            if len(row) <= code_index or not row[code_index].strip():
+                continue
+            description = ""
+            if description_index is not None and len(row) > description_index:
+                description = row[description_index].strip()
+            yield row[code_index], description
+
+
+def compile_codeset(entries: Iterable[Tuple[str, str]], output_path: str, name: str = "") -> int:
+    """
+    Compile code/description pairs into an index file.
+
+    The file is written next to ``output_path`` and renamed into place, so
+    processes that have the previous version mapped keep reading it.
+
+    Args:
+        entries: ``(code, description)`` pairs; later duplicates win
+        output_path: Index file to write
+        name: Code set name stored in the header
+
+    Returns:
+        Number of distinct codes written
+    """
+    codes: Dict[bytes, bytes] = {}
+    for code, description in entries:
+        key = normalize_code(code).encode("utf-8")
+        if not key:
+            continue
+        if len(key) > _MAX_CODE_BYTES:
+            raise ValueError(f"Code longer than {_MAX_CODE_BYTES} bytes: {code!r}")
+        codes[key] = (description or "").encode("utf-8")[:_MAX_DESCRIPTION_BYTES]
+
+    slots = 8
+    while slots < len(codes) * 2:
+        slots *= 2
+    mask = slots - 1
+    records_offset = _HEADER.size + slots * _SLOT.size
+
+    table = bytearray(slots * _SLOT.size)
+    records = bytearray()
+    for key, description in codes.items():
+        offset = records_offset + len(records)
+        records += _CODE_LENGTH.pack(len(key)) + key + _DESCRIPTION_LENGTH.pack(len(description)) + description
+        code_hash = _hash(key)
+        slot = code_hash & mask
+        while _SLOT.unpack_from(table, slot * _SLOT.size)[1]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(table, slot * _SLOT.size, code_hash, offset)
+    if records_offset + len(records) > 0xFFFFFFFF:
+        raise ValueError("Code set too large for a 32-bit record offset")
+
+    header = _HEADER.pack(MAGIC, VERSION, len(codes), slots, 0, records_offset,
+                          name.encode("utf-8")[:32])
+    directory = os.path.dirname(os.path.abspath(output_path))
+    descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".codeset-")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(header)
+            f.write(table)
+            f.write(records)
+        os.replace(temporary, output_path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+    return len(codes)
+
+
+def compile_csv(csv_path: str, output_path: str, name: str = "", **csv_options) -> int:
+    """Compile a CSV code list (see ``read_csv_codes``) into an index file."""
+    return compile_codeset(read_csv_codes(csv_path, **csv_options), output_path,
+                           name or os.path.splitext(os.path.basename(output_path))[0])
+
+
+class CodeSetIndex:
+    """
+    Read-only view of a compiled code-set index file.
+
+    Nothing is loaded up front: the file is memory-mapped and each lookup
+    hashes the code and probes the slot table in place.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"Not a code set index: {path}")
+        magic, version, count, slots, _, records_offset, name = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a code set index (or unsupported version): {path}")
+        self.name = name.rstrip(b"\0").decode("utf-8")
+        self._count = count
+        self._mask = slots - 1
+        self._records_offset = records_offset
+
+    def _find(self, code: str) -> int:
+        """Offset of the record for ``code``, or 0."""
+        key = normalize_code(code).encode("utf-8")
+        data = self._map
+        code_hash = _hash(key)
+        slot = code_hash & self._mask
+        unpack_slot = _SLOT.unpack_from
+        while True:
+            slot_hash, offset = unpack_slot(data, _HEADER.size + slot * _SLOT.size)
+            if not offset:
+                return 0
+            if slot_hash == code_hash:
+                length = data[offset]
+                if data[offset + 1:offset + 1 + length] == key:
+                    return offset
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, code: Any) -> bool:
+        return isinstance(code, str) and bool(self._find(code))
+
+    def get(self, code: str, default: Optional[str] = None) -> Optional[str]:
+        """Description of ``code``, or ``default`` when it is not in the set."""
+        if not isinstance(code, str):
+            return default
+        offset = self._find(code)
+        if not offset:
+            return default
+        start = offset + 1 + self._map[offset]
+        (length,) = _DESCRIPTION_LENGTH.unpack_from(self._map, start)
+        start += _DESCRIPTION_LENGTH.size
+        return self._map[start:start + length].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        """Codes in file order."""
+        data = self._map
+        offset = self._records_offset
+        end = len(data)
+        while offset < end:
+            length = data[offset]
+            yield data[offset + 1:offset + 1 + length].decode("utf-8")
+            offset += 1 + length
+            (description_length,) = _DESCRIPTION_LENGTH.unpack_from(data, offset)
+            offset += _DESCRIPTION_LENGTH.size + description_length
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "CodeSetIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"CodeSetIndex({self.name!r}, {self._count} codes)"
@@ -0,0 +1,154 @@
+"""
+Named code sets for validation and transformation.
+
+The registry resolves a code set name (``carc``, ``cpt``, ...) to a
+compiled CodeSetIndex, looked up as ``<name>.csi`` in the code set
+directory (``EDI_CODESET_DIR`` for the global registry) the first time
+it is asked for. Without a compiled index, the small built-in tables
+still describe the most common codes, but they cannot say a code is
+invalid, so ``contains`` returns None for them.
+"""
+
+from typing import Dict, Mapping, Optional, Union
+import logging
+import os
+import threading
+
+from .builtin import BUILTIN_CODESETS
+from .index import CodeSetIndex, normalize_code
+
+logger = logging.getLogger(__name__)
+
+# Code set names
+CARC = "carc"
+RARC = "rarc"
+CPT = "cpt"
+HCPCS = "hcpcs"
+ICD10 = "icd10"
+TAXONOMY = "taxonomy"
+CLAIM_STATUS = "claim_status"
+
+INDEX_SUFFIX = ".csi"
+CODESET_DIR_VARIABLE = "EDI_CODESET_DIR"
+
+
+class CodeSetRegistry:
+    """Resolve code set names to compiled indexes, falling back to built-in tables."""
+
+    def __init__(self, directory: Optional[str] = None, builtins: bool = True):
+        """
+        Initialize the registry.
+
+        Args:
+            directory: Directory holding ``<name>.csi`` index files
+            builtins: Fall back to the built-in tables for known names
+        """
+        self.directory = directory
+        self._builtins: Dict[str, Mapping[str, str]] = dict(BUILTIN_CODESETS) if builtins else {}
+        self._indexes: Dict[str, Optional[CodeSetIndex]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, codeset: Union[str, CodeSetIndex]) -> CodeSetIndex:
+        """Register a compiled index (or the path of one) under ``name``."""
+        index = CodeSetIndex(codeset) if isinstance(codeset, str) else codeset
+        with self._lock:
+            previous = self._indexes.get(name)
+            self._indexes[name] = index
+        if previous is not None and previous is not index:
+            previous.close()
+        return index
+
+    def index(self, name: str) -> Optional[CodeSetIndex]:
+        """The compiled index for ``name``, opening it from the directory on first use."""
+        try:
+            return self._indexes[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._indexes:
+                self._indexes[name] = self._open(name)
+            return self._indexes[name]
+
+    def _open(self, name: str) -> Optional[CodeSetIndex]:
+        if not self.directory:
+            return None
+        path = os.path.join(self.directory, name + INDEX_SUFFIX)
+        if not os.path.exists(path):
+            return None
+        try:
+            return CodeSetIndex(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring code set {name}: {e}")
+            return None
+
+    def is_compiled(self, name: str) -> bool:
+        """Whether a complete, compiled code set is available for ``name``."""
+        return self.index(name) is not None
+
+    def contains(self, name: str, code: str) -> Optional[bool]:
+        """
+        Whether ``code`` is in the code set.
+
+        Returns:
+            True or False with a compiled index; None when only a built-in
+            subset (or nothing) is available
+        """
+        index = self.index(name)
+        if index is None:
+            return None
+        return code in index
+
+    def describe(self, name: str, code: str, default: Optional[str] = None) -> Optional[str]:
+        """Description of ``code`` from the compiled index or the built-in table."""
+        if not isinstance(code, str):
+            return default
+        index = self.index(name)
+        if index is not None:
+            description = index.get(code)
+            if description is not None:
+                return description
+        builtin = self._builtins.get(name)
+        if builtin is not None:
+            description = builtin.get(normalize_code(code))
+            if description is not None:
+                return description
+        return default
+
+    def close(self):
+        """Unmap every open index."""
+        with self._lock:
+            indexes, self._indexes = self._indexes, {}
+        for index in indexes.values():
+            if index is not None:
+                index.close()
+
+
+_registry: Optional[CodeSetRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_codesets() -> CodeSetRegistry:
+    """Return the global registry, created from ``EDI_CODESET_DIR`` on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CodeSetRegistry(os.environ.get(CODESET_DIR_VARIABLE) or None)
+    return _registry
+
+
+def set_codesets(registry: Optional[CodeSetRegistry]) -> Optional[CodeSetRegistry]:
+    """
+    Install a registry globally.
+
+    Args:
+        registry: Registry to use, or None to recreate it from the environment
+
+    Returns:
+        The previously installed registry
+    """
+    global _registry
+    with _registry_lock:
+        previous = _registry
+        _registry = registry
+    return previous
@@ -0,0 +1,40 @@
+"""
+Duplicate claim and payment detection.
+
+This module keeps a persistent index of claim and payment fingerprints
+across files and flags 835 claims and payments that were already
+received, as the remittance is parsed.
+"""
+
+from .bloom import BloomFilter, optimal_parameters
+from .index import FingerprintIndex, FingerprintRecord, BLOOM_SUFFIX
+from .detector import (
+    Duplicate, DuplicateDetector, find_duplicates,
+    fingerprint, claim_fingerprint, payment_fingerprint, payer_key, trace_number,
+    CLAIM, PAYMENT
+)
+
+__all__ = [
+    # Bloom filter
+    'BloomFilter',
+    'optimal_parameters',
+
+    # Index
+    'FingerprintIndex',
+    'FingerprintRecord',
+    'BLOOM_SUFFIX',
+
+    # Detection
+    'Duplicate',
+    'DuplicateDetector',
+    'find_duplicates',
+
+    # Fingerprints
+    'fingerprint',
+    'claim_fingerprint',
+    'payment_fingerprint',
+    'payer_key',
+    'trace_number',
+    'CLAIM',
+    'PAYMENT'
+]
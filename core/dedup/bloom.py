@@ -0,0 +1,97 @@
+"""
+Bloom filter over fixed-size digests.
+
+Keys are already uniformly distributed hashes (see ``core.dedup.index``),
+so bit positions are derived from the key itself by double hashing
+(``h1 + i * h2``) instead of hashing it again k times. A negative answer
+is certain; a positive one is wrong at roughly ``error_rate`` once the
+filter holds ``capacity`` keys.
+"""
+
+from typing import BinaryIO
+import math
+import struct
+
+MAGIC = b"EDIBLOOM"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIQIQ")
+_HALVES = struct.Struct("<QQ")
+
+_MASK_64 = (1 << 64) - 1
+
+
+def optimal_parameters(capacity: int, error_rate: float):
+    """Bit count and hash count for ``capacity`` keys at ``error_rate``."""
+    if capacity < 1:
+        raise ValueError("Bloom filter capacity must be positive")
+    if not 0 < error_rate < 1:
+        raise ValueError("Bloom filter error rate must be between 0 and 1")
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    bits = max(64, (bits + 7) // 8 * 8)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """A Bloom filter for keys of at least 16 bytes."""
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001):
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: False positive rate at capacity
+        """
+        self.capacity = capacity
+        self.bit_count, self.hash_count = optimal_parameters(capacity, error_rate)
+        self.bits = bytearray(self.bit_count // 8)
+        self.count = 0
+
+    def _positions(self, key: bytes):
+        h1, h2 = _HALVES.unpack_from(key)
+        h2 |= 1
+        size = self.bit_count
+        for i in range(self.hash_count):
+            yield ((h1 + i * h2) & _MASK_64) % size
+
+    def add(self, key: bytes) -> None:
+        bits = self.bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self.bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+
+    def write(self, handle: BinaryIO) -> None:
+        handle.write(_HEADER.pack(MAGIC, VERSION, self.capacity, self.hash_count, self.count))
+        handle.write(self.bits)
+
+    @classmethod
+    def read(cls, handle: BinaryIO) -> "BloomFilter":
+        header = handle.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Truncated Bloom filter file")
+        magic, version, capacity, hash_count, count = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Bloom filter file (or unsupported version)")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.hash_count = hash_count
+        bloom.bits = bytearray(handle.read())
+        bloom.bit_count = len(bloom.bits) * 8
+        bloom.count = count
+        if not bloom.bit_count:
+            raise ValueError("Truncated Bloom filter file")
+        return bloom
@@ -0,0 +1,189 @@
+"""
+Duplicate claim and payment detection for 835 remittances.
+
+DuplicateDetector is a NodeListener: it fingerprints every claim and
+every payment as Parser835 closes them and looks each fingerprint up in a
+FingerprintIndex, so a file is checked in the same single pass that
+parses it, with its claims released as it goes.
+
+A claim fingerprint covers the payer, the payer claim control number
+(CLP07), the patient control number (CLP01), the claim status, the
+charge, payment and patient responsibility amounts and the service
+dates. A reversal (CLP02 = 22) or a corrected claim therefore differs
+from the original, while a resent remit matches it. A payment
+fingerprint covers the payer and the TRN02 trace number.
+
+Example:
+    with FingerprintIndex("remits.dedup") as index:
+        for duplicate in find_duplicates("resent.835", index):
+            print(duplicate.kind, duplicate.reference, "first seen in", duplicate.first_seen.source)
+"""
+
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import hashlib
+import os
+
+from ..base.parser import NodeListener
+from ..utils.money import to_cents
+from .index import FingerprintIndex, FingerprintRecord
+
+# Fingerprint kinds
+CLAIM = "claim"
+PAYMENT = "payment"
+
+_SEPARATOR = "\x1f"
+
+
+def fingerprint(kind: str, *fields: Any) -> bytes:
+    """16-byte digest of a kind and its identifying fields."""
+    text = _SEPARATOR.join([kind] + ["" if field is None else str(field) for field in fields])
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def payer_key(transaction_data: Any) -> str:
+    """Payer identity of an 835 transaction: the normalized N1*PR name."""
+    payer = getattr(transaction_data, "payer", None)
+    name = getattr(payer, "name", None) or ""
+    return " ".join(name.upper().split())
+
+
+def trace_number(transaction_data: Any) -> Optional[str]:
+    """TRN02 of an 835 transaction."""
+    for reference in getattr(transaction_data, "reference_numbers", None) or []:
+        if reference.get("type") == "trace_number":
+            return reference.get("value")
+    return None
+
+
+def claim_fields(claim: Any) -> Tuple[Any, ...]:
+    """The payer-independent fields of a claim fingerprint."""
+    service_dates = sorted({service.service_date for service in claim.services if service.service_date})
+    return (
+        claim.payer_control_number,
+        claim.claim_id,
+        claim.status_code,
+        to_cents(claim.total_charge),
+        to_cents(claim.total_paid),
+        to_cents(claim.patient_responsibility),
+        ",".join(service_dates),
+    )
+
+
+def claim_fingerprint(claim: Any, payer: str) -> bytes:
+    """Fingerprint of a claim paid by ``payer``."""
+    return fingerprint(CLAIM, payer, *claim_fields(claim))
+
+
+def payment_fingerprint(transaction_data: Any) -> Optional[bytes]:
+    """Fingerprint of a transaction's payment, or None without a trace number."""
+    trace = trace_number(transaction_data)
+    if not trace:
+        return None
+    return fingerprint(PAYMENT, payer_key(transaction_data), trace)
+
+
+@dataclass
+class Duplicate:
+    """A claim or payment that was already indexed."""
+    kind: str
+    reference: str
+    path: str
+    first_seen: FingerprintRecord
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "reference": self.reference,
+            "path": self.path,
+            "first_seen": self.first_seen._asdict(),
+        }
+
+
+class DuplicateDetector(NodeListener):
+    """
+    Check claims and payments against a FingerprintIndex as they are parsed.
+
+    Claims are fingerprinted when they close but checked when their
+    transaction closes, since the payer is only known from the whole
+    transaction; only the claims' fields are held until then.
+    """
+
+    def __init__(self, index: FingerprintIndex, source: str = "", record: bool = True):
+        """
+        Initialize the detector.
+
+        Args:
+            index: Fingerprint index to check (and extend)
+            source: Name recorded with new fingerprints, usually the file name
+            record: Add unseen fingerprints to the index; False only checks
+        """
+        self.index = index
+        self.source = source
+        self.record = record
+        self.duplicates: List[Duplicate] = []
+        self.claims_checked = 0
+        self.payments_checked = 0
+        self._claims: List[Tuple[Tuple[Any, ...], str, str]] = []
+
+    def on_claim(self, claim: Any, path: str) -> None:
+        self._claims.append((claim_fields(claim), claim.claim_id, path))
+
+    def on_transaction(self, transaction: Any, path: str) -> None:
+        data = transaction.transaction_data
+        payer = payer_key(data)
+        claims, self._claims = self._claims, []
+        for fields, claim_id, claim_path in claims:
+            self._check(fingerprint(CLAIM, payer, *fields), CLAIM, claim_id, claim_path)
+        self.claims_checked += len(claims)
+
+        digest = payment_fingerprint(data)
+        if digest is not None:
+            self._check(digest, PAYMENT, trace_number(data), path)
+            self.payments_checked += 1
+
+    def _check(self, digest: bytes, kind: str, reference: str, path: str) -> None:
+        if self.record:
+            existing = self.index.add(digest, kind, reference, self.source)
+        else:
+            existing = self.index.get(digest)
+        if existing is not None:
+            self.duplicates.append(Duplicate(kind, reference, path, existing))
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "claims_checked": self.claims_checked,
+            "payments_checked": self.payments_checked,
+            "duplicate_claims": sum(1 for duplicate in self.duplicates if duplicate.kind == CLAIM),
+            "duplicate_payments": sum(1 for duplicate in self.duplicates if duplicate.kind == PAYMENT),
+        }
+
+
+def find_duplicates(source: Union[str, BinaryIO], index: FingerprintIndex, record: bool = True,
+                    source_name: Optional[str] = None) -> List[Duplicate]:
+    """
+    Parse an 835 file in one pass and report its already-indexed claims and payments.
+
+    Args:
+        source: Path or binary handle of the EDI file
+        index: Fingerprint index to check
+        record: Add the file's new fingerprints to the index
+        source_name: Name recorded with new fingerprints; defaults to the file name
+
+    Returns:
+        Duplicates in document order of their transactions
+    """
+    from ..streaming import SegmentReader
+    from ..transactions.t835.parser import Parser835
+
+    if source_name is None:
+        source_name = os.path.basename(source) if isinstance(source, str) else getattr(source, "name", "")
+    detector = DuplicateDetector(index, source=str(source_name), record=record)
+    handle = open(source, "rb") if isinstance(source, str) else source
+    try:
+        segments = (segment.elements for segment in SegmentReader(handle))
+        Parser835(segments, listener=detector, retain_claims=False).parse()
+    finally:
+        if handle is not source:
+            handle.close()
+    return detector.duplicates
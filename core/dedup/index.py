@@ -0,0 +1,218 @@
+"""
+Persistent index of claim and payment fingerprints.
+
+Fingerprints are 16-byte digests stored in an SQLite table keyed by the
+digest (``WITHOUT ROWID``, so the table is the B-tree index itself). A
+Bloom filter kept next to the database (``<path>.bloom``) answers most
+lookups without touching disk: new claims, which are nearly all of them,
+are ruled out in memory, and only Bloom positives are confirmed with a
+primary-key lookup. New fingerprints are buffered and written in batches.
+
+The Bloom filter is saved on ``commit``; if it is missing or does not
+match the database (after a crash, say), it is rebuilt from the table
+when the index is opened, sized for at least twice the stored count.
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from datetime import datetime
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+from .bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+BLOOM_SUFFIX = ".bloom"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    digest BLOB PRIMARY KEY,
+    kind TEXT NOT NULL,
+    reference TEXT NOT NULL,
+    source INTEGER NOT NULL,
+    seen_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class FingerprintRecord(NamedTuple):
+    """Where and when a fingerprint was first indexed."""
+    kind: str
+    reference: str
+    source: str
+    seen_at: str
+
+
+class FingerprintIndex:
+    """
+    Disk-backed set of fingerprints with an in-memory Bloom filter.
+
+    Safe to share between threads. Call ``commit`` (or use the index as a
+    context manager) to make additions durable.
+    """
+
+    def __init__(self, path: str, capacity: int = 10000000, error_rate: float = 0.001,
+                 batch_size: int = 10000):
+        """
+        Open or create an index.
+
+        Args:
+            path: SQLite database file
+            capacity: Fingerprints the Bloom filter is sized for when created
+            error_rate: Bloom filter false positive rate at capacity
+            batch_size: Additions buffered before they are written
+        """
+        self.path = path
+        self.bloom_path = path + BLOOM_SUFFIX
+        self.error_rate = error_rate
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending: Dict[bytes, Tuple[str, str, int, str]] = {}
+        self._sources: Dict[str, int] = {}
+        self._source_names: Dict[int, str] = {}
+        self.count = self._stored_count()
+        self.bloom = self._load_bloom(capacity)
+        self.bloom_positives = 0
+        self.false_positives = 0
+
+    def _stored_count(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()
+        return row[0] if row else 0
+
+    def _load_bloom(self, capacity: int) -> BloomFilter:
+        if os.path.exists(self.bloom_path):
+            try:
+                with open(self.bloom_path, "rb") as f:
+                    bloom = BloomFilter.read(f)
+                if bloom.count == self.count and not bloom.saturated:
+                    return bloom
+                logger.info(f"Rebuilding Bloom filter for {self.path}: out of date or saturated")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Rebuilding Bloom filter for {self.path}: {e}")
+        bloom = BloomFilter(max(capacity, self.count * 2), self.error_rate)
+        if self.count:
+            for (digest,) in self._conn.execute("SELECT digest FROM fingerprints"):
+                bloom.add(digest)
+        return bloom
+
+    def _source_id(self, source: str) -> int:
+        source_id = self._sources.get(source)
+        if source_id is None:
+            self._conn.execute("INSERT OR IGNORE INTO sources (name) VALUES (?)", (source,))
+            source_id = self._conn.execute("SELECT id FROM sources WHERE name = ?", (source,)).fetchone()[0]
+            self._sources[source] = source_id
+            self._source_names[source_id] = source
+        return source_id
+
+    def get(self, digest: bytes) -> Optional[FingerprintRecord]:
+        """The record of an indexed fingerprint, or None."""
+        with self._lock:
+            if digest not in self.bloom:
+                return None
+            self.bloom_positives += 1
+            pending = self._pending.get(digest)
+            if pending is not None:
+                kind, reference, source_id, seen_at = pending
+                return FingerprintRecord(kind, reference, self._source_names[source_id], seen_at)
+            row = self._conn.execute(
+                "SELECT f.kind, f.reference, s.name, f.seen_at FROM fingerprints f "
+                "JOIN sources s ON s.id = f.source WHERE f.digest = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                self.false_positives += 1
+                return None
+            return FingerprintRecord(*row)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return self.get(digest) is not None
+
+    def add(self, digest: bytes, kind: str, reference: str = "",
+            source: str = "") -> Optional[FingerprintRecord]:
+        """
+        Index a fingerprint unless it is already there.
+
+        Returns:
+            The existing record when the fingerprint was already indexed,
+            otherwise None
+        """
+        with self._lock:
+            existing = self.get(digest)
+            if existing is not None:
+                return existing
+            self._pending[digest] = (kind, reference, self._source_id(source), datetime.now().isoformat())
+            self.bloom.add(digest)
+            self.count += 1
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+            return None
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO fingerprints (digest, kind, reference, source, seen_at) VALUES (?, ?, ?, ?, ?)",
+            [(digest,) + values for digest, values in self._pending.items()],
+        )
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('count', ?)", (self.count,))
+        self._pending = {}
+
+    def commit(self) -> None:
+        """Write buffered fingerprints and save the Bloom filter."""
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+            directory = os.path.dirname(os.path.abspath(self.bloom_path))
+            descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".bloom-")
+            try:
+                with os.fdopen(descriptor, "wb") as f:
+                    self.bloom.write(f)
+                os.replace(temporary, self.bloom_path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.unlink(temporary)
+                raise
+
+    def rollback(self) -> None:
+        """Drop fingerprints added since the last commit."""
+        with self._lock:
+            self._pending = {}
+            self._sources = {}
+            self._source_names = {}
+            self._conn.rollback()
+            self.count = self._stored_count()
+            self.bloom = self._load_bloom(self.bloom.capacity)
+
+    def stats(self) -> Dict[str, int]:
+        """Indexed fingerprints, Bloom positives and confirmed false positives."""
+        with self._lock:
+            return {"fingerprints": self.count, "bloom_positives": self.bloom_positives,
+                    "false_positives": self.false_positives}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "FingerprintIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
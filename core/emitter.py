@@ -1,5 +1,6 @@
 import json
 from .base.edi_ast import EdiRoot
+from .telemetry import get_instrumentation, SPAN_EMIT, HISTOGRAM_EMIT
 
 def convert_floats_to_ints(obj):
     """Recursively convert float values that are whole numbers to integers."""
@@ -17,6 +18,29 @@ class EdiEmitter:
         self.edi_root = edi_root
 
     def to_json(self, pretty: bool = False) -> str:
+        with get_instrumentation().timed(SPAN_EMIT, HISTOGRAM_EMIT, {"format": "json"}):
+            return self._render_json(pretty)
+
+    def to_csv(self) -> str:
+        """Convert EDI data to CSV format focusing on claims data."""
+        with get_instrumentation().timed(SPAN_EMIT, HISTOGRAM_EMIT, {"format": "csv"}):
+            return self._render_csv()
+
+    def to_x12(self, **options) -> str:
+        """
+        Convert the document back to X12.
+
+        Keyword arguments are passed to X12Writer.begin_interchange. Use
+        core.streaming.X12Writer directly to write large documents to a file.
+        """
+        import io
+        from .streaming.writer import X12Writer
+
+        output = io.StringIO()
+        X12Writer(output).write_root(self.edi_root, **options)
+        return output.getvalue()
+
+    def _render_json(self, pretty: bool) -> str:
         data = self.edi_root.to_dict()
         # Convert floats that are whole numbers to integers
         data = convert_floats_to_ints(data)
@@ -26,8 +50,7 @@ class EdiEmitter:
             json_output += '\n'
         return json_output
 
-    def to_csv(self) -> str:
-        """Convert EDI data to CSV format focusing on claims data."""
+    def _render_csv(self) -> str:
         import csv
         import io
         
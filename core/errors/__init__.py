@@ -26,12 +26,14 @@ from .context import (
     PluginErrorContext,
     create_parse_context,
     create_validation_context,
-    create_plugin_context
+    create_plugin_context,
+    DEFAULT_SEGMENT_WINDOW
 )
 
 from .handler import (
     ErrorHandler, 
     StandardErrorHandler,
+    BoundedErrorHandler,
     SilentErrorHandler,
     FailFastErrorHandler,
     FilteringErrorHandler
@@ -59,10 +61,12 @@ __all__ = [
     'create_parse_context',
     'create_validation_context',
     'create_plugin_context',
+    'DEFAULT_SEGMENT_WINDOW',
     
     # Handler classes
     'ErrorHandler',
     'StandardErrorHandler',
+    'BoundedErrorHandler',
     'SilentErrorHandler',
     'FailFastErrorHandler',
     'FilteringErrorHandler'
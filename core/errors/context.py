@@ -32,24 +32,39 @@ class ErrorContext:
         }
 
 
+# Segments kept on each side of the failing segment by segment_window()
+DEFAULT_SEGMENT_WINDOW = 2
+
+
 @dataclass
 class ParseErrorContext(ErrorContext):
-    """Context for parsing errors."""
+    """
+    Context for parsing errors.
+
+    ``segments`` is either the whole segment list or a window of it that
+    starts at index ``segment_offset``; ``current_segment_index`` is always
+    an index into the whole list.
+    """
     segments: List[List[str]] = field(default_factory=list)
     current_segment_index: int = -1
     transaction_code: str = ""
     parser_name: str = ""
+    segment_offset: int = 0
+    total_segments: Optional[int] = None
     
     @property
     def current_segment(self) -> Optional[List[str]]:
         """Get the current segment being processed."""
-        if 0 <= self.current_segment_index < len(self.segments):
-            return self.segments[self.current_segment_index]
+        index = self.current_segment_index - self.segment_offset
+        if self.current_segment_index >= 0 and 0 <= index < len(self.segments):
+            return self.segments[index]
         return None
     
     @property
     def segment_count(self) -> int:
         """Get total number of segments."""
+        if self.total_segments is not None:
+            return self.total_segments
         return len(self.segments)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -137,6 +152,22 @@ class ErrorContextBuilder:
         self._data['segments'] = segments
         return self
     
+    def segment_window(self, segments: List[List[str]], index: int,
+                       radius: int = DEFAULT_SEGMENT_WINDOW) -> 'ErrorContextBuilder':
+        """
+        Keep only the segments around ``index`` (for ParseErrorContext).
+
+        The context copies at most ``2 * radius + 1`` segments instead of
+        referencing the whole list, so collected errors do not keep large
+        documents alive.
+        """
+        start = max(index - radius, 0)
+        self._data['segments'] = segments[start:index + radius + 1]
+        self._data['segment_offset'] = start
+        self._data['total_segments'] = len(segments)
+        self._data['current_segment_index'] = index
+        return self
+    
     def current_segment_index(self, index: int) -> 'ErrorContextBuilder':
         """Set current segment index (for ParseErrorContext)."""
         self._data['current_segment_index'] = index
@@ -5,8 +5,10 @@ This module provides handlers that process and respond to errors
 during EDI parsing, validation, and plugin operations.
 """
 
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from collections import Counter
 import logging
+import random
 from abc import ABC, abstractmethod
 
 from .exceptions import EDIError, EDIMultipleErrors
@@ -85,7 +87,8 @@ class StandardErrorHandler(ErrorHandler):
         self.error_count += 1
         self.collected_errors.append(error)
         
-        if self.log_errors:
+        # Skip building the log record when ERROR logging is off
+        if self.log_errors and logger.isEnabledFor(logging.ERROR):
             self._log_error(error, context)
         
         if self.error_callback:
@@ -161,6 +164,98 @@ class StandardErrorHandler(ErrorHandler):
         logger.error(f"EDI Error: {error.message}", extra=error_info)
 
 
+class BoundedErrorHandler(ErrorHandler):
+    """
+    Error handler with bounded memory for inputs with very many errors.
+
+    Every error is counted per error code, but only the first error of
+    each code and a fixed-size uniform random sample (reservoir sampling)
+    of all errors are kept together with their contexts.
+    """
+    
+    def __init__(self,
+                 sample_size: int = 100,
+                 log_errors: bool = False,
+                 max_errors: Optional[int] = None,
+                 seed: Optional[int] = None):
+        """
+        Initialize the bounded error handler.
+        
+        Args:
+            sample_size: Number of errors kept in the random sample
+            log_errors: Whether to log each error
+            max_errors: Maximum number of errors before stopping (None for unlimited)
+            seed: Seed for the sampling random generator, for reproducible samples
+        """
+        if sample_size < 0:
+            raise ValueError(f"sample_size must not be negative, got {sample_size}")
+        self.sample_size = sample_size
+        self.log_errors = log_errors
+        self.max_errors = max_errors
+        self.error_count = 0
+        self.counts_by_code: Counter = Counter()
+        self.first_by_code: Dict[str, EDIError] = {}
+        self._samples: List[Tuple[EDIError, Optional[ErrorContext]]] = []
+        self._random = random.Random(seed)
+    
+    def handle_error(self, error: EDIError, context: Optional[ErrorContext] = None) -> None:
+        """Count the error and keep it if it is sampled."""
+        self.error_count += 1
+        code = getattr(error, 'error_code', type(error).__name__)
+        self.counts_by_code[code] += 1
+        if code not in self.first_by_code:
+            self.first_by_code[code] = error
+        
+        if len(self._samples) < self.sample_size:
+            self._samples.append((error, context))
+        elif self.sample_size:
+            slot = self._random.randrange(self.error_count)
+            if slot < self.sample_size:
+                self._samples[slot] = (error, context)
+        
+        if self.log_errors and logger.isEnabledFor(logging.ERROR):
+            logger.error(f"EDI Error [{code}]: {getattr(error, 'message', error)}")
+    
+    def handle_multiple_errors(self, errors: List[EDIError],
+                             context: Optional[ErrorContext] = None) -> None:
+        """Count and sample multiple errors."""
+        for error in errors:
+            self.handle_error(error, context)
+    
+    def should_continue(self, error: EDIError) -> bool:
+        """Determine if processing should continue."""
+        if self.max_errors is not None and self.error_count >= self.max_errors:
+            return False
+        return True
+    
+    def get_errors(self) -> List[EDIError]:
+        """Get the sampled errors."""
+        return [error for error, _ in self._samples]
+    
+    def get_samples(self) -> List[Tuple[EDIError, Optional[ErrorContext]]]:
+        """Get the sampled errors with their contexts."""
+        return self._samples.copy()
+    
+    def has_errors(self) -> bool:
+        """Check if any errors have been handled."""
+        return self.error_count > 0
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get error totals per error code."""
+        return {
+            'error_count': self.error_count,
+            'counts_by_code': dict(self.counts_by_code.most_common()),
+            'sampled': len(self._samples),
+        }
+    
+    def reset(self) -> None:
+        """Reset the error handler state."""
+        self.error_count = 0
+        self.counts_by_code.clear()
+        self.first_by_code.clear()
+        self._samples.clear()
+
+
 class SilentErrorHandler(ErrorHandler):
     """Error handler that collects errors without logging or raising."""
     
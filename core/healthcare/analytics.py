@@ -0,0 +1,381 @@
+"""
+Streaming, mergeable analytics over 835 remittances.
+
+Each accumulator takes one claim at a time, keeps integer cents and
+counts only, and can be merged with another accumulator of the same
+kind, so a month of remittances is aggregated in one pass per file, in
+parallel worker processes, with a final merge that gives the same totals
+as a single pass over everything:
+
+    PaymentTotals           the figures of ``calculate_payment_summary``
+    AdjustmentReasons       a histogram of the adjustments that
+                            ``extract_denial_reasons`` reports
+    AgingBuckets            the buckets of ``generate_claim_aging_report``
+
+RemittanceAnalytics is a NodeListener that feeds all three from
+Parser835, grouped by payer or payee, and ``aggregate_files`` runs it
+over many files on a process pool.
+
+Example:
+    analytics = aggregate_files(glob.glob("remits/2024-03/*.835"), group_by=GROUP_BY_PAYER)
+    report = analytics.to_dict()
+"""
+
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+
+from ..base.parser import NodeListener
+from ..utils.dates import AGING_BUCKETS, AGING_OVERFLOW_BUCKET, aging_bucket, parse_edi_date
+from ..utils.money import to_cents, to_decimal
+
+# Grouping keys
+GROUP_BY_PAYER = "payer"
+GROUP_BY_PAYEE = "payee"
+GROUP_BY_OPTIONS = (GROUP_BY_PAYER, GROUP_BY_PAYEE)
+
+# Claim status codes counted as paid and as denied by calculate_payment_summary
+PAID_STATUSES = frozenset(("1", "2", "3", "4"))
+DENIED_STATUSES = frozenset(("5", "6", "7", "8"))
+
+_BUCKET_NAMES = tuple(name for name, _ in AGING_BUCKETS) + (AGING_OVERFLOW_BUCKET,)
+
+
+def amount_cents(value: Any) -> int:
+    """Cents of an amount, rounding sub-cent values; 0 for missing or invalid ones."""
+    if value is None:
+        return 0
+    cents = to_cents(value)
+    if cents is not None:
+        return cents
+    try:
+        return int(to_decimal(value).scaleb(2).to_integral_value())
+    except (ArithmeticError, ValueError):
+        return 0
+
+
+def _amount(cents: int) -> float:
+    return cents / 100
+
+
+@dataclass
+class PaymentTotals:
+    """Running payment summary: claim counts and amounts in cents."""
+    total_claims: int = 0
+    charge_cents: int = 0
+    paid_cents: int = 0
+    adjustment_cents: int = 0
+    patient_responsibility_cents: int = 0
+    claims_paid: int = 0
+    claims_denied: int = 0
+    claims_pending: int = 0
+
+    def add_claim(self, claim: Any) -> None:
+        self.total_claims += 1
+        self.charge_cents += amount_cents(claim.total_charge)
+        self.paid_cents += amount_cents(claim.total_paid)
+        self.patient_responsibility_cents += amount_cents(claim.patient_responsibility)
+        for adjustment in claim.adjustments or ():
+            self.adjustment_cents += amount_cents(adjustment.amount)
+        status = claim.status_code
+        if status in PAID_STATUSES:
+            self.claims_paid += 1
+        elif status in DENIED_STATUSES:
+            self.claims_denied += 1
+        else:
+            self.claims_pending += 1
+
+    def add_plb(self, entries: Optional[Iterable[Any]]) -> None:
+        """Add provider-level (PLB) adjustments."""
+        for entry in entries or ():
+            if isinstance(entry, dict):
+                self.adjustment_cents += amount_cents(entry.get("amount", entry.get("adjustment_amount")))
+
+    def merge(self, other: "PaymentTotals") -> "PaymentTotals":
+        self.total_claims += other.total_claims
+        self.charge_cents += other.charge_cents
+        self.paid_cents += other.paid_cents
+        self.adjustment_cents += other.adjustment_cents
+        self.patient_responsibility_cents += other.patient_responsibility_cents
+        self.claims_paid += other.claims_paid
+        self.claims_denied += other.claims_denied
+        self.claims_pending += other.claims_pending
+        return self
+
+    def summary(self):
+        """The totals as a PaymentSummary."""
+        from .transformations import PaymentSummary
+
+        return PaymentSummary(
+            total_claims=self.total_claims,
+            total_charges=_amount(self.charge_cents),
+            total_payments=_amount(self.paid_cents),
+            total_adjustments=_amount(self.adjustment_cents),
+            total_patient_responsibility=_amount(self.patient_responsibility_cents),
+            net_amount=_amount(self.paid_cents + self.adjustment_cents + self.patient_responsibility_cents),
+            claims_paid=self.claims_paid,
+            claims_denied=self.claims_denied,
+            claims_pending=self.claims_pending,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.summary().to_dict()
+
+
+@dataclass
+class AdjustmentReasons:
+    """
+    Histogram of claim adjustments by group and reason code.
+
+    Only codes are counted; descriptions are looked up once per distinct
+    code when the histogram is reported.
+    """
+    counts: Dict[Tuple[str, str], List[int]] = field(default_factory=dict)
+
+    def add_claim(self, claim: Any) -> None:
+        counts = self.counts
+        for adjustment in claim.adjustments or ():
+            key = (adjustment.group_code, adjustment.reason_code)
+            entry = counts.get(key)
+            if entry is None:
+                counts[key] = entry = [0, 0]
+            entry[0] += 1
+            entry[1] += amount_cents(adjustment.amount)
+
+    def merge(self, other: "AdjustmentReasons") -> "AdjustmentReasons":
+        for key, (count, cents) in other.counts.items():
+            entry = self.counts.get(key)
+            if entry is None:
+                self.counts[key] = [count, cents]
+            else:
+                entry[0] += count
+                entry[1] += cents
+        return self
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Reasons with the fields of ``extract_denial_reasons``, largest amount first."""
+        from .transformations import HealthcareTransformer
+
+        reasons = []
+        for (group_code, reason_code), (count, cents) in self.counts.items():
+            reasons.append({
+                "group_code": group_code,
+                "reason_code": reason_code,
+                "reason_description": HealthcareTransformer._decode_adjustment_reason(reason_code),
+                "type": HealthcareTransformer._categorize_adjustment_group(group_code),
+                "count": count,
+                "amount": _amount(cents),
+            })
+        reasons.sort(key=lambda reason: (-abs(reason["amount"]), reason["group_code"], reason["reason_code"]))
+        return reasons
+
+
+@dataclass
+class AgingBuckets:
+    """
+    Claim counts and amounts per aging bucket, measured from a fixed date.
+
+    Accumulators can only be merged when they age claims from the same
+    ``as_of`` date.
+    """
+    as_of: date = field(default_factory=date.today)
+    input_format: str = "CCYYMMDD"
+    buckets: Dict[str, List[int]] = field(default_factory=lambda: {name: [0, 0] for name in _BUCKET_NAMES})
+
+    def add(self, service_date: Optional[str], amount: Any) -> bool:
+        """
+        Age one claim.
+
+        Returns:
+            False when the service date is missing or invalid and the claim
+            was skipped
+        """
+        if not service_date:
+            return False
+        parsed = parse_edi_date(service_date, self.input_format)
+        if parsed is None:
+            return False
+        entry = self.buckets[aging_bucket(self.as_of.toordinal() - parsed.toordinal())]
+        entry[0] += 1
+        entry[1] += amount_cents(amount)
+        return True
+
+    def merge(self, other: "AgingBuckets") -> "AgingBuckets":
+        if other.as_of != self.as_of:
+            raise ValueError(f"Cannot merge aging measured from {other.as_of} into aging measured from {self.as_of}")
+        for name, (count, cents) in other.buckets.items():
+            entry = self.buckets[name]
+            entry[0] += count
+            entry[1] += cents
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The shape of ``generate_claim_aging_report``."""
+        return {
+            "aging_buckets": {name: {"count": count, "amount": _amount(cents)}
+                              for name, (count, cents) in self.buckets.items()},
+            "total_claims": sum(count for count, _ in self.buckets.values()),
+            "total_amount": _amount(sum(cents for _, cents in self.buckets.values())),
+        }
+
+
+def claim_service_date(claim: Any) -> Optional[str]:
+    """Earliest service date of an 835 claim's service lines."""
+    dates = [service.service_date for service in claim.services or () if service.service_date]
+    return min(dates) if dates else None
+
+
+@dataclass
+class RemittanceAggregate:
+    """Payment totals, adjustment reasons and aging for one group of claims."""
+    payments: PaymentTotals
+    adjustments: AdjustmentReasons
+    aging: AgingBuckets
+
+    @classmethod
+    def empty(cls, as_of: date) -> "RemittanceAggregate":
+        # Parsed 835 dates are formatted as YYYY-MM-DD
+        return cls(PaymentTotals(), AdjustmentReasons(), AgingBuckets(as_of, "ISO"))
+
+    def add_claim(self, claim: Any) -> None:
+        self.payments.add_claim(claim)
+        self.adjustments.add_claim(claim)
+        self.aging.add(claim_service_date(claim), claim.total_charge)
+
+    def merge(self, other: "RemittanceAggregate") -> "RemittanceAggregate":
+        self.payments.merge(other.payments)
+        self.adjustments.merge(other.adjustments)
+        self.aging.merge(other.aging)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "payment_summary": self.payments.to_dict(),
+            "adjustment_reasons": self.adjustments.to_list(),
+            "aging": self.aging.to_dict(),
+        }
+
+
+class RemittanceAnalytics(NodeListener):
+    """
+    Aggregate 835 claims as Parser835 closes them.
+
+    Claims are added to an aggregate for their transaction, which is
+    merged into its payer's or payee's group when the transaction closes,
+    since the parties are only known from the whole transaction.
+    """
+
+    def __init__(self, group_by: Optional[str] = None, as_of: Optional[date] = None):
+        """
+        Initialize the analytics.
+
+        Args:
+            group_by: ``payer``, ``payee`` or None for a single group
+            as_of: Date claims are aged from (default: today)
+        """
+        if group_by is not None and group_by not in GROUP_BY_OPTIONS:
+            raise ValueError(f"Unknown grouping: {group_by}. Available: {', '.join(GROUP_BY_OPTIONS)}")
+        self.group_by = group_by
+        self.as_of = as_of or date.today()
+        self.groups: Dict[str, RemittanceAggregate] = {}
+        self.files = 0
+        self._current = RemittanceAggregate.empty(self.as_of)
+
+    def on_claim(self, claim: Any, path: str) -> None:
+        self._current.add_claim(claim)
+
+    def on_transaction(self, transaction: Any, path: str) -> None:
+        data = transaction.transaction_data
+        self._current.payments.add_plb(getattr(data, "plb", None))
+        self._group(self._group_key(data)).merge(self._current)
+        self._current = RemittanceAggregate.empty(self.as_of)
+
+    def _group_key(self, data: Any) -> str:
+        if self.group_by is None:
+            return ""
+        party = getattr(data, self.group_by, None)
+        return getattr(party, "name", None) or ""
+
+    def _group(self, key: str) -> RemittanceAggregate:
+        group = self.groups.get(key)
+        if group is None:
+            self.groups[key] = group = RemittanceAggregate.empty(self.as_of)
+        return group
+
+    def merge(self, other: "RemittanceAnalytics") -> "RemittanceAnalytics":
+        """Add another file's or worker's analytics into this one."""
+        if other.group_by != self.group_by:
+            raise ValueError(f"Cannot merge analytics grouped by {other.group_by} into analytics grouped by "
+                             f"{self.group_by}")
+        for key, group in other.groups.items():
+            self._group(key).merge(group)
+        self.files += other.files
+        return self
+
+    def total(self) -> RemittanceAggregate:
+        """All groups merged."""
+        total = RemittanceAggregate.empty(self.as_of)
+        for group in self.groups.values():
+            total.merge(group)
+        return total
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"as_of": self.as_of.isoformat(), "files": self.files, "group_by": self.group_by,
+                "total": self.total().to_dict()}
+        if self.group_by is not None:
+            data["groups"] = {key: group.to_dict() for key, group in sorted(self.groups.items())}
+        return data
+
+
+def aggregate_file(source: Union[str, BinaryIO], group_by: Optional[str] = None,
+                   as_of: Optional[date] = None) -> RemittanceAnalytics:
+    """
+    Aggregate one 835 file in a single streaming pass.
+
+    Args:
+        source: Path or binary handle of the EDI file
+        group_by: ``payer``, ``payee`` or None
+        as_of: Date claims are aged from (default: today)
+
+    Returns:
+        The file's analytics, ready to be merged with others
+    """
+    from ..streaming import SegmentReader
+    from ..transactions.t835.parser import Parser835
+
+    analytics = RemittanceAnalytics(group_by=group_by, as_of=as_of)
+    handle = open(source, "rb") if isinstance(source, str) else source
+    try:
+        segments = (segment.elements for segment in SegmentReader(handle))
+        Parser835(segments, listener=analytics, retain_claims=False).parse()
+    finally:
+        if handle is not source:
+            handle.close()
+    analytics.files = 1
+    return analytics
+
+
+def aggregate_files(paths: Iterable[str], group_by: Optional[str] = None, as_of: Optional[date] = None,
+                    max_workers: Optional[int] = None, use_processes: bool = True) -> RemittanceAnalytics:
+    """
+    Aggregate many 835 files in parallel, one pass per file, and merge the results.
+
+    Args:
+        paths: EDI files
+        group_by: ``payer``, ``payee`` or None
+        as_of: Date claims are aged from (default: today, fixed for all workers)
+        max_workers: Number of workers (defaults to the CPU count)
+        use_processes: Use a process pool rather than threads
+
+    Returns:
+        The merged analytics
+    """
+    from ..streaming.executor import ParallelExecutor
+
+    as_of = as_of or date.today()
+    analytics = RemittanceAnalytics(group_by=group_by, as_of=as_of)
+    executor = ParallelExecutor(max_workers=max_workers, use_processes=use_processes)
+    for result in executor.map(partial(aggregate_file, group_by=group_by, as_of=as_of), paths):
+        analytics.merge(result)
+    return analytics
@@ -0,0 +1,304 @@
+"""
+Provider master-data enrichment.
+
+Maps the provider NPIs found in parsed transactions (the 835 payee, the
+837P billing and rendering providers) to records from a provider master
+file: internal ID, name, taxonomy and group. Lookups go through a
+ProviderLookup backend (a SQLite database or a CSV file) behind a
+bounded LRU cache, and every NPI of a transaction, or of a whole
+pipeline item, is resolved with one batched backend query, so a file
+with a million claims from a few thousand providers costs a few
+thousand lookups.
+
+Example:
+    enricher = ProviderEnricher(SqliteProviderLookup("providers.db"))
+    providers = enricher.enrich_transaction(transaction.transaction_data)
+    # {"payee": {"npi": "1234567893", "internal_id": "P-0042", ...}}
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import csv
+import sqlite3
+import threading
+
+from ..transactions.t835.ast import Transaction835
+from ..transactions.t837p.ast import Transaction837P
+
+# Provider roles
+PAYEE = "payee"
+BILLING_PROVIDER = "billing_provider"
+RENDERING_PROVIDER = "rendering_provider"
+
+# ProviderRecord fields filled from same-named columns unless mapped otherwise
+RECORD_FIELDS = ("internal_id", "name", "taxonomy", "group")
+
+
+@dataclass
+class ProviderRecord:
+    """A provider master record."""
+    npi: str
+    internal_id: Optional[str] = None
+    name: Optional[str] = None
+    taxonomy: Optional[str] = None
+    group: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, npi: str, row: Mapping[str, Any],
+                 columns: Optional[Mapping[str, str]] = None) -> "ProviderRecord":
+        """
+        Build a record from a row keyed by column name.
+
+        Args:
+            npi: Provider NPI
+            row: Column values
+            columns: Record field to column name, for columns not named
+                after the field; other columns go into ``attributes``
+        """
+        columns = columns or {}
+        used = set()
+        values = {}
+        for name in RECORD_FIELDS:
+            column = columns.get(name, name)
+            if column in row:
+                values[name] = row[column]
+                used.add(column)
+        attributes = {column: value for column, value in row.items()
+                      if column not in used and column != columns.get("npi", "npi")}
+        return cls(npi=npi, attributes=attributes, **values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "npi": self.npi,
+            "internal_id": self.internal_id,
+            "name": self.name,
+            "taxonomy": self.taxonomy,
+            "group": self.group,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        return data
+
+
+class ProviderLookup(ABC):
+    """Backend that resolves NPIs to provider records."""
+
+    @abstractmethod
+    def lookup_many(self, npis: Sequence[str]) -> Dict[str, ProviderRecord]:
+        """Resolve NPIs in one batch; unknown NPIs are left out of the result."""
+        pass
+
+    def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+
+class SqliteProviderLookup(ProviderLookup):
+    """
+    Provider records from a table in a SQLite database.
+
+    Each batch is one ``SELECT ... WHERE npi IN (...)`` query (split at
+    ``batch_size`` NPIs to stay under SQLite's parameter limit). The
+    database is opened read-only; an index on the NPI column is assumed.
+    """
+
+    def __init__(self, path: str, table: str = "providers", npi_column: str = "npi",
+                 columns: Optional[Mapping[str, str]] = None, batch_size: int = 500):
+        """
+        Initialize the lookup.
+
+        Args:
+            path: SQLite database file
+            table: Table holding one row per provider
+            npi_column: Column holding the NPI
+            columns: Record field to column name, e.g. ``{"internal_id": "provider_key"}``
+            batch_size: Maximum NPIs per query
+        """
+        self.path = path
+        self.table = table
+        self.npi_column = npi_column
+        self.columns = dict(columns or {}, npi=npi_column)
+        self.batch_size = batch_size
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+    def lookup_many(self, npis: Sequence[str]) -> Dict[str, ProviderRecord]:
+        records = {}
+        for start in range(0, len(npis), self.batch_size):
+            batch = list(npis[start:start + self.batch_size])
+            query = (f'SELECT * FROM "{self.table}" WHERE "{self.npi_column}" IN '
+                     f'({", ".join("?" * len(batch))})')
+            with self._lock:
+                rows = self._connection.execute(query, batch).fetchall()
+            for row in rows:
+                npi = str(row[self.npi_column])
+                records[npi] = ProviderRecord.from_row(npi, dict(row), self.columns)
+        return records
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class CsvProviderLookup(ProviderLookup):
+    """
+    Provider records from a CSV file with a header row.
+
+    The file is read once into an NPI-keyed index when the lookup is
+    created; it suits master files that fit in memory.
+    """
+
+    def __init__(self, path: str, npi_column: str = "npi", columns: Optional[Mapping[str, str]] = None,
+                 encoding: str = "utf-8-sig"):
+        """
+        Initialize the lookup.
+
+        Args:
+            path: CSV file
+            npi_column: Column holding the NPI
+            columns: Record field to column name
+            encoding: File encoding; the default strips a UTF-8 byte order mark
+        """
+        self.path = path
+        columns = dict(columns or {}, npi=npi_column)
+        self._records: Dict[str, ProviderRecord] = {}
+        with open(path, newline="", encoding=encoding) as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or npi_column not in reader.fieldnames:
+                raise ValueError(f"Provider file {path} has no {npi_column!r} column")
+            for row in reader:
+                npi = (row.get(npi_column) or "").strip()
+                if npi:
+                    self._records[npi] = ProviderRecord.from_row(npi, row, columns)
+
+    def lookup_many(self, npis: Sequence[str]) -> Dict[str, ProviderRecord]:
+        records = self._records
+        return {npi: records[npi] for npi in npis if npi in records}
+
+
+def create_lookup(backend: str, path: str, **options) -> ProviderLookup:
+    """Create a lookup backend by name: ``sqlite`` or ``csv``."""
+    if backend == "sqlite":
+        return SqliteProviderLookup(path, **options)
+    if backend == "csv":
+        return CsvProviderLookup(path, **options)
+    raise ValueError(f"Unknown provider lookup backend: {backend}. Available: sqlite, csv")
+
+
+def transaction_npis(transaction_data: Any) -> Dict[str, str]:
+    """Provider NPIs of a parsed transaction, keyed by role."""
+    npis = {}
+    if isinstance(transaction_data, Transaction835):
+        if transaction_data.payee and transaction_data.payee.npi:
+            npis[PAYEE] = transaction_data.payee.npi
+    elif isinstance(transaction_data, Transaction837P):
+        if transaction_data.billing_provider and transaction_data.billing_provider.npi:
+            npis[BILLING_PROVIDER] = transaction_data.billing_provider.npi
+        if transaction_data.rendering_provider and transaction_data.rendering_provider.npi:
+            npis[RENDERING_PROVIDER] = transaction_data.rendering_provider.npi
+    return npis
+
+
+class ProviderEnricher:
+    """
+    Resolve NPIs through a lookup backend with a bounded LRU cache.
+
+    Unknown NPIs are cached too, so a provider missing from the master
+    file is not looked up again. Safe to share between threads.
+    """
+
+    def __init__(self, lookup: ProviderLookup, cache_size: int = 100000):
+        """
+        Initialize the enricher.
+
+        Args:
+            lookup: Backend resolving NPIs
+            cache_size: Maximum cached NPIs; 0 disables the cache
+        """
+        self.lookup = lookup
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[ProviderRecord]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+
+    def lookup_many(self, npis: Iterable[str]) -> Dict[str, Optional[ProviderRecord]]:
+        """
+        Resolve NPIs, querying the backend once for all cache misses.
+
+        Returns:
+            Record (or None when unknown) for each distinct NPI
+        """
+        results: Dict[str, Optional[ProviderRecord]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for npi in npis:
+                npi = npi.strip() if npi else ""
+                if not npi or npi in results:
+                    continue
+                if npi in self._cache:
+                    self._cache.move_to_end(npi)
+                    results[npi] = self._cache[npi]
+                    self.hits += 1
+                else:
+                    results[npi] = None
+                    missing.append(npi)
+            self.misses += len(missing)
+        if not missing:
+            return results
+
+        found = self.lookup.lookup_many(missing)
+        with self._lock:
+            self.queries += 1
+            for npi in missing:
+                record = found.get(npi)
+                results[npi] = record
+                if self.cache_size:
+                    self._cache[npi] = record
+                    self._cache.move_to_end(npi)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+    def get(self, npi: str) -> Optional[ProviderRecord]:
+        """Resolve a single NPI."""
+        return self.lookup_many([npi]).get((npi or "").strip())
+
+    def enrich_transactions(self, transactions: Iterable[Any]) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Provider records for each transaction's roles, resolved in one batch.
+
+        Args:
+            transactions: Transaction nodes or their ``transaction_data``
+
+        Returns:
+            One ``{role: record dict or None}`` mapping per transaction
+        """
+        roles = [transaction_npis(getattr(transaction, "transaction_data", transaction))
+                 for transaction in transactions]
+        records = self.lookup_many(npi for npis in roles for npi in npis.values())
+        return [
+            {role: _record_dict(records.get(npi)) for role, npi in npis.items()}
+            for npis in roles
+        ]
+
+    def enrich_transaction(self, transaction: Any) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Provider records for one transaction's roles."""
+        return self.enrich_transactions([transaction])[0]
+
+    def stats(self) -> Dict[str, int]:
+        """Cache hits, misses, backend queries and cached entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "queries": self.queries,
+                    "cached": len(self._cache)}
+
+    def close(self) -> None:
+        self.lookup.close()
+
+
+def _record_dict(record: Optional[ProviderRecord]) -> Optional[Dict[str, Any]]:
+    return record.to_dict() if record is not None else None
@@ -0,0 +1,582 @@
+"""
+Reconciliation of 835 remittances against submitted 837P claims.
+
+Submitted claims are indexed by patient control number (CLM01) in a
+SQLite ClaimStore as 837P files are sent. Remittances are then joined
+against the store by CLP01 as Parser835 streams their claims: each
+remitted claim is classified as paid, partially paid, denied, reversed
+or unmatched, and the submitted claim's status and amounts are updated.
+Paid amounts, patient responsibility and contractual adjustments
+accumulate over a claim's remittances, and a reversal (whose amounts are
+negative) takes them back. Both sides are incremental (files can arrive in any order
+and over any period), and neither keeps more than one batch of claims
+in memory, so the store can hold tens of millions of open claims.
+
+Example:
+    with ClaimStore("claims.db") as store:
+        index_claims("outbound.837", store)
+        summary = reconcile_remittance("inbound.835", store, on_result=print)
+        for claim in store.open_claims():
+            ...
+"""
+
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import os
+import sqlite3
+import threading
+
+from ..base.parser import NodeListener
+from ..utils.money import to_cents
+from .transformations import StandardizedClaim
+
+logger = logging.getLogger(__name__)
+
+# Submitted claim statuses
+OPEN = "open"
+PAID = "paid"
+PARTIALLY_PAID = "partially_paid"
+DENIED = "denied"
+
+# Remittance outcomes beyond the statuses above
+REVERSED = "reversed"
+UNMATCHED = "unmatched"
+
+OUTCOMES = (PAID, PARTIALLY_PAID, DENIED, REVERSED, UNMATCHED)
+
+# CLP02 claim status codes
+_DENIED_STATUS = "4"
+_REVERSAL_STATUS = "22"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    claim_id TEXT PRIMARY KEY,
+    payer_name TEXT,
+    provider_npi TEXT,
+    patient_name TEXT,
+    charge_cents INTEGER,
+    source TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    paid_cents INTEGER NOT NULL DEFAULT 0,
+    patient_responsibility_cents INTEGER NOT NULL DEFAULT 0,
+    contractual_cents INTEGER NOT NULL DEFAULT 0,
+    remit_count INTEGER NOT NULL DEFAULT 0,
+    remit_source TEXT,
+    reconciled_at TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS claims_status ON claims (status, submitted_at);
+"""
+
+_COLUMNS = ("claim_id", "payer_name", "provider_npi", "patient_name", "charge_cents", "source",
+            "submitted_at", "status", "paid_cents", "patient_responsibility_cents", "contractual_cents", "remit_count",
+            "remit_source", "reconciled_at")
+
+
+@dataclass
+class SubmittedClaim:
+    """A submitted claim and where its reconciliation stands."""
+    claim_id: str
+    payer_name: Optional[str] = None
+    provider_npi: Optional[str] = None
+    patient_name: Optional[str] = None
+    charge_cents: Optional[int] = None
+    source: str = ""
+    submitted_at: str = ""
+    status: str = OPEN
+    paid_cents: int = 0
+    patient_responsibility_cents: int = 0
+    contractual_cents: int = 0
+    remit_count: int = 0
+    remit_source: Optional[str] = None
+    reconciled_at: Optional[str] = None
+
+    @classmethod
+    def from_standardized(cls, claim: StandardizedClaim, source: str = "") -> "SubmittedClaim":
+        """Build a submitted claim from a standardized 837P claim."""
+        return cls(
+            claim_id=claim.claim_id,
+            payer_name=claim.payer_name,
+            provider_npi=claim.provider_npi,
+            patient_name=claim.patient_name,
+            charge_cents=to_cents(claim.total_charge),
+            source=source,
+            submitted_at=datetime.now().isoformat(),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claim_id": self.claim_id,
+            "payer_name": self.payer_name,
+            "provider_npi": self.provider_npi,
+            "patient_name": self.patient_name,
+            "total_charge": _amount(self.charge_cents),
+            "source": self.source,
+            "submitted_at": self.submitted_at,
+            "status": self.status,
+            "total_paid": _amount(self.paid_cents),
+            "patient_responsibility": _amount(self.patient_responsibility_cents),
+            "contractual_adjustment": _amount(self.contractual_cents),
+            "remit_count": self.remit_count,
+            "remit_source": self.remit_source,
+            "reconciled_at": self.reconciled_at,
+        }
+
+
+@dataclass
+class ReconciliationResult:
+    """The outcome of one remitted claim."""
+    claim_id: str
+    outcome: str
+    payer_control_number: Optional[str]
+    payer_name: Optional[str]
+    submitted_charge: Optional[float]
+    paid: Optional[float]
+    patient_responsibility: Optional[float]
+    contractual_adjustment: float
+    outstanding: Optional[float]
+    submitted_source: Optional[str]
+    path: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "claim_id": self.claim_id,
+            "outcome": self.outcome,
+            "payer_control_number": self.payer_control_number,
+            "payer_name": self.payer_name,
+            "submitted_charge": self.submitted_charge,
+            "paid": self.paid,
+            "patient_responsibility": self.patient_responsibility,
+            "contractual_adjustment": self.contractual_adjustment,
+            "outstanding": self.outstanding,
+            "submitted_source": self.submitted_source,
+            "path": self.path,
+        }
+
+
+class ClaimStore:
+    """
+    Disk-backed index of submitted claims keyed by patient control number.
+
+    Safe to share between threads. New claims are buffered and written in
+    batches; lookups are batched ``IN`` queries. Call ``commit`` (or use
+    the store as a context manager) to make changes durable.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10000, lookup_batch_size: int = 500):
+        """
+        Open or create a store.
+
+        Args:
+            path: SQLite database file
+            batch_size: Submitted claims buffered before they are written
+            lookup_batch_size: Maximum claim IDs per lookup query
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.lookup_batch_size = lookup_batch_size
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._pending: Dict[str, SubmittedClaim] = {}
+
+    def add(self, claim: SubmittedClaim) -> None:
+        """
+        Index a submitted claim.
+
+        A claim resubmitted under the same CLM01 (a corrected claim, say)
+        replaces the submission details and is reopened; payments already
+        reconciled against it are kept.
+        """
+        with self._lock:
+            self._pending[claim.claim_id] = claim
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        self._conn.executemany(
+            "INSERT INTO claims (claim_id, payer_name, provider_npi, patient_name, charge_cents, source, "
+            "submitted_at) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (claim_id) DO UPDATE SET "
+            "payer_name = excluded.payer_name, provider_npi = excluded.provider_npi, "
+            "patient_name = excluded.patient_name, charge_cents = excluded.charge_cents, "
+            "source = excluded.source, submitted_at = excluded.submitted_at, status = 'open'",
+            [(claim.claim_id, claim.payer_name, claim.provider_npi, claim.patient_name, claim.charge_cents,
+              claim.source, claim.submitted_at) for claim in self._pending.values()],
+        )
+        self._pending = {}
+
+    def lookup_many(self, claim_ids: Sequence[str]) -> Dict[str, SubmittedClaim]:
+        """Submitted claims by patient control number; unknown IDs are left out."""
+        claims = {}
+        with self._lock:
+            self._flush()
+            for start in range(0, len(claim_ids), self.lookup_batch_size):
+                batch = list(claim_ids[start:start + self.lookup_batch_size])
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM claims WHERE claim_id IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    claims[row[0]] = SubmittedClaim(*row)
+        return claims
+
+    def get(self, claim_id: str) -> Optional[SubmittedClaim]:
+        return self.lookup_many([claim_id]).get(claim_id)
+
+    def update_many(self, claims: Iterable[SubmittedClaim]) -> None:
+        """Write the reconciliation state of matched claims."""
+        with self._lock:
+            self._flush()
+            self._conn.executemany(
+                "UPDATE claims SET status = ?, paid_cents = ?, patient_responsibility_cents = ?, "
+                "contractual_cents = ?, remit_count = ?, remit_source = ?, reconciled_at = ? WHERE claim_id = ?",
+                [(claim.status, claim.paid_cents, claim.patient_responsibility_cents, claim.contractual_cents,
+                  claim.remit_count,
+                  claim.remit_source, claim.reconciled_at, claim.claim_id) for claim in claims],
+            )
+
+    def open_claims(self, submitted_before: Optional[str] = None) -> Iterator[SubmittedClaim]:
+        """
+        Claims with no remittance yet (or only reversed ones), oldest first.
+
+        Args:
+            submitted_before: Only claims submitted before this ISO timestamp
+        """
+        with self._lock:
+            self._flush()
+            query = f"SELECT {', '.join(_COLUMNS)} FROM claims WHERE status = 'open'"
+            parameters: List[str] = []
+            if submitted_before:
+                query += " AND submitted_at < ?"
+                parameters.append(submitted_before)
+            cursor = self._conn.execute(query + " ORDER BY submitted_at", parameters)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.lookup_batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield SubmittedClaim(*row)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of submitted claims per status."""
+        with self._lock:
+            self._flush()
+            counts = {status: 0 for status in (OPEN, PAID, PARTIALLY_PAID, DENIED)}
+            for status, count in self._conn.execute("SELECT status, COUNT(*) FROM claims GROUP BY status"):
+                counts[status] = count
+            return counts
+
+    def commit(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        """Drop changes made since the last commit."""
+        with self._lock:
+            self._pending = {}
+            self._conn.rollback()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ClaimStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.close()
+
+
+def _amount(cents: Optional[int]) -> Optional[float]:
+    return None if cents is None else cents / 100
+
+
+def _cents(value: Any) -> int:
+    cents = to_cents(value)
+    return cents if cents is not None else 0
+
+
+def classify(submitted: Optional[SubmittedClaim], claim: Any) -> str:
+    """
+    Outcome of a remitted 835 claim against its submission.
+
+    Reversals (CLP02 = 22) and denials (CLP02 = 4, or nothing paid and
+    nothing owed by the patient) are taken from the remittance. Otherwise
+    the claim is paid when the payments, patient responsibility and
+    contractual (CO) adjustments of this and earlier remittances cover
+    the submitted charge, and partially paid when they do not.
+    """
+    if submitted is None:
+        return UNMATCHED
+    if claim.status_code == _REVERSAL_STATUS:
+        return REVERSED
+    paid = _cents(claim.total_paid)
+    patient_responsibility = _cents(claim.patient_responsibility)
+    if claim.status_code == _DENIED_STATUS or (paid == 0 and patient_responsibility == 0
+                                               and submitted.paid_cents == 0
+                                               and submitted.patient_responsibility_cents == 0):
+        return DENIED
+    return PAID if _outstanding(submitted, claim) <= 0 else PARTIALLY_PAID
+
+
+def _contractual(claim: Any) -> int:
+    return sum(_cents(adjustment.amount) for adjustment in claim.adjustments if adjustment.group_code == "CO")
+
+
+def _outstanding(submitted: SubmittedClaim, claim: Any) -> int:
+    charge = submitted.charge_cents if submitted.charge_cents is not None else _cents(claim.total_charge)
+    settled = submitted.paid_cents + submitted.patient_responsibility_cents + submitted.contractual_cents
+    return (charge - settled - _cents(claim.total_paid) - _cents(claim.patient_responsibility)
+            - _contractual(claim))
+
+
+class Reconciler(NodeListener):
+    """
+    Join remitted claims against a ClaimStore as Parser835 closes them.
+
+    Remitted claims are buffered (as the few fields reconciliation needs)
+    until ``batch_size`` accumulate or their transaction closes, then
+    matched with one store lookup per batch.
+    """
+
+    def __init__(self, store: ClaimStore, source: str = "",
+                 on_result: Optional[Callable[[ReconciliationResult], None]] = None, batch_size: int = 500):
+        """
+        Initialize the reconciler.
+
+        Args:
+            store: Submitted claims
+            source: Remittance name recorded on matched claims, usually the file name
+            on_result: Called with each ReconciliationResult
+            batch_size: Remitted claims per store lookup
+        """
+        self.store = store
+        self.source = source
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self.counts = {outcome: 0 for outcome in OUTCOMES}
+        self._claims: List[Any] = []
+        self._payer_name: Optional[str] = None
+
+    def on_claim(self, claim: Any, path: str) -> None:
+        self._claims.append((claim.claim_id, claim.status_code, claim.total_charge, claim.total_paid,
+                             claim.patient_responsibility, claim.payer_control_number,
+                             list(claim.adjustments), path))
+        if len(self._claims) >= self.batch_size:
+            self._reconcile()
+
+    def on_transaction(self, transaction: Any, path: str) -> None:
+        payer = getattr(transaction.transaction_data, "payer", None)
+        self._payer_name = getattr(payer, "name", None)
+        self._reconcile()
+        self._payer_name = None
+
+    def _reconcile(self) -> None:
+        claims, self._claims = self._claims, []
+        if not claims:
+            return
+        submitted = self.store.lookup_many(list(dict.fromkeys(fields[0] for fields in claims)))
+        reconciled_at = datetime.now().isoformat()
+        updated: Dict[str, SubmittedClaim] = {}
+        for fields in claims:
+            claim = _RemittedClaim(*fields)
+            match = updated.get(claim.claim_id) or submitted.get(claim.claim_id)
+            outcome = classify(match, claim)
+            self.counts[outcome] += 1
+            result = self._result(claim, match, outcome)
+            if match is not None:
+                match.paid_cents += _cents(claim.total_paid)
+                match.patient_responsibility_cents += _cents(claim.patient_responsibility)
+                match.contractual_cents += _contractual(claim)
+                match.status = OPEN if outcome == REVERSED else outcome
+                match.remit_count += 1
+                match.remit_source = self.source
+                match.reconciled_at = reconciled_at
+                updated[claim.claim_id] = match
+            if self.on_result is not None:
+                self.on_result(result)
+        self.store.update_many(updated.values())
+
+    def _result(self, claim: "_RemittedClaim", submitted: Optional[SubmittedClaim],
+                outcome: str) -> ReconciliationResult:
+        outstanding = None
+        if submitted is not None and outcome != REVERSED:
+            outstanding = _amount(max(_outstanding(submitted, claim), 0))
+        return ReconciliationResult(
+            claim_id=claim.claim_id,
+            outcome=outcome,
+            payer_control_number=claim.payer_control_number,
+            payer_name=self._payer_name or (submitted.payer_name if submitted else None),
+            submitted_charge=_amount(submitted.charge_cents) if submitted else None,
+            paid=claim.total_paid,
+            patient_responsibility=claim.patient_responsibility,
+            contractual_adjustment=_amount(_contractual(claim)),
+            outstanding=outstanding,
+            submitted_source=submitted.source if submitted else None,
+            path=claim.path,
+        )
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.counts, remitted=sum(self.counts.values()))
+
+
+@dataclass
+class _RemittedClaim:
+    claim_id: str
+    status_code: str
+    total_charge: Any
+    total_paid: Any
+    patient_responsibility: Any
+    payer_control_number: Optional[str]
+    adjustments: List[Any]
+    path: str
+
+
+def _source_name(source: Union[str, BinaryIO], source_name: Optional[str]) -> str:
+    if source_name is not None:
+        return source_name
+    return os.path.basename(source) if isinstance(source, str) else str(getattr(source, "name", ""))
+
+
+def _person_name(nm1: List[str]) -> Optional[str]:
+    last = nm1[3] if len(nm1) > 3 else ""
+    first = nm1[4] if len(nm1) > 4 else ""
+    return f"{first} {last}" if first or last else None
+
+
+class _ClaimContext:
+    """The parties in scope at a CLM segment of an 837P transaction set."""
+
+    def __init__(self):
+        self.receiver: Optional[str] = None
+        self.billing_npi: Optional[str] = None
+        self.reset_subscriber()
+
+    def reset_subscriber(self) -> None:
+        self.payer: Optional[str] = None
+        self.subscriber: Optional[str] = None
+        self.patient: Optional[str] = None
+
+    def update(self, elements: List[str]) -> None:
+        segment_id = elements[0]
+        if segment_id == "HL":
+            level = elements[3] if len(elements) > 3 else ""
+            if level == "22":
+                self.reset_subscriber()
+            elif level == "23":
+                self.patient = None
+        elif segment_id == "NM1" and len(elements) > 1:
+            entity = elements[1]
+            if entity == "40":
+                self.receiver = elements[3] if len(elements) > 3 else None
+            elif entity == "85":
+                self.billing_npi = elements[9] if len(elements) > 9 else None
+            elif entity == "PR":
+                self.payer = elements[3] if len(elements) > 3 else None
+            elif entity == "IL":
+                self.subscriber = _person_name(elements)
+            elif entity == "QC":
+                self.patient = _person_name(elements)
+
+    def claim(self, clm: List[str], source: str, submitted_at: str) -> SubmittedClaim:
+        return SubmittedClaim(
+            claim_id=clm[1],
+            payer_name=self.payer or self.receiver,
+            provider_npi=self.billing_npi,
+            patient_name=self.patient or self.subscriber,
+            charge_cents=to_cents(clm[2]) if len(clm) > 2 and clm[2] else None,
+            source=source,
+            submitted_at=submitted_at,
+        )
+
+
+def index_claims(source: Union[str, BinaryIO], store: ClaimStore, source_name: Optional[str] = None) -> int:
+    """
+    Add the claims of an 837P file to a store.
+
+    Every CLM segment is indexed, with the payer (NM1*PR, or the receiver
+    NM1*40), billing provider NPI (NM1*85) and patient (NM1*QC, or the
+    subscriber NM1*IL) in scope at that point of its transaction set. The
+    file is streamed segment by segment, so transaction sets of any size
+    are indexed without being held in memory.
+
+    Args:
+        source: Path or binary handle of the EDI file
+        store: Store to add the claims to
+        source_name: Name recorded with the claims; defaults to the file name
+
+    Returns:
+        Number of distinct claims indexed
+    """
+    from ..streaming import SegmentReader
+
+    source_name = _source_name(source, source_name)
+    handle = open(source, "rb") if isinstance(source, str) else source
+    submitted_at = datetime.now().isoformat()
+    count = 0
+    context: Optional[_ClaimContext] = None
+    claim_ids: set = set()
+    try:
+        for segment in SegmentReader(handle):
+            elements = segment.elements
+            segment_id = elements[0]
+            if segment_id == "ST":
+                context = _ClaimContext() if len(elements) > 1 and elements[1].startswith("837") else None
+                claim_ids = set()
+            elif context is None:
+                continue
+            elif segment_id == "SE":
+                context = None
+            elif segment_id == "CLM":
+                # A claim repeated under the patient loop is indexed once
+                if len(elements) > 1 and elements[1] and elements[1] not in claim_ids:
+                    claim_ids.add(elements[1])
+                    store.add(context.claim(elements, source_name, submitted_at))
+                    count += 1
+            else:
+                context.update(elements)
+    finally:
+        if handle is not source:
+            handle.close()
+    return count
+
+
+def reconcile_remittance(source: Union[str, BinaryIO], store: ClaimStore,
+                         on_result: Optional[Callable[[ReconciliationResult], None]] = None,
+                         source_name: Optional[str] = None) -> Dict[str, int]:
+    """
+    Reconcile an 835 file against a store in one streaming pass.
+
+    Args:
+        source: Path or binary handle of the EDI file
+        store: Submitted claims; matched claims are updated
+        on_result: Called with each ReconciliationResult
+        source_name: Name recorded on matched claims; defaults to the file name
+
+    Returns:
+        Number of remitted claims per outcome, and in total
+    """
+    from ..streaming import SegmentReader
+    from ..transactions.t835.parser import Parser835
+
+    reconciler = Reconciler(store, source=_source_name(source, source_name), on_result=on_result)
+    handle = open(source, "rb") if isinstance(source, str) else source
+    try:
+        segments = (segment.elements for segment in SegmentReader(handle))
+        Parser835(segments, listener=reconciler, retain_claims=False).parse()
+    finally:
+        if handle is not source:
+            handle.close()
+    return reconciler.summary()
@@ -8,14 +8,15 @@ healthcare calculations, and enabling integration with other healthcare systems.
 
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 import re
 
+from ..codesets import get_codesets, CARC, CLAIM_STATUS
+from ..utils.identifiers import is_valid_npi
+from ..utils.dates import parse_edi_date
 from ..transactions.t835.ast import Transaction835, Claim as Claim835, Service as Service835
 from ..transactions.t837p.ast import Transaction837P, ServiceLine837P, DiagnosisInfo
-from ..transactions.t270.ast import Transaction270_271
-from ..transactions.t276.ast import Transaction276_277
 
 
 @dataclass
@@ -156,54 +157,24 @@ class HealthcareTransformer:
     
     @staticmethod
     def calculate_payment_summary(transaction: Transaction835) -> PaymentSummary:
-        """Calculate comprehensive payment summary from 835 transaction."""
+        """
+        Calculate comprehensive payment summary from 835 transaction.
+        
+        Amounts are summed in cents in a single pass over the claims; use
+        ``core.healthcare.analytics.PaymentTotals`` to accumulate a summary
+        across transactions and files.
+        """
+        from .analytics import PaymentTotals
+        
         if not transaction.claims:
             return PaymentSummary(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0)
         
-        total_claims = len(transaction.claims)
-        total_charges = sum(claim.total_charge for claim in transaction.claims)
-        total_payments = sum(claim.total_paid for claim in transaction.claims)
-        total_patient_responsibility = sum(claim.patient_responsibility for claim in transaction.claims)
-        
-        # Calculate adjustments from claim adjustments
-        total_adjustments = 0.0
+        totals = PaymentTotals()
         for claim in transaction.claims:
-            if claim.adjustments:
-                total_adjustments += sum(adj.amount for adj in claim.adjustments)
-        
+            totals.add_claim(claim)
         # Add PLB adjustments
-        if transaction.plb:
-            for plb_entry in transaction.plb:
-                if isinstance(plb_entry, dict) and 'adjustment_amount' in plb_entry:
-                    total_adjustments += float(plb_entry['adjustment_amount'])
-        
-        # Count claim statuses
-        claims_paid = 0
-        claims_denied = 0
-        claims_pending = 0
-        
-        for claim in transaction.claims:
-            status = claim.status_code
-            if status in ['1', '2', '3', '4']:  # Paid statuses
-                claims_paid += 1
-            elif status in ['5', '6', '7', '8']:  # Denied/rejected statuses
-                claims_denied += 1
-            else:
-                claims_pending += 1
-        
-        net_amount = total_payments + total_adjustments + total_patient_responsibility
-        
-        return PaymentSummary(
-            total_claims=total_claims,
-            total_charges=total_charges,
-            total_payments=total_payments,
-            total_adjustments=total_adjustments,
-            total_patient_responsibility=total_patient_responsibility,
-            net_amount=net_amount,
-            claims_paid=claims_paid,
-            claims_denied=claims_denied,
-            claims_pending=claims_pending
-        )
+        totals.add_plb(transaction.plb)
+        return totals.summary()
     
     @staticmethod
     def extract_denial_reasons(claim: Claim835) -> List[Dict[str, Any]]:
@@ -234,74 +205,36 @@ class HealthcareTransformer:
             raise ValueError(f"Unsupported transaction type: {type(transaction)}")
     
     @staticmethod
-    def generate_claim_aging_report(claims: List[StandardizedClaim]) -> Dict[str, Any]:
-        """Generate aging report for claims based on service dates."""
-        aging_buckets = {
-            "0-30": {"count": 0, "amount": 0.0},
-            "31-60": {"count": 0, "amount": 0.0},
-            "61-90": {"count": 0, "amount": 0.0},
-            "91-120": {"count": 0, "amount": 0.0},
-            "120+": {"count": 0, "amount": 0.0}
-        }
+    def generate_claim_aging_report(claims: List[StandardizedClaim], as_of: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Generate aging report for claims based on service dates.
         
-        today = datetime.now()
+        Claims are aged from ``as_of`` (default: today) in a single pass;
+        see ``core.healthcare.analytics.AgingBuckets`` for aging across
+        files.
+        """
+        from .analytics import AgingBuckets
         
+        aging = AgingBuckets(as_of or date.today())
         for claim in claims:
-            if not claim.service_date or not claim.total_charge:
-                continue
-            
-            try:
-                service_date = datetime.strptime(claim.service_date, "%Y%m%d")
-                days_old = (today - service_date).days
-                
-                if days_old <= 30:
-                    bucket = "0-30"
-                elif days_old <= 60:
-                    bucket = "31-60"
-                elif days_old <= 90:
-                    bucket = "61-90"
-                elif days_old <= 120:
-                    bucket = "91-120"
-                else:
-                    bucket = "120+"
-                
-                aging_buckets[bucket]["count"] += 1
-                aging_buckets[bucket]["amount"] += claim.total_charge
-                
-            except ValueError:
-                # Skip claims with invalid dates
-                continue
-        
-        return {
-            "aging_buckets": aging_buckets,
-            "total_claims": sum(bucket["count"] for bucket in aging_buckets.values()),
-            "total_amount": sum(bucket["amount"] for bucket in aging_buckets.values())
-        }
+            # Claims without a charge or with a missing or invalid date are skipped
+            if claim.total_charge:
+                aging.add(claim.service_date, claim.total_charge)
+        return aging.to_dict()
     
     @staticmethod
     def validate_npi(npi: str) -> bool:
         """Validate NPI (National Provider Identifier) using Luhn algorithm."""
-        if not npi or len(npi) != 10 or not npi.isdigit():
-            return False
-        
-        # NPI validation using Luhn algorithm
-        digits = [int(d) for d in npi]
-        checksum = 0
-        
-        # Process digits from right to left
-        for i in range(len(digits) - 1, -1, -1):
-            n = digits[i]
-            if (len(digits) - i) % 2 == 0:  # Even position from right
-                n *= 2
-                if n > 9:
-                    n = n // 10 + n % 10
-            checksum += n
-        
-        return checksum % 10 == 0
+        return bool(npi) and isinstance(npi, str) and is_valid_npi(npi)
     
     @staticmethod
-    def normalize_provider_data(provider_info: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize provider information across different transaction types."""
+    def normalize_provider_data(provider_info: Dict[str, Any], enricher=None) -> Dict[str, Any]:
+        """
+        Normalize provider information across different transaction types.
+        
+        With a ProviderEnricher (see ``core.healthcare.enrichment``), the
+        provider master record for the NPI is added as ``master``.
+        """
         normalized = {
             "name": provider_info.get("name", "").strip().title(),
             "npi": provider_info.get("npi", "").strip(),
@@ -312,6 +245,9 @@ class HealthcareTransformer:
         # Validate NPI if present
         if normalized["npi"]:
             normalized["npi_valid"] = HealthcareTransformer.validate_npi(normalized["npi"])
+            if enricher is not None:
+                record = enricher.get(normalized["npi"])
+                normalized["master"] = record.to_dict() if record is not None else None
         
         # Normalize address
         if "address" in provider_info and provider_info["address"]:
@@ -343,43 +279,12 @@ class HealthcareTransformer:
     @staticmethod
     def _decode_claim_status(status_code: str) -> str:
         """Decode 835 claim status codes."""
-        status_map = {
-            "1": "Processed as Primary",
-            "2": "Processed as Secondary", 
-            "3": "Processed as Tertiary",
-            "4": "Denied",
-            "5": "Pended",
-            "19": "Processed as Primary, Forwarded to Additional Payer(s)",
-            "20": "Processed as Secondary, Forwarded to Additional Payer(s)",
-            "21": "Processed as Tertiary, Forwarded to Additional Payer(s)",
-            "22": "Reversal of Previous Payment",
-            "23": "Not Our Claim, Forwarded to Additional Payer(s)",
-            "25": "Predetermination Pricing Only - No Payment"
-        }
-        return status_map.get(status_code, f"Unknown Status ({status_code})")
+        return get_codesets().describe(CLAIM_STATUS, status_code, f"Unknown Status ({status_code})")
     
     @staticmethod
     def _decode_adjustment_reason(reason_code: str) -> str:
-        """Decode common adjustment reason codes."""
-        # This is a subset of CARC (Claim Adjustment Reason Codes)
-        reason_map = {
-            "1": "Deductible Amount",
-            "2": "Coinsurance Amount", 
-            "3": "Co-payment Amount",
-            "4": "The procedure code is inconsistent with the modifier used",
-            "5": "The procedure code/bill type is inconsistent with the place of service",
-            "11": "The diagnosis is inconsistent with the procedure",
-            "12": "The diagnosis is inconsistent with the patient's age",
-            "13": "The diagnosis is inconsistent with the patient's gender",
-            "18": "Duplicate claim/service",
-            "29": "The time limit for filing has expired",
-            "50": "These are non-covered services because this is not deemed a 'medical necessity'",
-            "96": "Non-covered charge(s)",
-            "97": "The benefit for this service is included in the payment/allowance for another service/procedure",
-            "109": "Claim not covered by this payer/contractor",
-            "151": "Payment adjusted because the payer deems the information submitted does not support this many/frequency of services"
-        }
-        return reason_map.get(reason_code, f"Adjustment Reason {reason_code}")
+        """Decode adjustment reason codes (CARC) from the code set registry."""
+        return get_codesets().describe(CARC, reason_code, f"Adjustment Reason {reason_code}")
     
     @staticmethod
     def _categorize_adjustment_group(group_code: str) -> str:
@@ -451,8 +356,7 @@ def format_date_edi_to_readable(edi_date: str) -> str:
     if not edi_date or len(edi_date) != 8:
         return edi_date
     
-    try:
-        date_obj = datetime.strptime(edi_date, "%Y%m%d")
-        return date_obj.strftime("%m/%d/%Y")
-    except ValueError:
-        return edi_date
\ No newline at end of file
+    date_obj = parse_edi_date(edi_date)
+    if date_obj is None:
+        return edi_date
+    return date_obj.strftime("%m/%d/%Y")
\ No newline at end of file
@@ -7,6 +7,7 @@ core parsing logic and delegates specific transaction parsing to specialized
 parsers through the plugin system.
 """
 
+import io
 import json
 from typing import List, Optional, Dict, Any
 import logging
@@ -14,6 +15,9 @@ from .schema import EdiSchema
 from .base.edi_ast import EdiRoot, Interchange, FunctionalGroup, Transaction
 from .transactions.t835.ast import Transaction835, FinancialInformation, Payer, Payee, Claim, Adjustment, Service
 from .plugins.api import plugin_registry, PluginManager
+from .telemetry import get_instrumentation, SPAN_TOKENIZE, HISTOGRAM_TOKENIZE, COUNTER_BYTES
+from .utils.interning import intern_segment_id
+from .streaming.recovery import QuarantineManifest
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +30,8 @@ class EdiParser:
     parsing to specialized parsers while handling the core EDI structure.
     """
     
-    def __init__(self, edi_string: str, schema_path: str, auto_load_plugins: bool = True):
+    def __init__(self, edi_string: str, schema_path: str, auto_load_plugins: bool = True,
+                 recover: bool = False):
         """
         Initialize the EDI parser.
         
@@ -34,8 +39,13 @@ class EdiParser:
             edi_string: Raw EDI content to parse
             schema_path: Path to EDI schema definition file 
             auto_load_plugins: Whether to automatically load built-in plugins
+            recover: Parse transaction by transaction, quarantining broken
+                ST/SE spans instead of failing (see ``quarantine``)
         """
         self.edi_string = edi_string
+        self.recover = recover
+        # Quarantine manifest of the last recovering parse
+        self.quarantine: Optional[QuarantineManifest] = None
         with open(schema_path, 'r') as f:
             self.schema = EdiSchema.model_validate(json.load(f))
         self.segment_delimiter = self.schema.schema_definition.delimiters.segment
@@ -56,13 +66,19 @@ class EdiParser:
         Raises:
             ValueError: If segments are invalid for the detected transaction type
         """
-        # Normalize EDI content
-        edi_content = self.edi_string.replace('\n', '').replace('\r', '').strip()
-        segments = edi_content.split(self.segment_delimiter)
-        segments = [s for s in segments if s]
+        if self.recover:
+            return self._parse_with_recovery()
+        
+        instrumentation = get_instrumentation()
+        with instrumentation.timed(SPAN_TOKENIZE, HISTOGRAM_TOKENIZE):
+            # Normalize EDI content
+            edi_content = self.edi_string.replace('\n', '').replace('\r', '').strip()
+            segments = edi_content.split(self.segment_delimiter)
+            segments = [s for s in segments if s]
 
-        # Convert string segments to lists for easier processing
-        segment_lists = self._prepare_segments(segments)
+            # Convert string segments to lists for easier processing
+            segment_lists = self._prepare_segments(segments)
+        instrumentation.add(COUNTER_BYTES, len(self.edi_string))
 
         # Handle empty content
         if not segment_lists:
@@ -103,6 +119,7 @@ class EdiParser:
         segment_lists = []
         for segment_str in segments:
             parts = segment_str.split(self.element_delimiter)
+            parts[0] = intern_segment_id(parts[0])
             segment_lists.append(parts)
         return segment_lists
     
@@ -123,45 +140,36 @@ class EdiParser:
     def _parse_with_direct_parser(self, transaction_type: str, segments: list) -> EdiRoot:
         """Parse using direct parser instances for specific transaction types."""
         # Import parsers here to avoid circular imports
-        from .parser_835 import Parser835
-        from .parser_270 import Parser270
-        from .parser_276 import Parser276
-        from .parser_837p import Parser837P
+        from .transactions.t835.parser import Parser835
+        from .transactions.t270.parser import Parser270
+        from .transactions.t276.parser import Parser276
+        from .transactions.t837p.parser import Parser837P
         
         try:
-            if transaction_type == "835":
-                parser = Parser835(segments)
-                return parser.parse()
-            elif transaction_type in ["270", "271"]:
-                parser = Parser270(segments)
-                result = parser.parse()
-                # For 270/271, we need to wrap the result in an EdiRoot
-                # This is a temporary solution - ideally these parsers would return EdiRoot
-                root = EdiRoot()
-                # Add the transaction result to the root structure
-                # Note: This is a simplified approach for now
-                return root
+            if transaction_type in ["270", "271"]:
+                return Parser270(segments).parse()
             elif transaction_type in ["276", "277"]:
-                parser = Parser276(segments)
-                result = parser.parse()
-                # Similar wrapping for 276/277
-                root = EdiRoot()
-                return root
+                return Parser276(segments).parse()
             elif transaction_type == "837":
-                parser = Parser837P(segments)
-                result = parser.parse()
-                # Similar wrapping for 837P
-                root = EdiRoot()
-                return root
-            else:
-                # Default to 835 parser
+                return Parser837P(segments).parse()
+            elif transaction_type != "835":
                 logger.warning(f"Unknown transaction type {transaction_type}, defaulting to 835")
-                parser = Parser835(segments)
-                return parser.parse()
+            return Parser835(segments).parse()
         except Exception as e:
-            logger.error(f"Error in direct parser for transaction {transaction_type}: {e}")
-            # Return empty root on error
-            return EdiRoot()
+            # Keep the transactions that do parse rather than returning nothing
+            logger.error(f"Error in direct parser for transaction {transaction_type}: {e}; "
+                         "retrying transaction by transaction")
+            return self._parse_with_recovery()
+    
+    def _parse_with_recovery(self) -> EdiRoot:
+        """Parse transaction by transaction, recording broken spans in ``self.quarantine``."""
+        from .streaming.recovery import RecoveringParser
+        
+        # latin-1 keeps byte offsets equal to character offsets in edi_string
+        content = self.edi_string.encode("latin-1", errors="replace")
+        result = RecoveringParser(plugin_registry).parse_stream(io.BytesIO(content))
+        self.quarantine = result.manifest
+        return result.root
     
     def get_supported_transaction_types(self) -> list:
         """Get list of supported transaction types from registered plugins."""
@@ -0,0 +1,39 @@
+"""
+Configurable processing pipelines.
+
+This module composes parse, validate, transform, enrich, emit and
+acknowledge stages into a concurrent pipeline with bounded queues between
+stages and per-stage throughput reporting.
+"""
+
+from .stages import (
+    PipelineItem, PipelineStage, ParseStage, ValidateStage, TransformStage, EnrichStage, EmitStage,
+    AcknowledgeStage, STAGE_TYPES, TRANSFORMS
+)
+from .runner import Pipeline, PipelineStats, StageStats
+from .config import build_pipeline, build_stage, load_pipeline, default_pipeline
+
+__all__ = [
+    # Stages
+    'PipelineItem',
+    'PipelineStage',
+    'ParseStage',
+    'ValidateStage',
+    'TransformStage',
+    'EnrichStage',
+    'EmitStage',
+    'AcknowledgeStage',
+    'STAGE_TYPES',
+    'TRANSFORMS',
+
+    # Runner
+    'Pipeline',
+    'PipelineStats',
+    'StageStats',
+
+    # Configuration
+    'build_pipeline',
+    'build_stage',
+    'load_pipeline',
+    'default_pipeline'
+]
@@ -0,0 +1,116 @@
+"""
+Declarative pipeline configuration.
+
+Pipelines can be described in YAML or as a plain dictionary:
+
+    pipeline:
+      queue_size: 64
+      stages:
+        - type: parse
+          concurrency: 2
+        - type: validate
+          rules: [validation-rules/835-basic.yml]
+        - type: transform
+          function: payment_summary
+        - type: enrich
+          backend: sqlite
+          path: providers.db
+        - type: emit
+          output: results.jsonl
+        - type: acknowledge
+          output: results.999
+          schema: shared/schemas/x12/835.json
+"""
+
+from typing import Any, Dict, List, Optional
+import yaml
+
+from .runner import Pipeline
+from .stages import STAGE_TYPES, PipelineStage
+
+# Configuration keys mapped to stage constructor arguments
+_STAGE_OPTIONS = {
+    "parse": {},
+    "validate": {"rules": "rules_files"},
+    "transform": {"function": "function", "output_key": "output_key"},
+    "enrich": {"backend": "backend", "path": "path", "table": "table", "npi_column": "npi_column",
+               "columns": "columns", "cache_size": "cache_size", "output_key": "output_key",
+               "annotate": "annotate"},
+    "emit": {"output": "output", "include": "include", "ordered": "ordered"},
+    "acknowledge": {"output": "output", "ta1": "ta1", "report_accepted": "report_accepted",
+                    "supported_codes": "supported_codes", "control_start": "control_start",
+                    "schema": "schema"},
+}
+
+
+def build_stage(stage_config: Dict[str, Any]) -> PipelineStage:
+    """Create a stage from its configuration dictionary."""
+    stage_type = stage_config.get("type")
+    if not stage_type:
+        raise ValueError("Stage configuration must specify 'type'")
+    if stage_type not in STAGE_TYPES:
+        raise ValueError(f"Unknown stage type: {stage_type}. Available: {', '.join(STAGE_TYPES)}")
+
+    kwargs = {
+        "name": stage_config.get("name"),
+        "concurrency": int(stage_config.get("concurrency", 1)),
+    }
+    options = _STAGE_OPTIONS.get(stage_type, {})
+    for key, value in stage_config.items():
+        if key in ("type", "name", "concurrency"):
+            continue
+        if key not in options:
+            raise ValueError(f"Unknown option '{key}' for {stage_type} stage")
+        kwargs[options[key]] = value
+
+    if isinstance(kwargs.get("rules_files"), str):
+        kwargs["rules_files"] = [kwargs["rules_files"]]
+    return STAGE_TYPES[stage_type](**kwargs)
+
+
+def build_pipeline(config: Dict[str, Any], output: Optional[str] = None) -> Pipeline:
+    """
+    Build a Pipeline from a configuration dictionary.
+
+    Args:
+        config: Dictionary with an optional top-level ``pipeline`` key
+        output: Output path overriding the ``output`` of the emit stage
+
+    Returns:
+        Configured Pipeline
+
+    Raises:
+        ValueError: If the configuration is invalid, or ``output`` is given
+            and the pipeline does not have exactly one emit stage
+    """
+    config = config.get("pipeline", config)
+    stage_configs: List[Dict[str, Any]] = config.get("stages") or []
+    if not stage_configs:
+        raise ValueError("Pipeline configuration must define at least one stage")
+
+    if output is not None:
+        emit_indexes = [index for index, stage_config in enumerate(stage_configs)
+                        if stage_config.get("type") == "emit"]
+        if len(emit_indexes) != 1:
+            raise ValueError(f"An output path needs exactly one emit stage, found {len(emit_indexes)}")
+        stage_configs = list(stage_configs)
+        stage_configs[emit_indexes[0]] = dict(stage_configs[emit_indexes[0]], output=output)
+
+    stages = [build_stage(stage_config) for stage_config in stage_configs]
+    return Pipeline(stages, queue_size=int(config.get("queue_size", 64)))
+
+
+def load_pipeline(file_path: str, output: Optional[str] = None) -> Pipeline:
+    """Build a Pipeline from a YAML configuration file, optionally overriding the emit output."""
+    with open(file_path, "r") as f:
+        config = yaml.safe_load(f) or {}
+    return build_pipeline(config, output=output)
+
+
+def default_pipeline(output: str = None, validate: bool = True) -> Pipeline:
+    """Parse, optionally validate, and emit JSON lines."""
+    stages = [{"type": "parse"}]
+    if validate:
+        stages.append({"type": "validate"})
+    stages.append({"type": "emit", "output": output})
+    return build_pipeline({"stages": stages})
@@ -0,0 +1,224 @@
+"""
+Concurrent pipeline runner.
+
+This module runs a linear graph of PipelineStages over a stream of
+transactions. Every stage has its own worker threads and reads from a
+bounded queue fed by the previous stage, so parsing of transaction N+1
+overlaps with validation of N and emission of N-1 while memory stays
+bounded by the queue sizes.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+import logging
+import queue
+import threading
+import time
+
+from .stages import PipelineItem, PipelineStage
+from ..streaming.reader import SegmentReader, DEFAULT_CHUNK_SIZE
+from ..streaming.splitter import TransactionChunk, TransactionSplitter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for a single stage."""
+    name: str
+    concurrency: int
+    items: int = 0
+    skipped: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of pipeline wall-clock time."""
+        return self.items / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def average_latency_ms(self) -> float:
+        return (self.busy_seconds / self.items) * 1000 if self.items else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of available worker time spent processing items."""
+        capacity = self.wall_seconds * self.concurrency
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "items": self.items,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 6),
+            "blocked_seconds": round(self.blocked_seconds, 6),
+            "throughput_per_second": round(self.throughput, 2),
+            "average_latency_ms": round(self.average_latency_ms, 3),
+            "utilization": round(self.utilization, 3),
+        }
+
+
+@dataclass
+class PipelineStats:
+    """Summary of a pipeline run."""
+    items: int = 0
+    failed: int = 0
+    wall_seconds: float = 0.0
+    stages: List[StageStats] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "items": self.items,
+            "failed": self.failed,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "throughput_per_second": round(self.items / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+
+class Pipeline:
+    """
+    Run a sequence of stages concurrently over a stream of transactions.
+
+    Example:
+        pipeline = Pipeline([ParseStage(concurrency=2), ValidateStage(), EmitStage(output="out.jsonl")])
+        stats = pipeline.run_file("large.835")
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 64):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in execution order
+            queue_size: Capacity of each inter-stage queue
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, chunks: Iterable[TransactionChunk],
+            on_item: Optional[Callable[[PipelineItem], None]] = None) -> PipelineStats:
+        """
+        Feed transaction chunks through every stage.
+
+        Args:
+            chunks: Transaction chunks, consumed lazily
+            on_item: Optional callback for each item leaving the last stage
+
+        Returns:
+            PipelineStats with per-stage throughput
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stats = PipelineStats(stages=[StageStats(stage.name, stage.concurrency) for stage in self.stages])
+        failed_lock = threading.Lock()
+        threads: List[threading.Thread] = []
+
+        for stage in self.stages:
+            stage.open()
+
+        started = time.perf_counter()
+        try:
+            for position, stage in enumerate(self.stages):
+                downstream = queues[position + 1] if position + 1 < len(queues) else None
+                next_concurrency = self.stages[position + 1].concurrency if downstream else 0
+                remaining = [stage.concurrency]
+                lock = threading.Lock()
+                for worker in range(stage.concurrency):
+                    thread = threading.Thread(
+                        target=self._worker,
+                        args=(stage, stats.stages[position], queues[position], downstream,
+                              next_concurrency, remaining, lock, on_item, stats, failed_lock),
+                        name=f"pipeline-{stage.name}-{worker}",
+                        daemon=True,
+                    )
+                    thread.start()
+                    threads.append(thread)
+
+            try:
+                for index, chunk in enumerate(chunks):
+                    queues[0].put(PipelineItem(index=index, chunk=chunk))
+                    stats.items += 1
+            finally:
+                # Drain the workers even if reading the input failed
+                for _ in range(self.stages[0].concurrency):
+                    queues[0].put(_STOP)
+                for thread in threads:
+                    thread.join()
+        finally:
+            for stage in self.stages:
+                stage.close()
+
+        stats.wall_seconds = time.perf_counter() - started
+        for stage_stats in stats.stages:
+            stage_stats.wall_seconds = stats.wall_seconds
+        return stats
+
+    def run_file(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 on_item: Optional[Callable[[PipelineItem], None]] = None) -> PipelineStats:
+        """
+        Stream a file from disk through the pipeline.
+
+        The raw segments pass through each stage's ``observe`` before they
+        are split into transactions.
+        """
+        with open(path, "rb") as handle:
+            segments = SegmentReader(handle, chunk_size=chunk_size)
+            for stage in self.stages:
+                segments = stage.observe(segments)
+            return self.run(TransactionSplitter(segments), on_item)
+
+    def _worker(self, stage: PipelineStage, stage_stats: StageStats, inbound: queue.Queue,
+                outbound: Optional[queue.Queue], next_concurrency: int, remaining: List[int],
+                lock: threading.Lock, on_item: Optional[Callable[[PipelineItem], None]],
+                stats: PipelineStats, failed_lock: threading.Lock):
+        while True:
+            item = inbound.get()
+            if item is _STOP:
+                with lock:
+                    remaining[0] -= 1
+                    last_worker = remaining[0] == 0
+                # The last worker of a stage propagates shutdown downstream
+                if last_worker and outbound is not None:
+                    for _ in range(next_concurrency):
+                        outbound.put(_STOP)
+                return
+
+            if item.failed and not stage.handles_failed_items:
+                with lock:
+                    stage_stats.skipped += 1
+            else:
+                started = time.perf_counter()
+                try:
+                    stage.process(item)
+                except Exception as e:
+                    item.errors.append(f"{stage.name}: {e}")
+                    logger.debug(f"Stage {stage.name} failed on item {item.index}: {e}")
+                    with lock:
+                        stage_stats.errors += 1
+                elapsed = time.perf_counter() - started
+                with lock:
+                    stage_stats.items += 1
+                    stage_stats.busy_seconds += elapsed
+
+            if outbound is not None:
+                blocked_from = time.perf_counter()
+                outbound.put(item)
+                blocked = time.perf_counter() - blocked_from
+                with lock:
+                    stage_stats.blocked_seconds += blocked
+            else:
+                if item.failed:
+                    with failed_lock:
+                        stats.failed += 1
+                if on_item is not None:
+                    on_item(item)
@@ -0,0 +1,416 @@
+"""
+Pipeline stages for streaming EDI processing.
+
+Each stage transforms a PipelineItem in place. Stages are independent of
+the runner, so they can be composed in any order and each given its own
+concurrency. The built-in stages wrap the existing parser plugins,
+ValidationEngine, HealthcareTransformer and EdiEmitter.
+"""
+
+from typing import Any, Callable, Dict, IO, Iterable, List, Optional
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import json
+import logging
+import sys
+import threading
+
+from ..base.edi_ast import EdiRoot
+from ..emitter import convert_floats_to_ints
+from ..healthcare.enrichment import ProviderEnricher, create_lookup
+from ..healthcare.transformations import HealthcareTransformer
+from ..streaming.acknowledgment import AcknowledgmentCollector
+from ..streaming.reader import RawSegment
+from ..streaming.schema import SegmentValidator
+from ..streaming.splitter import TransactionChunk
+from ..streaming.writer import X12Writer
+from ..telemetry import get_instrumentation, SPAN_EMIT, HISTOGRAM_EMIT
+from ..transactions.t835.ast import Transaction835
+from ..transactions.t837p.ast import Transaction837P
+from ..validation.engine import ValidationEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineItem:
+    """A single transaction moving through the pipeline."""
+    index: int
+    chunk: Optional[TransactionChunk] = None
+    edi_root: Optional[EdiRoot] = None
+    validation: Optional[Dict[str, Any]] = None
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors)
+
+    def transactions(self) -> List[Any]:
+        """Return the parsed Transaction nodes for this item."""
+        if self.edi_root is None:
+            return []
+        return [
+            transaction
+            for interchange in self.edi_root.interchanges
+            for functional_group in interchange.functional_groups
+            for transaction in functional_group.transactions
+        ]
+
+
+class PipelineStage(ABC):
+    """Base class for pipeline stages."""
+
+    stage_type = "stage"
+    handles_failed_items = False
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1):
+        if concurrency < 1:
+            raise ValueError(f"Stage concurrency must be at least 1, got {concurrency}")
+        self.name = name or self.stage_type
+        self.concurrency = concurrency
+
+    @abstractmethod
+    def process(self, item: PipelineItem) -> None:
+        """Process an item in place. Raised exceptions are recorded on the item."""
+        pass
+
+    def open(self) -> None:
+        """Called once before the first item is processed."""
+        pass
+
+    def close(self) -> None:
+        """Called once after the last item is processed."""
+        pass
+
+    def observe(self, segments: Iterable[RawSegment]) -> Iterable[RawSegment]:
+        """Wrap the raw segment stream read by ``Pipeline.run_file``; a pass-through by default."""
+        return segments
+
+
+class ParseStage(PipelineStage):
+    """Parse a TransactionChunk with the registered transaction parser plugin."""
+
+    stage_type = "parse"
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1, registry=None):
+        super().__init__(name, concurrency)
+        self.registry = registry
+
+    def open(self) -> None:
+        if self.registry is None:
+            from ..plugins.api import PluginManager, plugin_registry
+            if not plugin_registry.get_parser_for_transaction("835"):
+                PluginManager(plugin_registry).load_builtin_plugins()
+            self.registry = plugin_registry
+
+    def process(self, item: PipelineItem) -> None:
+        code = item.chunk.transaction_set_code
+        parser_plugin = self.registry.get_parser_for_transaction(code)
+        if parser_plugin is None:
+            raise ValueError(f"No parser plugin available for transaction code: {code}")
+        item.edi_root = parser_plugin.parse(item.chunk.segments)
+
+
+class ValidateStage(PipelineStage):
+    """Run a ValidationEngine over the parsed document."""
+
+    stage_type = "validate"
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1,
+                 engine: Optional[ValidationEngine] = None, rules_files: Optional[List[str]] = None):
+        super().__init__(name, concurrency)
+        self.engine = engine
+        self.rules_files = rules_files or []
+
+    def open(self) -> None:
+        if self.engine is not None:
+            return
+        if self.rules_files:
+            from ..validation.yaml_loader import YamlValidationLoader
+            self.engine = ValidationEngine()
+            loader = YamlValidationLoader()
+            for rules_file in self.rules_files:
+                for rule in loader.load_from_file(rules_file):
+                    self.engine.register_rule_plugin(rule)
+        else:
+            from ..validation.integration import validation_manager
+            self.engine = validation_manager.validation_engine
+
+    def process(self, item: PipelineItem) -> None:
+        item.validation = self.engine.validate(item.edi_root).to_dict()
+
+
+def _standardize_claims(transaction: Any) -> List[Dict[str, Any]]:
+    data = transaction.transaction_data
+    if isinstance(data, Transaction835):
+        return [HealthcareTransformer.standardize_claim_from_835(claim, data).to_dict()
+                for claim in data.claims]
+    if isinstance(data, Transaction837P):
+        return [HealthcareTransformer.standardize_claim_from_837p(data).to_dict()]
+    return []
+
+
+def _payment_summary(transaction: Any) -> Optional[Dict[str, Any]]:
+    data = transaction.transaction_data
+    if not isinstance(data, Transaction835):
+        return None
+    return HealthcareTransformer.calculate_payment_summary(data).to_dict()
+
+
+def _denial_reasons(transaction: Any) -> List[Dict[str, Any]]:
+    data = transaction.transaction_data
+    reasons = []
+    for claim in getattr(data, "claims", None) or []:
+        for reason in HealthcareTransformer.extract_denial_reasons(claim):
+            reasons.append(dict(reason, claim_id=claim.claim_id))
+    return reasons
+
+
+def _clearinghouse_format(transaction: Any) -> Dict[str, Any]:
+    return HealthcareTransformer.format_for_clearinghouse(transaction.transaction_data)
+
+
+TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    "standardize_claims": _standardize_claims,
+    "payment_summary": _payment_summary,
+    "denial_reasons": _denial_reasons,
+    "clearinghouse": _clearinghouse_format,
+}
+
+
+class TransformStage(PipelineStage):
+    """Apply a HealthcareTransformer function to every parsed transaction."""
+
+    stage_type = "transform"
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1,
+                 function: str = "standardize_claims", output_key: Optional[str] = None):
+        if function not in TRANSFORMS:
+            raise ValueError(f"Unknown transform: {function}. Available: {', '.join(sorted(TRANSFORMS))}")
+        super().__init__(name or function, concurrency)
+        self.function = function
+        self.output_key = output_key or function
+
+    def process(self, item: PipelineItem) -> None:
+        transform = TRANSFORMS[self.function]
+        item.outputs[self.output_key] = [transform(transaction) for transaction in item.transactions()]
+
+
+class EnrichStage(PipelineStage):
+    """
+    Add provider master data for the NPIs of every parsed transaction.
+
+    All NPIs of an item are resolved with one backend query behind a
+    shared LRU cache. Records go to ``outputs[output_key]``, one
+    ``{role: record}`` mapping per transaction, and standardized claims
+    already in the outputs named by ``annotate`` get their provider's
+    record as ``provider_details``.
+    """
+
+    stage_type = "enrich"
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1,
+                 enricher: Optional[ProviderEnricher] = None, backend: str = "sqlite",
+                 path: Optional[str] = None, table: str = "providers", npi_column: str = "npi",
+                 columns: Optional[Dict[str, str]] = None, cache_size: int = 100000,
+                 output_key: str = "providers", annotate: Optional[List[str]] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name
+            concurrency: Number of worker threads
+            enricher: Enricher to use instead of building one from the options below
+            backend: Lookup backend, ``sqlite`` or ``csv``
+            path: Provider master database or CSV file
+            table: SQLite table (sqlite backend only)
+            npi_column: Column holding the NPI
+            columns: Record field to column name
+            cache_size: Maximum cached NPIs
+            output_key: Output key for the provider records
+            annotate: Transform output keys holding standardized claims to
+                annotate; defaults to ``standardize_claims``
+        """
+        super().__init__(name, concurrency)
+        if enricher is None and not path:
+            raise ValueError("Enrich stage requires a provider master 'path'")
+        self.enricher = enricher
+        self.backend = backend
+        self.path = path
+        self.lookup_options: Dict[str, Any] = {"npi_column": npi_column, "columns": columns}
+        if backend == "sqlite":
+            self.lookup_options["table"] = table
+        self.cache_size = cache_size
+        self.output_key = output_key
+        self.annotate = annotate if annotate is not None else ["standardize_claims"]
+        self._owns_enricher = enricher is None
+
+    def open(self) -> None:
+        if self.enricher is None:
+            self.enricher = ProviderEnricher(create_lookup(self.backend, self.path, **self.lookup_options),
+                                             cache_size=self.cache_size)
+
+    def close(self) -> None:
+        if self.enricher is not None and self._owns_enricher:
+            logger.info(f"Provider enrichment: {self.enricher.stats()}")
+            self.enricher.close()
+            self.enricher = None
+
+    def process(self, item: PipelineItem) -> None:
+        transactions = item.transactions()
+        providers = self.enricher.enrich_transactions(transactions)
+        item.outputs[self.output_key] = providers
+
+        for key in self.annotate:
+            for claims, roles in zip(item.outputs.get(key) or [], providers):
+                records = {record["npi"]: record for record in roles.values() if record}
+                for claim in claims or []:
+                    if isinstance(claim, dict) and claim.get("provider_npi"):
+                        claim["provider_details"] = records.get(claim["provider_npi"])
+
+
+class EmitStage(PipelineStage):
+    """Write one JSON line per item to a file or stdout."""
+
+    stage_type = "emit"
+    handles_failed_items = True
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1,
+                 output: Optional[str] = None, include: Optional[List[str]] = None,
+                 ordered: bool = True):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name
+            concurrency: Number of worker threads
+            output: Output path; stdout when omitted
+            include: Sections to emit: ``transactions``, ``validation`` and/or
+                transform output keys. Defaults to everything.
+            ordered: Write lines in input order even when upstream stages
+                run concurrently
+        """
+        super().__init__(name, concurrency)
+        self.output = output
+        self.include = include
+        self.ordered = ordered
+        self._handle: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, str] = {}
+        self._next_index = 0
+
+    def open(self) -> None:
+        self._handle = open(self.output, "w") if self.output else sys.stdout
+        self._pending = {}
+        self._next_index = 0
+
+    def close(self) -> None:
+        # Flush anything still held back, e.g. when indexes had gaps
+        for index in sorted(self._pending):
+            self._handle.write(self._pending.pop(index))
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+        self._handle = None
+
+    def _wanted(self, section: str) -> bool:
+        return self.include is None or section in self.include
+
+    def process(self, item: PipelineItem) -> None:
+        with get_instrumentation().timed(SPAN_EMIT, HISTOGRAM_EMIT, {"format": "jsonl"}):
+            self._emit(item)
+
+    def _emit(self, item: PipelineItem) -> None:
+        record: Dict[str, Any] = {
+            "index": item.index,
+            "control_number": item.chunk.control_number if item.chunk else None,
+        }
+        if self._wanted("transactions"):
+            record["transactions"] = [transaction.to_dict() for transaction in item.transactions()]
+        if self._wanted("validation") and item.validation is not None:
+            record["validation"] = item.validation
+        for key, value in item.outputs.items():
+            if self._wanted(key):
+                record[key] = value
+        if item.errors:
+            record["errors"] = item.errors
+
+        line = json.dumps(convert_floats_to_ints(record), default=str) + "\n"
+        with self._lock:
+            if not self.ordered:
+                self._handle.write(line)
+                return
+            self._pending[item.index] = line
+            while self._next_index in self._pending:
+                self._handle.write(self._pending.pop(self._next_index))
+                self._next_index += 1
+
+
+class AcknowledgeStage(PipelineStage):
+    """
+    Write 999 and TA1 acknowledgments for the input file.
+
+    Envelope checks happen while ``Pipeline.run_file`` reads the input,
+    so the stage needs run_file rather than run. Parser errors, validation
+    errors and stage failures of each item are added as it passes. The
+    acknowledgment file is written on close.
+    """
+
+    stage_type = "acknowledge"
+    handles_failed_items = True
+
+    def __init__(self, name: Optional[str] = None, concurrency: int = 1,
+                 output: Optional[str] = None, ta1: str = "errors", report_accepted: bool = True,
+                 supported_codes: Optional[List[str]] = None, control_start: int = 1,
+                 schema: Optional[str] = None):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name
+            concurrency: Number of worker threads
+            output: Output path; stdout when omitted
+            ta1: TA1 policy: ``errors``, ``always`` or ``never``
+            report_accepted: Include AK2 loops for accepted transactions
+            supported_codes: ST01 codes to accept; all when omitted
+            control_start: First ISA13 control number written
+            schema: Segment schema JSON file; element errors are reported
+                as IK4 while the input is read
+        """
+        super().__init__(name, concurrency)
+        self.output = output
+        self.ta1 = ta1
+        self.report_accepted = report_accepted
+        self.supported_codes = supported_codes
+        self.control_start = control_start
+        self.schema = SegmentValidator.from_file(schema) if schema else None
+        self.collector = AcknowledgmentCollector(supported_codes, schema=self.schema)
+
+    def observe(self, segments: Iterable[RawSegment]) -> Iterable[RawSegment]:
+        # Called once per run_file, before open()
+        self.collector = AcknowledgmentCollector(self.supported_codes, schema=self.schema)
+        return self.collector.observe(segments)
+
+    def process(self, item: PipelineItem) -> None:
+        errors = item.edi_root.errors if item.edi_root is not None else ()
+        self.collector.record_chunk(item.chunk, errors=errors, validation=item.validation,
+                                    failures=item.errors)
+
+    def close(self) -> None:
+        if self.output:
+            with open(self.output, "wb") as handle, X12Writer(handle, control_start=self.control_start) as writer:
+                self.collector.write(writer, self.ta1, self.report_accepted)
+        else:
+            writer = X12Writer(sys.stdout, control_start=self.control_start)
+            self.collector.write(writer, self.ta1, self.report_accepted)
+            writer.flush()
+
+
+STAGE_TYPES: Dict[str, type] = {
+    ParseStage.stage_type: ParseStage,
+    ValidateStage.stage_type: ValidateStage,
+    TransformStage.stage_type: TransformStage,
+    EnrichStage.stage_type: EnrichStage,
+    EmitStage.stage_type: EmitStage,
+    AcknowledgeStage.stage_type: AcknowledgeStage,
+}
@@ -10,6 +10,9 @@ from typing import Dict, List, Any, Optional, Type
 from .api import TransactionParserPlugin
 from .factory import TransactionParserFactory, ASTNodeFactory, plugin_context
 from ..base.edi_ast import EdiRoot
+from ..telemetry import (
+    get_instrumentation, record_document_counts, SPAN_PARSE, HISTOGRAM_PARSE, COUNTER_SEGMENTS
+)
 
 
 class FactoryBasedPlugin(TransactionParserPlugin):
@@ -61,15 +64,32 @@ class FactoryBasedPlugin(TransactionParserPlugin):
         self._ensure_factories()
         return self._ast_factory.get_transaction_class()
     
-    def parse(self, segments: List[List[str]]) -> EdiRoot:
-        """Parse EDI segments using factory-created parser."""
+    def parse(self, segments: List[List[str]], listener=None) -> EdiRoot:
+        """
+        Parse EDI segments using factory-created parser.
+        
+        Args:
+            segments: EDI segments to parse
+            listener: Optional NodeListener notified as the parser closes each node
+        """
         self._ensure_factories()
         
         # Create parser using factory
         parser = self._parser_factory.create_parser(segments)
+        if listener is not None:
+            parser.listener = listener
+        
+        instrumentation = get_instrumentation()
+        if not instrumentation.enabled:
+            # Parse using the factory-created parser
+            return parser.parse()
         
-        # Parse using the factory-created parser
-        return parser.parse()
+        attributes = {"plugin": self.plugin_name}
+        with instrumentation.timed(SPAN_PARSE, HISTOGRAM_PARSE, attributes):
+            edi_root = parser.parse()
+        instrumentation.add(COUNTER_SEGMENTS, len(segments), attributes)
+        record_document_counts(instrumentation, edi_root, attributes)
+        return edi_root
     
     def validate_segments(self, segments: List[List[str]]) -> bool:
         """Validate segments using factory-created parser."""
@@ -24,19 +24,10 @@ class Plugin837P(FactoryBasedPlugin):
     def setup_factories(self) -> Tuple[TransactionParserFactory, ASTNodeFactory]:
         """Setup factories for 837P transaction parsing."""
         from ..factory import GenericTransactionParserFactory, GenericASTNodeFactory
+        from ...transactions.t837p.parser import Parser837P
         from ...transactions.t837p.ast import Transaction837P
-        from ...base.parser import BaseParser
         
-        # Create a stub parser for 837P until full implementation is ready
-        class StubParser837P(BaseParser):
-            def get_transaction_codes(self):
-                return ["837"]
-            
-            def parse(self):
-                from ...base.edi_ast import EdiRoot
-                return EdiRoot()  # Return empty structure for now
-        
-        parser_factory = GenericTransactionParserFactory(StubParser837P, ["837"])
+        parser_factory = GenericTransactionParserFactory(Parser837P, ["837"])
         ast_factory = GenericASTNodeFactory(Transaction837P)
         
         return parser_factory, ast_factory
\ No newline at end of file
@@ -9,6 +9,11 @@ class Delimiters(BaseModel):
 class Element(BaseModel):
     name: str
     type: str
+    length: Optional[int] = None
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    codes: Optional[List[str]] = None
+    required: bool = False
 
 class Segment(BaseModel):
     name: str
@@ -0,0 +1,103 @@
+"""
+Streaming EDI processing.
+
+This module provides bounded-memory building blocks for large files:
+a chunked segment reader, an envelope-only scanner, byte-range file
+splitting and merging, a streaming X12 writer, compiled segment schema
+checks, single-pass 999/TA1 acknowledgments, error-tolerant parsing
+with a quarantine manifest, a structural diff, a transaction splitter, a
+bounded parallel executor, an SQLite-backed batch job queue and a
+directory watcher.
+"""
+
+from .reader import Delimiters, RawSegment, SegmentReader, detect_delimiters, iter_segments
+from .envelope import (EnvelopeIssue, EnvelopeScan, EnvelopeScanner, GroupEnvelope, InterchangeEnvelope,
+                       TransactionEnvelope, scan_envelopes)
+from .partition import InterchangeWriter, WrittenFile, merge_files, split_file
+from .writer import X12Writer, get_serializer, register_serializer, write_x12
+from .schema import CompiledSegment, ElementError, SegmentValidator, compile_segment
+from .acknowledgment import AcknowledgmentCollector, GroupAck, InterchangeAck, SegmentNote, TransactionAck
+from .recovery import (QuarantinedSpan, QuarantineManifest, RecoveringParser, RecoveryResult,
+                       extract_quarantined, recover_file)
+from .diff import EdiDiff, FieldDelta, UnitDiff, diff_files
+from .splitter import TransactionChunk, TransactionSplitter
+from .executor import ChunkResult, ParallelExecutor, process_chunk, process_chunks
+from .jobs import JobStore, JobRunner
+from .watcher import WatchConfig, WatchDaemon, FileOutcome, ProcessedFileStore
+
+__all__ = [
+    # Reading
+    'Delimiters',
+    'RawSegment',
+    'SegmentReader',
+    'detect_delimiters',
+    'iter_segments',
+
+    # Envelope scanning
+    'EnvelopeIssue',
+    'EnvelopeScan',
+    'EnvelopeScanner',
+    'GroupEnvelope',
+    'InterchangeEnvelope',
+    'TransactionEnvelope',
+    'scan_envelopes',
+
+    # File splitting and merging
+    'InterchangeWriter',
+    'WrittenFile',
+    'merge_files',
+    'split_file',
+
+    # Writing
+    'X12Writer',
+    'get_serializer',
+    'register_serializer',
+    'write_x12',
+
+    # Segment schema validation
+    'CompiledSegment',
+    'ElementError',
+    'SegmentValidator',
+    'compile_segment',
+
+    # Acknowledgments
+    'AcknowledgmentCollector',
+    'GroupAck',
+    'InterchangeAck',
+    'SegmentNote',
+    'TransactionAck',
+
+    # Recovery
+    'QuarantinedSpan',
+    'QuarantineManifest',
+    'RecoveringParser',
+    'RecoveryResult',
+    'extract_quarantined',
+    'recover_file',
+
+    # Diffing
+    'EdiDiff',
+    'FieldDelta',
+    'UnitDiff',
+    'diff_files',
+
+    # Splitting
+    'TransactionChunk',
+    'TransactionSplitter',
+
+    # Execution
+    'ChunkResult',
+    'ParallelExecutor',
+    'process_chunk',
+    'process_chunks',
+
+    # Jobs
+    'JobStore',
+    'JobRunner',
+
+    # Watching
+    'WatchConfig',
+    'WatchDaemon',
+    'FileOutcome',
+    'ProcessedFileStore'
+]
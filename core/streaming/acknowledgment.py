@@ -0,0 +1,601 @@
+"""
+999 and TA1 acknowledgments.
+
+AcknowledgmentCollector builds acknowledgments in the same pass that
+parses a file. ``observe`` wraps the raw segment stream that feeds the
+TransactionSplitter and checks the envelopes as segments go by: control
+numbers, SE/GE/IEA counts, missing trailers and duplicate ST02 values.
+Parser errors and validation results are added per transaction with
+``record``, keyed by the ST byte offset. Once the stream is consumed,
+``write`` emits one interchange per inbound interchange with a TA1 and
+one 999 per inbound functional group.
+
+Example:
+    collector = AcknowledgmentCollector()
+    with open("inbound.837", "rb") as handle:
+        for chunk in TransactionSplitter(collector.observe(SegmentReader(handle))):
+            root = plugin.parse(chunk.segments)
+            collector.record_chunk(chunk, errors=root.errors)
+    with open("inbound.999", "wb") as handle, X12Writer(handle) as writer:
+        collector.write(writer)
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from dataclasses import dataclass, field
+import logging
+import threading
+
+from ..telemetry import get_instrumentation, SPAN_EMIT, HISTOGRAM_EMIT
+from .reader import RawSegment
+from .schema import SegmentValidator
+from .splitter import TransactionChunk
+from .writer import IMPLEMENTATION_GUIDES, X12Writer
+
+logger = logging.getLogger(__name__)
+
+ENVELOPE_SEGMENTS = frozenset(("ISA", "IEA", "GS", "GE", "ST", "SE"))
+
+# IK5/AK905 status codes raised by the envelope checks
+TRANSACTION_NOT_SUPPORTED = "1"
+TRAILER_MISSING = "2"
+CONTROL_NUMBER_MISMATCH = "3"
+SEGMENT_COUNT_MISMATCH = "4"
+SEGMENTS_IN_ERROR = "5"
+INVALID_TRANSACTION_IDENTIFIER = "7"
+DUPLICATE_CONTROL_NUMBER = "23"
+IMPLEMENTATION_SEGMENTS_IN_ERROR = "I5"
+
+GROUP_TRAILER_MISSING = "3"
+GROUP_CONTROL_NUMBER_MISMATCH = "4"
+TRANSACTION_COUNT_MISMATCH = "5"
+
+# TA105 interchange note codes
+TA1_NO_ERROR = "000"
+TA1_CONTROL_NUMBER_MISMATCH = "001"
+TA1_GROUP_COUNT_MISMATCH = "021"
+TA1_END_OF_FILE = "023"
+
+_TA1_REJECTING = frozenset((TA1_CONTROL_NUMBER_MISMATCH, TA1_END_OF_FILE))
+
+# IK3 "segment has data element errors"
+SEGMENT_HAS_ELEMENT_ERRORS = "8"
+
+# IK403 codes guessed from validation error codes and messages
+_ELEMENT_ERROR_KEYWORDS = (
+    ("MISSING", "1"),
+    ("REQUIRED", "1"),
+    ("TOO_SHORT", "4"),
+    ("TOO_LONG", "5"),
+    ("LENGTH", "5"),
+    ("DATE", "8"),
+    ("TIME", "9"),
+)
+INVALID_CODE_VALUE = "7"
+
+# IK5 and AK9 carry at most five syntax error codes
+_MAX_CODES = 5
+_MAX_BAD_VALUE = 99
+
+
+@dataclass
+class SegmentNote:
+    """An IK3 segment error with its optional IK4 element error."""
+    segment_id: str
+    position: int
+    error_code: str = SEGMENT_HAS_ELEMENT_ERRORS
+    loop_id: str = ""
+    element_position: Optional[int] = None
+    element_error_code: str = ""
+    bad_value: str = ""
+    message: str = ""
+
+
+@dataclass
+class TransactionAck:
+    """Acknowledgment state of one inbound ST..SE."""
+    code: str
+    control_number: str
+    implementation_reference: str
+    start: int
+    segment_count: int = 0
+    codes: List[str] = field(default_factory=list)
+    notes: List[SegmentNote] = field(default_factory=list)
+    dropped_notes: int = 0
+
+    @property
+    def accepted(self) -> bool:
+        return not self.codes and not self.notes
+
+    @property
+    def status(self) -> str:
+        """IK501 status: A (accepted) or R (rejected)."""
+        return "A" if self.accepted else "R"
+
+    def add_code(self, code: str):
+        if code not in self.codes:
+            self.codes.append(code)
+
+
+@dataclass
+class GroupAck:
+    """Acknowledgment state of one inbound GS..GE."""
+    functional_id: str
+    sender_id: str
+    receiver_id: str
+    control_number: str
+    version: str
+    declared_count: Optional[int] = None
+    transactions: List[TransactionAck] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+    _control_numbers: set = field(default_factory=set, repr=False)
+
+    @property
+    def received(self) -> int:
+        return len(self.transactions)
+
+    @property
+    def accepted(self) -> int:
+        return sum(1 for transaction in self.transactions if transaction.accepted)
+
+    @property
+    def status(self) -> str:
+        """AK901 status: A, E (accepted with errors), P (partially accepted) or R."""
+        accepted = self.accepted
+        if not accepted:
+            return "R"
+        if accepted < self.received:
+            return "P"
+        return "E" if self.codes else "A"
+
+    def add_code(self, code: str):
+        if code not in self.codes:
+            self.codes.append(code)
+
+
+@dataclass
+class InterchangeAck:
+    """Acknowledgment state of one inbound ISA..IEA."""
+    sender_qualifier: str
+    sender_id: str
+    receiver_qualifier: str
+    receiver_id: str
+    control_number: str
+    date: str
+    time: str
+    version: str
+    usage_indicator: str
+    acknowledgment_requested: bool
+    groups: List[GroupAck] = field(default_factory=list)
+    note_code: str = TA1_NO_ERROR
+
+    @property
+    def status(self) -> str:
+        """TA104 status: A, E (accepted with errors) or R."""
+        if self.note_code == TA1_NO_ERROR:
+            return "A"
+        return "R" if self.note_code in _TA1_REJECTING else "E"
+
+
+def _element(elements: Sequence[str], position: int) -> str:
+    return elements[position].strip() if len(elements) > position else ""
+
+
+def _count(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class AcknowledgmentCollector:
+    """
+    Collect envelope, parser and validation errors for 999/TA1 output.
+
+    ``observe`` must see every segment of the stream; ``record`` may be
+    called from worker threads once the transaction's SE has been read.
+    """
+
+    def __init__(self, supported_codes: Optional[Iterable[str]] = None, max_segment_errors: int = 20,
+                 schema: Optional[SegmentValidator] = None):
+        """
+        Initialize the collector.
+
+        Args:
+            supported_codes: ST01 codes that are accepted; others are
+                rejected with IK5 code 1. All codes when omitted.
+            max_segment_errors: IK3 loops reported per transaction
+            schema: Compiled segment schema; element errors in transaction
+                bodies are reported as IK3/IK4 while ``observe`` reads them
+        """
+        self.supported_codes = frozenset(supported_codes) if supported_codes else None
+        self.max_segment_errors = max_segment_errors
+        self.schema = schema
+        self.interchanges: List[InterchangeAck] = []
+        self._by_start: Dict[int, TransactionAck] = {}
+        self._lock = threading.Lock()
+        self._interchange: Optional[InterchangeAck] = None
+        self._group: Optional[GroupAck] = None
+        self._transaction: Optional[TransactionAck] = None
+
+    # Envelope checks
+
+    def observe(self, segments: Iterable[RawSegment]) -> Iterator[RawSegment]:
+        """
+        Pass segments through unchanged while checking their envelopes.
+
+        Each segment is checked before it is yielded, so a transaction is
+        known to the collector by the time a splitter downstream emits it.
+        """
+        for segment in segments:
+            segment_id = segment.segment_id
+            if segment_id == "ISA":
+                self._begin_interchange(segment)
+            elif segment_id == "GS":
+                self._begin_group(segment)
+            elif segment_id == "ST":
+                self._begin_transaction(segment)
+            elif self._transaction is not None:
+                self._transaction.segment_count += 1
+                if segment_id == "SE":
+                    self._end_transaction(segment.elements)
+                elif segment_id in ("GE", "IEA"):
+                    # The SE never came; the trailer above belongs to the group
+                    self._transaction.segment_count -= 1
+                    self._close_transaction()
+                    self._end_envelope(segment_id, segment.elements)
+                elif self.schema is not None:
+                    self._check_elements(segment)
+            elif segment_id in ("GE", "IEA"):
+                self._end_envelope(segment_id, segment.elements)
+            yield segment
+        self.finish()
+
+    def finish(self):
+        """Close anything left open at the end of the stream."""
+        self._close_transaction()
+        self._close_group()
+        if self._interchange is not None:
+            self._interchange.note_code = TA1_END_OF_FILE
+            self._interchange = None
+
+    def _begin_interchange(self, segment: RawSegment):
+        self._close_transaction()
+        self._close_group()
+        if self._interchange is not None:
+            self._interchange.note_code = TA1_END_OF_FILE
+        elements = segment.elements
+        self._interchange = InterchangeAck(
+            sender_qualifier=_element(elements, 5),
+            sender_id=_element(elements, 6),
+            receiver_qualifier=_element(elements, 7),
+            receiver_id=_element(elements, 8),
+            control_number=_element(elements, 13),
+            date=_element(elements, 9),
+            time=_element(elements, 10),
+            version=_element(elements, 12),
+            usage_indicator=_element(elements, 15) or "P",
+            acknowledgment_requested=_element(elements, 14) == "1",
+        )
+        self.interchanges.append(self._interchange)
+
+    def _begin_group(self, segment: RawSegment):
+        self._close_transaction()
+        self._close_group()
+        if self._interchange is None:
+            logger.warning(f"GS at byte {segment.start} outside an interchange; not acknowledged")
+            return
+        elements = segment.elements
+        self._group = GroupAck(
+            functional_id=_element(elements, 1),
+            sender_id=_element(elements, 2),
+            receiver_id=_element(elements, 3),
+            control_number=_element(elements, 6),
+            version=_element(elements, 8),
+        )
+        self._interchange.groups.append(self._group)
+
+    def _begin_transaction(self, segment: RawSegment):
+        self._close_transaction()
+        group = self._group
+        if group is None:
+            logger.warning(f"ST at byte {segment.start} outside a functional group; not acknowledged")
+            return
+        elements = segment.elements
+        transaction = TransactionAck(
+            code=_element(elements, 1),
+            control_number=_element(elements, 2),
+            implementation_reference=_element(elements, 3),
+            start=segment.start,
+            segment_count=1,
+        )
+        if not transaction.code:
+            transaction.add_code(INVALID_TRANSACTION_IDENTIFIER)
+        elif self.supported_codes is not None and transaction.code not in self.supported_codes:
+            transaction.add_code(TRANSACTION_NOT_SUPPORTED)
+        if transaction.control_number in group._control_numbers:
+            transaction.add_code(DUPLICATE_CONTROL_NUMBER)
+        group._control_numbers.add(transaction.control_number)
+
+        group.transactions.append(transaction)
+        with self._lock:
+            self._by_start[transaction.start] = transaction
+        self._transaction = transaction
+
+    def _end_transaction(self, elements: List[str]):
+        transaction, self._transaction = self._transaction, None
+        if _element(elements, 2) != transaction.control_number:
+            transaction.add_code(CONTROL_NUMBER_MISMATCH)
+        if _count(_element(elements, 1)) != transaction.segment_count:
+            transaction.add_code(SEGMENT_COUNT_MISMATCH)
+
+    def _check_elements(self, segment: RawSegment):
+        transaction = self._transaction
+        names = None
+        for position, code, value in self.schema.check(segment.elements):
+            if names is None:
+                names = self.schema.segments[segment.segment_id].element_names
+            name = names[position - 1] if position <= len(names) else ""
+            self._add_note(transaction, SegmentNote(
+                segment_id=segment.segment_id,
+                position=transaction.segment_count,
+                element_position=position,
+                element_error_code=code,
+                bad_value=value,
+                message=f"{segment.segment_id}{position:02d} {name}".rstrip(),
+            ), SEGMENTS_IN_ERROR)
+
+    def _close_transaction(self):
+        if self._transaction is not None:
+            self._transaction.add_code(TRAILER_MISSING)
+            self._transaction = None
+
+    def _close_group(self):
+        if self._group is not None:
+            self._group.add_code(GROUP_TRAILER_MISSING)
+            self._group = None
+
+    def _end_envelope(self, segment_id: str, elements: List[str]):
+        if segment_id == "GE":
+            group, self._group = self._group, None
+            if group is None:
+                return
+            group.declared_count = _count(_element(elements, 1))
+            if _element(elements, 2) != group.control_number:
+                group.add_code(GROUP_CONTROL_NUMBER_MISMATCH)
+            if group.declared_count != group.received:
+                group.add_code(TRANSACTION_COUNT_MISMATCH)
+            return
+
+        self._close_group()
+        interchange, self._interchange = self._interchange, None
+        if interchange is None:
+            return
+        if _element(elements, 2) != interchange.control_number:
+            interchange.note_code = TA1_CONTROL_NUMBER_MISMATCH
+        elif _count(_element(elements, 1)) != len(interchange.groups):
+            interchange.note_code = TA1_GROUP_COUNT_MISMATCH
+
+    # Parser and validation errors
+
+    def record(self, transaction_start: int, errors: Iterable[Any] = (), validation: Any = None,
+               segments: Optional[Sequence[Sequence[str]]] = None, failures: Sequence[str] = (),
+               st_index: int = 0):
+        """
+        Add parser and validation errors for one transaction.
+
+        Args:
+            transaction_start: Byte offset of the transaction's ST segment
+            errors: EDISegmentErrors collected by the parser; errors on
+                envelope segments are ignored because ``observe`` checks those
+            validation: ValidationResult (either flavour) or its ``to_dict()``;
+                only errors are reported, warnings are not
+            segments: Parsed segments, used to locate validation errors by
+                segment ID
+            failures: Messages of failures that left no usable parse;
+                they reject the transaction
+            st_index: Index of the ST segment in ``segments`` and in the
+                parser's segment indexes
+        """
+        with self._lock:
+            transaction = self._by_start.pop(transaction_start, None)
+        if transaction is None:
+            logger.warning(f"No transaction observed at byte {transaction_start}; errors not acknowledged")
+            return
+
+        for error in errors:
+            segment_id, index, element_position = self._locate_parse_error(error)
+            if segment_id in ENVELOPE_SEGMENTS:
+                continue
+            if segment_id is None or index is None:
+                transaction.add_code(SEGMENTS_IN_ERROR)
+                continue
+            self._add_note(transaction, SegmentNote(
+                segment_id=segment_id,
+                position=index - st_index + 1,
+                element_position=element_position,
+                element_error_code=INVALID_CODE_VALUE if element_position else "",
+                message=str(error),
+            ), SEGMENTS_IN_ERROR)
+
+        for error in self._validation_errors(validation):
+            self._add_validation_error(transaction, error, segments, st_index)
+
+        if failures:
+            transaction.add_code(SEGMENTS_IN_ERROR)
+
+    def record_chunk(self, chunk: TransactionChunk, errors: Iterable[Any] = (), validation: Any = None,
+                     failures: Sequence[str] = ()):
+        """``record`` for a TransactionChunk parsed on its own (ST is its third segment)."""
+        self.record(chunk.start, errors, validation, chunk.segments, failures, st_index=2)
+
+    def _add_note(self, transaction: TransactionAck, note: SegmentNote, code: str):
+        transaction.add_code(code)
+        if len(transaction.notes) >= self.max_segment_errors:
+            transaction.dropped_notes += 1
+            return
+        transaction.notes.append(note)
+
+    @staticmethod
+    def _locate_parse_error(error: Any):
+        """Segment ID, segment index and element position of a parser error."""
+        if isinstance(error, dict):
+            metadata = error
+        else:
+            # Parser handlers build EDISegmentError(message, context), so the
+            # location lives in the context metadata rather than the attributes
+            context = getattr(error, "segment_id", None)
+            metadata = getattr(context, "metadata", None)
+            if not isinstance(metadata, dict):
+                metadata = {
+                    "segment_id": context,
+                    "segment_index": getattr(error, "segment_position", None),
+                    "element_position": getattr(error, "element_position", None),
+                }
+        index = metadata.get("segment_index", metadata.get("segment_position"))
+        if index is not None and index < 0:
+            index = None
+        return metadata.get("segment_id"), index, metadata.get("element_position")
+
+    @staticmethod
+    def _validation_errors(validation: Any) -> List[Any]:
+        if validation is None:
+            return []
+        if isinstance(validation, dict):
+            return validation.get("errors") or []
+        return list(getattr(validation, "errors", None) or [])
+
+    def _add_validation_error(self, transaction: TransactionAck, error: Any,
+                              segments: Optional[Sequence[Sequence[str]]], st_index: int):
+        if isinstance(error, dict):
+            get = error.get
+        else:
+            def get(key, default=None):
+                return getattr(error, key, default)
+        segment_id = get("segment_id") or get("segment")
+        element_position = get("element_position") or get("element")
+        if isinstance(element_position, str):
+            # "CLP04" style references
+            if segment_id and element_position.startswith(segment_id):
+                element_position = element_position[len(segment_id):]
+            element_position = _count(element_position)
+
+        position = None
+        if segment_id and segments is not None:
+            for index in range(st_index, len(segments)):
+                if segments[index] and segments[index][0] == segment_id:
+                    position = index - st_index + 1
+                    break
+        if position is None:
+            transaction.add_code(IMPLEMENTATION_SEGMENTS_IN_ERROR)
+            return
+
+        self._add_note(transaction, SegmentNote(
+            segment_id=segment_id,
+            position=position,
+            element_position=element_position,
+            element_error_code=self._element_error_code(error) if element_position else "",
+            bad_value=str(get("value") or ""),
+            message=str(get("message") or ""),
+        ), IMPLEMENTATION_SEGMENTS_IN_ERROR)
+
+    @staticmethod
+    def _element_error_code(error: Any) -> str:
+        if isinstance(error, dict):
+            text = f"{error.get('code', '')} {error.get('message', '')}"
+        else:
+            text = f"{getattr(error, 'code', '')} {getattr(error, 'message', '')}"
+        text = text.upper()
+        for keyword, code in _ELEMENT_ERROR_KEYWORDS:
+            if keyword in text:
+                return code
+        return INVALID_CODE_VALUE
+
+    # Output
+
+    def write(self, writer: X12Writer, ta1: str = "errors", report_accepted: bool = True) -> int:
+        """
+        Write the acknowledgments.
+
+        Each inbound interchange gets one outbound interchange with sender
+        and receiver swapped, holding an optional TA1 and, unless the
+        interchange was rejected, an FA group with one 999 per inbound group.
+
+        Args:
+            writer: X12Writer to write to
+            ta1: ``errors`` writes a TA1 for interchanges with envelope errors
+                or ISA14 set to 1, ``always`` for every interchange, ``never``
+            report_accepted: Include AK2/IK5 loops for accepted transactions
+
+        Returns:
+            Number of 999 transaction sets written
+        """
+        if ta1 not in ("errors", "always", "never"):
+            raise ValueError(f"Unknown TA1 policy: {ta1}")
+        written = 0
+        with get_instrumentation().timed(SPAN_EMIT, HISTOGRAM_EMIT, {"format": "999"}):
+            for interchange in self.interchanges:
+                wants_ta1 = ta1 == "always" or (ta1 == "errors" and (
+                    interchange.status != "A" or interchange.acknowledgment_requested))
+                groups = interchange.groups if interchange.status != "R" else []
+                if not wants_ta1 and not groups:
+                    continue
+
+                writer.begin_interchange(
+                    interchange.receiver_id, interchange.sender_id,
+                    sender_qualifier=interchange.receiver_qualifier or "ZZ",
+                    receiver_qualifier=interchange.sender_qualifier or "ZZ",
+                    version=interchange.version or "00501",
+                    usage_indicator=interchange.usage_indicator,
+                )
+                if wants_ta1:
+                    writer.segment("TA1", interchange.control_number, interchange.date, interchange.time,
+                                   interchange.status, interchange.note_code)
+                if groups:
+                    first = groups[0]
+                    with writer.group("FA", first.receiver_id, first.sender_id, IMPLEMENTATION_GUIDES["999"]):
+                        for group in groups:
+                            self._write_999(writer, group, report_accepted)
+                            written += 1
+                writer.end_interchange()
+        return written
+
+    def _write_999(self, writer: X12Writer, group: GroupAck, report_accepted: bool):
+        segment = writer.segment
+        with writer.transaction("999"):
+            segment("AK1", group.functional_id, group.control_number, group.version)
+            for transaction in group.transactions:
+                if transaction.accepted and not report_accepted:
+                    continue
+                segment("AK2", transaction.code, transaction.control_number,
+                        transaction.implementation_reference)
+                for note in transaction.notes:
+                    segment("IK3", note.segment_id, note.position, note.loop_id, note.error_code)
+                    if note.element_position:
+                        segment("IK4", note.element_position, "", note.element_error_code,
+                                self._clean(writer, note.bad_value))
+                segment("IK5", transaction.status, *transaction.codes[:_MAX_CODES])
+            received = group.received
+            declared = group.declared_count if group.declared_count is not None else received
+            segment("AK9", group.status, declared, received, group.accepted, *group.codes[:_MAX_CODES])
+
+    @staticmethod
+    def _clean(writer: X12Writer, value: str) -> str:
+        """A bad value with the writer's delimiters removed, fit for IK404."""
+        delimiters = writer.delimiters
+        for delimiter in (delimiters.element, delimiters.component, delimiters.segment, delimiters.repetition):
+            if delimiter:
+                value = value.replace(delimiter, "")
+        return value[:_MAX_BAD_VALUE]
+
+    def summary(self) -> Dict[str, int]:
+        """Counts of interchanges, groups and accepted/rejected transactions."""
+        groups = [group for interchange in self.interchanges for group in interchange.groups]
+        received = sum(group.received for group in groups)
+        accepted = sum(group.accepted for group in groups)
+        return {
+            "interchanges": len(self.interchanges),
+            "groups": len(groups),
+            "transactions": received,
+            "accepted": accepted,
+            "rejected": received - accepted,
+        }
@@ -0,0 +1,414 @@
+"""
+Streaming structural diff of two EDI files.
+
+Each file is read once with a SegmentReader and cut into units: one per
+claim (the CLP segment with everything up to the next CLP or the end of
+the claim loop) and one per transaction set (its segments outside the
+claims, without the envelope). Every unit is reduced to a fingerprint:
+its alignment key, a content hash and its byte range.
+
+Claims are aligned by patient control number (CLP01) and payer claim
+control number (CLP07), transactions by their control number (ST02);
+repeats of a key are told apart by their occurrence in the file. The
+two files are walked in lockstep and a unit waits in a pending table
+only until its counterpart shows up, so memory grows with how far claims
+moved between the files, not with their size, and the work is linear.
+Only fingerprints are held; when two hashes differ, the claim is read
+back from its byte range to compute field-level deltas.
+
+Element values are compared with trailing empty elements removed, so
+files that differ only in delimiters or trailing separators compare
+equal.
+
+Example:
+    diff = EdiDiff("original.835", "resubmitted.835")
+    for difference in diff:
+        print(difference.status, difference.claim_id, [d.location for d in difference.deltas])
+    print(diff.summary())
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, field
+import hashlib
+import logging
+
+from .reader import DEFAULT_CHUNK_SIZE, Delimiters, SegmentReader
+
+logger = logging.getLogger(__name__)
+
+# Difference statuses
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Unit kinds
+CLAIM = "claim"
+TRANSACTION = "transaction"
+
+# Envelope segments are left out of fingerprints
+_ENVELOPE = frozenset(("ISA", "IEA", "GS", "GE", "ST", "SE"))
+# Segments that end a claim loop (2100) in an 835
+_CLAIM_END = _ENVELOPE | frozenset(("CLP", "LX", "TS3", "TS2", "PLB"))
+
+_ELEMENT_SEPARATOR = "\x1f"
+_SEGMENT_SEPARATOR = "\x1e"
+
+
+@dataclass
+class FieldDelta:
+    """
+    A difference in one element, or a segment present on one side only.
+
+    ``occurrence`` counts segments with the same ID within the claim or
+    transaction, so ``CAS[1]`` is its second CAS segment. ``element`` is
+    None when the whole segment was added or removed.
+    """
+    segment_id: str
+    occurrence: int
+    element: Optional[int]
+    old: Optional[str]
+    new: Optional[str]
+
+    @property
+    def location(self) -> str:
+        position = f"{self.element:02d}" if self.element is not None else ""
+        return f"{self.segment_id}[{self.occurrence}]{position}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "location": self.location,
+            "segment_id": self.segment_id,
+            "occurrence": self.occurrence,
+            "element": self.element,
+            "old": self.old,
+            "new": self.new,
+        }
+
+
+@dataclass
+class UnitDiff:
+    """A claim or transaction that was added, removed or changed."""
+    kind: str
+    status: str
+    key: Tuple[str, ...]
+    old_control_number: Optional[str] = None
+    new_control_number: Optional[str] = None
+    old_range: Optional[Tuple[int, int]] = None
+    new_range: Optional[Tuple[int, int]] = None
+    deltas: List[FieldDelta] = field(default_factory=list)
+
+    @property
+    def claim_id(self) -> Optional[str]:
+        return self.key[0] if self.kind == CLAIM else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "kind": self.kind,
+            "status": self.status,
+            "key": list(self.key),
+            "old_control_number": self.old_control_number,
+            "new_control_number": self.new_control_number,
+            "old_range": list(self.old_range) if self.old_range else None,
+            "new_range": list(self.new_range) if self.new_range else None,
+            "deltas": [delta.to_dict() for delta in self.deltas],
+        }
+        if self.kind == CLAIM:
+            data["claim_id"] = self.claim_id
+        return data
+
+
+class Fingerprint(NamedTuple):
+    """Alignment key, content hash and byte range of one unit."""
+    kind: str
+    key: Tuple[str, ...]
+    digest: bytes
+    start: int
+    end: int
+    control_number: str
+
+
+def _trimmed(elements: Sequence[str]) -> Sequence[str]:
+    end = len(elements)
+    while end > 1 and not elements[end - 1]:
+        end -= 1
+    return elements[:end]
+
+
+def _digest(segments: Sequence[Sequence[str]]) -> bytes:
+    text = _SEGMENT_SEPARATOR.join([_ELEMENT_SEPARATOR.join(_trimmed(elements)) for elements in segments])
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class _Unit(NamedTuple):
+    fingerprint: Fingerprint
+    segments: Optional[List[List[str]]]
+
+
+def iter_units(reader: SegmentReader) -> Iterator[_Unit]:
+    """
+    Cut a segment stream into claim and transaction units.
+
+    A transaction unit is yielded at its SE, after its claims, and holds
+    the transaction's segments outside its claims.
+    """
+    control_number = ""
+    transaction_start = 0
+    transaction_segments: List[List[str]] = []
+    transaction_seen: Dict[str, int] = {}
+    # Occurrences count across the whole file, so a key repeated in another
+    # transaction set stays unique
+    claim_seen: Dict[Tuple[str, str], int] = {}
+    claim: Optional[List[List[str]]] = None
+    claim_key: Tuple[str, ...] = ()
+    claim_start = claim_end = 0
+    in_transaction = False
+
+    for segment in reader:
+        elements = segment.elements
+        segment_id = elements[0]
+
+        if claim is not None and segment_id in _CLAIM_END:
+            yield _Unit(Fingerprint(CLAIM, claim_key, _digest(claim), claim_start, claim_end, control_number),
+                        claim)
+            claim = None
+
+        if segment_id == "ST":
+            control_number = elements[2] if len(elements) > 2 else ""
+            transaction_start = segment.start
+            transaction_segments = []
+            in_transaction = True
+        elif segment_id == "SE":
+            if in_transaction:
+                occurrence = transaction_seen.get(control_number, 0)
+                transaction_seen[control_number] = occurrence + 1
+                yield _Unit(Fingerprint(TRANSACTION, (control_number, str(occurrence)),
+                                        _digest(transaction_segments), transaction_start, segment.end,
+                                        control_number),
+                            transaction_segments)
+            in_transaction = False
+        elif segment_id == "CLP" and in_transaction:
+            identity = (elements[1] if len(elements) > 1 else "", elements[7] if len(elements) > 7 else "")
+            occurrence = claim_seen.get(identity, 0)
+            claim_seen[identity] = occurrence + 1
+            claim_key = identity + (str(occurrence),)
+            claim = [elements]
+            claim_start = segment.start
+            claim_end = segment.end
+        elif claim is not None:
+            claim.append(elements)
+            claim_end = segment.end
+        elif in_transaction and segment_id not in _ENVELOPE:
+            transaction_segments.append(elements)
+
+    if claim is not None:
+        yield _Unit(Fingerprint(CLAIM, claim_key, _digest(claim), claim_start, claim_end, control_number), claim)
+
+
+def segment_deltas(old: Sequence[Sequence[str]], new: Sequence[Sequence[str]]) -> List[FieldDelta]:
+    """
+    Element-level differences between two segment lists.
+
+    Segments are paired by ID and occurrence; a segment without a partner
+    is reported whole.
+    """
+    def index(segments):
+        counts: Dict[str, int] = {}
+        indexed = {}
+        for elements in segments:
+            occurrence = counts.get(elements[0], 0)
+            counts[elements[0]] = occurrence + 1
+            indexed[(elements[0], occurrence)] = _trimmed(elements)
+        return indexed
+
+    old_index = index(old)
+    new_index = index(new)
+    deltas = []
+    for key in list(old_index) + [key for key in new_index if key not in old_index]:
+        segment_id, occurrence = key
+        before = old_index.get(key)
+        after = new_index.get(key)
+        if before is None or after is None:
+            deltas.append(FieldDelta(segment_id, occurrence, None,
+                                     "*".join(before) if before is not None else None,
+                                     "*".join(after) if after is not None else None))
+            continue
+        for position in range(1, max(len(before), len(after))):
+            old_value = before[position] if position < len(before) else ""
+            new_value = after[position] if position < len(after) else ""
+            if old_value != new_value:
+                deltas.append(FieldDelta(segment_id, occurrence, position, old_value, new_value))
+    return deltas
+
+
+def _read_segments(handle: BinaryIO, delimiters: Delimiters, start: int, end: int,
+                   encoding: str) -> List[List[str]]:
+    handle.seek(start)
+    text = handle.read(end - start).decode(encoding)
+    return [
+        segment.strip().split(delimiters.element)
+        for segment in text.split(delimiters.segment)
+        if segment.strip()
+    ]
+
+
+class _Side:
+    """One input file: its unit stream and random access to units already read."""
+
+    def __init__(self, source: Union[str, BinaryIO], chunk_size: int, encoding: str):
+        self._owned = isinstance(source, str)
+        self.handle = open(source, "rb") if self._owned else source
+        self.encoding = encoding
+        self.reader = SegmentReader(self.handle, chunk_size=chunk_size, encoding=encoding)
+        self.units = iter_units(self.reader)
+
+    def segments(self, fingerprint: Fingerprint) -> List[List[str]]:
+        """Read a claim back from its byte range, leaving the reader's position alone."""
+        position = self.handle.tell()
+        try:
+            return _read_segments(self.handle, self.reader.delimiters, fingerprint.start, fingerprint.end,
+                                  self.encoding)
+        finally:
+            self.handle.seek(position)
+
+    def close(self):
+        if self._owned:
+            self.handle.close()
+
+
+class EdiDiff:
+    """
+    Iterate over the claims and transactions that differ between two files.
+
+    Differences are yielded as soon as both sides of a unit have been
+    seen; units left unmatched at the end are reported as removed or
+    added. Counts are available from ``summary`` once iteration is done.
+    """
+
+    def __init__(self, old: Union[str, BinaryIO], new: Union[str, BinaryIO],
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "latin-1",
+                 include_transactions: bool = True):
+        """
+        Initialize the diff.
+
+        Args:
+            old: Original file path (or seekable binary stream)
+            new: Revised file path (or seekable binary stream)
+            chunk_size: Read size of the segment readers
+            encoding: Encoding of both files
+            include_transactions: Also report changes outside claims
+        """
+        self.old = old
+        self.new = new
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.include_transactions = include_transactions
+        self.counts: Dict[str, Dict[str, int]] = {
+            kind: {"compared": 0, "unchanged": 0, CHANGED: 0, ADDED: 0, REMOVED: 0}
+            for kind in (CLAIM, TRANSACTION)
+        }
+        self.max_pending = 0
+
+    def __iter__(self) -> Iterator[UnitDiff]:
+        old_side = _Side(self.old, self.chunk_size, self.encoding)
+        new_side = _Side(self.new, self.chunk_size, self.encoding)
+        # Pending claims keep only their fingerprint; transactions keep their
+        # segments outside claims, which are small and cannot be read back
+        # as one byte range
+        pending_old: Dict[Tuple[str, Tuple[str, ...]], _Unit] = {}
+        pending_new: Dict[Tuple[str, Tuple[str, ...]], _Unit] = {}
+        try:
+            old_units: Optional[Iterator[_Unit]] = old_side.units
+            new_units: Optional[Iterator[_Unit]] = new_side.units
+            while old_units is not None or new_units is not None:
+                if old_units is not None:
+                    unit = next(old_units, None)
+                    if unit is None:
+                        old_units = None
+                    else:
+                        difference = self._match(unit, pending_new, pending_old, old_side, new_side, True)
+                        if difference is not None:
+                            yield difference
+                if new_units is not None:
+                    unit = next(new_units, None)
+                    if unit is None:
+                        new_units = None
+                    else:
+                        difference = self._match(unit, pending_old, pending_new, old_side, new_side, False)
+                        if difference is not None:
+                            yield difference
+                self.max_pending = max(self.max_pending, len(pending_old) + len(pending_new))
+
+            for unit in pending_old.values():
+                difference = self._unmatched(unit.fingerprint, REMOVED)
+                if difference is not None:
+                    yield difference
+            for unit in pending_new.values():
+                difference = self._unmatched(unit.fingerprint, ADDED)
+                if difference is not None:
+                    yield difference
+        finally:
+            old_side.close()
+            new_side.close()
+
+    def _match(self, unit: _Unit, others: Dict, own: Dict, old_side: _Side, new_side: _Side,
+               is_old: bool) -> Optional[UnitDiff]:
+        fingerprint = unit.fingerprint
+        slot = (fingerprint.kind, fingerprint.key)
+        partner = others.pop(slot, None)
+        if partner is None:
+            own[slot] = unit if fingerprint.kind == TRANSACTION else _Unit(fingerprint, None)
+            return None
+
+        old, new = (unit, partner) if is_old else (partner, unit)
+        counts = self.counts[fingerprint.kind]
+        counts["compared"] += 1
+        if old.fingerprint.digest == new.fingerprint.digest:
+            counts["unchanged"] += 1
+            return None
+        counts[CHANGED] += 1
+        if fingerprint.kind == TRANSACTION and not self.include_transactions:
+            return None
+
+        old_segments = old.segments if old.segments is not None else old_side.segments(old.fingerprint)
+        new_segments = new.segments if new.segments is not None else new_side.segments(new.fingerprint)
+        return UnitDiff(
+            kind=fingerprint.kind,
+            status=CHANGED,
+            key=fingerprint.key,
+            old_control_number=old.fingerprint.control_number,
+            new_control_number=new.fingerprint.control_number,
+            old_range=(old.fingerprint.start, old.fingerprint.end),
+            new_range=(new.fingerprint.start, new.fingerprint.end),
+            deltas=segment_deltas(old_segments, new_segments),
+        )
+
+    def _unmatched(self, fingerprint: Fingerprint, status: str) -> Optional[UnitDiff]:
+        self.counts[fingerprint.kind][status] += 1
+        if fingerprint.kind == TRANSACTION and not self.include_transactions:
+            return None
+        span = (fingerprint.start, fingerprint.end)
+        return UnitDiff(
+            kind=fingerprint.kind,
+            status=status,
+            key=fingerprint.key,
+            old_control_number=fingerprint.control_number if status == REMOVED else None,
+            new_control_number=fingerprint.control_number if status == ADDED else None,
+            old_range=span if status == REMOVED else None,
+            new_range=span if status == ADDED else None,
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts per unit kind, and the largest number of units held pending."""
+        return {
+            "claims": dict(self.counts[CLAIM]),
+            "transactions": dict(self.counts[TRANSACTION]),
+            "max_pending": self.max_pending,
+        }
+
+
+def diff_files(old: Union[str, BinaryIO], new: Union[str, BinaryIO],
+               **options) -> Tuple[List[UnitDiff], Dict[str, Any]]:
+    """Collect every difference between two files, with the summary counts."""
+    diff = EdiDiff(old, new, **options)
+    differences = list(diff)
+    return differences, diff.summary()
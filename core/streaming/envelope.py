@@ -0,0 +1,504 @@
+"""
+Envelope-only scanner for X12 streams.
+
+Routing and control-number reconciliation need only the ISA/IEA, GS/GE
+and ST/SE segments. This scanner finds those segments with a compiled
+byte pattern and never decodes or splits the segments in between; it
+only counts them, so SE01 can still be checked. The result is the
+envelope hierarchy with byte ranges, counts and every control-number or
+structure mismatch found, and each transaction set keeps its own code,
+so interchanges that mix transaction types are reported as they are.
+"""
+
+from typing import Any, BinaryIO, Counter as CounterType, Dict, List, Optional
+from collections import Counter
+from dataclasses import dataclass, field
+import itertools
+import re
+
+from ..telemetry import get_instrumentation, COUNTER_BYTES
+from .reader import DEFAULT_CHUNK_SIZE, Delimiters, _WHITESPACE, detect_delimiters
+
+# Issue codes
+ISSUE_ISA_IEA_CONTROL_MISMATCH = "ISA_IEA_CONTROL_MISMATCH"
+ISSUE_IEA_GROUP_COUNT_MISMATCH = "IEA_GROUP_COUNT_MISMATCH"
+ISSUE_GS_GE_CONTROL_MISMATCH = "GS_GE_CONTROL_MISMATCH"
+ISSUE_GE_TRANSACTION_COUNT_MISMATCH = "GE_TRANSACTION_COUNT_MISMATCH"
+ISSUE_ST_SE_CONTROL_MISMATCH = "ST_SE_CONTROL_MISMATCH"
+ISSUE_SE_SEGMENT_COUNT_MISMATCH = "SE_SEGMENT_COUNT_MISMATCH"
+ISSUE_DUPLICATE_ST_CONTROL = "DUPLICATE_ST_CONTROL_NUMBER"
+ISSUE_DUPLICATE_GS_CONTROL = "DUPLICATE_GS_CONTROL_NUMBER"
+ISSUE_MISSING_TRAILER = "MISSING_TRAILER"
+ISSUE_UNEXPECTED_TRAILER = "UNEXPECTED_TRAILER"
+ISSUE_MISSING_HEADER = "MISSING_HEADER"
+
+
+def _element(elements: List[str], index: int) -> str:
+    return elements[index].strip() if len(elements) > index else ""
+
+
+def _count(value: str) -> Optional[int]:
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class EnvelopeIssue:
+    """A control-number, count or nesting problem in the envelope."""
+    code: str
+    message: str
+    start: int
+    control_number: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "code": self.code,
+            "message": self.message,
+            "start": self.start,
+            "control_number": self.control_number,
+        }
+
+
+@dataclass
+class TransactionEnvelope:
+    """An ST..SE transaction set."""
+    code: str
+    control_number: str
+    start: int
+    end: int = 0
+    segment_count: int = 0
+    declared_segment_count: Optional[int] = None
+    implementation_reference: str = ""
+    # Byte offsets of the content between the ST and SE segments
+    header_end: int = 0
+    trailer_start: int = 0
+    _first_segment: int = field(default=0, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "code": self.code,
+            "control_number": self.control_number,
+            "implementation_reference": self.implementation_reference,
+            "start": self.start,
+            "end": self.end,
+            "segment_count": self.segment_count,
+            "declared_segment_count": self.declared_segment_count,
+        }
+
+
+@dataclass
+class GroupEnvelope:
+    """A GS..GE functional group."""
+    functional_id: str
+    sender_id: str
+    receiver_id: str
+    control_number: str
+    version: str
+    start: int
+    end: int = 0
+    declared_transaction_count: Optional[int] = None
+    transaction_count: int = 0
+    transaction_codes: CounterType[str] = field(default_factory=Counter)
+    transactions: List[TransactionEnvelope] = field(default_factory=list)
+    elements: List[str] = field(default_factory=list, repr=False)
+    _control_numbers: set = field(default_factory=set, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "functional_id": self.functional_id,
+            "sender_id": self.sender_id,
+            "receiver_id": self.receiver_id,
+            "control_number": self.control_number,
+            "version": self.version,
+            "start": self.start,
+            "end": self.end,
+            "transaction_count": self.transaction_count,
+            "declared_transaction_count": self.declared_transaction_count,
+            "transaction_codes": dict(self.transaction_codes),
+            "transactions": [transaction.to_dict() for transaction in self.transactions],
+        }
+
+
+@dataclass
+class InterchangeEnvelope:
+    """An ISA..IEA interchange."""
+    sender_qualifier: str
+    sender_id: str
+    receiver_qualifier: str
+    receiver_id: str
+    control_number: str
+    date: str
+    time: str
+    version: str
+    usage_indicator: str
+    start: int
+    end: int = 0
+    declared_group_count: Optional[int] = None
+    groups: List[GroupEnvelope] = field(default_factory=list)
+    elements: List[str] = field(default_factory=list, repr=False)
+    _control_numbers: set = field(default_factory=set, repr=False)
+
+    @property
+    def transaction_codes(self) -> CounterType[str]:
+        codes: CounterType[str] = Counter()
+        for group in self.groups:
+            codes.update(group.transaction_codes)
+        return codes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sender_qualifier": self.sender_qualifier,
+            "sender_id": self.sender_id,
+            "receiver_qualifier": self.receiver_qualifier,
+            "receiver_id": self.receiver_id,
+            "control_number": self.control_number,
+            "date": self.date,
+            "time": self.time,
+            "version": self.version,
+            "usage_indicator": self.usage_indicator,
+            "start": self.start,
+            "end": self.end,
+            "declared_group_count": self.declared_group_count,
+            "groups": [group.to_dict() for group in self.groups],
+        }
+
+
+@dataclass
+class EnvelopeScan:
+    """Result of scanning a stream's envelopes."""
+    interchanges: List[InterchangeEnvelope] = field(default_factory=list)
+    issues: List[EnvelopeIssue] = field(default_factory=list)
+    delimiters: Optional[Delimiters] = None
+    segment_count: int = 0
+    bytes_scanned: int = 0
+
+    @property
+    def is_consistent(self) -> bool:
+        """True when no control-number, count or nesting issues were found."""
+        return not self.issues
+
+    @property
+    def transaction_codes(self) -> CounterType[str]:
+        """Number of transaction sets per ST01 code across the stream."""
+        codes: CounterType[str] = Counter()
+        for interchange in self.interchanges:
+            codes.update(interchange.transaction_codes)
+        return codes
+
+    @property
+    def transaction_count(self) -> int:
+        return sum(self.transaction_codes.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interchanges": [interchange.to_dict() for interchange in self.interchanges],
+            "issues": [issue.to_dict() for issue in self.issues],
+            "transaction_codes": dict(self.transaction_codes),
+            "segment_count": self.segment_count,
+            "bytes_scanned": self.bytes_scanned,
+        }
+
+
+class EnvelopeScanner:
+    """
+    Scan the envelope segments of a binary stream.
+
+    Example:
+        with open("inbound.x12", "rb") as handle:
+            scan = EnvelopeScanner(handle).scan()
+        for interchange in scan.interchanges:
+            print(interchange.sender_id, dict(interchange.transaction_codes))
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 encoding: str = "latin-1", include_transactions: bool = True):
+        """
+        Initialize the scanner.
+
+        Args:
+            stream: Binary file-like object positioned at the start of the ISA
+            chunk_size: Number of bytes to read per chunk
+            encoding: Encoding used to decode envelope segments
+            include_transactions: Keep one TransactionEnvelope per ST..SE;
+                when False, groups keep only counts per transaction code
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.include_transactions = include_transactions
+
+        self._result = EnvelopeScan()
+        self._interchange: Optional[InterchangeEnvelope] = None
+        self._group: Optional[GroupEnvelope] = None
+        self._transaction: Optional[TransactionEnvelope] = None
+
+    def scan(self) -> EnvelopeScan:
+        """Read the whole stream and return its envelope structure."""
+        try:
+            self._scan()
+        finally:
+            get_instrumentation().add(COUNTER_BYTES, self._result.bytes_scanned)
+        return self._result
+
+    def _read_chunk(self) -> bytes:
+        chunk = self.stream.read(self.chunk_size)
+        self._result.bytes_scanned += len(chunk)
+        return chunk
+
+    def _scan(self):
+        buffer = self._read_chunk()
+        while len(buffer) < 512:
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            buffer += chunk
+
+        if not buffer.strip(_WHITESPACE):
+            return
+
+        delimiters = detect_delimiters(buffer)
+        self._result.delimiters = delimiters
+        terminator = delimiters.segment.encode(self.encoding)
+        element = delimiters.element.encode(self.encoding)
+        # An envelope segment at the start of the buffer, and one after any terminator.
+        # Anchoring the main pattern on the terminator keeps the regex scan in C.
+        envelope_id = rb"[ \t\r\n]*((?:ISA|IEA|GS|GE|ST|SE)" + re.escape(element) + rb")"
+        leading = re.compile(envelope_id)
+        pattern = re.compile(re.escape(terminator) + envelope_id)
+
+        buffer_offset = 0
+        # Number of segments terminated before the current match
+        segments_before = 0
+        eof = False
+
+        while True:
+            # Only complete segments are scanned until the stream is exhausted
+            limit = len(buffer) if eof else buffer.rfind(terminator) + 1
+            counted = 0
+
+            first = leading.match(buffer, 0, limit)
+            matches = pattern.finditer(buffer, 0, limit)
+            for match in itertools.chain((first,) if first else (), matches):
+                start = match.start(1)
+                end = buffer.find(terminator, start, limit)
+                terminated = end >= 0
+                if not terminated:
+                    end = limit
+                segments_before += buffer.count(terminator, counted, start)
+                counted = start
+                text = buffer[start:end].rstrip(_WHITESPACE).decode(self.encoding)
+                self._on_segment(
+                    text.split(delimiters.element),
+                    buffer_offset + start,
+                    buffer_offset + end + (1 if terminated else 0),
+                    segments_before,
+                )
+
+            segments_before += buffer.count(terminator, counted, limit)
+            if eof:
+                # Trailing data without a terminator is still a segment
+                if buffer[buffer.rfind(terminator) + 1:].strip(_WHITESPACE):
+                    segments_before += 1
+                break
+
+            buffer_offset += limit
+            chunk = self._read_chunk()
+            eof = not chunk
+            buffer = buffer[limit:] + chunk
+
+        self._result.segment_count = segments_before
+        self._finish(buffer_offset + len(buffer))
+
+    def _issue(self, code: str, message: str, start: int, control_number: str = ""):
+        self._result.issues.append(EnvelopeIssue(code, message, start, control_number))
+
+    def _on_segment(self, elements: List[str], start: int, end: int, index: int):
+        segment_id = elements[0].strip()
+        if segment_id == "ST":
+            self._on_st(elements, start, end, index)
+        elif segment_id == "SE":
+            self._on_se(elements, start, end, index)
+        elif segment_id == "GS":
+            self._on_gs(elements, start)
+        elif segment_id == "GE":
+            self._on_ge(elements, start, end)
+        elif segment_id == "ISA":
+            self._on_isa(elements, start)
+        elif segment_id == "IEA":
+            self._on_iea(elements, start, end)
+
+    def _on_isa(self, elements: List[str], start: int):
+        if self._interchange is not None:
+            self._close_interchange(start, missing_trailer=True)
+        control_number = _element(elements, 13)
+        self._interchange = InterchangeEnvelope(
+            sender_qualifier=_element(elements, 5),
+            sender_id=_element(elements, 6),
+            receiver_qualifier=_element(elements, 7),
+            receiver_id=_element(elements, 8),
+            control_number=control_number,
+            date=_element(elements, 9),
+            time=_element(elements, 10),
+            version=_element(elements, 12),
+            usage_indicator=_element(elements, 15),
+            start=start,
+            elements=elements,
+        )
+        self._result.interchanges.append(self._interchange)
+
+    def _on_gs(self, elements: List[str], start: int):
+        if self._group is not None:
+            self._close_group(start, missing_trailer=True)
+        if self._interchange is None:
+            self._issue(ISSUE_MISSING_HEADER, "GS outside of an ISA interchange", start)
+            self._on_isa(["ISA"], start)
+        control_number = _element(elements, 6)
+        if control_number in self._interchange._control_numbers:
+            self._issue(ISSUE_DUPLICATE_GS_CONTROL,
+                        f"Duplicate GS control number {control_number} in interchange "
+                        f"{self._interchange.control_number}", start, control_number)
+        self._interchange._control_numbers.add(control_number)
+        self._group = GroupEnvelope(
+            functional_id=_element(elements, 1),
+            sender_id=_element(elements, 2),
+            receiver_id=_element(elements, 3),
+            control_number=control_number,
+            version=_element(elements, 8),
+            start=start,
+            elements=elements,
+        )
+        self._interchange.groups.append(self._group)
+
+    def _on_st(self, elements: List[str], start: int, end: int, index: int):
+        if self._transaction is not None:
+            self._close_transaction(start, missing_trailer=True)
+        if self._group is None:
+            self._issue(ISSUE_MISSING_HEADER, "ST outside of a GS functional group", start)
+            self._on_gs(["GS"], start)
+        control_number = _element(elements, 2)
+        group = self._group
+        if control_number in group._control_numbers:
+            self._issue(ISSUE_DUPLICATE_ST_CONTROL,
+                        f"Duplicate ST control number {control_number} in group {group.control_number}",
+                        start, control_number)
+        group._control_numbers.add(control_number)
+        self._transaction = TransactionEnvelope(
+            code=_element(elements, 1),
+            control_number=control_number,
+            implementation_reference=_element(elements, 3),
+            start=start,
+            header_end=end,
+            _first_segment=index,
+        )
+
+    def _on_se(self, elements: List[str], start: int, end: int, index: int):
+        transaction = self._transaction
+        if transaction is None:
+            self._issue(ISSUE_UNEXPECTED_TRAILER, "SE without a matching ST", start, _element(elements, 2))
+            return
+        transaction.end = end
+        transaction.trailer_start = start
+        transaction.segment_count = index - transaction._first_segment + 1
+        transaction.declared_segment_count = _count(_element(elements, 1))
+        trailer_control = _element(elements, 2)
+        if trailer_control != transaction.control_number:
+            self._issue(ISSUE_ST_SE_CONTROL_MISMATCH,
+                        f"SE02 {trailer_control} does not match ST02 {transaction.control_number}",
+                        start, transaction.control_number)
+        if transaction.declared_segment_count != transaction.segment_count:
+            self._issue(ISSUE_SE_SEGMENT_COUNT_MISMATCH,
+                        f"SE01 declares {_element(elements, 1)} segments but transaction "
+                        f"{transaction.control_number} has {transaction.segment_count}",
+                        start, transaction.control_number)
+        self._close_transaction(end)
+
+    def _on_ge(self, elements: List[str], start: int, end: int):
+        group = self._group
+        if group is None:
+            self._issue(ISSUE_UNEXPECTED_TRAILER, "GE without a matching GS", start, _element(elements, 2))
+            return
+        if self._transaction is not None:
+            self._close_transaction(start, missing_trailer=True)
+        group.declared_transaction_count = _count(_element(elements, 1))
+        trailer_control = _element(elements, 2)
+        if trailer_control != group.control_number:
+            self._issue(ISSUE_GS_GE_CONTROL_MISMATCH,
+                        f"GE02 {trailer_control} does not match GS06 {group.control_number}",
+                        start, group.control_number)
+        if group.declared_transaction_count != group.transaction_count:
+            self._issue(ISSUE_GE_TRANSACTION_COUNT_MISMATCH,
+                        f"GE01 declares {_element(elements, 1)} transaction sets but group "
+                        f"{group.control_number} has {group.transaction_count}",
+                        start, group.control_number)
+        self._close_group(end)
+
+    def _on_iea(self, elements: List[str], start: int, end: int):
+        interchange = self._interchange
+        if interchange is None:
+            self._issue(ISSUE_UNEXPECTED_TRAILER, "IEA without a matching ISA", start, _element(elements, 2))
+            return
+        if self._group is not None:
+            self._close_group(start, missing_trailer=True)
+        interchange.declared_group_count = _count(_element(elements, 1))
+        trailer_control = _element(elements, 2)
+        if trailer_control != interchange.control_number:
+            self._issue(ISSUE_ISA_IEA_CONTROL_MISMATCH,
+                        f"IEA02 {trailer_control} does not match ISA13 {interchange.control_number}",
+                        start, interchange.control_number)
+        if interchange.declared_group_count != len(interchange.groups):
+            self._issue(ISSUE_IEA_GROUP_COUNT_MISMATCH,
+                        f"IEA01 declares {_element(elements, 1)} functional groups but interchange "
+                        f"{interchange.control_number} has {len(interchange.groups)}",
+                        start, interchange.control_number)
+        self._close_interchange(end)
+
+    def _close_transaction(self, end: int, missing_trailer: bool = False):
+        transaction = self._transaction
+        if missing_trailer:
+            transaction.end = end
+            self._issue(ISSUE_MISSING_TRAILER, f"Transaction {transaction.control_number} has no SE",
+                        transaction.start, transaction.control_number)
+        group = self._group
+        group.transaction_count += 1
+        group.transaction_codes[transaction.code] += 1
+        if self.include_transactions:
+            group.transactions.append(transaction)
+        self._transaction = None
+
+    def _close_group(self, end: int, missing_trailer: bool = False):
+        if self._transaction is not None:
+            self._close_transaction(end, missing_trailer=True)
+        group = self._group
+        group.end = end
+        group._control_numbers = set()
+        if missing_trailer:
+            self._issue(ISSUE_MISSING_TRAILER, f"Functional group {group.control_number} has no GE",
+                        group.start, group.control_number)
+        self._group = None
+
+    def _close_interchange(self, end: int, missing_trailer: bool = False):
+        if self._group is not None:
+            self._close_group(end, missing_trailer=True)
+        interchange = self._interchange
+        interchange.end = end
+        interchange._control_numbers = set()
+        if missing_trailer:
+            self._issue(ISSUE_MISSING_TRAILER, f"Interchange {interchange.control_number} has no IEA",
+                        interchange.start, interchange.control_number)
+        self._interchange = None
+
+    def _finish(self, end: int):
+        if self._interchange is not None:
+            self._close_interchange(end, missing_trailer=True)
+
+
+def scan_envelopes(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   include_transactions: bool = True) -> EnvelopeScan:
+    """Scan the envelopes of a file on disk."""
+    with open(path, "rb") as handle:
+        return EnvelopeScanner(handle, chunk_size=chunk_size,
+                               include_transactions=include_transactions).scan()
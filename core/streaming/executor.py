@@ -0,0 +1,212 @@
+"""
+Bounded parallel execution of parse and validate work.
+
+This module fans TransactionChunks out to a thread or process pool while
+keeping only a bounded number of chunks in flight, so producers reading
+a large file never run ahead of the workers. Results are yielded in
+submission order.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import os
+import threading
+
+from .splitter import TransactionChunk
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of parsing and validating a single TransactionChunk."""
+    index: int
+    transaction_set_code: str
+    control_number: str
+    start: int
+    end: int
+    parse_success: bool
+    parse_error: Optional[str] = None
+    transaction: Optional[Dict[str, Any]] = None
+    claims: List[Dict[str, Any]] = field(default_factory=list)
+    validation: Optional[Dict[str, Any]] = None
+
+    @property
+    def error_count(self) -> int:
+        count = 0 if self.parse_success else 1
+        if self.validation:
+            count += self.validation.get("error_count", 0)
+        return count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "transaction_set_code": self.transaction_set_code,
+            "control_number": self.control_number,
+            "byte_range": [self.start, self.end],
+            "parse_success": self.parse_success,
+            "parse_error": self.parse_error,
+            "claim_count": len(self.claims),
+            "transaction": self.transaction,
+            "validation": self.validation,
+        }
+
+
+_validation_manager = None
+_validation_manager_lock = threading.Lock()
+
+
+def _get_validation_manager():
+    """Return the per-process validation manager, loading plugins on first use."""
+    global _validation_manager
+    if _validation_manager is None:
+        # Pool threads race here on the first chunks; load plugins only once
+        with _validation_manager_lock:
+            if _validation_manager is None:
+                from ..plugins.api import plugin_registry
+                from ..validation.integration import validation_manager, setup_validation_integration
+
+                if not plugin_registry.get_parser_for_transaction("835"):
+                    setup_validation_integration()
+                _validation_manager = validation_manager
+    return _validation_manager
+
+
+def _extract_claims(transaction_data: Any) -> List[Dict[str, Any]]:
+    claims = getattr(transaction_data, "claims", None)
+    if claims is None:
+        claim = getattr(transaction_data, "claim", None)
+        claims = [claim] if claim is not None else []
+    return [claim.to_dict() for claim in claims]
+
+
+def process_chunk(chunk: TransactionChunk, validate: bool = True) -> ChunkResult:
+    """
+    Parse and optionally validate a single transaction chunk.
+
+    This is a module-level function so it can be shipped to process pools.
+
+    Args:
+        chunk: Transaction chunk produced by TransactionSplitter
+        validate: Whether to run the validation engine on the parsed result
+
+    Returns:
+        ChunkResult with the serialized transaction, claims and findings
+    """
+    manager = _get_validation_manager()
+    result = ChunkResult(
+        index=chunk.index,
+        transaction_set_code=chunk.transaction_set_code,
+        control_number=chunk.control_number,
+        start=chunk.start,
+        end=chunk.end,
+        parse_success=False,
+    )
+
+    if validate and manager.is_validation_enabled():
+        outcome = manager.parse_and_validate(chunk.segments)
+        edi_root = outcome["edi_root"]
+        result.parse_error = outcome["parse_error"]
+        if outcome["validation_result"] is not None:
+            result.validation = outcome["validation_result"].to_dict()
+    else:
+        try:
+            edi_root = manager.parse(chunk.segments)
+        except Exception as e:
+            edi_root = None
+            result.parse_error = str(e)
+
+    if edi_root is None:
+        return result
+
+    result.parse_success = True
+    for interchange in edi_root.interchanges:
+        for functional_group in interchange.functional_groups:
+            for transaction in functional_group.transactions:
+                result.transaction = transaction.to_dict()
+                result.claims = _extract_claims(transaction.transaction_data)
+    return result
+
+
+class ParallelExecutor:
+    """
+    Ordered, bounded parallel map over an iterable of work items.
+
+    At most ``max_pending`` items are submitted but not yet consumed, which
+    caps memory use regardless of how fast the input is produced.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 use_processes: bool = False):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of workers (defaults to the CPU count)
+            max_pending: Maximum number of in-flight items (defaults to 2x workers)
+            use_processes: Use a process pool instead of threads for CPU-bound work
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 2
+        self.use_processes = use_processes
+
+    def _create_pool(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """
+        Apply ``func`` to every item in parallel, yielding results in order.
+
+        Args:
+            func: Picklable callable when ``use_processes`` is set
+            items: Work items; consumed lazily
+
+        Yields:
+            Results in the same order as ``items``
+        """
+        pending: "deque[Future]" = deque()
+        with self._create_pool() as pool:
+            try:
+                for item in items:
+                    pending.append(pool.submit(func, item))
+                    if len(pending) >= self.max_pending:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def process_chunks(chunks: Iterable[TransactionChunk], validate: bool = True,
+                   max_workers: Optional[int] = None, use_processes: bool = False) -> Iterator[ChunkResult]:
+    """
+    Parse and validate transaction chunks in parallel.
+
+    Args:
+        chunks: Iterable of TransactionChunks (typically a TransactionSplitter)
+        validate: Whether to run validation on each transaction
+        max_workers: Number of parallel workers
+        use_processes: Use processes instead of threads
+
+    Yields:
+        ChunkResult for each chunk, in input order
+    """
+    executor = ParallelExecutor(max_workers=max_workers, use_processes=use_processes)
+    if validate:
+        worker = process_chunk
+    else:
+        worker = _process_chunk_without_validation
+    yield from executor.map(worker, chunks)
+
+
+def _process_chunk_without_validation(chunk: TransactionChunk) -> ChunkResult:
+    return process_chunk(chunk, validate=False)
@@ -0,0 +1,338 @@
+"""
+SQLite-backed job queue for batch EDI processing.
+
+This module stores submitted batch jobs, their progress counters and
+their paged results in a local SQLite database. A JobRunner claims
+queued jobs and streams each file through the SegmentReader,
+TransactionSplitter and ParallelExecutor, writing results in batches so
+memory stays flat regardless of input size.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+
+from .reader import SegmentReader, DEFAULT_CHUNK_SIZE
+from .splitter import TransactionSplitter
+from .executor import ChunkResult, process_chunks
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+RESULT_KINDS = ("transactions", "claims")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    source_path TEXT NOT NULL,
+    validate INTEGER NOT NULL DEFAULT 1,
+    bytes_total INTEGER NOT NULL DEFAULT 0,
+    bytes_processed INTEGER NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    claim_count INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (job_id, kind, seq)
+);
+"""
+
+
+class JobStore:
+    """Persistent store for jobs and their results."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store, creating the schema if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._claim_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def create_job(self, source_path: str, validate: bool = True) -> Dict[str, Any]:
+        """Register a new queued job for a file already on local disk."""
+        job_id = uuid.uuid4().hex
+        bytes_total = os.path.getsize(source_path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, source_path, validate, bytes_total, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, source_path, int(validate), bytes_total, _now()),
+            )
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["validate"] = bool(job["validate"])
+        job["progress"] = (job["bytes_processed"] / job["bytes_total"]) if job["bytes_total"] else 0.0
+        return job
+
+    def claim_next_job(self) -> Optional[Dict[str, Any]]:
+        """Atomically move the oldest queued job to running and return it."""
+        with self._claim_lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+                (JOB_RUNNING, _now(), row["id"], JOB_QUEUED),
+            )
+        return self.get_job(row["id"])
+
+    def requeue_running_jobs(self) -> int:
+        """Return jobs interrupted by a restart to the queue, discarding partial results."""
+        with self._connect() as conn:
+            ids = [row["id"] for row in conn.execute(
+                "SELECT id FROM jobs WHERE status = ?", (JOB_RUNNING,))]
+            for job_id in ids:
+                conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+                conn.execute(
+                    "UPDATE jobs SET status = ?, bytes_processed = 0, transaction_count = 0, "
+                    "claim_count = 0, error_count = 0, started_at = NULL WHERE id = ?",
+                    (JOB_QUEUED, job_id),
+                )
+        return len(ids)
+
+    def append_results(self, job_id: str, results: List[ChunkResult], bytes_processed: int):
+        """Store a batch of chunk results and advance the job's progress counters."""
+        with self._connect() as conn:
+            counts = conn.execute(
+                "SELECT transaction_count, claim_count FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            transaction_seq = counts["transaction_count"]
+            claim_seq = counts["claim_count"]
+            transaction_rows = []
+            claim_rows = []
+            error_count = 0
+
+            for result in results:
+                transaction_rows.append((job_id, "transactions", transaction_seq,
+                                         json.dumps(result.to_dict())))
+                transaction_seq += 1
+                for claim in result.claims:
+                    claim = dict(claim, transaction_control_number=result.control_number)
+                    claim_rows.append((job_id, "claims", claim_seq, json.dumps(claim)))
+                    claim_seq += 1
+                error_count += result.error_count
+
+            conn.executemany(
+                "INSERT INTO job_results (job_id, kind, seq, payload) VALUES (?, ?, ?, ?)",
+                transaction_rows + claim_rows,
+            )
+            conn.execute(
+                "UPDATE jobs SET transaction_count = ?, claim_count = ?, "
+                "error_count = error_count + ?, bytes_processed = ? WHERE id = ?",
+                (transaction_seq, claim_seq, error_count, bytes_processed, job_id),
+            )
+
+    def finish_job(self, job_id: str, error: Optional[str] = None):
+        """Mark a job completed, or failed when an error message is given."""
+        with self._connect() as conn:
+            if error is None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, bytes_processed = bytes_total, finished_at = ? "
+                    "WHERE id = ?",
+                    (JOB_COMPLETED, _now(), job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                    (JOB_FAILED, error, _now(), job_id),
+                )
+
+    def get_results(self, job_id: str, kind: str = "transactions", page: int = 1,
+                    page_size: int = 100) -> Dict[str, Any]:
+        """
+        Return one page of results.
+
+        Sequence numbers are contiguous per job and kind, so a page is a
+        primary-key range scan rather than an OFFSET walk.
+
+        Args:
+            job_id: Job identifier
+            kind: ``transactions`` or ``claims``
+            page: 1-based page number
+            page_size: Number of items per page
+
+        Returns:
+            Dictionary with the page items and pagination metadata
+        """
+        if kind not in RESULT_KINDS:
+            raise ValueError(f"Unknown result kind: {kind}. Must be one of: {', '.join(RESULT_KINDS)}")
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+
+        job = self.get_job(job_id)
+        if job is None:
+            raise KeyError(job_id)
+
+        total = job["transaction_count"] if kind == "transactions" else job["claim_count"]
+        first = (page - 1) * page_size
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT payload FROM job_results WHERE job_id = ? AND kind = ? "
+                "AND seq >= ? AND seq < ? ORDER BY seq",
+                (job_id, kind, first, first + page_size),
+            ).fetchall()
+
+        return {
+            "job_id": job_id,
+            "kind": kind,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "has_more": first + page_size < total,
+            "items": [json.loads(row["payload"]) for row in rows],
+        }
+
+
+class JobRunner:
+    """Background worker that drains the job queue."""
+
+    def __init__(self, store: JobStore, max_workers: Optional[int] = None,
+                 use_processes: bool = False, batch_size: int = 200,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, poll_interval: float = 1.0,
+                 spool_dir: Optional[str] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            store: Job store to claim work from
+            max_workers: Parallel parse/validate workers per job
+            use_processes: Use a process pool for parsing
+            batch_size: Number of transactions written per database commit
+            chunk_size: Read size for the segment reader
+            poll_interval: Seconds to wait between queue polls when idle
+            spool_dir: Directory of uploaded files; a job's source file inside
+                it is deleted once the job completes or fails
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self.spool_dir = os.path.realpath(spool_dir) if spool_dir else None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background thread, resuming any interrupted jobs."""
+        requeued = self.store.requeue_running_jobs()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted job(s)")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="edi-job-runner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the runner to stop after the current job and wait for it."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self):
+        """Wake the runner immediately after a job was submitted."""
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            if not self.run_pending():
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def run_pending(self) -> bool:
+        """Process the next queued job, if any. Returns True if a job was run."""
+        job = self.store.claim_next_job()
+        if job is None:
+            return False
+        self.run_job(job)
+        return True
+
+    def run_job(self, job: Dict[str, Any]):
+        """Stream a job's source file through parsing and validation."""
+        job_id = job["id"]
+        logger.info(f"Starting job {job_id} for {job['source_path']}")
+        try:
+            with open(job["source_path"], "rb") as handle:
+                reader = SegmentReader(handle, chunk_size=self.chunk_size)
+                chunks = TransactionSplitter(reader)
+                batch: List[ChunkResult] = []
+                for result in process_chunks(chunks, validate=job["validate"],
+                                             max_workers=self.max_workers,
+                                             use_processes=self.use_processes):
+                    batch.append(result)
+                    if len(batch) >= self.batch_size:
+                        self.store.append_results(job_id, batch, result.end)
+                        batch = []
+                if batch:
+                    self.store.append_results(job_id, batch, batch[-1].end)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.finish_job(job_id, error=str(e))
+            self._release_source(job["source_path"])
+            return
+
+        self.store.finish_job(job_id)
+        self._release_source(job["source_path"])
+        logger.info(f"Finished job {job_id}")
+
+    def _release_source(self, source_path: str):
+        """Delete a finished job's source file if it was spooled by the API."""
+        if self.spool_dir is None:
+            return
+        if os.path.dirname(os.path.realpath(source_path)) != self.spool_dir:
+            return
+        try:
+            os.remove(source_path)
+        except OSError as e:
+            logger.warning(f"Could not remove spooled file {source_path}: {e}")
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
@@ -0,0 +1,384 @@
+"""
+Split and merge X12 files by copying transaction byte ranges.
+
+Both operations start from an EnvelopeScan of each input, decide which
+transaction sets go to which output, and then write every output as
+ISA/GS headers with fresh control numbers followed by each transaction's
+original bytes. Only the ST and SE segments of a transaction are
+rewritten (to renumber ST02/SE02); the content between them is copied
+with ``os.copy_file_range`` where the platform supports it, so nothing is
+parsed or re-serialized and large files split at close to disk speed.
+"""
+
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import os
+import re
+
+from .envelope import EnvelopeScan, GroupEnvelope, InterchangeEnvelope, TransactionEnvelope, scan_envelopes
+
+logger = logging.getLogger(__name__)
+
+SPLIT_BY_TRANSACTION = "transaction"
+SPLIT_BY_PAYEE = "payee"
+SPLIT_BY_PAYER = "payer"
+SPLIT_BY_SIZE = "size"
+SPLIT_STRATEGIES = (SPLIT_BY_TRANSACTION, SPLIT_BY_PAYEE, SPLIT_BY_PAYER, SPLIT_BY_SIZE)
+
+UNKNOWN_KEY = "unknown"
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Payee and payer N1 loops sit in the 835 header, before the first LX/CLP
+_HEADER_READ_SIZE = 64 * 1024
+_SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a size such as ``500kb``, ``50mb`` or ``1gb`` into bytes.
+
+    Raises:
+        ValueError: If the value is not a size
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([kmg]?b)?\s*", value.lower())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2) or "b"])
+
+
+@dataclass
+class TransactionRef:
+    """A transaction set in a scanned source file."""
+    source: str
+    scan: EnvelopeScan
+    interchange: InterchangeEnvelope
+    group: GroupEnvelope
+    transaction: TransactionEnvelope
+
+    @property
+    def byte_length(self) -> int:
+        return self.transaction.end - self.transaction.start
+
+
+@dataclass
+class WrittenFile:
+    """An output file produced by split or merge."""
+    path: str
+    key: str
+    interchanges: int = 0
+    groups: int = 0
+    transactions: int = 0
+    bytes: int = 0
+    control_numbers: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "key": self.key,
+            "interchanges": self.interchanges,
+            "groups": self.groups,
+            "transactions": self.transactions,
+            "bytes": self.bytes,
+            "control_numbers": self.control_numbers,
+        }
+
+
+def iter_transactions(source: str, scan: EnvelopeScan) -> Iterable[TransactionRef]:
+    """Yield the complete (ST..SE) transaction sets of a scan in file order."""
+    for interchange in scan.interchanges:
+        for group in interchange.groups:
+            for transaction in group.transactions:
+                if not transaction.trailer_start:
+                    logger.warning(f"{source}: skipping transaction {transaction.control_number} "
+                                   f"at byte {transaction.start} without SE")
+                    continue
+                yield TransactionRef(source, scan, interchange, group, transaction)
+
+
+class _RangeCopier:
+    """Copy byte ranges between files, zero-copy when the kernel allows it."""
+
+    def __init__(self):
+        self.zero_copy = hasattr(os, "copy_file_range")
+
+    def copy(self, source: BinaryIO, target_fd: int, start: int, length: int):
+        while self.zero_copy and length > 0:
+            try:
+                copied = os.copy_file_range(source.fileno(), target_fd, length, start)
+            except OSError as e:
+                # e.g. cross-device copies or unsupported filesystems
+                logger.debug(f"copy_file_range unavailable ({e}); falling back to read/write")
+                self.zero_copy = False
+                break
+            if copied == 0:
+                break
+            start += copied
+            length -= copied
+
+        if length > 0:
+            source.seek(start)
+        while length > 0:
+            data = source.read(min(length, _COPY_BUFFER_SIZE))
+            if not data:
+                raise IOError(f"Unexpected end of {source.name} at byte {source.tell()}")
+            os.write(target_fd, data)
+            length -= len(data)
+
+
+class InterchangeWriter:
+    """
+    Write transaction sets into new interchanges with regenerated control numbers.
+
+    Transactions are grouped into one interchange per distinct ISA sender,
+    receiver, version and delimiters, and into one functional group per
+    distinct GS01/GS02/GS03/GS08, in first-seen order. ISA13 values are
+    taken from ``next_control_number``; GS06 and ST02 restart at 1 in
+    each interchange and group.
+    """
+
+    def __init__(self, next_control_number: Callable[[], int]):
+        self.next_control_number = next_control_number
+        self.copier = _RangeCopier()
+        self._sources: Dict[str, BinaryIO] = {}
+
+    def close(self):
+        for handle in self._sources.values():
+            handle.close()
+        self._sources.clear()
+
+    def __enter__(self) -> "InterchangeWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _source(self, path: str) -> BinaryIO:
+        handle = self._sources.get(path)
+        if handle is None:
+            handle = self._sources[path] = open(path, "rb")
+        return handle
+
+    @staticmethod
+    def _interchange_key(ref: TransactionRef) -> tuple:
+        isa = ref.interchange
+        return (isa.sender_qualifier, isa.sender_id, isa.receiver_qualifier, isa.receiver_id,
+                isa.version, isa.usage_indicator, ref.scan.delimiters)
+
+    @staticmethod
+    def _group_key(ref: TransactionRef) -> tuple:
+        gs = ref.group
+        return (gs.functional_id, gs.sender_id, gs.receiver_id, gs.version)
+
+    def _line_ending(self, ref: TransactionRef) -> bytes:
+        # Reuse the source's segment separator whitespace (e.g. newlines after ~)
+        handle = self._source(ref.source)
+        handle.seek(ref.transaction.header_end)
+        peek = handle.read(2)
+        return peek[:len(peek) - len(peek.lstrip(b"\r\n"))]
+
+    def write(self, path: str, refs: List[TransactionRef], key: str = "") -> WrittenFile:
+        """Write the given transactions to ``path``, replacing any existing file."""
+        interchanges: "OrderedDict[tuple, OrderedDict[tuple, List[TransactionRef]]]" = OrderedDict()
+        for ref in refs:
+            groups = interchanges.setdefault(self._interchange_key(ref), OrderedDict())
+            groups.setdefault(self._group_key(ref), []).append(ref)
+
+        written = WrittenFile(path=path, key=key)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            for groups in interchanges.values():
+                self._write_interchange(fd, groups, written)
+        finally:
+            os.close(fd)
+        written.bytes = os.path.getsize(path)
+        return written
+
+    def _write_interchange(self, fd: int, groups: "OrderedDict[tuple, List[TransactionRef]]",
+                           written: WrittenFile):
+        first = next(iter(groups.values()))[0]
+        delimiters = first.scan.delimiters
+        element = delimiters.element
+        terminator = delimiters.segment
+        newline = self._line_ending(first).decode("latin-1")
+        encode = lambda parts: (element.join(parts) + terminator + newline).encode("latin-1")
+
+        control_number = f"{self.next_control_number():09d}"
+        isa = list(first.interchange.elements)
+        isa += [""] * (17 - len(isa))
+        isa[13] = control_number
+        os.write(fd, encode(isa))
+        written.interchanges += 1
+        written.control_numbers.append(control_number)
+
+        for group_number, members in enumerate(groups.values(), start=1):
+            gs = list(members[0].group.elements)
+            gs += [""] * (9 - len(gs))
+            gs[6] = str(group_number)
+            os.write(fd, encode(gs))
+
+            for set_number, ref in enumerate(members, start=1):
+                self._write_transaction(fd, ref, f"{set_number:04d}", encode)
+
+            os.write(fd, encode(["GE", str(len(members)), str(group_number)]))
+            written.groups += 1
+            written.transactions += len(members)
+
+        os.write(fd, encode(["IEA", str(len(groups)), control_number]))
+
+    def _write_transaction(self, fd: int, ref: TransactionRef, control_number: str,
+                           encode: Callable[[List[str]], bytes]):
+        transaction = ref.transaction
+        st = ["ST", transaction.code, control_number]
+        if transaction.implementation_reference:
+            st.append(transaction.implementation_reference)
+        # The copied body keeps its own leading/trailing whitespace
+        os.write(fd, encode(st).rstrip(b"\r\n"))
+        self.copier.copy(self._source(ref.source), fd, transaction.header_end,
+                         transaction.trailer_start - transaction.header_end)
+        os.write(fd, encode(["SE", str(transaction.segment_count), control_number]))
+
+
+def transaction_party(ref: TransactionRef, handle: BinaryIO, entity: str) -> str:
+    """
+    Identifier of an 835 party (``PE`` payee or ``PR`` payer) for a transaction.
+
+    Only the transaction header is read, up to the first LX or CLP so a
+    claim-level N1 is never taken for the payee. The identifier is N104
+    (NM109 for files that carry the party in an NM1 segment), falling
+    back to the name.
+
+    Returns:
+        The identifier, or UNKNOWN_KEY when there is no N1 for that entity
+    """
+    delimiters = ref.scan.delimiters
+    element = re.escape(delimiters.element.encode("latin-1"))
+    terminator = re.escape(delimiters.segment.encode("latin-1"))
+    transaction = ref.transaction
+    handle.seek(transaction.start)
+    header = handle.read(min(transaction.end - transaction.start, _HEADER_READ_SIZE))
+
+    claim = re.search(terminator + rb"[ \t\r\n]*(?:LX|CLP)" + element, header)
+    if claim:
+        header = header[:claim.start()]
+    party = re.search(terminator + rb"[ \t\r\n]*((?:N1|NM1)" + element + re.escape(entity.encode("latin-1"))
+                      + element + rb"[^" + terminator + rb"]*)", header)
+    if not party:
+        return UNKNOWN_KEY
+    elements = party.group(1).decode("latin-1").split(delimiters.element)
+    # Identifier and name positions: N104/N102, or NM109/NM103 for NM1-style loops
+    id_index, name_index = (4, 2) if elements[0] == "N1" else (9, 3)
+    identifier = elements[id_index].strip() if len(elements) > id_index else ""
+    name = elements[name_index].strip() if len(elements) > name_index else ""
+    return identifier or name or UNKNOWN_KEY
+
+
+def _safe_key(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_") or UNKNOWN_KEY
+
+
+def plan_split(source: str, scan: EnvelopeScan, by: str = SPLIT_BY_TRANSACTION,
+               max_bytes: Optional[int] = None) -> List[Tuple[str, List[TransactionRef]]]:
+    """
+    Decide which transactions go to which output file.
+
+    Args:
+        source: Path of the scanned file
+        scan: Its envelope scan
+        by: One of SPLIT_STRATEGIES
+        max_bytes: Maximum transaction bytes per output for SPLIT_BY_SIZE; a
+            single larger transaction still gets its own file
+
+    Returns:
+        (key, transactions) per output, in first-seen order
+    """
+    if by not in SPLIT_STRATEGIES:
+        raise ValueError(f"Unknown split strategy: {by}. Available: {', '.join(SPLIT_STRATEGIES)}")
+    refs = iter_transactions(source, scan)
+
+    if by == SPLIT_BY_TRANSACTION:
+        return [(f"{ref.transaction.code}-{ref.interchange.control_number}-{ref.group.control_number}-"
+                 f"{ref.transaction.control_number}", [ref]) for ref in refs]
+
+    if by == SPLIT_BY_SIZE:
+        if not max_bytes or max_bytes <= 0:
+            raise ValueError("Splitting by size requires a positive max_bytes")
+        outputs: List[Tuple[str, List[TransactionRef]]] = []
+        current: List[TransactionRef] = []
+        current_bytes = 0
+        for ref in refs:
+            if current and current_bytes + ref.byte_length > max_bytes:
+                outputs.append((f"part{len(outputs) + 1}", current))
+                current, current_bytes = [], 0
+            current.append(ref)
+            current_bytes += ref.byte_length
+        if current:
+            outputs.append((f"part{len(outputs) + 1}", current))
+        return outputs
+
+    entity = "PE" if by == SPLIT_BY_PAYEE else "PR"
+    by_key: "OrderedDict[str, List[TransactionRef]]" = OrderedDict()
+    with open(source, "rb") as handle:
+        for ref in refs:
+            by_key.setdefault(transaction_party(ref, handle, entity), []).append(ref)
+    return list(by_key.items())
+
+
+def split_file(path: str, output_dir: str, by: str = SPLIT_BY_TRANSACTION,
+               max_bytes: Optional[int] = None, control_start: int = 1,
+               scan: Optional[EnvelopeScan] = None) -> List[WrittenFile]:
+    """
+    Split an X12 file into several files.
+
+    Args:
+        path: Input file
+        output_dir: Directory for the output files (created if missing)
+        by: SPLIT_BY_TRANSACTION, SPLIT_BY_PAYEE (835 N1*PE), SPLIT_BY_PAYER (835 N1*PR) or SPLIT_BY_SIZE
+        max_bytes: Maximum transaction bytes per output when splitting by size
+        control_start: ISA13 of the first output; later outputs count up
+        scan: Existing envelope scan of ``path``
+
+    Returns:
+        One WrittenFile per output, in order
+    """
+    scan = scan or scan_envelopes(path)
+    outputs = plan_split(path, scan, by, max_bytes)
+    os.makedirs(output_dir, exist_ok=True)
+    stem, suffix = os.path.splitext(os.path.basename(path))
+    counter = iter(range(control_start, control_start + 10 ** 9))
+
+    written = []
+    with InterchangeWriter(lambda: next(counter)) as writer:
+        for index, (key, refs) in enumerate(outputs, start=1):
+            output = os.path.join(output_dir, f"{stem}.{index:04d}.{_safe_key(key)}{suffix or '.edi'}")
+            written.append(writer.write(output, refs, key))
+    return written
+
+
+def merge_files(paths: List[str], output: str, control_start: int = 1) -> WrittenFile:
+    """
+    Merge the transaction sets of several X12 files into one file.
+
+    Transactions with the same ISA sender/receiver and delimiters share an
+    interchange, and those with the same GS functional ID, sender, receiver
+    and version share a functional group; all control numbers are
+    regenerated.
+
+    Args:
+        paths: Input files, merged in order
+        output: Output file
+        control_start: ISA13 of the first interchange in the output
+
+    Returns:
+        WrittenFile describing the output
+    """
+    refs: List[TransactionRef] = []
+    for path in paths:
+        refs.extend(iter_transactions(path, scan_envelopes(path)))
+    if not refs:
+        raise ValueError("No complete transaction sets found in the input files")
+
+    counter = iter(range(control_start, control_start + 10 ** 9))
+    with InterchangeWriter(lambda: next(counter)) as writer:
+        return writer.write(output, refs, key="merged")
@@ -0,0 +1,210 @@
+"""
+Chunked segment reader for large X12 files.
+
+This module reads EDI content from a binary stream in fixed-size chunks
+and yields one segment at a time, so multi-gigabyte interchanges can be
+processed without loading the whole file into memory. Delimiters are
+detected from the ISA header and every segment carries its byte range
+in the source file.
+"""
+
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+import logging
+
+from ..telemetry import get_instrumentation, SPAN_TOKENIZE, HISTOGRAM_TOKENIZE, COUNTER_BYTES
+from ..utils.interning import intern_segment_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = b" \t\r\n"
+
+
+@dataclass(frozen=True)
+class Delimiters:
+    """Delimiters detected from an ISA header."""
+    element: str = "*"
+    component: str = ":"
+    segment: str = "~"
+    repetition: Optional[str] = None
+
+
+@dataclass
+class RawSegment:
+    """A single segment split into elements, with its source byte range."""
+    elements: List[str]
+    start: int
+    end: int
+
+    @property
+    def segment_id(self) -> str:
+        return self.elements[0] if self.elements else ""
+
+
+def detect_delimiters(header: bytes) -> Delimiters:
+    """
+    Detect delimiters from the beginning of an interchange.
+
+    The element separator is the byte following ``ISA``; the component
+    separator is the single byte in ISA16 and the segment terminator is
+    the byte immediately after it.
+
+    Args:
+        header: Leading bytes of the file (at least the full ISA segment)
+
+    Returns:
+        Detected Delimiters
+
+    Raises:
+        ValueError: If the content does not start with a valid ISA segment
+    """
+    data = header.lstrip(_WHITESPACE)
+    if not data.startswith(b"ISA") or len(data) < 4:
+        raise ValueError("EDI content must start with an ISA segment")
+
+    element = data[3:4]
+    position = 3
+    for _ in range(15):
+        position = data.find(element, position + 1)
+        if position < 0:
+            raise ValueError("Incomplete ISA segment: expected 16 element separators")
+
+    if len(data) < position + 3:
+        raise ValueError("Incomplete ISA segment: missing component separator or terminator")
+
+    component = data[position + 1:position + 2]
+    segment = data[position + 2:position + 3]
+
+    # ISA11 carries the repetition separator from version 00402 onwards
+    elements = data[:position].split(element)
+    repetition = None
+    if len(elements) > 11 and len(elements[11]) == 1 and not elements[11].isalnum():
+        repetition = elements[11].decode("latin-1")
+
+    return Delimiters(
+        element=element.decode("latin-1"),
+        component=component.decode("latin-1"),
+        segment=segment.decode("latin-1"),
+        repetition=repetition,
+    )
+
+
+class SegmentReader:
+    """
+    Iterate over the segments of a binary stream in bounded memory.
+
+    Example:
+        with open("large.835", "rb") as handle:
+            for segment in SegmentReader(handle):
+                print(segment.segment_id, segment.start)
+    """
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 encoding: str = "latin-1"):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Binary file-like object positioned at the start of the ISA
+            chunk_size: Number of bytes to read per chunk
+            encoding: Encoding used to decode segment text
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.delimiters: Optional[Delimiters] = None
+        self.bytes_read = 0
+        self.segment_count = 0
+
+    def __iter__(self) -> Iterator[RawSegment]:
+        try:
+            yield from self._iter_segments()
+        finally:
+            get_instrumentation().add(COUNTER_BYTES, self.bytes_read)
+
+    def _iter_segments(self) -> Iterator[RawSegment]:
+        buffer = self._read_chunk()
+        # Make sure the complete ISA header is available for delimiter detection
+        while len(buffer) < 512:
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            buffer += chunk
+
+        if not buffer.strip(_WHITESPACE):
+            return
+
+        self.delimiters = detect_delimiters(buffer)
+        terminator = self.delimiters.segment.encode(self.encoding)
+        element = self.delimiters.element
+        buffer_offset = 0
+
+        instrumentation = get_instrumentation()
+        while True:
+            # Tokenize the whole chunk before yielding, so the span times only
+            # the reader and not the consumer of its segments
+            with instrumentation.timed(SPAN_TOKENIZE, HISTOGRAM_TOKENIZE):
+                segments, position = self._split(buffer, buffer_offset, terminator, element)
+            yield from segments
+
+            remainder = buffer[position:]
+            buffer_offset += position
+            chunk = self._read_chunk()
+            if not chunk:
+                break
+            buffer = remainder + chunk
+
+        # Trailing data without a terminator is still a segment
+        if remainder.strip(_WHITESPACE):
+            segment = self._make_segment(remainder, 0, len(remainder), buffer_offset, element,
+                                         terminated=False)
+            if segment is not None:
+                yield segment
+
+    def _split(self, buffer: bytes, buffer_offset: int, terminator: bytes,
+               element: str) -> Tuple[List[RawSegment], int]:
+        """Split the terminated segments off a buffer; returns them and the remainder's offset."""
+        segments = []
+        position = 0
+        while True:
+            end = buffer.find(terminator, position)
+            if end < 0:
+                return segments, position
+            segment = self._make_segment(buffer, position, end, buffer_offset, element)
+            if segment is not None:
+                segments.append(segment)
+            position = end + 1
+
+    def _read_chunk(self) -> bytes:
+        chunk = self.stream.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+    def _make_segment(self, buffer: bytes, start: int, end: int,
+                      buffer_offset: int, element: str,
+                      terminated: bool = True) -> Optional[RawSegment]:
+        raw = buffer[start:end]
+        stripped = raw.lstrip(_WHITESPACE)
+        leading = len(raw) - len(stripped)
+        stripped = stripped.rstrip(_WHITESPACE)
+        if not stripped:
+            return None
+
+        self.segment_count += 1
+        absolute_start = buffer_offset + start + leading
+        elements = stripped.decode(self.encoding).split(element)
+        elements[0] = intern_segment_id(elements[0])
+        return RawSegment(
+            elements=elements,
+            start=absolute_start,
+            end=buffer_offset + end + (1 if terminated else 0),
+        )
+
+
+def iter_segments(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[RawSegment]:
+    """Iterate over the segments of a file on disk."""
+    with open(path, "rb") as handle:
+        yield from SegmentReader(handle, chunk_size=chunk_size)
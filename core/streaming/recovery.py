@@ -0,0 +1,375 @@
+"""
+Error-tolerant parsing for corrupted files.
+
+RecoveringParser parses every ST..SE span of a stream on its own. A span
+that is structurally broken (no SE, SE control number or segment count
+that does not match, no enclosing ISA/GS, or a parser failure) is
+quarantined instead of failing the whole file, and parsing resumes at
+the next ST, GS or ISA. Segments found outside any transaction set are
+quarantined the same way.
+
+The result is a partial EdiRoot with every good transaction plus a
+QuarantineManifest of byte ranges, so only the broken slices need to be
+repaired and reprocessed.
+
+Example:
+    result = recover_file("corrupted.835")
+    print(result.transactions, "parsed,", len(result.manifest.spans), "quarantined")
+    result.manifest.write("corrupted.quarantine.json")
+    extract_quarantined("corrupted.835", result.manifest, "quarantine/")
+"""
+
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+
+from ..base.edi_ast import EdiRoot, FunctionalGroup, Interchange
+from .reader import DEFAULT_CHUNK_SIZE, Delimiters, RawSegment, SegmentReader, detect_delimiters
+
+logger = logging.getLogger(__name__)
+
+# ISA is fixed at 16 elements after the segment ID
+_ISA_ELEMENT_COUNT = 17
+
+# Segments that end a broken span; parsing resynchronizes at each of them
+_BOUNDARIES = frozenset(("ST", "ISA", "GS", "GE", "IEA"))
+
+
+@dataclass
+class QuarantinedSpan:
+    """A byte range of the source that could not be parsed."""
+    start: int
+    end: int
+    reason: str
+    first_segment: int
+    segment_count: int
+    transaction_set_code: str = ""
+    control_number: str = ""
+    interchange_control_number: str = ""
+    group_control_number: str = ""
+    isa_range: Optional[List[int]] = None
+    gs_range: Optional[List[int]] = None
+
+    @property
+    def byte_length(self) -> int:
+        return self.end - self.start
+
+    def read(self, handle: BinaryIO) -> bytes:
+        """Read the quarantined bytes from the source file."""
+        handle.seek(self.start)
+        return handle.read(self.byte_length)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class QuarantineManifest:
+    """Quarantined spans of one source file, in file order."""
+    source: str = ""
+    spans: List[QuarantinedSpan] = field(default_factory=list)
+
+    @property
+    def bytes_quarantined(self) -> int:
+        return sum(span.byte_length for span in self.spans)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "bytes_quarantined": self.bytes_quarantined,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+    def write(self, path: str):
+        """Write the manifest as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "QuarantineManifest":
+        """Read a manifest written by ``write``."""
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(source=data.get("source", ""),
+                   spans=[QuarantinedSpan(**span) for span in data.get("spans", [])])
+
+
+@dataclass
+class RecoveryResult:
+    """Partial parse of a stream and what was left out of it."""
+    root: EdiRoot
+    manifest: QuarantineManifest
+    transactions: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not self.manifest.spans
+
+
+class _Span:
+    """Segments collected for a transaction set or a run of stray segments."""
+
+    def __init__(self, segment: RawSegment, index: int):
+        self.segments = [segment]
+        self.first_index = index
+
+    @property
+    def start(self) -> int:
+        return self.segments[0].start
+
+    @property
+    def end(self) -> int:
+        return self.segments[-1].end
+
+
+def _element(elements: List[str], position: int) -> str:
+    return elements[position].strip() if len(elements) > position else ""
+
+
+def _range(segment: Optional[RawSegment]) -> Optional[List[int]]:
+    return [segment.start, segment.end] if segment is not None else None
+
+
+class RecoveringParser:
+    """
+    Parse a segment stream transaction by transaction, quarantining broken spans.
+
+    Each transaction set is parsed by the registered parser plugin for its
+    ST01 code, wrapped in its own ISA/GS headers like a TransactionChunk.
+    """
+
+    def __init__(self, registry=None, check_counts: bool = True):
+        """
+        Initialize the parser.
+
+        Args:
+            registry: Plugin registry; the global registry with the
+                built-in plugins when omitted
+            check_counts: Quarantine transaction sets whose SE01 does not
+                match the number of segments read
+        """
+        if registry is None:
+            from ..plugins.api import PluginManager, plugin_registry
+            if not plugin_registry.get_parser_for_transaction("835"):
+                PluginManager(plugin_registry).load_builtin_plugins()
+            registry = plugin_registry
+        self.registry = registry
+        self.check_counts = check_counts
+
+    def parse_file(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> RecoveryResult:
+        """Parse a file from disk in bounded memory."""
+        with open(path, "rb") as handle:
+            return self.parse_stream(handle, source=path, chunk_size=chunk_size)
+
+    def parse_stream(self, stream: BinaryIO, source: str = "",
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> RecoveryResult:
+        """Parse a binary stream."""
+        return self.parse_segments(SegmentReader(stream, chunk_size=chunk_size), source)
+
+    def parse_segments(self, segments: Iterable[RawSegment], source: str = "") -> RecoveryResult:
+        """
+        Parse raw segments, resynchronizing after every broken span.
+
+        Args:
+            segments: Segments with byte offsets, e.g. from a SegmentReader
+            source: Source name recorded in the manifest
+
+        Returns:
+            RecoveryResult with the partial EdiRoot and the quarantine manifest
+        """
+        self._result = RecoveryResult(root=EdiRoot(), manifest=QuarantineManifest(source=source))
+        self._isa: Optional[RawSegment] = None
+        self._gs: Optional[RawSegment] = None
+        self._interchange: Optional[Interchange] = None
+        self._group: Optional[FunctionalGroup] = None
+        transaction: Optional[_Span] = None
+        stray: Optional[_Span] = None
+
+        for index, segment in enumerate(segments):
+            segment_id = segment.segment_id
+
+            if transaction is not None:
+                if segment_id == "SE":
+                    transaction.segments.append(segment)
+                    self._finish_transaction(transaction)
+                    transaction = None
+                    continue
+                if segment_id not in _BOUNDARIES:
+                    transaction.segments.append(segment)
+                    continue
+                self._quarantine(transaction, f"{segment_id} at byte {segment.start} before the SE "
+                                              "of the transaction set")
+                transaction = None
+
+            if segment_id in _BOUNDARIES and stray is not None:
+                self._quarantine(stray, "segments outside a transaction set")
+                stray = None
+
+            if segment_id == "ST":
+                transaction = _Span(segment, index)
+            elif segment_id == "ISA":
+                self._begin_interchange(segment, index)
+            elif segment_id == "GS":
+                self._gs = segment
+                self._group = None
+            elif segment_id == "GE":
+                self._gs = None
+                self._group = None
+            elif segment_id == "IEA":
+                self._isa = self._gs = None
+                self._interchange = self._group = None
+            elif stray is None:
+                stray = _Span(segment, index)
+            else:
+                stray.segments.append(segment)
+
+        if transaction is not None:
+            self._quarantine(transaction, "input ended before the SE of the transaction set")
+        if stray is not None:
+            self._quarantine(stray, "segments outside a transaction set")
+
+        result = self._result
+        manifest = result.manifest
+        if manifest.spans:
+            logger.warning(f"Quarantined {len(manifest.spans)} span(s), {manifest.bytes_quarantined} bytes; "
+                           f"parsed {result.transactions} transaction set(s)")
+        return result
+
+    def _begin_interchange(self, segment: RawSegment, index: int):
+        self._gs = None
+        self._interchange = self._group = None
+        if len(segment.elements) < _ISA_ELEMENT_COUNT:
+            # Later transactions have no usable envelope until the next ISA
+            self._isa = None
+            self._quarantine(_Span(segment, index), "malformed ISA header")
+            return
+        self._isa = segment
+
+    def _finish_transaction(self, span: _Span):
+        reason = self._structural_problem(span)
+        if reason is None:
+            code = span.segments[0].elements[1].strip()
+            plugin = self.registry.get_parser_for_transaction(code)
+            if plugin is None:
+                reason = f"no parser plugin for transaction code {code}"
+        if reason is not None:
+            self._quarantine(span, reason)
+            return
+
+        isa = self._isa.elements
+        gs = self._gs.elements
+        segments = [isa, gs]
+        segments.extend(segment.elements for segment in span.segments)
+        segments.append(["GE", "1", _element(gs, 6)])
+        segments.append(["IEA", "1", _element(isa, 13)])
+        try:
+            parsed = plugin.parse(segments)
+        except Exception as e:
+            self._quarantine(span, f"parse failed: {e}")
+            return
+        if not self._merge(parsed):
+            self._quarantine(span, f"parser plugin {plugin.plugin_name} returned no transaction set")
+
+    def _structural_problem(self, span: _Span) -> Optional[str]:
+        """Why a complete ST..SE span cannot be parsed, or None."""
+        st = span.segments[0].elements
+        se = span.segments[-1].elements
+        if not _element(st, 1):
+            return "ST without a transaction set identifier"
+        if _element(se, 2) != _element(st, 2):
+            return (f"SE control number {_element(se, 2)!r} does not match "
+                    f"ST control number {_element(st, 2)!r}")
+        if self.check_counts and _element(se, 1) != str(len(span.segments)):
+            return f"SE declares {_element(se, 1) or 'no'} segments, found {len(span.segments)}"
+        if self._isa is None or self._gs is None:
+            return "transaction set outside an interchange or functional group"
+        return None
+
+    def _merge(self, parsed: EdiRoot) -> int:
+        """Add the parsed transactions to the result; returns how many there were."""
+        result = self._result
+        merged = 0
+        if not any(group.transactions for interchange in parsed.interchanges
+                   for group in interchange.functional_groups):
+            return merged
+        result.root.errors.extend(getattr(parsed, "errors", ()))
+        for interchange in parsed.interchanges:
+            for group in interchange.functional_groups:
+                if self._interchange is None:
+                    self._interchange = interchange
+                    interchange.functional_groups = []
+                    result.root.interchanges.append(interchange)
+                if self._group is None:
+                    self._group = group
+                    transactions, group.transactions = group.transactions, []
+                    self._interchange.functional_groups.append(group)
+                else:
+                    transactions = group.transactions
+                self._group.transactions.extend(transactions)
+                merged += len(transactions)
+        result.transactions += merged
+        return merged
+
+    def _quarantine(self, span: _Span, reason: str):
+        st = span.segments[0].elements if span.segments[0].segment_id == "ST" else []
+        isa = self._isa.elements if self._isa is not None else []
+        gs = self._gs.elements if self._gs is not None else []
+        self._result.manifest.spans.append(QuarantinedSpan(
+            start=span.start,
+            end=span.end,
+            reason=reason,
+            first_segment=span.first_index,
+            segment_count=len(span.segments),
+            transaction_set_code=_element(st, 1),
+            control_number=_element(st, 2),
+            interchange_control_number=_element(isa, 13),
+            group_control_number=_element(gs, 6),
+            isa_range=_range(self._isa),
+            gs_range=_range(self._gs),
+        ))
+        logger.debug(f"Quarantined bytes {span.start}-{span.end}: {reason}")
+
+
+def recover_file(path: str, registry=None, check_counts: bool = True,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> RecoveryResult:
+    """Parse a file with RecoveringParser."""
+    return RecoveringParser(registry, check_counts).parse_file(path, chunk_size=chunk_size)
+
+
+def extract_quarantined(source: str, manifest: QuarantineManifest, output_dir: str) -> List[str]:
+    """
+    Write each quarantined span to its own file for repair and reprocessing.
+
+    Spans that had an enclosing ISA and GS are written between copies of
+    those headers with synthesized GE/IEA trailers, so the file can be
+    parsed on its own once repaired.
+
+    Returns:
+        Paths of the written files, in manifest order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(source))[0]
+    paths = []
+    with open(source, "rb") as handle:
+        delimiters = detect_delimiters(handle.read(512))
+        for number, span in enumerate(manifest.spans, start=1):
+            path = os.path.join(output_dir, f"{base}-quarantine-{number:04d}-{span.start}-{span.end}.edi")
+            with open(path, "wb") as out:
+                enveloped = span.isa_range is not None and span.gs_range is not None
+                if enveloped:
+                    for start, end in (span.isa_range, span.gs_range):
+                        handle.seek(start)
+                        out.write(handle.read(end - start) + b"\n")
+                out.write(span.read(handle))
+                if enveloped:
+                    out.write(b"\n" + _trailer(delimiters, "GE", span.group_control_number))
+                    out.write(b"\n" + _trailer(delimiters, "IEA", span.interchange_control_number) + b"\n")
+            paths.append(path)
+    return paths
+
+
+def _trailer(delimiters: Delimiters, segment_id: str, control_number: str) -> bytes:
+    text = delimiters.element.join([segment_id, "1", control_number]) + delimiters.segment
+    return text.encode("latin-1")
@@ -0,0 +1,311 @@
+"""
+Segment-level structural validation against a JSON segment schema.
+
+The schemas in ``shared/schemas/x12`` describe each segment's elements by
+name and type (``string``, ``number``, ``integer``, ``date``, ``time``),
+optionally with ``length`` (maximum), ``min_length``, ``max_length``,
+``codes`` and ``required``. SegmentValidator compiles every segment
+definition once into a tuple of ``(position, check)`` pairs, where each
+check is a closure over a precompiled regular expression or code set, so
+validating a raw segment is a short loop with no AST and no per-call
+lookups. Errors carry their segment index, byte offset and element
+position, with IK403 codes so they feed straight into a 999.
+
+Segments the schema does not describe are not checked, and elements past
+the last one described are allowed unless ``strict_element_count`` is set,
+since the bundled schemas list only the leading elements of most segments.
+The schema format has no notion of components, so composite values are
+not length-checked.
+
+Example:
+    validator = SegmentValidator.from_file("shared/schemas/x12/835.json")
+    with open("remit.835", "rb") as handle:
+        for segment in validator.observe(SegmentReader(handle)):
+            ...
+    for error in validator.errors:
+        print(error.segment_id, error.element_position, error.message)
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from dataclasses import dataclass
+import json
+import re
+
+from .reader import RawSegment
+
+# IK403 element syntax error codes
+ELEMENT_MISSING = "1"
+TOO_MANY_ELEMENTS = "3"
+ELEMENT_TOO_SHORT = "4"
+ELEMENT_TOO_LONG = "5"
+INVALID_CHARACTER = "6"
+INVALID_CODE_VALUE = "7"
+INVALID_DATE = "8"
+INVALID_TIME = "9"
+
+_MESSAGES = {
+    ELEMENT_MISSING: "Mandatory data element missing",
+    TOO_MANY_ELEMENTS: "Too many data elements",
+    ELEMENT_TOO_SHORT: "Data element too short",
+    ELEMENT_TOO_LONG: "Data element too long",
+    INVALID_CHARACTER: "Invalid character in data element",
+    INVALID_CODE_VALUE: "Invalid code value",
+    INVALID_DATE: "Invalid date",
+    INVALID_TIME: "Invalid time",
+}
+
+# Element type patterns; lengths of numeric types count digits only
+_TYPE_PATTERNS = {
+    "integer": (re.compile(r"-?\d+"), INVALID_CHARACTER),
+    "number": (re.compile(r"-?(?:\d+\.?\d*|\.\d+)"), INVALID_CHARACTER),
+    "date": (re.compile(r"(?:\d\d)?\d\d(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])"), INVALID_DATE),
+    "time": (re.compile(r"(?:[01]\d|2[0-3])[0-5]\d(?:[0-5]\d\d{0,2})?"), INVALID_TIME),
+}
+_NUMERIC_TYPES = frozenset(("integer", "number"))
+
+# Element check: returns an IK403 code, or None when the value is valid
+ElementCheck = Callable[[str], Optional[str]]
+
+_NO_ERRORS: Tuple = ()
+
+
+@dataclass
+class ElementError:
+    """A structural error in one element of a raw segment."""
+    segment_index: int
+    segment_id: str
+    element_position: int
+    code: str
+    value: str = ""
+    element_name: str = ""
+    offset: Optional[int] = None
+
+    @property
+    def message(self) -> str:
+        name = f" {self.element_name}" if self.element_name else ""
+        return f"{_MESSAGES.get(self.code, 'Invalid data element')}: {self.segment_id}{self.element_position:02d}{name}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "segment_index": self.segment_index,
+            "segment_id": self.segment_id,
+            "element_position": self.element_position,
+            "code": self.code,
+            "value": self.value,
+            "element_name": self.element_name,
+            "offset": self.offset,
+            "message": self.message,
+        }
+
+
+class CompiledSegment(NamedTuple):
+    """A segment definition compiled to its element checks."""
+    segment_id: str
+    name: str
+    element_count: int
+    checks: Tuple[Tuple[int, ElementCheck], ...]
+    required: Tuple[int, ...]
+    element_names: Tuple[str, ...]
+
+
+def compile_element(definition: Dict[str, Any], component_separator: str = ":") -> Optional[ElementCheck]:
+    """
+    Compile one element definition into a check, or None if anything goes.
+
+    Args:
+        definition: Element definition with ``type`` and optional ``length``,
+            ``min_length``, ``max_length`` and ``codes``
+        component_separator: Marks composite values, which skip length checks
+    """
+    element_type = definition.get("type", "string")
+    max_length = definition.get("max_length", definition.get("length"))
+    min_length = definition.get("min_length")
+    codes = definition.get("codes")
+    pattern, pattern_code = _TYPE_PATTERNS.get(element_type, (None, None))
+    match = pattern.fullmatch if pattern is not None else None
+    numeric = element_type in _NUMERIC_TYPES
+
+    if codes:
+        code_set = frozenset(str(code) for code in codes)
+
+        def check_code(value: str) -> Optional[str]:
+            return None if value in code_set else INVALID_CODE_VALUE
+        return check_code
+
+    if match is None and max_length is None and min_length is None:
+        return None
+
+    if match is None:
+        def check_string(value: str) -> Optional[str]:
+            if component_separator in value:
+                return None
+            size = len(value)
+            if max_length is not None and size > max_length:
+                return ELEMENT_TOO_LONG
+            if min_length is not None and size < min_length:
+                return ELEMENT_TOO_SHORT
+            return None
+        return check_string
+
+    if max_length is None and min_length is None:
+        def check_type(value: str) -> Optional[str]:
+            return None if match(value) else pattern_code
+        return check_type
+
+    def check_typed_length(value: str) -> Optional[str]:
+        if not match(value):
+            return pattern_code
+        size = len(value.replace("-", "").replace(".", "")) if numeric else len(value)
+        if max_length is not None and size > max_length:
+            return ELEMENT_TOO_LONG
+        if min_length is not None and size < min_length:
+            return ELEMENT_TOO_SHORT
+        return None
+    return check_typed_length
+
+
+def compile_segment(segment_id: str, definition: Dict[str, Any],
+                    component_separator: str = ":") -> CompiledSegment:
+    """Compile a segment definition; element positions are 1-based as in X12."""
+    elements = definition.get("elements", [])
+    checks = []
+    required = []
+    for position, element in enumerate(elements, start=1):
+        check = compile_element(element, component_separator)
+        if check is not None:
+            checks.append((position, check))
+        if element.get("required"):
+            required.append(position)
+    return CompiledSegment(
+        segment_id=segment_id,
+        name=definition.get("name", ""),
+        element_count=len(elements),
+        checks=tuple(checks),
+        required=tuple(required),
+        element_names=tuple(element.get("name", "") for element in elements),
+    )
+
+
+class SegmentValidator:
+    """
+    Validate raw segments against compiled segment definitions.
+
+    ``check`` is the hot path and returns ``(position, code, value)``
+    tuples; ``validate`` and ``observe`` wrap it to produce ElementErrors.
+    """
+
+    def __init__(self, schema: Dict[str, Any], strict_element_count: bool = False,
+                 max_errors: Optional[int] = 10000, component_separator: str = ":"):
+        """
+        Initialize the validator.
+
+        Args:
+            schema: Schema document (``{"schema": {"segments": ...}}``) or its
+                ``segments`` mapping
+            strict_element_count: Report elements beyond the last one defined
+            max_errors: ElementErrors kept by ``observe``; all are counted
+            component_separator: Component separator of the input (ISA16)
+        """
+        if "schema" in schema:
+            schema = schema["schema"]
+        segments = schema.get("segments", schema)
+        self.segments: Dict[str, CompiledSegment] = {
+            segment_id: compile_segment(segment_id, definition, component_separator)
+            for segment_id, definition in segments.items()
+        }
+        self.strict_element_count = strict_element_count
+        self.max_errors = max_errors
+        self.errors: List[ElementError] = []
+        self.error_count = 0
+        self.segment_count = 0
+
+    @classmethod
+    def from_file(cls, path: str, **options) -> "SegmentValidator":
+        """Compile the schema in a JSON file."""
+        with open(path, "r") as f:
+            return cls(json.load(f), **options)
+
+    def check(self, elements: Sequence[str]) -> Sequence[Tuple[int, str, str]]:
+        """
+        Check one segment's elements.
+
+        Returns:
+            ``(element_position, code, value)`` for each invalid element;
+            an empty tuple when the segment is valid or not in the schema
+        """
+        compiled = self.segments.get(elements[0])
+        if compiled is None:
+            return _NO_ERRORS
+        size = len(elements)
+        errors = None
+        for position, check in compiled.checks:
+            if position >= size:
+                break
+            value = elements[position]
+            if value:
+                code = check(value)
+                if code is not None:
+                    if errors is None:
+                        errors = []
+                    errors.append((position, code, value))
+        for position in compiled.required:
+            if position >= size or not elements[position]:
+                if errors is None:
+                    errors = []
+                errors.append((position, ELEMENT_MISSING, ""))
+        if self.strict_element_count and size - 1 > compiled.element_count:
+            if errors is None:
+                errors = []
+            errors.append((compiled.element_count + 1, TOO_MANY_ELEMENTS, elements[compiled.element_count + 1]))
+        if errors is None:
+            return _NO_ERRORS
+        errors.sort()
+        return errors
+
+    def element_errors(self, elements: Sequence[str], segment_index: int,
+                       offset: Optional[int] = None) -> List[ElementError]:
+        """ElementErrors for one segment."""
+        found = self.check(elements)
+        if not found:
+            return []
+        names = self.segments[elements[0]].element_names
+        return [
+            ElementError(
+                segment_index=segment_index,
+                segment_id=elements[0],
+                element_position=position,
+                code=code,
+                value=value,
+                element_name=names[position - 1] if position <= len(names) else "",
+                offset=offset,
+            )
+            for position, code, value in found
+        ]
+
+    def validate(self, segments: Iterable[Any]) -> List[ElementError]:
+        """Validate element lists or RawSegments; returns every error."""
+        errors = []
+        for index, segment in enumerate(segments):
+            if isinstance(segment, RawSegment):
+                errors.extend(self.element_errors(segment.elements, index, segment.start))
+            elif segment:
+                errors.extend(self.element_errors(segment, index))
+        return errors
+
+    def observe(self, segments: Iterable[RawSegment]) -> Iterator[RawSegment]:
+        """
+        Pass RawSegments through unchanged, validating each as it goes by.
+
+        Errors are collected in ``errors`` (up to ``max_errors``) and
+        counted in ``error_count``.
+        """
+        check = self.check
+        for segment in segments:
+            elements = segment.elements
+            if check(elements):
+                for error in self.element_errors(elements, self.segment_count, segment.start):
+                    self.error_count += 1
+                    if self.max_errors is None or len(self.errors) < self.max_errors:
+                        self.errors.append(error)
+            self.segment_count += 1
+            yield segment
@@ -0,0 +1,117 @@
+"""
+Transaction splitter for streamed X12 content.
+
+This module groups the segments produced by a SegmentReader into
+self-contained ST..SE units. Each unit is re-wrapped in its original
+ISA/GS headers with synthesized GE/IEA trailers so it can be handed to
+any transaction parser on its own, in another thread or process.
+"""
+
+from typing import Iterable, Iterator, List, Optional
+from dataclasses import dataclass, field
+import logging
+
+from .reader import RawSegment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TransactionChunk:
+    """A single transaction set with the envelope needed to parse it."""
+    index: int
+    transaction_set_code: str
+    control_number: str
+    segments: List[List[str]]
+    start: int
+    end: int
+    interchange_control_number: str = ""
+    group_control_number: str = ""
+
+    @property
+    def byte_length(self) -> int:
+        return self.end - self.start
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments between ST and SE inclusive."""
+        return max(len(self.segments) - 4, 0)
+
+
+@dataclass
+class _Envelope:
+    isa: Optional[List[str]] = None
+    gs: Optional[List[str]] = None
+    body: List[List[str]] = field(default_factory=list)
+    start: int = 0
+
+
+class TransactionSplitter:
+    """
+    Split a segment stream into independently parseable transactions.
+
+    Only one transaction is buffered at a time. Segments outside an
+    ST..SE span (other than the envelope headers) are ignored.
+    """
+
+    def __init__(self, segments: Iterable[RawSegment]):
+        self.segments = segments
+        self.transaction_count = 0
+        self.interchange_count = 0
+        self.group_count = 0
+
+    def __iter__(self) -> Iterator[TransactionChunk]:
+        envelope = _Envelope()
+        in_transaction = False
+
+        for segment in self.segments:
+            segment_id = segment.segment_id
+
+            if segment_id == "ISA":
+                envelope.isa = segment.elements
+                envelope.gs = None
+                self.interchange_count += 1
+            elif segment_id == "GS":
+                envelope.gs = segment.elements
+                self.group_count += 1
+            elif segment_id == "ST":
+                if in_transaction:
+                    logger.warning(f"ST at byte {segment.start} before SE of previous transaction; "
+                                   "discarding incomplete transaction")
+                in_transaction = True
+                envelope.body = [segment.elements]
+                envelope.start = segment.start
+            elif in_transaction:
+                envelope.body.append(segment.elements)
+                if segment_id == "SE":
+                    in_transaction = False
+                    yield self._build_chunk(envelope, segment.end)
+                    envelope.body = []
+
+        if in_transaction:
+            logger.warning("Input ended before SE of the last transaction; discarding it")
+
+    def _build_chunk(self, envelope: _Envelope, end: int) -> TransactionChunk:
+        st = envelope.body[0]
+        isa = envelope.isa or ["ISA"] + [""] * 16
+        gs = envelope.gs or ["GS"] + [""] * 8
+        isa_control = isa[13] if len(isa) > 13 else ""
+        gs_control = gs[6] if len(gs) > 6 else ""
+
+        segments = [isa, gs]
+        segments.extend(envelope.body)
+        segments.append(["GE", "1", gs_control])
+        segments.append(["IEA", "1", isa_control])
+
+        chunk = TransactionChunk(
+            index=self.transaction_count,
+            transaction_set_code=st[1] if len(st) > 1 else "",
+            control_number=st[2] if len(st) > 2 else "",
+            segments=segments,
+            start=envelope.start,
+            end=end,
+            interchange_control_number=isa_control,
+            group_control_number=gs_control,
+        )
+        self.transaction_count += 1
+        return chunk
@@ -0,0 +1,421 @@
+"""
+Directory watcher ingestion daemon.
+
+This module watches inbound directories for completed EDI files and runs
+each one through parse, validate and emit with bounded parallelism. Files
+are detected with inotify on Linux (IN_CLOSE_WRITE / IN_MOVED_TO) and by
+polling for a stable size and modification time elsewhere. Processed
+files are recorded in SQLite so restarts never reprocess them.
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import logging
+import os
+import queue
+import select
+import shutil
+import sqlite3
+import struct
+import threading
+import time
+
+from .reader import SegmentReader
+from .splitter import TransactionSplitter
+from .executor import process_chunk
+from ..emitter import convert_floats_to_ints
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+_EVENT_HEADER = struct.Struct("iIII")
+
+_STOP = object()
+
+
+@dataclass
+class WatchConfig:
+    """Configuration for the watch daemon."""
+    input_dirs: List[str]
+    output_dir: str
+    error_dir: str
+    state_path: Optional[str] = None
+    patterns: List[str] = field(default_factory=lambda: ["*"])
+    max_workers: int = 4
+    queue_size: int = 16
+    validate: bool = True
+    use_polling: bool = False
+    poll_interval: float = 1.0
+    settle_time: float = 2.0
+
+    def __post_init__(self):
+        if self.state_path is None:
+            self.state_path = os.path.join(self.output_dir, ".edi-watch.db")
+
+
+class ProcessedFileStore:
+    """SQLite record of files that have already been ingested."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_files ("
+            "path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "status TEXT NOT NULL, output_path TEXT, error TEXT, "
+            "transaction_count INTEGER NOT NULL DEFAULT 0, processed_at TEXT NOT NULL, "
+            "PRIMARY KEY (path, size, mtime_ns))"
+        )
+        self._conn.commit()
+
+    def is_processed(self, path: str, stat: os.stat_result) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM processed_files WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        return row is not None
+
+    def record(self, path: str, stat: os.stat_result, status: str, output_path: Optional[str] = None,
+               error: Optional[str] = None, transaction_count: int = 0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO processed_files "
+                "(path, size, mtime_ns, status, output_path, error, transaction_count, processed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, status, output_path, error,
+                 transaction_count, datetime.now().isoformat()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PollingWatcher:
+    """Detect completed files by waiting for size and mtime to stop changing."""
+
+    def __init__(self, directories: List[str], poll_interval: float = 1.0, settle_time: float = 2.0):
+        self.directories = directories
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self._observed: Dict[str, tuple] = {}
+
+    def poll(self) -> List[str]:
+        """Scan once and return paths whose size and mtime have been stable for settle_time."""
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                seen.add(entry.path)
+                stat = entry.stat()
+                signature = (stat.st_size, stat.st_mtime_ns)
+                previous = self._observed.get(entry.path)
+                if previous is None or previous[0] != signature:
+                    self._observed[entry.path] = (signature, now, False)
+                elif not previous[2] and now - previous[1] >= self.settle_time:
+                    self._observed[entry.path] = (signature, previous[1], True)
+                    ready.append(entry.path)
+
+        for path in list(self._observed):
+            if path not in seen:
+                del self._observed[path]
+        return ready
+
+    def watch(self, stop_event: threading.Event) -> Iterator[str]:
+        while not stop_event.is_set():
+            yield from self.poll()
+            stop_event.wait(self.poll_interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher for files closed after writing or moved into place."""
+
+    def __init__(self, directories: List[str], timeout: float = 1.0):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name or not hasattr(ctypes.CDLL(libc_name), "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.timeout = timeout
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._watches: Dict[int, str] = {}
+        for directory in directories:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory),
+                                              IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"Cannot watch directory: {directory}")
+            self._watches[wd] = directory
+        self.directories = directories
+
+    def existing_files(self) -> List[str]:
+        """Files already present when watching starts; inotify only reports new ones."""
+        paths = []
+        for directory in self.directories:
+            for entry in os.scandir(directory):
+                if entry.is_file() and not entry.name.startswith("."):
+                    paths.append(entry.path)
+        return paths
+
+    def watch(self, stop_event: threading.Event) -> Iterator[str]:
+        yield from self.existing_files()
+        while not stop_event.is_set():
+            readable, _, _ = select.select([self._fd], [], [], self.timeout)
+            if not readable:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            yield from self._decode_events(data)
+
+    def _decode_events(self, data: bytes) -> Iterator[str]:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            directory = self._watches.get(wd)
+            if directory and name and not name.startswith(b"."):
+                yield os.path.join(directory, os.fsdecode(name))
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(config: WatchConfig):
+    """Create an inotify watcher, falling back to polling when unavailable."""
+    if not config.use_polling:
+        try:
+            return InotifyWatcher(config.input_dirs, timeout=config.poll_interval)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}); falling back to polling")
+    return PollingWatcher(config.input_dirs, config.poll_interval, config.settle_time)
+
+
+@dataclass
+class FileOutcome:
+    """Result of ingesting a single file."""
+    path: str
+    status: str
+    output_path: Optional[str] = None
+    error_path: Optional[str] = None
+    transaction_count: int = 0
+    error_count: int = 0
+    error: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+
+class WatchDaemon:
+    """
+    Watch inbound directories and ingest completed files concurrently.
+
+    Detected files are placed on a bounded queue; when all workers are busy
+    and the queue is full the watcher blocks, which applies backpressure
+    instead of accumulating unbounded work.
+    """
+
+    def __init__(self, config: WatchConfig,
+                 on_complete: Optional[Callable[[FileOutcome], None]] = None):
+        self.config = config
+        self.on_complete = on_complete
+        for directory in [config.output_dir, config.error_dir] + list(config.input_dirs):
+            os.makedirs(directory, exist_ok=True)
+        self.store = ProcessedFileStore(config.state_path)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=config.queue_size)
+        self._stop_event = threading.Event()
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._directory_keys = self._assign_directory_keys(config.input_dirs)
+
+    @staticmethod
+    def _assign_directory_keys(directories: List[str]) -> Dict[str, str]:
+        # Outputs of each watched directory go in a subdirectory named after
+        # it, suffixed with its position when two watched directories share a name
+        keys: Dict[str, str] = {}
+        for index, directory in enumerate(directories):
+            key = os.path.basename(os.path.normpath(os.path.abspath(directory))) or "root"
+            if key in keys.values():
+                key = f"{key}-{index}"
+            keys[os.path.abspath(directory)] = key
+        return keys
+
+    def _relative_name(self, path: str) -> str:
+        """Output name of an input file: ``<watched directory key>/<file name>``."""
+        directory = os.path.abspath(os.path.dirname(path))
+        key = self._directory_keys.get(directory) or os.path.basename(directory) or "root"
+        return os.path.join(key, os.path.basename(path))
+
+    def run(self):
+        """Run until stop() is called or the process is interrupted."""
+        watcher = create_watcher(self.config)
+        logger.info(f"Watching {', '.join(self.config.input_dirs)} with {type(watcher).__name__}")
+        self._start_workers()
+        try:
+            for path in watcher.watch(self._stop_event):
+                self.submit(path)
+        finally:
+            watcher.close()
+            self._stop_workers()
+            self.store.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def submit(self, path: str) -> bool:
+        """Queue a file for ingestion unless it was already processed or is in flight."""
+        if not self._matches(path):
+            return False
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if self.store.is_processed(path, stat):
+            return False
+
+        with self._in_flight_lock:
+            if path in self._in_flight:
+                return False
+            self._in_flight.add(path)
+
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(path, timeout=self.config.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        # Stopping before a worker took it; let a later run pick it up
+        with self._in_flight_lock:
+            self._in_flight.discard(path)
+        return False
+
+    def _matches(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.config.patterns)
+
+    def _start_workers(self):
+        for index in range(self.config.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"edi-watch-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _stop_workers(self):
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def _worker_loop(self):
+        while True:
+            path = self._queue.get()
+            if path is _STOP:
+                break
+            try:
+                outcome = self.process_file(path)
+                if self.on_complete:
+                    self.on_complete(outcome)
+            except Exception:
+                # A failure on one file must not take the worker down with it
+                logger.exception(f"Unhandled error ingesting {path}")
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight.discard(path)
+
+    def process_file(self, path: str) -> FileOutcome:
+        """Parse, validate and emit one file, recording the outcome."""
+        started = time.monotonic()
+        name = self._relative_name(path)
+        output_path = os.path.join(self.config.output_dir, f"{name}.json")
+        outcome = FileOutcome(path=path, status="processed")
+        findings = []
+
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            # Removed or unreadable since it was detected; nothing to record
+            outcome.status = "failed"
+            outcome.error = str(e)
+            logger.warning(f"Cannot ingest {path}: {e}")
+            return outcome
+
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            temp_path = output_path + ".tmp"
+            with open(path, "rb") as source, open(temp_path, "w") as output:
+                output.write("[")
+                for chunk in TransactionSplitter(SegmentReader(source)):
+                    result = process_chunk(chunk, validate=self.config.validate)
+                    if not result.parse_success:
+                        raise ValueError(f"Transaction {result.control_number}: {result.parse_error}")
+                    if outcome.transaction_count:
+                        output.write(",")
+                    # Same rendering as EdiEmitter and the pipeline emit stage
+                    output.write(json.dumps(convert_floats_to_ints(result.transaction), default=str))
+                    outcome.transaction_count += 1
+                    outcome.error_count += result.error_count
+                    if result.error_count:
+                        findings.append({
+                            "control_number": result.control_number,
+                            "byte_range": [result.start, result.end],
+                            "validation": result.validation,
+                        })
+                output.write("]\n")
+            os.replace(temp_path, output_path)
+            outcome.output_path = output_path
+
+            if findings:
+                outcome.status = "invalid"
+                outcome.error_path = self._write_error_report(name, {"path": path, "findings": findings})
+        except Exception as e:
+            if os.path.exists(output_path + ".tmp"):
+                os.remove(output_path + ".tmp")
+            outcome.status = "failed"
+            outcome.error = str(e)
+            logger.error(f"Failed to ingest {path}: {e}")
+            try:
+                outcome.error_path = self._write_error_report(name, {"path": path, "error": str(e)})
+                shutil.copy2(path, os.path.join(self.config.error_dir, name))
+            except OSError as copy_error:
+                logger.error(f"Cannot move {path} to {self.config.error_dir}: {copy_error}")
+
+        outcome.elapsed_seconds = time.monotonic() - started
+        self.store.record(path, stat, outcome.status, outcome.output_path, outcome.error,
+                          outcome.transaction_count)
+        return outcome
+
+    def _write_error_report(self, name: str, report: Dict) -> str:
+        error_path = os.path.join(self.config.error_dir, f"{name}.errors.json")
+        os.makedirs(os.path.dirname(error_path), exist_ok=True)
+        with open(error_path, "w") as handle:
+            json.dump(report, handle, indent=2, default=str)
+        return error_path
@@ -0,0 +1,458 @@
+"""
+Streaming X12 writer.
+
+X12Writer serializes segments straight to a file handle through a small
+write buffer, so multi-gigabyte outputs never exist as one string. It
+owns the envelope bookkeeping: ISA/GS/ST headers are written with fresh
+or supplied control numbers and the SE, GE and IEA trailers get their
+segment, transaction and group counts automatically.
+
+Parsed documents (EdiRoot and transaction ASTs) are written through
+per-transaction serializers registered with ``register_serializer``.
+"""
+
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Union
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+import io
+import logging
+
+from ..base.edi_ast import EdiRoot, FunctionalGroup, Interchange, Transaction
+from ..telemetry import get_instrumentation, SPAN_EMIT, HISTOGRAM_EMIT
+from ..transactions.t835.ast import Transaction835
+from ..transactions.t835.serializer import write_835
+from ..transactions.t837p.ast import Transaction837P
+from ..transactions.t837p.serializer import write_837p
+from ..utils.formatters import to_edi_date, to_edi_time
+from ..utils.money import format_amount
+from .reader import Delimiters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DELIMITERS = Delimiters(element="*", component=":", segment="~", repetition="^")
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# GS08 / ST03 implementation guides and GS01 functional identifiers (5010)
+IMPLEMENTATION_GUIDES = {
+    "270": "005010X279A1",
+    "271": "005010X279A1",
+    "276": "005010X212",
+    "277": "005010X212",
+    "835": "005010X221A1",
+    "837": "005010X222A1",
+    "999": "005010X231A1",
+}
+FUNCTIONAL_IDS = {
+    "270": "HS",
+    "271": "HB",
+    "276": "HR",
+    "277": "HN",
+    "835": "HP",
+    "837": "HC",
+    "997": "FA",
+    "999": "FA",
+}
+
+Serializer = Callable[["X12Writer", Any], None]
+
+_SERIALIZERS: Dict[type, Serializer] = {
+    Transaction835: write_835,
+    Transaction837P: write_837p,
+}
+
+
+def register_serializer(ast_type: type, serializer: Serializer):
+    """
+    Register the serializer for a transaction AST type.
+
+    A serializer receives the writer and the transaction data and writes
+    the segments between ST and SE with ``writer.segment``.
+    """
+    _SERIALIZERS[ast_type] = serializer
+
+
+def get_serializer(transaction_data: Any) -> Serializer:
+    """
+    Serializer for a transaction AST.
+
+    Raises:
+        ValueError: If no serializer is registered for its type
+    """
+    for cls in type(transaction_data).__mro__:
+        serializer = _SERIALIZERS.get(cls)
+        if serializer is not None:
+            return serializer
+    raise ValueError(f"No X12 serializer registered for {type(transaction_data).__name__}")
+
+
+@dataclass
+class _OpenEnvelope:
+    """A header that has been written and still needs its trailer."""
+    control_number: str
+    count: int = 0
+    next_child: int = 1
+    version: str = ""
+
+
+class X12Writer:
+    """
+    Write X12 segments and envelopes to a text or binary file handle.
+
+    Example:
+        with open("out.835", "wb") as handle, X12Writer(handle) as writer:
+            with writer.interchange("PAYER", "PROVIDER"):
+                with writer.group("HP", "PAYER", "PROVIDER", "005010X221A1"):
+                    with writer.transaction("835"):
+                        writer.segment("BPR", "I", 100.0, "C", "CHK")
+
+    Control numbers that are not supplied are generated: ISA13 counts up
+    from ``control_start``, GS06 restarts at 1 in each interchange and
+    ST02 at 0001 in each group. Trailing empty elements are dropped.
+    """
+
+    def __init__(self, handle: Union[BinaryIO, TextIO], delimiters: Optional[Delimiters] = None,
+                 line_ending: str = "\n", control_start: int = 1, encoding: str = "latin-1",
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Initialize the writer.
+
+        Args:
+            handle: Binary or text file-like object to write to
+            delimiters: Delimiters to write with (default ``* : ~ ^``)
+            line_ending: Written after each segment terminator ("" for none)
+            control_start: First generated interchange control number
+            encoding: Encoding used for binary handles
+            buffer_size: Characters buffered before each write to the handle
+        """
+        self.handle = handle
+        self.delimiters = delimiters or DEFAULT_DELIMITERS
+        self.line_ending = line_ending
+        self.encoding = encoding
+        self.buffer_size = buffer_size
+        self.next_control_number = control_start
+        self.segment_count = 0
+        self.bytes_written = 0
+
+        self._binary = not isinstance(handle, io.TextIOBase)
+        self._element = self.delimiters.element
+        self._terminator = self.delimiters.segment
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._interchange: Optional[_OpenEnvelope] = None
+        self._group: Optional[_OpenEnvelope] = None
+        self._transaction: Optional[_OpenEnvelope] = None
+
+    def __enter__(self) -> "X12Writer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.flush()
+
+    # Segments
+
+    def segment(self, segment_id: str, *elements: Any):
+        """
+        Write one segment.
+
+        Elements may be strings, ints, floats (written with format_amount),
+        None (empty) or a tuple/list of components for a composite element.
+
+        Raises:
+            ValueError: If an element contains the element separator or
+                segment terminator
+        """
+        parts = [value if value.__class__ is str else self._format(value) for value in elements]
+        while parts and not parts[-1]:
+            parts.pop()
+        element = self._element
+        text = element.join(parts)
+        if parts:
+            # Joining n parts adds exactly n - 1 separators unless a part holds one
+            contains_delimiter = text.count(element) != len(parts) - 1
+        else:
+            contains_delimiter = element in segment_id
+        if contains_delimiter:
+            raise ValueError(f"{segment_id} element contains a delimiter: {text!r}")
+        if parts:
+            text = segment_id + element + text
+        if self._terminator in text:
+            raise ValueError(f"{segment_id} element contains a delimiter: {text!r}")
+        self._emit(text)
+
+    def write_segment(self, elements: Sequence[Any]):
+        """Write one segment given as a list of elements (segment ID first)."""
+        self.segment(elements[0], *elements[1:])
+
+    def _format(self, value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, float):
+            return format_amount(value)
+        if isinstance(value, (tuple, list)):
+            components = [self._format(component) for component in value]
+            while components and not components[-1]:
+                components.pop()
+            return self.delimiters.component.join(components)
+        return str(value)
+
+    def _emit(self, text: str):
+        chunk = text + self._terminator + self.line_ending
+        self._pending.append(chunk)
+        self._pending_size += len(chunk)
+        self.segment_count += 1
+        if self._transaction is not None:
+            self._transaction.count += 1
+        if self._pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered segments to the handle."""
+        if not self._pending:
+            return
+        data = "".join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        if self._binary:
+            encoded = data.encode(self.encoding)
+            self.handle.write(encoded)
+            self.bytes_written += len(encoded)
+        else:
+            self.handle.write(data)
+            self.bytes_written += len(data.encode(self.encoding))
+
+    def close(self):
+        """Write the trailers of any open envelopes and flush. The handle is left open."""
+        if self._transaction is not None:
+            self.end_transaction()
+        if self._group is not None:
+            self.end_group()
+        if self._interchange is not None:
+            self.end_interchange()
+        self.flush()
+
+    # Envelopes
+
+    def begin_interchange(self, sender_id: str, receiver_id: str, sender_qualifier: str = "ZZ",
+                          receiver_qualifier: str = "ZZ", date: Optional[str] = None,
+                          time: Optional[str] = None, version: str = "00501",
+                          usage_indicator: str = "P", acknowledgment_requested: str = "0",
+                          control_number: Optional[str] = None) -> str:
+        """
+        Write an ISA header.
+
+        Dates may be YYMMDD, CCYYMMDD or YYYY-MM-DD and times HHMM or HH:MM;
+        both default to now.
+
+        Returns:
+            The nine-digit interchange control number
+        """
+        if self._interchange is not None:
+            raise ValueError("An interchange is already open")
+        if control_number:
+            control = self._fixed_control_number(control_number, 9)
+        else:
+            control = f"{self.next_control_number:09d}"
+            self.next_control_number += 1
+
+        now = datetime.now()
+        delimiters = self.delimiters
+        isa = [
+            "ISA", "00", " " * 10, "00", " " * 10,
+            self._fixed(sender_qualifier, 2), self._fixed(sender_id, 15),
+            self._fixed(receiver_qualifier, 2), self._fixed(receiver_id, 15),
+            to_edi_date(date, "YYMMDD") if date else now.strftime("%y%m%d"),
+            to_edi_time(time)[:4] if time else now.strftime("%H%M"),
+            delimiters.repetition or "U", version, control,
+            acknowledgment_requested, usage_indicator, delimiters.component,
+        ]
+        self._emit(self._element.join(isa))
+        self._interchange = _OpenEnvelope(control_number=control, version=version)
+        return control
+
+    def end_interchange(self):
+        """Write the IEA trailer with the number of groups written."""
+        if self._interchange is None:
+            raise ValueError("No interchange is open")
+        if self._group is not None:
+            raise ValueError(f"Functional group {self._group.control_number} is still open")
+        interchange, self._interchange = self._interchange, None
+        self.segment("IEA", str(interchange.count), interchange.control_number)
+
+    def begin_group(self, functional_id: str, sender_id: str, receiver_id: str, version: str,
+                    date: Optional[str] = None, time: Optional[str] = None,
+                    control_number: Optional[str] = None) -> str:
+        """
+        Write a GS header inside the open interchange.
+
+        Args:
+            functional_id: GS01, e.g. HP for 835 or HC for 837
+            version: GS08 implementation guide, e.g. 005010X221A1
+
+        Returns:
+            The group control number
+        """
+        interchange = self._interchange
+        if interchange is None:
+            raise ValueError("begin_group requires an open interchange")
+        if self._group is not None:
+            raise ValueError(f"Functional group {self._group.control_number} is still open")
+        if control_number:
+            control = str(control_number).lstrip("0") or "0"
+        else:
+            control = str(interchange.next_child)
+        interchange.next_child += 1
+
+        now = datetime.now()
+        self.segment(
+            "GS", functional_id, sender_id.strip(), receiver_id.strip(),
+            to_edi_date(date) if date else now.strftime("%Y%m%d"),
+            to_edi_time(time) if time else now.strftime("%H%M"),
+            control, "X", version,
+        )
+        interchange.count += 1
+        self._group = _OpenEnvelope(control_number=control, version=version)
+        return control
+
+    def end_group(self):
+        """Write the GE trailer with the number of transaction sets written."""
+        if self._group is None:
+            raise ValueError("No functional group is open")
+        if self._transaction is not None:
+            raise ValueError(f"Transaction set {self._transaction.control_number} is still open")
+        group, self._group = self._group, None
+        self.segment("GE", str(group.count), group.control_number)
+
+    def begin_transaction(self, code: str, control_number: Optional[str] = None,
+                          implementation_reference: Optional[str] = None) -> str:
+        """
+        Write an ST header inside the open group.
+
+        ST03 defaults to the group's GS08 for 5010 interchanges.
+
+        Returns:
+            The transaction set control number
+        """
+        group = self._group
+        if group is None:
+            raise ValueError("begin_transaction requires an open functional group")
+        if self._transaction is not None:
+            raise ValueError(f"Transaction set {self._transaction.control_number} is still open")
+        if control_number:
+            control = str(control_number).zfill(4)
+        else:
+            control = f"{group.next_child:04d}"
+        group.next_child += 1
+
+        if implementation_reference is None and self._interchange.version >= "00501":
+            implementation_reference = group.version
+        self._transaction = _OpenEnvelope(control_number=control)
+        self.segment("ST", code, control, implementation_reference)
+        group.count += 1
+        return control
+
+    def end_transaction(self):
+        """Write the SE trailer with the transaction's segment count (ST through SE)."""
+        if self._transaction is None:
+            raise ValueError("No transaction set is open")
+        transaction = self._transaction
+        self.segment("SE", str(transaction.count + 1), transaction.control_number)
+        self._transaction = None
+
+    @contextmanager
+    def interchange(self, sender_id: str, receiver_id: str, **options) -> Iterator[str]:
+        """Context manager around begin_interchange/end_interchange."""
+        control = self.begin_interchange(sender_id, receiver_id, **options)
+        yield control
+        self.end_interchange()
+
+    @contextmanager
+    def group(self, functional_id: str, sender_id: str, receiver_id: str, version: str,
+              **options) -> Iterator[str]:
+        """Context manager around begin_group/end_group."""
+        control = self.begin_group(functional_id, sender_id, receiver_id, version, **options)
+        yield control
+        self.end_group()
+
+    @contextmanager
+    def transaction(self, code: str, **options) -> Iterator[str]:
+        """Context manager around begin_transaction/end_transaction."""
+        control = self.begin_transaction(code, **options)
+        yield control
+        self.end_transaction()
+
+    @staticmethod
+    def _fixed(value: str, width: int) -> str:
+        value = (value or "").strip()
+        if len(value) > width:
+            raise ValueError(f"ISA value {value!r} is longer than {width} characters")
+        return value.ljust(width)
+
+    @staticmethod
+    def _fixed_control_number(value: str, width: int) -> str:
+        value = str(value).strip()
+        if not value.isdigit() or len(value) > width:
+            raise ValueError(f"Invalid control number: {value!r}")
+        return value.zfill(width)
+
+    # ASTs
+
+    def write_root(self, root: EdiRoot, **interchange_options):
+        """
+        Write every interchange of a parsed document.
+
+        Envelope control numbers, IDs, dates and times come from the AST;
+        values the AST does not carry (qualifiers, version, usage indicator)
+        can be passed as begin_interchange keyword arguments.
+        """
+        with get_instrumentation().timed(SPAN_EMIT, HISTOGRAM_EMIT, {"format": "x12"}):
+            for interchange in root.interchanges:
+                self.write_interchange(interchange, **interchange_options)
+        self.flush()
+
+    def write_interchange(self, interchange: Interchange, **options):
+        """Write one Interchange AST node with its groups and transactions."""
+        header = interchange.header
+        options.setdefault("date", header.get("date"))
+        options.setdefault("time", header.get("time"))
+        options.setdefault("control_number", header.get("control_number"))
+        with self.interchange(header.get("sender_id", ""), header.get("receiver_id", ""), **options):
+            for group in interchange.functional_groups:
+                self.write_group(group)
+
+    def write_group(self, group: FunctionalGroup):
+        """Write one FunctionalGroup AST node inside the open interchange."""
+        header = group.header
+        code = group.transactions[0].header.get("transaction_set_code", "") if group.transactions else ""
+        functional_id = header.get("functional_group_code") or FUNCTIONAL_IDS.get(code, "")
+        with self.group(functional_id, header.get("sender_id", ""), header.get("receiver_id", ""),
+                        IMPLEMENTATION_GUIDES.get(code, "005010"), date=header.get("date"),
+                        time=header.get("time"), control_number=header.get("control_number")):
+            for transaction in group.transactions:
+                self.write_transaction(transaction)
+
+    def write_transaction(self, transaction: Transaction):
+        """Write one Transaction AST node (ST through SE) inside the open group."""
+        serializer = get_serializer(transaction.transaction_data)
+        with self.transaction(transaction.header.get("transaction_set_code", ""),
+                              control_number=transaction.header.get("control_number")):
+            serializer(self, transaction.transaction_data)
+
+
+def write_x12(root: EdiRoot, path: str, delimiters: Optional[Delimiters] = None,
+              line_ending: str = "\n", **interchange_options) -> int:
+    """
+    Write a parsed document to ``path`` as X12.
+
+    Returns:
+        Number of bytes written
+    """
+    with open(path, "wb") as handle:
+        writer = X12Writer(handle, delimiters=delimiters, line_ending=line_ending)
+        writer.write_root(root, **interchange_options)
+    return writer.bytes_written
@@ -0,0 +1,44 @@
+"""
+Metrics and tracing for EDI processing.
+
+This module provides a pluggable instrumentation layer with a no-op
+default, an in-memory aggregator and an optional OpenTelemetry adapter.
+"""
+
+from .base import (
+    Instrumentation, NoOpInstrumentation, InMemoryInstrumentation,
+    get_instrumentation, set_instrumentation, record_document_counts, configure_from_env,
+    SPAN_TOKENIZE, SPAN_PARSE, SPAN_VALIDATE, SPAN_VALIDATE_RULE, SPAN_EMIT,
+    HISTOGRAM_TOKENIZE, HISTOGRAM_PARSE, HISTOGRAM_VALIDATE, HISTOGRAM_VALIDATE_RULE, HISTOGRAM_EMIT,
+    COUNTER_SEGMENTS, COUNTER_TRANSACTIONS, COUNTER_CLAIMS, COUNTER_BYTES
+)
+from .otel import OpenTelemetryInstrumentation, OPENTELEMETRY_AVAILABLE
+
+__all__ = [
+    # Instrumentation
+    'Instrumentation',
+    'NoOpInstrumentation',
+    'InMemoryInstrumentation',
+    'OpenTelemetryInstrumentation',
+    'OPENTELEMETRY_AVAILABLE',
+    'get_instrumentation',
+    'set_instrumentation',
+    'record_document_counts',
+    'configure_from_env',
+
+    # Names
+    'SPAN_TOKENIZE',
+    'SPAN_PARSE',
+    'SPAN_VALIDATE',
+    'SPAN_VALIDATE_RULE',
+    'SPAN_EMIT',
+    'HISTOGRAM_TOKENIZE',
+    'HISTOGRAM_PARSE',
+    'HISTOGRAM_VALIDATE',
+    'HISTOGRAM_VALIDATE_RULE',
+    'HISTOGRAM_EMIT',
+    'COUNTER_SEGMENTS',
+    'COUNTER_TRANSACTIONS',
+    'COUNTER_CLAIMS',
+    'COUNTER_BYTES'
+]
@@ -0,0 +1,217 @@
+"""
+Instrumentation interface for parse, validate and emit.
+
+Library code reports spans, duration histograms and counters through the
+active Instrumentation. The default is a no-op whose methods return
+immediately, so instrumented code pays almost nothing until an adapter
+(in-memory or OpenTelemetry) is installed with set_instrumentation().
+"""
+
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Span names
+SPAN_TOKENIZE = "edi.tokenize"
+SPAN_PARSE = "edi.parse"
+SPAN_VALIDATE = "edi.validate"
+SPAN_VALIDATE_RULE = "edi.validate.rule"
+SPAN_EMIT = "edi.emit"
+
+# Duration histograms (milliseconds)
+HISTOGRAM_TOKENIZE = "edi.tokenize.duration"
+HISTOGRAM_PARSE = "edi.parse.duration"
+HISTOGRAM_VALIDATE = "edi.validate.duration"
+HISTOGRAM_VALIDATE_RULE = "edi.validate.rule.duration"
+HISTOGRAM_EMIT = "edi.emit.duration"
+
+# Counters
+COUNTER_SEGMENTS = "edi.segments"
+COUNTER_TRANSACTIONS = "edi.transactions"
+COUNTER_CLAIMS = "edi.claims"
+COUNTER_BYTES = "edi.bytes"
+
+_NULL_CONTEXT = nullcontext()
+
+
+class Instrumentation:
+    """
+    No-op instrumentation and the interface every adapter implements.
+
+    ``enabled`` lets hot loops skip building attributes entirely.
+    """
+
+    enabled = False
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> ContextManager:
+        """Trace a block of work."""
+        return _NULL_CONTEXT
+
+    def record(self, histogram: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Record a histogram observation."""
+        pass
+
+    def add(self, counter: str, value: int = 1, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Increment a monotonic counter."""
+        pass
+
+    def timed(self, span_name: str, histogram: str,
+              attributes: Optional[Dict[str, Any]] = None) -> ContextManager:
+        """Trace a block and record its duration in milliseconds."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(span_name, histogram, attributes)
+
+    @contextmanager
+    def _timed(self, span_name: str, histogram: str,
+               attributes: Optional[Dict[str, Any]]) -> Iterator[None]:
+        started = time.perf_counter()
+        with self.span(span_name, attributes):
+            try:
+                yield
+            finally:
+                self.record(histogram, (time.perf_counter() - started) * 1000, attributes)
+
+
+NoOpInstrumentation = Instrumentation
+
+
+class InMemoryInstrumentation(Instrumentation):
+    """
+    Aggregate spans, histograms and counters in process, e.g. for the CLI or tests.
+
+    Only the most recent ``max_spans`` spans are kept so long runs stay bounded.
+    """
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 1000):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[tuple, int]] = defaultdict(lambda: defaultdict(int))
+        # Histogram series are kept as running [count, sum, max]
+        self.histograms: Dict[str, Dict[tuple, List[float]]] = defaultdict(
+            lambda: defaultdict(lambda: [0, 0.0, 0.0]))
+        self.spans: "deque[Dict[str, Any]]" = deque(maxlen=max_spans)
+
+    @staticmethod
+    def _key(attributes: Optional[Dict[str, Any]]) -> tuple:
+        return tuple(sorted((attributes or {}).items()))
+
+    @contextmanager
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[None]:
+        started = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            with self._lock:
+                self.spans.append({
+                    "name": name,
+                    "attributes": dict(attributes or {}),
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                    "error": error,
+                })
+
+    def record(self, histogram: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            series = self.histograms[histogram][self._key(attributes)]
+            series[0] += 1
+            series[1] += value
+            if value > series[2]:
+                series[2] = value
+
+    def add(self, counter: str, value: int = 1, attributes: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self.counters[counter][self._key(attributes)] += value
+
+    def counter_total(self, counter: str) -> int:
+        return sum(self.counters.get(counter, {}).values())
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals per counter and count/sum/max per histogram series."""
+        with self._lock:
+            counters = {name: sum(series.values()) for name, series in self.counters.items()}
+            histograms = {}
+            for name, series in self.histograms.items():
+                for key, (count, total, maximum) in series.items():
+                    label = name + ("{" + ",".join(f"{k}={v}" for k, v in key) + "}" if key else "")
+                    histograms[label] = {
+                        "count": count,
+                        "sum_ms": round(total, 4),
+                        "max_ms": round(maximum, 4),
+                    }
+        return {"counters": counters, "histograms": histograms}
+
+
+def record_document_counts(instrumentation: Instrumentation, edi_root: Any,
+                           attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Add transaction and claim counts for a parsed EdiRoot."""
+    transactions = 0
+    claims = 0
+    for interchange in edi_root.interchanges:
+        for functional_group in interchange.functional_groups:
+            for transaction in functional_group.transactions:
+                transactions += 1
+                data = transaction.transaction_data
+                claim_list = getattr(data, "claims", None)
+                if claim_list is not None:
+                    claims += len(claim_list)
+                elif getattr(data, "claim", None) is not None:
+                    claims += 1
+    instrumentation.add(COUNTER_TRANSACTIONS, transactions, attributes)
+    instrumentation.add(COUNTER_CLAIMS, claims, attributes)
+
+
+_instrumentation: Instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    """Return the active instrumentation (a no-op unless one was installed)."""
+    return _instrumentation
+
+
+def set_instrumentation(instrumentation: Optional[Instrumentation]) -> Instrumentation:
+    """
+    Install an instrumentation adapter globally.
+
+    Args:
+        instrumentation: Adapter to use, or None to restore the no-op default
+
+    Returns:
+        The previously active instrumentation
+    """
+    global _instrumentation
+    previous = _instrumentation
+    _instrumentation = instrumentation or Instrumentation()
+    return previous
+
+
+def configure_from_env(variable: str = "EDI_TELEMETRY") -> Instrumentation:
+    """
+    Install instrumentation selected by an environment variable.
+
+    ``otel`` installs the OpenTelemetry adapter, ``memory`` the in-memory
+    aggregator; anything else leaves the current instrumentation in place.
+
+    Returns:
+        The active instrumentation
+    """
+    mode = os.environ.get(variable, "").strip().lower()
+    if mode in ("otel", "opentelemetry"):
+        from .otel import OpenTelemetryInstrumentation
+        try:
+            set_instrumentation(OpenTelemetryInstrumentation())
+        except ImportError as e:
+            logger.warning(f"{variable}={mode} ignored: {e}")
+    elif mode == "memory":
+        set_instrumentation(InMemoryInstrumentation())
+    return get_instrumentation()
@@ -0,0 +1,78 @@
+"""
+OpenTelemetry adapter.
+
+Routes spans, histograms and counters to the OpenTelemetry API. The
+``opentelemetry-api`` package is optional; install it together with an
+SDK/exporter of your choice to ship data to your dashboards.
+"""
+
+from typing import Any, ContextManager, Dict, Optional
+import threading
+
+from .base import Instrumentation
+
+try:
+    from opentelemetry import metrics, trace
+    OPENTELEMETRY_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    metrics = None
+    trace = None
+    OPENTELEMETRY_AVAILABLE = False
+
+INSTRUMENTATION_NAME = "edi-cli"
+
+_UNITS = {
+    "edi.bytes": "By",
+    "edi.segments": "{segment}",
+    "edi.transactions": "{transaction}",
+    "edi.claims": "{claim}",
+}
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Instrumentation backed by an OpenTelemetry tracer and meter."""
+
+    enabled = True
+
+    def __init__(self, tracer_provider=None, meter_provider=None):
+        """
+        Initialize the adapter.
+
+        Args:
+            tracer_provider: TracerProvider to use (defaults to the global provider)
+            meter_provider: MeterProvider to use (defaults to the global provider)
+
+        Raises:
+            ImportError: If opentelemetry-api is not installed
+        """
+        if not OPENTELEMETRY_AVAILABLE:
+            raise ImportError("OpenTelemetry support requires the 'opentelemetry-api' package")
+
+        self.tracer = trace.get_tracer(INSTRUMENTATION_NAME, tracer_provider=tracer_provider)
+        self.meter = metrics.get_meter(INSTRUMENTATION_NAME, meter_provider=meter_provider)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Any] = {}
+        self._counters: Dict[str, Any] = {}
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> ContextManager:
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def record(self, histogram: str, value: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+        instrument = self._histograms.get(histogram)
+        if instrument is None:
+            with self._lock:
+                instrument = self._histograms.get(histogram)
+                if instrument is None:
+                    instrument = self.meter.create_histogram(histogram, unit="ms")
+                    self._histograms[histogram] = instrument
+        instrument.record(value, attributes=attributes)
+
+    def add(self, counter: str, value: int = 1, attributes: Optional[Dict[str, Any]] = None) -> None:
+        instrument = self._counters.get(counter)
+        if instrument is None:
+            with self._lock:
+                instrument = self._counters.get(counter)
+                if instrument is None:
+                    instrument = self.meter.create_counter(counter, unit=_UNITS.get(counter, "1"))
+                    self._counters[counter] = instrument
+        instrument.add(value, attributes=attributes)
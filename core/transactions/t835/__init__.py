@@ -1,7 +1,7 @@
 """
 EDI 835 (Electronic Remittance Advice) Transaction Processing.
 
-This module provides AST definitions, parser, and validators
+This module provides AST definitions, parser, serializer and validators
 specific to EDI 835 Healthcare Claim Payment/Advice transactions.
 """
 
@@ -15,6 +15,7 @@ from .ast import (
     Service
 )
 from .parser import Parser835
+from .serializer import write_835
 from .validators import (
     Financial835ValidationRule,
     Claim835ValidationRule,
@@ -37,6 +38,9 @@ __all__ = [
     
     # Parser
     'Parser835',
+
+    # Serializer
+    'write_835',
     
     # Validators
     'Financial835ValidationRule',
@@ -13,8 +13,12 @@ from typing import List, Optional, Dict, Callable, Any
 from enum import Enum
 from dataclasses import dataclass
 import logging
-from ...base.parser import BaseParser
-from ...errors import StandardErrorHandler, EDISegmentError, create_parse_context
+from ...base.parser import BaseParser, NodeListener
+from ...base.profiling import HandlerProfiler
+from ...utils.interning import SymbolTable, intern_segment_id
+from ...utils.money import parse_amount, sum_cents, to_cents
+from ...telemetry import get_instrumentation, SPAN_TOKENIZE, HISTOGRAM_TOKENIZE, COUNTER_BYTES
+from ...errors import ErrorHandler, StandardErrorHandler, EDISegmentError, create_parse_context
 from ...base.edi_ast import EdiRoot, Interchange, FunctionalGroup, Transaction
 from .ast import (
     Transaction835,
@@ -28,6 +32,12 @@ from .ast import (
 
 logger = logging.getLogger(__name__)
 
+# Segments that close the open service line, claim and transaction when
+# nodes are tracked (SE closes its transaction after it is handled)
+_CLOSES_SERVICE = frozenset({"SVC", "CLP", "LX", "PLB", "SE", "ST", "GE", "IEA", "ISA", "GS"})
+_CLOSES_CLAIM = frozenset({"CLP", "LX", "PLB", "SE", "ST", "GE", "IEA", "ISA", "GS"})
+_CLOSES_TRANSACTION = frozenset({"ST", "GE", "IEA", "ISA", "GS"})
+
 
 # Constants and Enums
 class EntityCode(Enum):
@@ -84,6 +94,21 @@ class ParseState:
     current_claim: Optional[Claim] = None
     segment_count: int = 0
     errors: List[EDISegmentError] = None
+
+    # Canonical strings for repeated codes and identifiers
+    symbols: SymbolTable = None
+
+    # Open nodes, tracked only with a listener or when claims are released
+    track_nodes: bool = False
+    open_transaction: Optional[Transaction] = None
+    open_claim: Optional[Claim] = None
+    open_service: Optional[Service] = None
+    transaction_path: str = ""
+    claim_index: int = -1
+
+    # Paid totals of claims released from the current transaction
+    released_paid: float = 0.0
+    released_cents: Optional[int] = 0
     
     # Dynamic delimiters
     element_separator: str = "*"
@@ -93,6 +118,8 @@ class ParseState:
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.symbols is None:
+            self.symbols = SymbolTable()
 
 
 class ParserUtilities:
@@ -158,19 +185,21 @@ class ParserUtilities:
             if not reason_code or not amount_str:
                 break
                 
+            amount = parse_amount(amount_str, None)
+            if amount is None:
+                break
             try:
-                amount = float(amount_str)
                 quantity = float(quantity_str) if quantity_str and quantity_str.strip() else None
-                
-                triplets.append({
-                    "reason_code": reason_code,
-                    "amount": amount,
-                    "quantity": quantity
-                })
-                
-                index += 3  # Move to next triplet
             except ValueError:
                 break
+            
+            triplets.append({
+                "reason_code": reason_code,
+                "amount": amount,
+                "quantity": quantity
+            })
+            
+            index += 3  # Move to next triplet
         
         return triplets
 
@@ -178,10 +207,26 @@ class ParserUtilities:
 class Parser835(BaseParser):
     """Refactored parser for EDI 835 Healthcare Claim Payment/Advice transactions."""
 
-    def __init__(self, segments: List[List[str]] = None):
-        """Initialize the parser with optional segments."""
+    def __init__(self, segments: List[List[str]] = None, profile: bool = False,
+                 error_handler: Optional[ErrorHandler] = None,
+                 listener: Optional[NodeListener] = None, retain_claims: bool = True):
+        """
+        Initialize the parser with optional segments.
+
+        Args:
+            segments: Pre-split EDI segments (any iterable of segments)
+            profile: Record call counts and time per segment handler
+            error_handler: Handler for segment errors (defaults to StandardErrorHandler);
+                use BoundedErrorHandler for inputs with very many errors
+            listener: Receives services, claims and transactions as they are closed
+            retain_claims: Keep closed claims in the tree; with False each claim is
+                dropped once the listener has seen it, so memory stays bounded
+                by the largest claim rather than the largest transaction
+        """
         super().__init__(segments or [])
-        self.error_handler = StandardErrorHandler()
+        self.error_handler = error_handler or StandardErrorHandler()
+        self.listener = listener
+        self.retain_claims = retain_claims
         self.utilities = ParserUtilities()
         
         # Segment dispatcher map
@@ -207,6 +252,34 @@ class Parser835(BaseParser):
             "LX": self._handle_lx,
         }
 
+        self.profiler: Optional[HandlerProfiler] = None
+        if profile:
+            self.enable_profiling()
+
+    def enable_profiling(self, profiler: Optional[HandlerProfiler] = None) -> HandlerProfiler:
+        """
+        Wrap every segment handler with a timer.
+
+        Profiling is opt-in: without it the dispatch table holds the plain
+        bound methods and parsing pays no instrumentation cost.
+
+        Args:
+            profiler: Existing profiler to accumulate into across parsers
+
+        Returns:
+            The active HandlerProfiler
+        """
+        if self.profiler is None:
+            self.profiler = profiler or HandlerProfiler()
+            self.segment_handlers = self.profiler.wrap_handlers(self.segment_handlers)
+        return self.profiler
+
+    def profile_report(self) -> Optional[Dict[str, Any]]:
+        """Return the per-handler profiling report, or None when profiling is off."""
+        if self.profiler is None:
+            return None
+        return self.profiler.report()
+
     def get_transaction_codes(self) -> List[str]:
         """Get the transaction codes this parser supports."""
         return ["835"]
@@ -229,16 +302,21 @@ class Parser835(BaseParser):
             
             # Handle case where edi_content is provided
             if edi_content:
-                segments = self._parse_edi_content(edi_content)
+                instrumentation = get_instrumentation()
+                with instrumentation.timed(SPAN_TOKENIZE, HISTOGRAM_TOKENIZE):
+                    segments = self._parse_edi_content(edi_content)
+                instrumentation.add(COUNTER_BYTES, len(edi_content))
             else:
                 segments = self.segments
             
             # Initialize parse state
             state = ParseState(root=EdiRoot())
+            listener = self.listener
+            state.track_nodes = listener is not None or not self.retain_claims
+            segment_listener = listener if listener is not None and listener.wants_segments else None
             
-            # Extract delimiters from ISA segment if available
-            if segments and segments[0] and segments[0][0] == "ISA":
-                self._extract_delimiters(segments[0], state)
+            if self.profiler is not None:
+                parse_started = self.profiler.clock()
             
             # Process each segment
             for segment_index, segment in enumerate(segments):
@@ -248,13 +326,25 @@ class Parser835(BaseParser):
                 state.segment_count += 1
                 segment_id = segment[0]
                 
+                # Extract delimiters from a leading ISA segment
+                if segment_index == 0 and segment_id == "ISA":
+                    self._extract_delimiters(segment, state)
+                
                 try:
+                    if state.track_nodes:
+                        if segment_listener is not None:
+                            segment_listener.on_segment(segment, segment_index)
+                        self._close_nodes(segment_id, state)
+                    
                     # Use dispatcher to handle segment
                     handler = self.segment_handlers.get(segment_id)
                     if handler:
                         handler(segment, state, segment_index)
                     else:
                         logger.debug(f"No handler for segment {segment_id}, skipping")
+                    
+                    if segment_id == "SE" and state.track_nodes:
+                        self._close_transaction(state)
                         
                 except Exception as e:
                     # Create error context and continue parsing
@@ -267,9 +357,22 @@ class Parser835(BaseParser):
                     state.errors.append(error)
                     self.error_handler.handle_error(error)
             
+            # The end of input closes whatever is still open
+            if state.track_nodes:
+                self._close_transaction(state)
+            
             # Perform final validation
-            self._perform_balancing_checks(state)
+            if self.profiler is not None:
+                balancing_started = self.profiler.clock()
+                self._perform_balancing_checks(state)
+                finished = self.profiler.clock()
+                self.profiler.record("*", "_perform_balancing_checks", finished - balancing_started)
+                self.profiler.wall_ns += finished - parse_started
+                self.profiler.segments += state.segment_count
+            else:
+                self._perform_balancing_checks(state)
             
+            state.root.errors = state.errors
             logger.debug(f"Parsed 835 transaction with {len(state.current_transaction_835.claims) if state.current_transaction_835 else 0} claims")
             return state.root
             
@@ -319,6 +422,7 @@ class Parser835(BaseParser):
             if raw_segment:
                 # Split by element separator
                 elements = raw_segment.split(element_separator)
+                elements[0] = intern_segment_id(elements[0])
                 segments.append(elements)
         
         return segments
@@ -326,9 +430,10 @@ class Parser835(BaseParser):
     # Segment Handlers
     def _handle_isa(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle ISA (Interchange Control Header) segment."""
+        symbols = state.symbols
         state.current_interchange = Interchange(
-            sender_id=self._get_element(segment, 6),
-            receiver_id=self._get_element(segment, 8),
+            sender_id=symbols.intern(self._get_element(segment, 6)),
+            receiver_id=symbols.intern(self._get_element(segment, 8)),
             date=self._format_date_yymmdd(self._get_element(segment, 9)),
             time=self._format_time(self._get_element(segment, 10)),
             control_number=self._get_element(segment, 13),
@@ -355,10 +460,11 @@ class Parser835(BaseParser):
     def _handle_gs(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle GS (Functional Group Header) segment."""
         if state.current_interchange:
+            symbols = state.symbols
             state.current_functional_group = FunctionalGroup(
-                functional_group_code=self._get_element(segment, 1),
-                sender_id=self._get_element(segment, 2),
-                receiver_id=self._get_element(segment, 3),
+                functional_group_code=symbols.intern(self._get_element(segment, 1)),
+                sender_id=symbols.intern(self._get_element(segment, 2)),
+                receiver_id=symbols.intern(self._get_element(segment, 3)),
                 date=self._format_date_ccyymmdd(self._get_element(segment, 4)),
                 time=self._format_time(self._get_element(segment, 5)),
                 control_number=self._get_element(segment, 6),
@@ -385,19 +491,31 @@ class Parser835(BaseParser):
     def _handle_st(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle ST (Transaction Set Header) segment."""
         if state.current_functional_group:
+            transaction_set_code = state.symbols.intern(self._get_element(segment, 1))
             state.current_transaction_835 = Transaction835(
                 header={
-                    "transaction_set_identifier": self._get_element(segment, 1),
+                    "transaction_set_identifier": transaction_set_code,
                     "transaction_set_control_number": self._get_element(segment, 2),
                 }
             )
             
             state.current_transaction = Transaction(
-                transaction_set_code=self._get_element(segment, 1),
+                transaction_set_code=transaction_set_code,
                 control_number=self._get_element(segment, 2),
                 transaction_data=state.current_transaction_835
             )
             state.current_functional_group.transactions.append(state.current_transaction)
+            state.released_paid = 0.0
+            state.released_cents = 0
+            
+            if state.track_nodes:
+                state.open_transaction = state.current_transaction
+                state.transaction_path = (
+                    f"interchange[{len(state.root.interchanges) - 1}]"
+                    f".functional_group[{len(state.current_interchange.functional_groups) - 1}]"
+                    f".transaction[{len(state.current_functional_group.transactions) - 1}]"
+                )
+                state.claim_index = -1
 
     def _handle_se(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle SE (Transaction Set Trailer) segment."""
@@ -427,10 +545,10 @@ class Parser835(BaseParser):
     def _handle_bpr(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle BPR (Beginning Segment for Payment Order/Remittance Advice) segment."""
         if state.current_transaction_835:
-            total_paid = self._safe_float(self._get_element(segment, 2))
-            payment_method = self._get_element(segment, 4)
+            total_paid = parse_amount(self._get_element(segment, 2))
+            payment_method = state.symbols.intern(self._get_element(segment, 4))
             payment_date_raw = self._get_element(segment, 11)
-            payment_date = self._format_date_ccyymmdd(payment_date_raw)
+            payment_date = state.symbols.intern(self._format_date_ccyymmdd(payment_date_raw))
             
             state.current_transaction_835.financial_information = FinancialInformation(
                 total_paid=total_paid,
@@ -450,14 +568,14 @@ class Parser835(BaseParser):
 
     def _handle_dtm(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle DTM (Date/Time Reference) segment."""
-        date_qualifier = self._get_element(segment, 1)
+        date_qualifier = state.symbols.intern(self._get_element(segment, 1))
         date_value = self._get_element(segment, 2)
         
         if not date_value:
             return
             
         parsed_dtm = self.utilities.parse_dtm(date_qualifier, date_value)
-        formatted_date = self._format_date_ccyymmdd(date_value)
+        formatted_date = state.symbols.intern(self._format_date_ccyymmdd(date_value))
         parsed_dtm["date"] = formatted_date
         
         if state.current_claim and state.current_claim.services and parsed_dtm["type"] == "service_date":
@@ -471,14 +589,21 @@ class Parser835(BaseParser):
         """Handle N1 (Name) segment."""
         if state.current_transaction_835:
             entity_code = self._get_element(segment, 1)
-            name = self._get_element(segment, 2)
+            name = state.symbols.intern(self._get_element(segment, 2))
             
             try:
                 entity_enum = EntityCode(entity_code)
                 if entity_enum == EntityCode.PAYER:
                     state.current_transaction_835.payer = Payer(name=name)
                 elif entity_enum == EntityCode.PAYEE:
-                    state.current_transaction_835.payee = Payee(name=name, npi="", tax_id="")
+                    # N103/N104 identify the payee by NPI (XX) or tax ID (FI)
+                    id_qualifier = self._get_element(segment, 3)
+                    identifier = state.symbols.intern(self._get_element(segment, 4))
+                    state.current_transaction_835.payee = Payee(
+                        name=name,
+                        npi=identifier if id_qualifier == "XX" else "",
+                        tax_id=identifier if id_qualifier == "FI" else "",
+                    )
             except ValueError:
                 logger.debug(f"Unknown entity code: {entity_code}")
 
@@ -514,7 +639,7 @@ class Parser835(BaseParser):
 
     def _handle_ref(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle REF (Reference Information) segment."""
-        reference_qualifier = self._get_element(segment, 1)
+        reference_qualifier = state.symbols.intern(self._get_element(segment, 1))
         reference_value = self._get_element(segment, 2)
         
         if not reference_value:
@@ -525,9 +650,9 @@ class Parser835(BaseParser):
             
             if ref_enum == RefQualifier.TAX_ID and state.current_transaction_835 and state.current_transaction_835.payee:
                 # Fix: REF*TJ is Tax ID, not NPI
-                state.current_transaction_835.payee.tax_id = reference_value
+                state.current_transaction_835.payee.tax_id = state.symbols.intern(reference_value)
             elif ref_enum == RefQualifier.NPI and state.current_transaction_835 and state.current_transaction_835.payee:
-                state.current_transaction_835.payee.npi = reference_value
+                state.current_transaction_835.payee.npi = state.symbols.intern(reference_value)
             elif state.current_transaction_835:
                 # Generic reference
                 state.current_transaction_835.reference_numbers.append({
@@ -547,20 +672,24 @@ class Parser835(BaseParser):
         if state.current_transaction_835:
             state.current_claim = Claim(
                 claim_id=self._get_element(segment, 1),
-                status_code=self._get_element(segment, 2),
-                total_charge=self._safe_float(self._get_element(segment, 3)),
-                total_paid=self._safe_float(self._get_element(segment, 4)),
-                patient_responsibility=self._safe_float(self._get_element(segment, 5)),
+                status_code=state.symbols.intern(self._get_element(segment, 2)),
+                total_charge=parse_amount(self._get_element(segment, 3)),
+                total_paid=parse_amount(self._get_element(segment, 4)),
+                patient_responsibility=parse_amount(self._get_element(segment, 5)),
                 payer_control_number=self._get_element(segment, 7),
             )
             state.current_transaction_835.claims.append(state.current_claim)
+            if state.track_nodes:
+                state.open_claim = state.current_claim
+                state.claim_index += 1
 
     def _handle_cas(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle CAS (Claim Adjustment) segment with multiple triplets."""
         if not state.current_claim:
             return
             
-        group_code = self._get_element(segment, 1)
+        symbols = state.symbols
+        group_code = symbols.intern(self._get_element(segment, 1))
         
         # Parse all triplets in the segment
         triplets = self.utilities.parse_cas_triplets(segment, start_index=2)
@@ -569,7 +698,7 @@ class Parser835(BaseParser):
             if triplet["reason_code"]:
                 adjustment = Adjustment(
                     group_code=group_code,
-                    reason_code=triplet["reason_code"],
+                    reason_code=symbols.intern(triplet["reason_code"]),
                     amount=triplet["amount"],
                     quantity=triplet["quantity"],  # Can be None now
                 )
@@ -580,9 +709,10 @@ class Parser835(BaseParser):
         if not state.current_claim:
             return
             
-        service_code_raw = self._get_element(segment, 1)
-        charge_amount = self._safe_float(self._get_element(segment, 2))
-        paid_amount = self._safe_float(self._get_element(segment, 3))
+        symbols = state.symbols
+        service_code_raw = symbols.intern(self._get_element(segment, 1))
+        charge_amount = parse_amount(self._get_element(segment, 2))
+        paid_amount = parse_amount(self._get_element(segment, 3))
         
         # Parse composite service code (use ':' as default separator for service codes)
         separator = ':' if ':' in service_code_raw else state.component_separator
@@ -598,20 +728,22 @@ class Parser835(BaseParser):
         
         # Add parsed components as attributes
         if "procedure_code" in service_code_parts:
-            service.procedure_code = service_code_parts["procedure_code"]
+            service.procedure_code = symbols.intern(service_code_parts["procedure_code"])
         if "modifier1" in service_code_parts:
-            service.modifier1 = service_code_parts["modifier1"]
+            service.modifier1 = symbols.intern(service_code_parts["modifier1"])
         if "modifier2" in service_code_parts:
-            service.modifier2 = service_code_parts["modifier2"]
+            service.modifier2 = symbols.intern(service_code_parts["modifier2"])
             
         state.current_claim.services.append(service)
+        if state.track_nodes and state.current_claim is state.open_claim:
+            state.open_service = service
 
     def _handle_svd(self, segment: List[str], state: ParseState, segment_index: int):
         """Handle SVD (Service Line Adjudication Information) segment."""
         if state.current_claim and state.current_claim.services:
             # SVD provides additional adjudication info for the last service
             service = state.current_claim.services[-1]
-            adjudicated_amount = self._safe_float(self._get_element(segment, 2))
+            adjudicated_amount = parse_amount(self._get_element(segment, 2))
             
             # Add adjudication information
             if not hasattr(service, 'adjudication_info'):
@@ -623,8 +755,8 @@ class Parser835(BaseParser):
         if not state.current_transaction_835:
             return
             
-        provider_id = self._get_element(segment, 1)
-        fiscal_period_date = self._get_element(segment, 2)
+        provider_id = state.symbols.intern(self._get_element(segment, 1))
+        fiscal_period_date = state.symbols.intern(self._get_element(segment, 2))
         
         # Initialize PLB list if not exists
         if not hasattr(state.current_transaction_835, 'plb'):
@@ -633,13 +765,13 @@ class Parser835(BaseParser):
         # Parse adjustment pairs (reason code, reference, amount)
         index = 3
         while index + 2 < len(segment):
-            reason_code = self._get_element(segment, index)
+            reason_code = state.symbols.intern(self._get_element(segment, index))
             reference = self._get_element(segment, index + 1)
             amount_str = self._get_element(segment, index + 2)
             
             if reason_code and amount_str:
-                try:
-                    amount = float(amount_str)
+                amount = parse_amount(amount_str, None)
+                if amount is not None:
                     plb_adjustment = {
                         "provider_npi": provider_id,
                         "fiscal_period_date": fiscal_period_date,
@@ -648,8 +780,6 @@ class Parser835(BaseParser):
                         "amount": amount
                     }
                     state.current_transaction_835.plb.append(plb_adjustment)
-                except ValueError:
-                    pass
             
             index += 3
 
@@ -661,6 +791,59 @@ class Parser835(BaseParser):
                 state.current_claim.line_numbers = []
             state.current_claim.line_numbers.append(line_number)
 
+    def _close_nodes(self, segment_id: str, state: ParseState):
+        """Close the nodes that the segment about to be handled ends."""
+        if segment_id in _CLOSES_TRANSACTION:
+            self._close_transaction(state)
+        elif segment_id in _CLOSES_CLAIM:
+            self._close_claim(state)
+        elif segment_id in _CLOSES_SERVICE:
+            self._close_service(state)
+
+    def _close_service(self, state: ParseState):
+        """Report the open service line to the listener."""
+        service = state.open_service
+        if service is None:
+            return
+        state.open_service = None
+        if self.listener is not None:
+            claim = state.open_claim
+            path = (f"{state.transaction_path}.claims[{state.claim_index}]"
+                    f".services[{len(claim.services) - 1}]")
+            self.listener.on_service(service, claim, path)
+
+    def _close_claim(self, state: ParseState):
+        """Report the open claim to the listener, then release it if claims are not retained."""
+        self._close_service(state)
+        claim = state.open_claim
+        if claim is None:
+            return
+        state.open_claim = None
+        if self.listener is not None:
+            self.listener.on_claim(claim, f"{state.transaction_path}.claims[{state.claim_index}]")
+        
+        if not self.retain_claims and state.current_transaction_835:
+            claims = state.current_transaction_835.claims
+            if claims and claims[-1] is claim:
+                claims.pop()
+                if claim.total_paid is not None:
+                    state.released_paid += claim.total_paid
+                    if state.released_cents is not None:
+                        cents = to_cents(claim.total_paid)
+                        state.released_cents = None if cents is None else state.released_cents + cents
+            if state.current_claim is claim:
+                state.current_claim = None
+
+    def _close_transaction(self, state: ParseState):
+        """Report the open transaction set to the listener."""
+        self._close_claim(state)
+        transaction = state.open_transaction
+        if transaction is None:
+            return
+        state.open_transaction = None
+        if self.listener is not None:
+            self.listener.on_transaction(transaction, state.transaction_path)
+
     def _perform_balancing_checks(self, state: ParseState):
         """Perform financial balancing and validation checks."""
         if not state.current_transaction_835:
@@ -670,27 +853,34 @@ class Parser835(BaseParser):
         if not financial_info:
             return
             
-        # Calculate total claim payments
-        total_claim_payments = sum(
-            claim.total_paid for claim in state.current_transaction_835.claims
-            if claim.total_paid is not None
-        )
+        claims = state.current_transaction_835.claims
+        plbs = getattr(state.current_transaction_835, 'plb', None) or []
+        bpr_total = financial_info.total_paid or 0
         
-        # Calculate total PLB adjustments
-        total_plb_adjustments = 0
-        if hasattr(state.current_transaction_835, 'plb') and state.current_transaction_835.plb:
-            total_plb_adjustments = sum(
-                plb["amount"] for plb in state.current_transaction_835.plb
-                if plb["amount"] is not None
-            )
+        # Balance in integer cents so the check is exact
+        bpr_cents = to_cents(bpr_total)
+        claim_cents = sum_cents(claim.total_paid for claim in claims)
+        if claim_cents is not None:
+            claim_cents = None if state.released_cents is None else claim_cents + state.released_cents
+        plb_cents = sum_cents(plb["amount"] for plb in plbs)
         
-        # Check balance
-        bpr_total = financial_info.total_paid or 0
-        calculated_total = total_claim_payments + total_plb_adjustments
-        balance_delta = bpr_total - calculated_total
+        if bpr_cents is not None and claim_cents is not None and plb_cents is not None:
+            calculated_total = (claim_cents + plb_cents) / 100
+            delta_cents = bpr_cents - claim_cents - plb_cents
+            out_of_balance = abs(delta_cents) > 1
+            balance_delta = delta_cents / 100
+        else:
+            # Sub-cent amounts: fall back to float arithmetic
+            calculated_total = (
+                sum(claim.total_paid for claim in claims if claim.total_paid is not None)
+                + state.released_paid
+                + sum(plb["amount"] for plb in plbs if plb["amount"] is not None)
+            )
+            balance_delta = bpr_total - calculated_total
+            out_of_balance = abs(balance_delta) > 0.01
         
         # Set balance flags
-        state.current_transaction_835.out_of_balance = abs(balance_delta) > 0.01
+        state.current_transaction_835.out_of_balance = out_of_balance
         state.current_transaction_835.balance_delta = balance_delta
         
         if state.current_transaction_835.out_of_balance:
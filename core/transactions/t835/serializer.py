@@ -0,0 +1,93 @@
+"""
+EDI 835 serializer.
+
+Writes the segments of a Transaction835 between ST and SE in 005010X221A1
+order. The AST does not keep every element of the source file, so only
+the values it carries are written back (e.g. CLP06 is left empty).
+"""
+
+from itertools import groupby
+from typing import Any, Dict, List
+
+from ...utils.formatters import to_edi_date
+from .ast import Claim, Transaction835
+
+# CAS and PLB repeat their adjustment element groups at most six times
+_MAX_REPEATS = 6
+
+
+def write_835(writer: Any, transaction: Transaction835):
+    """
+    Write an 835 transaction body with an X12Writer.
+
+    Args:
+        writer: core.streaming.writer.X12Writer with the ST already written
+        transaction: The 835 AST
+    """
+    segment = writer.segment
+
+    info = transaction.financial_information
+    if info:
+        segment("BPR", "I", info.total_paid, "C", info.payment_method,
+                *[""] * 11, to_edi_date(info.payment_date))
+
+    for reference in transaction.reference_numbers:
+        if reference.get("type") == "trace_number":
+            segment("TRN", "1", reference.get("value"))
+    for reference in transaction.reference_numbers:
+        if reference.get("type") != "trace_number":
+            segment("REF", reference.get("type"), reference.get("value"))
+    for date in transaction.dates:
+        segment("DTM", date.get("qualifier"), to_edi_date(date.get("date")))
+
+    if transaction.payer:
+        segment("N1", "PR", transaction.payer.name)
+        for contact in getattr(transaction, "contacts", []):
+            segment("PER", contact.get("function"), contact.get("name"))
+    payee = transaction.payee
+    if payee:
+        if payee.npi:
+            segment("N1", "PE", payee.name, "XX", payee.npi)
+        else:
+            segment("N1", "PE", payee.name)
+        if payee.tax_id:
+            segment("REF", "TJ", payee.tax_id)
+
+    if transaction.claims:
+        segment("LX", "1")
+        for claim in transaction.claims:
+            _write_claim(writer, claim)
+
+    _write_plb(writer, transaction.plb)
+
+
+def _write_claim(writer: Any, claim: Claim):
+    segment = writer.segment
+    segment("CLP", claim.claim_id, claim.status_code, claim.total_charge, claim.total_paid,
+            claim.patient_responsibility, "", claim.payer_control_number)
+
+    for group_code, adjustments in groupby(claim.adjustments, key=lambda adjustment: adjustment.group_code):
+        adjustments = list(adjustments)
+        for start in range(0, len(adjustments), _MAX_REPEATS):
+            elements: List[Any] = []
+            for adjustment in adjustments[start:start + _MAX_REPEATS]:
+                quantity = adjustment.quantity
+                elements += [adjustment.reason_code, adjustment.amount,
+                             "" if quantity is None else f"{quantity:g}"]
+            segment("CAS", group_code, *elements)
+
+    for service in claim.services:
+        segment("SVC", service.service_code, service.charge_amount, service.paid_amount)
+        if service.service_date:
+            segment("DTM", "472", to_edi_date(service.service_date))
+
+
+def _write_plb(writer: Any, adjustments: List[Dict[str, Any]]):
+    key = lambda adjustment: (adjustment.get("provider_npi"), adjustment.get("fiscal_period_date"))
+    for (provider, fiscal_date), entries in groupby(adjustments, key=key):
+        entries = list(entries)
+        for start in range(0, len(entries), _MAX_REPEATS):
+            elements: List[Any] = []
+            for entry in entries[start:start + _MAX_REPEATS]:
+                elements += [(entry.get("reason"), entry.get("reference")), entry.get("amount")]
+            writer.segment("PLB", provider, to_edi_date(fiscal_date), *elements)
@@ -9,6 +9,7 @@ from typing import Dict, List, Any, Optional
 from ...base.validation import ValidationRule, ValidationError, ValidationSeverity, ValidationCategory, BusinessRule
 from ...base.edi_ast import EdiRoot
 from ...utils import validate_npi
+from ...utils.dates import parse_date
 import logging
 
 logger = logging.getLogger(__name__)
@@ -204,42 +205,31 @@ class Date835ValidationRule(BusinessRule):
     def _validate_dates(self, edi_root: EdiRoot, context: Dict[str, Any]) -> bool:
         """Validate date information."""
         try:
-            from datetime import datetime
+            from datetime import date
             
             for interchange in edi_root.interchanges:
                 # Validate interchange date
-                try:
-                    interchange_date = datetime.strptime(interchange.header['date'], '%Y-%m-%d')
-                except ValueError:
+                if parse_date(interchange.header['date'], '%Y-%m-%d') is None:
                     return False
                 
                 for fg in interchange.functional_groups:
                     # Validate functional group date
-                    try:
-                        fg_date = datetime.strptime(fg.header['date'], '%Y-%m-%d')
-                    except ValueError:
+                    if parse_date(fg.header['date'], '%Y-%m-%d') is None:
                         return False
                     
                     for transaction in fg.transactions:
                         if transaction.financial_information:
                             # Validate payment date
-                            try:
-                                payment_date = datetime.strptime(
-                                    transaction.financial_information.payment_date, '%Y-%m-%d'
-                                )
-                            except ValueError:
+                            if parse_date(transaction.financial_information.payment_date, '%Y-%m-%d') is None:
                                 return False
                         
                         # Validate service dates
                         for claim in transaction.claims:
                             for service in claim.services:
                                 if service.service_date:
-                                    try:
-                                        service_date = datetime.strptime(service.service_date, '%Y-%m-%d')
-                                        # Service date should not be in the future
-                                        if service_date > datetime.now():
-                                            return False
-                                    except ValueError:
+                                    service_date = parse_date(service.service_date, '%Y-%m-%d')
+                                    # Service date should not be in the future
+                                    if service_date is None or service_date > date.today():
                                         return False
             
             return True
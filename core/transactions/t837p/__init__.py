@@ -1,7 +1,7 @@
 """
 EDI 837P (Professional Healthcare Claim) Transaction Processing.
 
-This module provides AST definitions and parser
+This module provides AST definitions, parser and X12 serializer
 specific to EDI 837P Professional Healthcare Claim transactions.
 """
 
@@ -18,6 +18,7 @@ from .ast import (
     RenderingProviderInfo
 )
 from .parser import Parser837P
+from .serializer import write_837p
 
 __all__ = [
     'Transaction837P',
@@ -30,5 +31,6 @@ __all__ = [
     'ServiceLine837P',
     'DiagnosisInfo',
     'RenderingProviderInfo',
-    'Parser837P'
+    'Parser837P',
+    'write_837p'
 ]
\ No newline at end of file
@@ -60,29 +60,7 @@ class Parser837P(BaseParser):
                 control_number=self.transaction.header.get("transaction_set_control_number", "0001"),
                 transaction_data=self.transaction
             )
-            
-            functional_group = FunctionalGroup(
-                functional_group_code="HC",
-                sender_id="SENDER",
-                receiver_id="RECEIVER", 
-                date="20240101",
-                time="1200",
-                control_number="1"
-            )
-            functional_group.transactions = [transaction]
-            
-            interchange = Interchange(
-                sender_id="SENDER",
-                receiver_id="RECEIVER",
-                date="20240101", 
-                time="1200",
-                control_number="1"
-            )
-            interchange.functional_groups = [functional_group]
-            
-            root = EdiRoot()
-            root.interchanges = [interchange]
-            return root
+            return self._wrap(transaction)
             
         except Exception as e:
             logger.error(f"Error parsing 837P transaction: {e}")
@@ -92,28 +70,38 @@ class Parser837P(BaseParser):
                 control_number="0001",
                 transaction_data=Transaction837P(header={})
             )
-            functional_group = FunctionalGroup(
-                functional_group_code="HC",
-                sender_id="SENDER",
-                receiver_id="RECEIVER",
-                date="20240101",
-                time="1200", 
-                control_number="1"
-            )
-            functional_group.transactions = [transaction]
-            
-            interchange = Interchange(
-                sender_id="SENDER",
-                receiver_id="RECEIVER",
-                date="20240101",
-                time="1200",
-                control_number="1"
-            )
-            interchange.functional_groups = [functional_group]
-            
-            root = EdiRoot()
-            root.interchanges = [interchange]
-            return root
+            return self._wrap(transaction)
+    
+    def _wrap(self, transaction: Transaction) -> EdiRoot:
+        """Wrap a transaction in the ISA/GS envelope of the segments, or a placeholder one."""
+        isa = self._find_segment("ISA")
+        gs = self._find_segment("GS")
+        
+        def element(segment: Optional[List[str]], position: int, default: str) -> str:
+            return segment[position] if segment and len(segment) > position else default
+        
+        functional_group = FunctionalGroup(
+            functional_group_code=element(gs, 1, "HC"),
+            sender_id=element(gs, 2, "SENDER"),
+            receiver_id=element(gs, 3, "RECEIVER"),
+            date=element(gs, 4, "20240101"),
+            time=element(gs, 5, "1200"),
+            control_number=element(gs, 6, "1")
+        )
+        functional_group.transactions = [transaction]
+        
+        interchange = Interchange(
+            sender_id=element(isa, 6, "SENDER").strip(),
+            receiver_id=element(isa, 8, "RECEIVER").strip(),
+            date=element(isa, 9, "20240101"),
+            time=element(isa, 10, "1200"),
+            control_number=element(isa, 13, "1")
+        )
+        interchange.functional_groups = [functional_group]
+        
+        root = EdiRoot()
+        root.interchanges = [interchange]
+        return root
     
     def get_transaction_codes(self) -> List[str]:
         """Get the transaction codes this parser supports."""
@@ -0,0 +1,109 @@
+"""
+EDI 837P serializer.
+
+Writes the segments of a Transaction837P between ST and SE in 005010X222A1
+order: submitter and receiver, then the billing provider, subscriber and
+(optional) patient hierarchical levels, the claim and its service lines.
+"""
+
+from typing import Any, Dict, Optional
+
+from .ast import Transaction837P
+
+# HI carries at most twelve diagnosis composites
+_MAX_DIAGNOSES = 12
+
+
+def write_837p(writer: Any, transaction: Transaction837P):
+    """
+    Write an 837P transaction body with an X12Writer.
+
+    Args:
+        writer: core.streaming.writer.X12Writer with the ST already written
+        transaction: The 837P AST
+    """
+    segment = writer.segment
+    header = transaction.header
+    segment("BHT", header.get("hierarchical_structure_code", "0019"),
+            header.get("transaction_set_purpose_code", "00"), header.get("reference_identification"),
+            header.get("date"), header.get("time"), header.get("transaction_type_code", "CH"))
+
+    submitter = transaction.submitter
+    if submitter:
+        segment("NM1", submitter.entity_identifier_code, "2", submitter.name, "", "", "", "",
+                submitter.id_code_qualifier, submitter.id_code)
+        contacts = []
+        if submitter.contact_phone:
+            contacts += ["TE", submitter.contact_phone]
+        if submitter.contact_email:
+            contacts += ["EM", submitter.contact_email]
+        if submitter.contact_name or contacts:
+            segment("PER", "IC", submitter.contact_name, *contacts)
+    receiver = transaction.receiver
+    if receiver:
+        segment("NM1", receiver.entity_identifier_code, "2", receiver.name, "", "", "", "",
+                receiver.id_code_qualifier, receiver.id_code)
+
+    billing = transaction.billing_provider
+    subscriber = transaction.subscriber
+    patient = transaction.patient
+
+    segment("HL", "1", "", "20", "1")
+    if billing:
+        segment("NM1", billing.entity_identifier_code, "2", billing.name, "", "", "", "",
+                billing.id_code_qualifier, billing.npi)
+        _write_address(writer, billing.address)
+        if billing.tax_id:
+            segment("REF", billing.tax_id_qualifier, billing.tax_id)
+
+    segment("HL", "2", "1", "22", "1" if patient else "0")
+    if subscriber:
+        segment("SBR", subscriber.payer_responsibility_code, "" if patient else "18")
+        segment("NM1", "IL", "1", subscriber.last_name, subscriber.first_name, subscriber.middle_name,
+                "", subscriber.name_suffix, subscriber.id_code_qualifier, subscriber.member_id)
+        _write_address(writer, subscriber.address)
+        _write_demographics(writer, subscriber.date_of_birth, subscriber.gender)
+
+    if patient:
+        segment("HL", "3", "2", "23", "0")
+        segment("PAT", patient.relationship_code)
+        segment("NM1", "QC", "1", patient.last_name, patient.first_name, patient.middle_name,
+                "", patient.name_suffix)
+        _write_address(writer, patient.address)
+        _write_demographics(writer, patient.date_of_birth, patient.gender)
+
+    claim = transaction.claim
+    if claim:
+        segment("CLM", claim.claim_id, claim.total_charge, "", "", claim.place_of_service_code,
+                claim.signature_indicator, claim.medicare_assignment, claim.benefits_assignment,
+                claim.release_of_info)
+        diagnoses = transaction.diagnoses
+        for start in range(0, len(diagnoses), _MAX_DIAGNOSES):
+            segment("HI", *[(diagnosis.qualifier, diagnosis.code)
+                            for diagnosis in diagnoses[start:start + _MAX_DIAGNOSES]])
+
+        rendering = transaction.rendering_provider
+        if rendering:
+            segment("NM1", rendering.entity_identifier_code, "1", rendering.name, "", "", "", "",
+                    rendering.id_code_qualifier, rendering.npi)
+
+        for line in transaction.service_lines:
+            segment("LX", line.line_number)
+            segment("SV1", ("HC", line.procedure_code, *line.procedure_modifiers), line.charge_amount,
+                    "UN", f"{line.units:g}", "", "", tuple(line.diagnosis_pointers),
+                    line.emergency_indicator)
+
+
+def _write_address(writer: Any, address: Optional[Dict[str, str]]):
+    if not address:
+        return
+    if address.get("address_line_1"):
+        writer.segment("N3", address.get("address_line_1"), address.get("address_line_2"))
+    if address.get("city") or address.get("postal_code"):
+        writer.segment("N4", address.get("city"), address.get("state"), address.get("postal_code"),
+                       address.get("country_code"))
+
+
+def _write_demographics(writer: Any, date_of_birth: Optional[str], gender: Optional[str]):
+    if date_of_birth or gender:
+        writer.segment("DMG", "D8", date_of_birth, gender)
@@ -5,14 +5,22 @@ This module provides shared utilities that are used across multiple
 parsers and plugins to eliminate code duplication.
 """
 
-from .formatters import format_edi_date, format_edi_time
+from .formatters import format_edi_date, format_edi_time, to_edi_date, to_edi_time
 from .helpers import get_element, safe_float, safe_int, parse_segment_header
 from .validators import validate_npi, validate_amount_format, validate_date_format, validate_control_number
+from .identifiers import (
+    luhn_valid, is_valid_npi, validate_npis, validate_eins, validate_control_numbers, IdentifierValidator
+)
+from .interning import SymbolTable, intern_segment_id
+from .dates import parse_edi_date, parse_date, parse_date_column, days_since_column, is_valid_edi_date
+from .money import Amount, parse_amount, format_amount, to_cents, to_decimal, sum_cents, cents_to_decimal
 
 __all__ = [
     # Formatters
     'format_edi_date',
     'format_edi_time',
+    'to_edi_date',
+    'to_edi_time',
     
     # Helpers
     'get_element',
@@ -24,5 +32,33 @@ __all__ = [
     'validate_npi',
     'validate_amount_format',
     'validate_date_format',
-    'validate_control_number'
+    'validate_control_number',
+
+    # Identifiers
+    'luhn_valid',
+    'is_valid_npi',
+    'validate_npis',
+    'validate_eins',
+    'validate_control_numbers',
+    'IdentifierValidator',
+
+    # Interning
+    'SymbolTable',
+    'intern_segment_id',
+
+    # Dates
+    'parse_edi_date',
+    'parse_date',
+    'parse_date_column',
+    'days_since_column',
+    'is_valid_edi_date',
+
+    # Money
+    'Amount',
+    'parse_amount',
+    'format_amount',
+    'to_cents',
+    'to_decimal',
+    'sum_cents',
+    'cents_to_decimal'
 ]
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Memoized date parsing for EDI date elements.
+
+Remittances repeat the same few dozen service, statement and check dates
+across thousands of segments, so parsed values are cached per distinct
+string. CCYYMMDD, YYMMDD, MMDDYY, MMDDCCYY and ISO (YYYY-MM-DD) strings
+are parsed by slicing rather than ``datetime.strptime``; ``date()`` still
+checks that the calendar date exists.
+
+Columnar helpers parse each distinct value of a column once and map the
+results back, which is the fast path for aging and validation over
+millions of service lines.
+"""
+
+from bisect import bisect_left
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# strptime formats with an equivalent slicing parser. Two-digit-year
+# formats are left to strptime, whose century pivot differs from the EDI one.
+_STRPTIME_FORMATS = {
+    "%Y%m%d": "CCYYMMDD",
+    "%m%d%Y": "MMDDCCYY",
+    "%Y-%m-%d": "ISO",
+}
+
+# Aging bucket upper bounds in days; anything older falls in the last bucket
+AGING_BUCKETS: Tuple[Tuple[str, int], ...] = (
+    ("0-30", 30),
+    ("31-60", 60),
+    ("61-90", 90),
+    ("91-120", 120),
+)
+AGING_OVERFLOW_BUCKET = "120+"
+
+
+def _year_from_yy(yy: int) -> int:
+    # Sliding window used by format_edi_date: 00-29 = 20xx, 30-99 = 19xx
+    return 2000 + yy if yy <= 29 else 1900 + yy
+
+
+@lru_cache(maxsize=8192)
+def parse_edi_date(date_str: str, input_format: str = "CCYYMMDD") -> Optional[date]:
+    """
+    Parse an EDI date string into a date.
+
+    Args:
+        date_str: Date string
+        input_format: "CCYYMMDD", "YYMMDD", "MMDDYY", "MMDDCCYY" or "ISO"
+
+    Returns:
+        The date, or None if the string is malformed or not a calendar date
+
+    Examples:
+        >>> parse_edi_date("20241226")
+        datetime.date(2024, 12, 26)
+        >>> parse_edi_date("20240230") is None
+        True
+    """
+    if not date_str or not isinstance(date_str, str):
+        return None
+    text = date_str.strip()
+    length = len(text)
+
+    try:
+        if input_format == "ISO":
+            if length != 10 or text[4] != "-" or text[7] != "-":
+                return None
+            digits = text[0:4] + text[5:7] + text[8:10]
+            if not (digits.isascii() and digits.isdigit()):
+                return None
+            return date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+
+        if not (text.isascii() and text.isdigit()):
+            return None
+        if input_format == "CCYYMMDD" and length == 8:
+            return date(int(text[0:4]), int(text[4:6]), int(text[6:8]))
+        if input_format == "YYMMDD" and length == 6:
+            return date(_year_from_yy(int(text[0:2])), int(text[2:4]), int(text[4:6]))
+        if input_format == "MMDDYY" and length == 6:
+            return date(_year_from_yy(int(text[4:6])), int(text[0:2]), int(text[2:4]))
+        if input_format == "MMDDCCYY" and length == 8:
+            return date(int(text[4:8]), int(text[0:2]), int(text[2:4]))
+    except ValueError:
+        return None
+    return None
+
+
+def is_valid_edi_date(date_str: str, input_format: str = "CCYYMMDD") -> bool:
+    """Return True if the string is a real calendar date in the given EDI format."""
+    return parse_edi_date(date_str, input_format) is not None
+
+
+@lru_cache(maxsize=8192)
+def parse_date(date_str: str, format_str: str = "%Y-%m-%d") -> Optional[date]:
+    """
+    Parse a date with a strptime format, memoized.
+
+    Common EDI formats are parsed by slicing; strings the fast path rejects
+    (and other formats) go through ``datetime.strptime`` so results match it.
+
+    Args:
+        date_str: Date string
+        format_str: strptime format
+
+    Returns:
+        The date, or None if the string does not match the format
+    """
+    if not isinstance(date_str, str):
+        return None
+    edi_format = _STRPTIME_FORMATS.get(format_str)
+    if edi_format is not None:
+        parsed = parse_edi_date(date_str, edi_format)
+        if parsed is not None:
+            return parsed
+    try:
+        return datetime.strptime(date_str, format_str).date()
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_date_column(values: Iterable[Optional[str]], input_format: str = "CCYYMMDD") -> List[Optional[date]]:
+    """
+    Parse a column of EDI date strings, parsing each distinct value once.
+
+    Args:
+        values: Date strings (None and empty values map to None)
+        input_format: EDI date format of every value
+
+    Returns:
+        Dates in the same order as ``values``
+    """
+    parsed: Dict[Optional[str], Optional[date]] = {}
+    result = []
+    for value in values:
+        try:
+            result.append(parsed[value])
+        except KeyError:
+            parsed[value] = parse_edi_date(value, input_format) if value else None
+            result.append(parsed[value])
+    return result
+
+
+def days_since_column(values: Iterable[Optional[str]], reference: Optional[date] = None,
+                      input_format: str = "CCYYMMDD") -> List[Optional[int]]:
+    """
+    Age in days of each date in a column relative to ``reference``.
+
+    Args:
+        values: Date strings
+        reference: Date to measure from (default: today)
+        input_format: EDI date format of every value
+
+    Returns:
+        Whole days between each date and ``reference``, None for invalid dates
+    """
+    reference_ordinal = (reference or date.today()).toordinal()
+    ages: Dict[Optional[str], Optional[int]] = {}
+    result = []
+    for value in values:
+        try:
+            result.append(ages[value])
+        except KeyError:
+            parsed = parse_edi_date(value, input_format) if value else None
+            ages[value] = reference_ordinal - parsed.toordinal() if parsed is not None else None
+            result.append(ages[value])
+    return result
+
+
+_BUCKET_BOUNDS = [bound for _, bound in AGING_BUCKETS]
+_BUCKET_NAMES = [name for name, _ in AGING_BUCKETS] + [AGING_OVERFLOW_BUCKET]
+
+
+def aging_bucket(days_old: int) -> str:
+    """Name of the AGING_BUCKETS bucket a claim of this age falls in."""
+    return _BUCKET_NAMES[bisect_left(_BUCKET_BOUNDS, days_old)]
+
@@ -5,10 +5,11 @@ This module provides standardized date and time formatting functions
 that are used across multiple EDI transaction parsers.
 """
 
-import re
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=4096)
 def format_edi_date(date_str: str, input_format: str = "CCYYMMDD") -> str:
     """
     Format EDI date strings to YYYY-MM-DD format.
@@ -18,7 +19,8 @@ def format_edi_date(date_str: str, input_format: str = "CCYYMMDD") -> str:
         input_format: Input format ("CCYYMMDD", "YYMMDD", "MMDDYY", "MMDDCCYY")
         
     Returns:
-        Formatted date string in YYYY-MM-DD format, or original string if invalid
+        Formatted date string in YYYY-MM-DD format, or original string if invalid.
+        Results are memoized, since the same dates repeat throughout a file.
         
     Examples:
         >>> format_edi_date("20241226", "CCYYMMDD")
@@ -90,6 +92,45 @@ def format_edi_time(time_str: str, input_format: str = "HHMM") -> str:
     return time_str
 
 
+@lru_cache(maxsize=4096)
+def to_edi_date(date_str: str, output_format: str = "CCYYMMDD") -> str:
+    """
+    Convert a formatted date back to an EDI date element.
+
+    The inverse of format_edi_date: accepts YYYY-MM-DD (or an EDI date that
+    is already CCYYMMDD) and returns it as CCYYMMDD or YYMMDD.
+
+    Examples:
+        >>> to_edi_date("2024-12-26")
+        "20241226"
+        >>> to_edi_date("2024-12-26", "YYMMDD")
+        "241226"
+    """
+    if not date_str or not date_str.strip():
+        return ""
+
+    digits = date_str.strip().replace("-", "")
+    if len(digits) == 6 and digits.isdigit():
+        century = "20" if int(digits[0:2]) <= 29 else "19"
+        digits = century + digits
+    if output_format == "YYMMDD" and len(digits) == 8:
+        return digits[2:]
+    return digits
+
+
+def to_edi_time(time_str: str) -> str:
+    """
+    Convert a formatted time (HH:MM or HH:MM:SS) back to HHMM or HHMMSS.
+
+    Examples:
+        >>> to_edi_time("14:30")
+        "1430"
+    """
+    if not time_str or not time_str.strip():
+        return ""
+    return time_str.strip().replace(":", "")
+
+
 def format_date_ccyymmdd(date_str: str) -> str:
     """
     Legacy compatibility function for CCYYMMDD format.
@@ -124,6 +165,16 @@ def format_date_yymmdd(date_str: str) -> str:
     return format_edi_date(date_str, "YYMMDD")
 
 
+_FORMAT_LENGTHS = {
+    "CCYYMMDD": 8,
+    "YYMMDD": 6,
+    "MMDDYY": 6,
+    "MMDDCCYY": 8,
+    "HHMM": 4,
+    "HHMMSS": 6
+}
+
+
 def validate_edi_date_format(date_str: str, input_format: str = "CCYYMMDD") -> bool:
     """
     Validate that a date string matches the expected EDI format.
@@ -140,21 +191,11 @@ def validate_edi_date_format(date_str: str, input_format: str = "CCYYMMDD") -> b
     
     date_str = date_str.strip()
     
-    format_patterns = {
-        "CCYYMMDD": (8, r"^\d{8}$"),
-        "YYMMDD": (6, r"^\d{6}$"),
-        "MMDDYY": (6, r"^\d{6}$"),
-        "MMDDCCYY": (8, r"^\d{8}$"),
-        "HHMM": (4, r"^\d{4}$"),
-        "HHMMSS": (6, r"^\d{6}$")
-    }
-    
-    if input_format not in format_patterns:
+    expected_length = _FORMAT_LENGTHS.get(input_format)
+    if expected_length is None:
         return False
     
-    expected_length, pattern = format_patterns[input_format]
-    
-    return len(date_str) == expected_length and bool(re.match(pattern, date_str))
+    return len(date_str) == expected_length and date_str.isascii() and date_str.isdigit()
 
 
 # Legacy function aliases for backward compatibility
@@ -0,0 +1,164 @@
+"""
+Batch validation of NPIs, EINs and control numbers.
+
+The same few provider NPIs and tax IDs recur on thousands of claims, so
+each distinct identifier is checked once: ``is_valid_npi`` is memoized,
+and the column helpers and IdentifierValidator keep the result of every
+value they have seen. The Luhn checksum runs over the identifier's bytes
+with ``bytes.translate`` tables for the digit values and doubled-digit
+values, so summing the digits is done in C rather than per digit in
+Python.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Identifier kinds
+NPI = "npi"
+EIN = "ein"
+CONTROL_NUMBER = "control_number"
+
+# Prefix of every NPI as a card issuer identifier (80 = health, 840 = US);
+# the NPI check digit is computed over the prefixed number
+NPI_PREFIX = "80840"
+
+_DIGITS = b"0123456789"
+# Digit value, and the digit sum of twice the digit
+_VALUE = bytes.maketrans(_DIGITS, bytes(range(10)))
+_DOUBLED = bytes.maketrans(_DIGITS, bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
+
+
+def luhn_valid(digits: str) -> bool:
+    """
+    Whether a string of ASCII digits passes the Luhn checksum.
+
+    The last digit is the check digit; every second digit to its left is
+    doubled.
+    """
+    if not digits or not digits.isascii() or not digits.isdigit():
+        return False
+    data = digits.encode("ascii")
+    return (sum(data[-1::-2].translate(_VALUE)) + sum(data[-2::-2].translate(_DOUBLED))) % 10 == 0
+
+
+@lru_cache(maxsize=65536)
+def is_valid_npi(npi: str) -> bool:
+    """
+    Whether ``npi`` is exactly ten digits with a valid check digit.
+
+    The check digit is the Luhn check digit of the NPI prefixed with
+    ``80840``, as CMS specifies.
+
+    Examples:
+        >>> is_valid_npi("1234567893")
+        True
+        >>> is_valid_npi("1234567890")
+        False
+    """
+    return len(npi) == 10 and luhn_valid(NPI_PREFIX + npi)
+
+
+def normalize_identifier(value: str) -> str:
+    """Strip surrounding whitespace and the spaces and dashes used in formatted IDs."""
+    return value.strip().replace(" ", "").replace("-", "")
+
+
+def check_npi(value: Optional[str]) -> bool:
+    """NPI check on a possibly formatted value."""
+    if not value or not isinstance(value, str):
+        return False
+    return is_valid_npi(normalize_identifier(value))
+
+
+def check_ein(value: Optional[str]) -> bool:
+    """EIN format check: nine digits once dashes and spaces are removed."""
+    if not value or not isinstance(value, str):
+        return False
+    ein = normalize_identifier(value)
+    return len(ein) == 9 and ein.isascii() and ein.isdigit()
+
+
+def check_control_number(value: Optional[str]) -> bool:
+    """Control number format check: one to nine digits."""
+    if not value or not isinstance(value, str):
+        return False
+    control = value.strip()
+    return 1 <= len(control) <= 9 and control.isascii() and control.isdigit()
+
+
+IDENTIFIER_CHECKS: Dict[str, Callable[[Optional[str]], bool]] = {
+    NPI: check_npi,
+    EIN: check_ein,
+    CONTROL_NUMBER: check_control_number,
+}
+
+
+def _check_column(values: Iterable[Optional[str]], check: Callable[[Optional[str]], bool],
+                  seen: Dict[Optional[str], bool]) -> List[bool]:
+    result = []
+    for value in values:
+        try:
+            result.append(seen[value])
+        except KeyError:
+            seen[value] = valid = check(value)
+            result.append(valid)
+        except TypeError:
+            # Unhashable values are never valid identifiers
+            result.append(False)
+    return result
+
+
+def validate_npis(values: Iterable[Optional[str]]) -> List[bool]:
+    """Check a column of NPIs, checking each distinct value once."""
+    return _check_column(values, check_npi, {})
+
+
+def validate_eins(values: Iterable[Optional[str]]) -> List[bool]:
+    """Check a column of EINs, checking each distinct value once."""
+    return _check_column(values, check_ein, {})
+
+
+def validate_control_numbers(values: Iterable[Optional[str]]) -> List[bool]:
+    """Check a column of control numbers, checking each distinct value once."""
+    return _check_column(values, check_control_number, {})
+
+
+class IdentifierValidator:
+    """
+    Identifier checks that remember every value seen during a run.
+
+    Create one per file or job and pass it batches of identifiers; values
+    already checked in an earlier batch are answered from the memo.
+    """
+
+    def __init__(self):
+        self._seen: Dict[str, Dict[Optional[str], bool]] = {kind: {} for kind in IDENTIFIER_CHECKS}
+
+    def validate(self, kind: str, values: Iterable[Optional[str]]) -> List[bool]:
+        """
+        Check a batch of identifiers of one kind.
+
+        Args:
+            kind: ``npi``, ``ein`` or ``control_number``
+            values: Identifiers (None and empty values are invalid)
+
+        Returns:
+            Validity of each value, in order
+        """
+        try:
+            check = IDENTIFIER_CHECKS[kind]
+        except KeyError:
+            raise ValueError(f"Unknown identifier kind: {kind}. Available: {', '.join(IDENTIFIER_CHECKS)}")
+        return _check_column(values, check, self._seen[kind])
+
+    def invalid(self, kind: str, values: Iterable[Optional[str]]) -> List[int]:
+        """Positions of the invalid identifiers in a batch."""
+        return [index for index, valid in enumerate(self.validate(kind, values)) if not valid]
+
+    def is_valid(self, kind: str, value: Optional[str]) -> bool:
+        """Check a single identifier through the memo."""
+        return self.validate(kind, (value,))[0]
+
+    def seen(self, kind: str) -> int:
+        """Number of distinct values of ``kind`` checked so far."""
+        return len(self._seen[kind])
@@ -0,0 +1,89 @@
+"""
+String interning for repeated EDI element values.
+
+Codes such as claim status, adjustment group/reason codes, procedure codes
+and payer/payee identifiers take only a few hundred distinct values even in
+files with millions of segments, yet every split() produces a fresh string.
+A SymbolTable maps each distinct value to one canonical object so the AST
+holds a single copy per value.
+"""
+
+from typing import Dict, Optional
+import sys
+
+
+class SymbolTable:
+    """
+    Bounded pool of canonical strings, typically one per parse.
+
+    Canonical values come from ``sys.intern`` so they are also identical to
+    string literals in code, which lets comparisons such as
+    ``adjustment.group_code == "CO"`` succeed on the identity fast path.
+    Once ``max_size`` symbols are held, new values are returned unchanged,
+    so a column that turns out to be high-cardinality cannot grow the
+    table without bound.
+
+    Example:
+        symbols = SymbolTable()
+        status_code = symbols.intern(segment[2])
+    """
+
+    def __init__(self, max_size: int = 4096, max_length: int = 32):
+        """
+        Initialize the symbol table.
+
+        Args:
+            max_size: Maximum number of distinct values to hold
+            max_length: Longer values are never interned
+        """
+        self.max_size = max_size
+        self.max_length = max_length
+        self._symbols: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        Return the canonical object for a value.
+
+        Args:
+            value: Element value; empty, non-string and over-long values pass through
+
+        Returns:
+            The canonical string equal to ``value``
+        """
+        symbol = self._symbols.get(value)
+        if symbol is not None:
+            self.hits += 1
+            return symbol
+        if not value or not isinstance(value, str) or len(value) > self.max_length:
+            return value
+        self.misses += 1
+        if len(self._symbols) >= self.max_size:
+            return value
+        symbol = sys.intern(value)
+        self._symbols[symbol] = symbol
+        return symbol
+
+    __call__ = intern
+
+    def clear(self):
+        self._symbols.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._symbols
+
+
+def intern_segment_id(segment_id: str) -> str:
+    """
+    Intern a segment identifier.
+
+    Segment IDs come from a small fixed vocabulary, so they are interned
+    globally; this also makes dispatch-table lookups hit on identity.
+    """
+    return sys.intern(segment_id) if len(segment_id) <= 3 else segment_id
@@ -0,0 +1,181 @@
+"""
+Exact monetary amounts for EDI parsing and balancing.
+
+X12 monetary elements (R data type) carry at most two decimal places, so
+they are held as integer cents. An Amount is a float, which keeps every
+existing consumer (arithmetic, JSON output, comparisons) unchanged, and
+additionally carries the exact value in ``cents``. Balancing sums the
+cents, so it is exact without converting each value to Decimal.
+"""
+
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+# float(text) * 100 rounds back to the exact cents below this magnitude
+_EXACT_LIMIT = 1e13
+
+
+class Amount(float):
+    """
+    A float parsed from a monetary element, with its exact value in cents.
+
+    ``cents`` is None when the source text had more than two decimal places
+    (or was written in exponent form); such amounts fall back to Decimal.
+    Arithmetic on an Amount returns a plain float.
+    """
+
+    __slots__ = ("cents", "_decimal")
+
+    def __new__(cls, value: float, cents: Optional[int] = None, decimal: Optional[Decimal] = None):
+        amount = super().__new__(cls, value)
+        amount.cents = cents
+        amount._decimal = decimal
+        return amount
+
+    def to_decimal(self) -> Decimal:
+        """Exact Decimal value, computed once per Amount."""
+        if self._decimal is None:
+            if self.cents is not None:
+                self._decimal = Decimal(self.cents).scaleb(-2)
+            else:
+                self._decimal = Decimal(repr(float(self)))
+        return self._decimal
+
+    def __reduce__(self):
+        return (Amount, (float(self), self.cents, self._decimal))
+
+
+@lru_cache(maxsize=16384)
+def _parse(text: str) -> Amount:
+    value = float(text)
+    digits = text.lstrip("+-")
+    point = digits.find(".")
+    if ((point < 0 or len(digits) - point <= 3)
+            and digits.isascii() and digits.replace(".", "", 1).isdigit()
+            and abs(value) < _EXACT_LIMIT):
+        return Amount(value, round(value * 100))
+    return Amount(value, None, Decimal(text))
+
+
+def parse_amount(value: Any, default: Any = 0.0) -> Any:
+    """
+    Parse a monetary element into an Amount.
+
+    Parsed amounts are cached, so repeated values (common for copays,
+    adjustments and zero amounts) share one object.
+
+    Args:
+        value: Element text
+        default: Returned for empty or invalid values
+
+    Returns:
+        Amount equal to ``float(value)``, or ``default``
+
+    Examples:
+        >>> parse_amount("123.45").cents
+        12345
+        >>> parse_amount("", None) is None
+        True
+    """
+    if value is None or value == "":
+        return default
+    if isinstance(value, Amount):
+        return value
+    try:
+        return _parse(value.strip() if isinstance(value, str) else str(value))
+    except (ValueError, InvalidOperation):
+        return default
+
+
+@lru_cache(maxsize=16384, typed=True)
+def format_amount(value: Any) -> str:
+    """
+    Format an amount as X12 element text.
+
+    Values with an exact cent representation are written with two decimal
+    places; anything finer keeps all of its digits.
+
+    Examples:
+        >>> format_amount(parse_amount("100"))
+        '100.00'
+        >>> format_amount(-0.125)
+        '-0.125'
+    """
+    if value is None or value == "":
+        return ""
+    cents = to_cents(value)
+    if cents is not None:
+        whole, fraction = divmod(abs(cents), 100)
+        return f"{'-' if cents < 0 else ''}{whole}.{fraction:02d}"
+    return format(to_decimal(value), "f")
+
+
+def to_cents(value: Any) -> Optional[int]:
+    """
+    Exact value in cents.
+
+    Args:
+        value: Amount, int, float, Decimal or numeric string
+
+    Returns:
+        Integer cents, or None for None, invalid or sub-cent values
+    """
+    if value is None:
+        return None
+    if isinstance(value, Amount):
+        return value.cents
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        if value != value or abs(value) >= _EXACT_LIMIT:
+            return None
+        cents = round(value * 100)
+        return cents if cents / 100 == value else None
+    if isinstance(value, Decimal):
+        try:
+            cents = value.scaleb(2)
+            return int(cents) if cents == cents.to_integral_value() else None
+        except (InvalidOperation, ValueError, OverflowError):
+            return None
+    amount = parse_amount(value, None)
+    return amount.cents if amount is not None else None
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    Convert a value to Decimal; a faster ``Decimal(str(value))`` for amounts.
+
+    Raises:
+        InvalidOperation: If the value is not numeric
+    """
+    if isinstance(value, Amount):
+        return value.to_decimal()
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def sum_cents(values: Iterable[Any]) -> Optional[int]:
+    """
+    Exact sum of amounts in cents, skipping None.
+
+    Returns:
+        Total cents, or None if any value has no exact cent representation
+    """
+    total = 0
+    for value in values:
+        if value is None:
+            continue
+        cents = to_cents(value)
+        if cents is None:
+            return None
+        total += cents
+    return total
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Decimal amount with two decimal places for an integer cent value."""
+    return Decimal(cents).scaleb(-2)
@@ -6,11 +6,14 @@ across multiple EDI transaction parsers and validation rules.
 """
 
 import re
-from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from typing import Union, Optional, List
 import logging
 
+from .dates import parse_date
+from .identifiers import check_npi, check_ein, check_control_number
+from ..codesets import get_codesets, CARC
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,33 +35,7 @@ def validate_npi(npi: str) -> bool:
         >>> validate_npi("123")  # Wrong length
         False
     """
-    if not npi or not isinstance(npi, str):
-        return False
-    
-    # Remove any spaces or formatting
-    npi = npi.strip().replace(" ", "").replace("-", "")
-    
-    # NPI must be exactly 10 digits
-    if len(npi) != 10 or not npi.isdigit():
-        return False
-    
-    # Apply Luhn algorithm
-    try:
-        total = 0
-        for i, digit in enumerate(npi):
-            n = int(digit)
-            # Double every second digit from right (odd positions in 0-indexed)
-            if i % 2 == 0:
-                n *= 2
-                # If doubling results in two digits, add them together
-                if n > 9:
-                    n = n // 10 + n % 10
-            total += n
-        
-        # Valid if total is divisible by 10
-        return total % 10 == 0
-    except (ValueError, TypeError):
-        return False
+    return check_npi(npi)
 
 
 def validate_amount_format(amount: Union[str, float, int, Decimal]) -> bool:
@@ -131,11 +108,7 @@ def validate_date_format(date_str: str, format_str: str = "%Y-%m-%d") -> bool:
     if not date_str or not isinstance(date_str, str):
         return False
     
-    try:
-        datetime.strptime(date_str.strip(), format_str)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return parse_date(date_str.strip(), format_str) is not None
 
 
 def validate_control_number(control_num: str) -> bool:
@@ -158,13 +131,7 @@ def validate_control_number(control_num: str) -> bool:
         >>> validate_control_number("abc123")
         False
     """
-    if not control_num or not isinstance(control_num, str):
-        return False
-    
-    control_num = control_num.strip()
-    
-    # Control number should be 1-9 digits
-    return bool(control_num and control_num.isdigit() and 1 <= len(control_num) <= 9)
+    return check_control_number(control_num)
 
 
 def validate_transaction_code(transaction_code: str, valid_codes: Optional[List[str]] = None) -> bool:
@@ -221,13 +188,7 @@ def validate_ein(ein: str) -> bool:
         >>> validate_ein("12-345678")  # Too short
         False
     """
-    if not ein or not isinstance(ein, str):
-        return False
-    
-    ein = ein.strip().replace("-", "").replace(" ", "")
-    
-    # EIN should be exactly 9 digits
-    return len(ein) == 9 and ein.isdigit()
+    return check_ein(ein)
 
 
 def validate_phone_number(phone: str) -> bool:
@@ -358,6 +319,9 @@ def validate_adjustment_reason_code(reason_code: str, group_code: str = None) ->
     """
     Validate adjustment reason code format and value.
     
+    With a compiled CARC code set (see ``core.codesets``) the code must be
+    in it; otherwise the numeric format and group ranges are checked.
+    
     Args:
         reason_code: Reason code to validate
         group_code: Optional group code context (CO, PR, OA, PI)
@@ -376,6 +340,10 @@ def validate_adjustment_reason_code(reason_code: str, group_code: str = None) ->
     
     reason_code = reason_code.strip()
     
+    known = get_codesets().contains(CARC, reason_code)
+    if known is not None:
+        return known
+    
     # Reason codes are typically 1-3 digit numbers
     if not reason_code.isdigit() or len(reason_code) > 3:
         return False
@@ -8,6 +8,7 @@ that integrates with the plugin architecture.
 from .engine import ValidationEngine, ValidationResult, ValidationError
 from .rules import BaseValidationRule, ValidationContext
 from .factory import ValidationRuleFactory
+from .streaming import NodeRule, StreamingValidator, validate_stream
 
 __all__ = [
     'ValidationEngine',
@@ -15,5 +16,8 @@ __all__ = [
     'ValidationError',
     'BaseValidationRule',
     'ValidationContext',
-    'ValidationRuleFactory'
+    'ValidationRuleFactory',
+    'NodeRule',
+    'StreamingValidator',
+    'validate_stream'
 ]
\ No newline at end of file
@@ -15,6 +15,8 @@ from enum import Enum
 
 from ..base.edi_ast import EdiRoot
 from .engine import ValidationError, ValidationSeverity
+from ..utils.money import to_decimal
+from ..utils.dates import parse_date
 
 
 class BusinessRuleSeverity(Enum):
@@ -146,7 +148,7 @@ class FieldValidator:
             return True
         
         try:
-            decimal_value = Decimal(str(value))
+            decimal_value = to_decimal(value)
             
             # Check for reasonable precision (max 2 decimal places for currency)
             if abs(decimal_value.as_tuple().exponent) > 2:
@@ -169,7 +171,9 @@ class FieldValidator:
         date_format = self.parameters.get('format', '%Y%m%d')
         
         try:
-            parsed_date = datetime.strptime(str(value), date_format).date()
+            parsed_date = parse_date(str(value), date_format)
+            if parsed_date is None:
+                return False
             
             # Check date range if specified
             min_date = self.parameters.get('min_date')
@@ -472,7 +476,7 @@ class BusinessRule:
             return None
         
         try:
-            return Decimal(str(value))
+            return to_decimal(value)
         except (InvalidOperation, ValueError):
             return None
     
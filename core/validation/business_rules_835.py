@@ -10,6 +10,7 @@ from datetime import datetime, date
 from typing import Dict, List, Any, Optional
 import re
 
+from ..utils.money import to_decimal, sum_cents, cents_to_decimal
 from .business_engine import (
     BusinessRule, 
     FieldValidator, 
@@ -50,15 +51,19 @@ def create_financial_balance_rule() -> BusinessRule:
             if hasattr(transaction_data, 'financial_information'):
                 fi = transaction_data.financial_information
                 if hasattr(fi, 'total_paid'):
-                    bpr_total = Decimal(str(fi.total_paid))
+                    bpr_total = to_decimal(fi.total_paid)
             
-            # Calculate sum of claim payments
+            # Calculate sum of claim payments, exactly in cents when possible
             claims_total = Decimal('0')
-            if hasattr(transaction_data, 'claims'):
-                for claim in transaction_data.claims:
+            claims = getattr(transaction_data, 'claims', None) or []
+            claims_cents = sum_cents(getattr(claim, 'total_paid', None) for claim in claims)
+            if claims_cents is not None:
+                claims_total = cents_to_decimal(claims_cents)
+            else:
+                for claim in claims:
                     if hasattr(claim, 'total_paid'):
                         try:
-                            claim_paid = Decimal(str(claim.total_paid))
+                            claim_paid = to_decimal(claim.total_paid)
                             claims_total += claim_paid
                         except (ValueError, TypeError):
                             continue
@@ -83,7 +88,7 @@ def create_financial_balance_rule() -> BusinessRule:
                 for plb in transaction_data.plb:
                     if hasattr(plb, 'amount'):
                         try:
-                            plb_amount = Decimal(str(plb.amount))
+                            plb_amount = to_decimal(plb.amount)
                             plb_total += plb_amount
                         except (ValueError, TypeError):
                             continue
@@ -156,13 +161,13 @@ def create_claim_payment_validation_rule() -> BusinessRule:
                     
                     if hasattr(claim, 'total_charge'):
                         try:
-                            total_charge = Decimal(str(claim.total_charge))
+                            total_charge = to_decimal(claim.total_charge)
                         except (ValueError, TypeError):
                             continue
                     
                     if hasattr(claim, 'total_paid'):
                         try:
-                            total_paid = Decimal(str(claim.total_paid))
+                            total_paid = to_decimal(claim.total_paid)
                         except (ValueError, TypeError):
                             continue
                     
@@ -358,13 +363,13 @@ def create_service_line_validation_rule() -> BusinessRule:
                         for service in claim.services:
                             if hasattr(service, 'charge_amount'):
                                 try:
-                                    service_charge_total += Decimal(str(service.charge_amount))
+                                    service_charge_total += to_decimal(service.charge_amount)
                                 except (ValueError, TypeError):
                                     pass
                             
                             if hasattr(service, 'paid_amount'):
                                 try:
-                                    service_paid_total += Decimal(str(service.paid_amount))
+                                    service_paid_total += to_decimal(service.paid_amount)
                                 except (ValueError, TypeError):
                                     pass
                         
@@ -374,13 +379,13 @@ def create_service_line_validation_rule() -> BusinessRule:
                         
                         if hasattr(claim, 'total_charge'):
                             try:
-                                claim_charge = Decimal(str(claim.total_charge))
+                                claim_charge = to_decimal(claim.total_charge)
                             except (ValueError, TypeError):
                                 pass
                         
                         if hasattr(claim, 'total_paid'):
                             try:
-                                claim_paid = Decimal(str(claim.total_paid))
+                                claim_paid = to_decimal(claim.total_paid)
                             except (ValueError, TypeError):
                                 pass
                         
@@ -479,7 +484,7 @@ def create_adjustment_validation_rule() -> BusinessRule:
                             # Validate adjustment amount
                             if hasattr(adjustment, 'amount'):
                                 try:
-                                    adj_amount = Decimal(str(adjustment.amount))
+                                    adj_amount = to_decimal(adjustment.amount)
                                     if adj_amount == 0:
                                         errors.append({
                                             'severity': 'info',
@@ -530,7 +535,7 @@ def create_provider_level_adjustment_rule() -> BusinessRule:
                     # Validate PLB amount
                     if hasattr(plb, 'amount'):
                         try:
-                            plb_amount = Decimal(str(plb.amount))
+                            plb_amount = to_decimal(plb.amount)
                             
                             # Flag unusual PLB amounts
                             if abs(plb_amount) > Decimal('50000'):
@@ -634,7 +639,7 @@ def create_business_logic_rule() -> BusinessRule:
                 fi = transaction_data.financial_information
                 if hasattr(fi, 'total_paid'):
                     try:
-                        total_amount = Decimal(str(fi.total_paid))
+                        total_amount = to_decimal(fi.total_paid)
                         if total_amount > Decimal('100000'):
                             errors.append({
                                 'severity': 'info',
@@ -668,7 +673,7 @@ def create_business_logic_rule() -> BusinessRule:
                 for i, claim in enumerate(transaction_data.claims):
                     if hasattr(claim, 'patient_responsibility'):
                         try:
-                            patient_resp = Decimal(str(claim.patient_responsibility))
+                            patient_resp = to_decimal(claim.patient_responsibility)
                             if patient_resp < 0:
                                 errors.append({
                                     'severity': 'error',
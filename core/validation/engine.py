@@ -5,7 +5,7 @@ This module provides the core validation engine that processes EDI documents
 through registered validation rules and returns detailed validation results.
 """
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Iterable, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -13,6 +13,9 @@ import logging
 
 from ..base.edi_ast import EdiRoot
 from ..plugins.api import ValidationRulePlugin
+from ..telemetry import (
+    get_instrumentation, SPAN_VALIDATE, SPAN_VALIDATE_RULE, HISTOGRAM_VALIDATE, HISTOGRAM_VALIDATE_RULE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +104,14 @@ class ValidationResult:
         elif error.severity == ValidationSeverity.INFO:
             self.info.append(error)
     
+    def merge(self, other: 'ValidationResult'):
+        """Add the findings, rules and time of another result to this one."""
+        for error in other.errors + other.warnings + other.info:
+            self.add_error(error)
+        self.executed_rules.extend(other.executed_rules)
+        self.skipped_rules.extend(other.skipped_rules)
+        self.execution_time_ms += other.execution_time_ms
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary representation."""
         return {
@@ -156,24 +167,44 @@ class ValidationEngine:
         self.disabled_rules.add(rule_name)
         self.enabled_rules.discard(rule_name)
     
-    def validate(self, edi_root: EdiRoot, context: Optional[Dict[str, Any]] = None) -> ValidationResult:
+    def validate(self, edi_root: EdiRoot, context: Optional[Dict[str, Any]] = None,
+                 include_node_rules: bool = True) -> ValidationResult:
         """
         Validate an EDI document using registered rules.
         
         Args:
             edi_root: The EDI document to validate
             context: Additional validation context
+            include_node_rules: Also run NodeRules; pass False when they
+                already ran in a single pass through stream_validator()
             
         Returns:
             ValidationResult with all validation issues found
         """
-        start_time = datetime.now()
-        result = ValidationResult(is_valid=True)
-        validation_context = context or {}
+        instrumentation = get_instrumentation()
+        with instrumentation.timed(SPAN_VALIDATE, HISTOGRAM_VALIDATE):
+            return self._validate(edi_root, context, instrumentation, include_node_rules)
+    
+    def stream_validator(self, context: Optional[Dict[str, Any]] = None,
+                         transaction_codes: Iterable[str] = ("835",)):
+        """
+        Create a node listener that runs the enabled NodeRules in the parse pass.
         
-        # Collect all applicable rules
+        Args:
+            context: Additional validation context
+            transaction_codes: Transaction codes whose rules are included
+            
+        Returns:
+            StreamingValidator to pass to the parser as its listener
+        """
+        from .streaming import NodeRule, StreamingValidator
+        
+        rules = [rule for rule in self.applicable_rules(transaction_codes) if isinstance(rule, NodeRule)]
+        return StreamingValidator(self, rules, context)
+    
+    def applicable_rules(self, transaction_codes: Iterable[str]) -> List[ValidationRulePlugin]:
+        """Enabled global rules followed by the enabled rules for each transaction code."""
         applicable_rules = []
-        transaction_codes = self._extract_transaction_codes(edi_root)
         
         # Add global rules
         for rule in self.global_rules:
@@ -187,13 +218,30 @@ class ValidationEngine:
                     if self._is_rule_enabled(rule.rule_name):
                         applicable_rules.append(rule)
         
+        return applicable_rules
+    
+    def _validate(self, edi_root: EdiRoot, context: Optional[Dict[str, Any]],
+                  instrumentation, include_node_rules: bool = True) -> ValidationResult:
+        """Run every applicable rule, timing each one through the instrumentation."""
+        start_time = datetime.now()
+        result = ValidationResult(is_valid=True)
+        validation_context = context or {}
+        
+        # Collect all applicable rules
+        applicable_rules = self.applicable_rules(self._extract_transaction_codes(edi_root))
+        if not include_node_rules:
+            from .streaming import NodeRule
+            applicable_rules = [rule for rule in applicable_rules if not isinstance(rule, NodeRule)]
+        
         # Execute validation rules
         for rule in applicable_rules:
             try:
                 logger.debug(f"Executing validation rule: {rule.rule_name}")
                 
                 # Execute the rule
-                rule_errors = rule.validate(edi_root, validation_context)
+                with instrumentation.timed(SPAN_VALIDATE_RULE, HISTOGRAM_VALIDATE_RULE,
+                                           {"rule_name": rule.rule_name}):
+                    rule_errors = rule.validate(edi_root, validation_context)
                 
                 # Convert to ValidationError objects
                 for error_dict in rule_errors:
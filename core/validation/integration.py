@@ -10,7 +10,10 @@ import logging
 
 from .engine import ValidationEngine, ValidationResult
 from .factory import create_validation_engine
-from .rules_835 import Transaction835StructureRule, Transaction835DataValidationRule, Transaction835BusinessRule
+from .rules_835 import (
+    Transaction835StructureRule, Transaction835DataValidationRule, Transaction835BusinessRule,
+    Transaction835CodeSetRule
+)
 from ..plugins.api import PluginManager, plugin_registry
 from ..base.edi_ast import EdiRoot
 
@@ -33,6 +36,7 @@ class ValidationIntegrationManager:
         builder.add_rule(Transaction835StructureRule())
         builder.add_rule(Transaction835DataValidationRule())
         builder.add_rule(Transaction835BusinessRule())
+        builder.add_rule(Transaction835CodeSetRule())
         
         logger.info("Created validation engine with built-in rules")
         return builder.build()
@@ -52,13 +56,17 @@ class ValidationIntegrationManager:
         return self._validation_enabled
     
     def parse_and_validate(self, segments: List[List[str]], 
-                          validation_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                          validation_context: Optional[Dict[str, Any]] = None,
+                          single_pass: bool = False) -> Dict[str, Any]:
         """
         Parse EDI segments and validate the result.
         
         Args:
             segments: EDI segments to parse
             validation_context: Optional validation context
+            single_pass: Run NodeRules while the parser closes each node
+                instead of in a second pass over the tree; other rules
+                still run on the parsed document
             
         Returns:
             Dictionary containing parsing and validation results
@@ -71,9 +79,15 @@ class ValidationIntegrationManager:
             'validation_result': None
         }
         
+        listener = None
+        if single_pass and self._validation_enabled:
+            listener = self.validation_engine.stream_validator(
+                validation_context, [self._extract_transaction_code(segments) or ""]
+            )
+        
         # Step 1: Parse the segments
         try:
-            edi_root = self._parse_segments(segments)
+            edi_root = self._parse_segments(segments, listener)
             result['parse_success'] = True
             result['edi_root'] = edi_root
             logger.debug("Successfully parsed EDI segments")
@@ -86,7 +100,16 @@ class ValidationIntegrationManager:
         # Step 2: Validate if enabled
         if self._validation_enabled:
             try:
-                validation_result = self.validation_engine.validate(edi_root, validation_context)
+                if listener is not None:
+                    if not listener.transaction_count:
+                        # The parser emitted no node events
+                        listener.replay(edi_root)
+                    validation_result = listener.finish()
+                    validation_result.merge(self.validation_engine.validate(
+                        edi_root, validation_context, include_node_rules=False
+                    ))
+                else:
+                    validation_result = self.validation_engine.validate(edi_root, validation_context)
                 result['validation_result'] = validation_result
                 logger.debug(f"Validation completed: {validation_result.error_count} errors, "
                            f"{validation_result.warning_count} warnings")
@@ -105,8 +128,24 @@ class ValidationIntegrationManager:
                 result['validation_result'] = error_result
         
         return result
-    
-    def _parse_segments(self, segments: List[List[str]]) -> EdiRoot:
+
+    def parse(self, segments: List[List[str]]) -> EdiRoot:
+        """
+        Parse EDI segments with the matching parser plugin, without validating.
+
+        Args:
+            segments: EDI segments to parse
+
+        Returns:
+            Parsed EdiRoot
+
+        Raises:
+            ValueError: If the segments carry no ST or no plugin handles the
+                transaction set
+        """
+        return self._parse_segments(segments)
+
+    def _parse_segments(self, segments: List[List[str]], listener=None) -> EdiRoot:
         """Parse EDI segments using appropriate plugin."""
         if not segments:
             raise ValueError("No segments provided for parsing")
@@ -122,6 +161,8 @@ class ValidationIntegrationManager:
             raise ValueError(f"No parser plugin available for transaction code: {transaction_code}")
         
         # Parse using the plugin
+        if listener is not None:
+            return parser_plugin.parse(segments, listener=listener)
         return parser_plugin.parse(segments)
     
     def _extract_transaction_code(self, segments: List[List[str]]) -> Optional[str]:
@@ -206,18 +247,20 @@ def setup_validation_integration(plugin_manager: Optional[PluginManager] = None)
 
 
 def parse_and_validate(segments: List[List[str]], 
-                      validation_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                      validation_context: Optional[Dict[str, Any]] = None,
+                      single_pass: bool = False) -> Dict[str, Any]:
     """
     Convenience function to parse and validate EDI segments.
     
     Args:
         segments: EDI segments to parse
         validation_context: Optional validation context
+        single_pass: Run NodeRules in the parsing pass
         
     Returns:
         Dictionary containing parsing and validation results
     """
-    return validation_manager.parse_and_validate(segments, validation_context)
+    return validation_manager.parse_and_validate(segments, validation_context, single_pass)
 
 
 def validate_document(edi_root: EdiRoot, 
@@ -34,6 +34,27 @@ class ValidationContext:
         return self.business_rules.get(rule_name, default)
 
 
+def to_validation_context(context: Dict[str, Any]) -> ValidationContext:
+    """Convert a validation context dictionary to a ValidationContext."""
+    validation_context = ValidationContext()
+    
+    # Map common context fields
+    if 'strict_mode' in context:
+        validation_context.strict_mode = context['strict_mode']
+    if 'ignore_warnings' in context:
+        validation_context.ignore_warnings = context['ignore_warnings']
+    if 'custom_rules' in context:
+        validation_context.custom_rules = context['custom_rules']
+    if 'business_rules' in context:
+        validation_context.business_rules = context['business_rules']
+    if 'trading_partner_id' in context:
+        validation_context.trading_partner_id = context['trading_partner_id']
+    if 'validation_profile' in context:
+        validation_context.validation_profile = context['validation_profile']
+    
+    return validation_context
+
+
 class BaseValidationRule(ValidationRulePlugin):
     """Base class for validation rules with common functionality."""
     
@@ -88,24 +109,7 @@ class BaseValidationRule(ValidationRulePlugin):
     
     def validate(self, edi_root: EdiRoot, context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Implementation of ValidationRulePlugin.validate()."""
-        # Convert context dict to ValidationContext
-        validation_context = ValidationContext()
-        
-        # Map common context fields
-        if 'strict_mode' in context:
-            validation_context.strict_mode = context['strict_mode']
-        if 'ignore_warnings' in context:
-            validation_context.ignore_warnings = context['ignore_warnings']
-        if 'custom_rules' in context:
-            validation_context.custom_rules = context['custom_rules']
-        if 'business_rules' in context:
-            validation_context.business_rules = context['business_rules']
-        if 'trading_partner_id' in context:
-            validation_context.trading_partner_id = context['trading_partner_id']
-        if 'validation_profile' in context:
-            validation_context.validation_profile = context['validation_profile']
-        
-        return self.validate_document(edi_root, validation_context)
+        return self.validate_document(edi_root, to_validation_context(context))
 
 
 class StructuralValidationRule(BaseValidationRule):
@@ -9,8 +9,11 @@ from typing import List, Dict, Any
 from decimal import Decimal, InvalidOperation
 
 from .rules import BusinessValidationRule, DataValidationRule, StructuralValidationRule, ValidationContext
+from .streaming import NodeRule, NODE_CLAIM, NODE_SERVICE, NODE_TRANSACTION
+from ..codesets import get_codesets, CARC, CPT, HCPCS
 from ..base.edi_ast import EdiRoot, Transaction
 from ..utils.validators import validate_npi, validate_amount_format
+from ..utils.money import to_decimal, sum_cents, cents_to_decimal
 
 
 class Transaction835StructureRule(StructuralValidationRule):
@@ -73,35 +76,32 @@ class Transaction835StructureRule(StructuralValidationRule):
         return errors
 
 
-class Transaction835DataValidationRule(DataValidationRule):
-    """Validates data values and formats in 835 transactions."""
+class Transaction835DataValidationRule(NodeRule, DataValidationRule):
+    """
+    Validates data values and formats in 835 transactions.
+    
+    Claims are checked as they close and the payment and payee once the
+    transaction closes, so the rule also runs in single-pass validation.
+    """
     
     def __init__(self):
         super().__init__(
             rule_name="835_data_validation",
             supported_transactions=["835"],
+            interests=[NODE_CLAIM, NODE_TRANSACTION],
             description="Validates data formats and values in 835 transactions",
             severity="error"
         )
     
-    def validate_data_values(self, edi_root: EdiRoot, context: ValidationContext) -> List[Dict[str, Any]]:
-        """Validate data values in 835 transactions."""
-        errors = []
-        
-        for i, interchange in enumerate(edi_root.interchanges):
-            for j, functional_group in enumerate(interchange.functional_groups):
-                for k, transaction in enumerate(functional_group.transactions):
-                    if transaction.header.get("transaction_set_code") == "835":
-                        tx_path = f"interchange[{i}].functional_group[{j}].transaction[{k}]"
-                        errors.extend(self._validate_835_data(transaction, tx_path, context))
-        
-        return errors
+    def check_claim(self, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate claim amounts and status."""
+        return self._validate_claim_data(claim, path, context)
     
-    def _validate_835_data(self, transaction: Transaction, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
-        """Validate 835-specific data values."""
+    def check_transaction(self, transaction: Transaction, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate transaction-level data values."""
         errors = []
         
-        if not transaction.transaction_data:
+        if transaction.header.get("transaction_set_code") != "835" or not transaction.transaction_data:
             return errors
         
         transaction_835 = transaction.transaction_data
@@ -120,12 +120,6 @@ class Transaction835DataValidationRule(DataValidationRule):
                     value=transaction_835.payee.npi
                 ))
         
-        # Validate claims
-        if hasattr(transaction_835, 'claims') and transaction_835.claims:
-            for claim_idx, claim in enumerate(transaction_835.claims):
-                claim_path = f"{path}.claims[{claim_idx}]"
-                errors.extend(self._validate_claim_data(claim, claim_path, context))
-        
         return errors
     
     def _validate_financial_info(self, financial_info, path: str) -> List[Dict[str, Any]]:
@@ -135,7 +129,7 @@ class Transaction835DataValidationRule(DataValidationRule):
         # Validate total paid amount
         if hasattr(financial_info, 'total_paid'):
             try:
-                amount = Decimal(str(financial_info.total_paid))
+                amount = to_decimal(financial_info.total_paid)
                 if amount < 0:
                     errors.append(self.create_error(
                         message=f"Total paid amount cannot be negative: {amount}",
@@ -173,9 +167,9 @@ class Transaction835DataValidationRule(DataValidationRule):
         # Validate claim amounts
         if hasattr(claim, 'total_charge') and hasattr(claim, 'total_paid') and hasattr(claim, 'patient_responsibility'):
             try:
-                charge = Decimal(str(claim.total_charge))
-                paid = Decimal(str(claim.total_paid))
-                patient_resp = Decimal(str(claim.patient_responsibility))
+                charge = to_decimal(claim.total_charge)
+                paid = to_decimal(claim.total_paid)
+                patient_resp = to_decimal(claim.patient_responsibility)
                 
                 # Check for negative amounts
                 if charge < 0:
@@ -232,7 +226,8 @@ class Transaction835DataValidationRule(DataValidationRule):
         # Validate claim status code
         if hasattr(claim, 'status_code'):
             valid_status_codes = [1, 2, 3, 4, 5, 19, 20, 21, 22, 23]
-            if claim.status_code not in valid_status_codes:
+            # CLP02 is kept as the element text
+            if str(claim.status_code).strip() not in map(str, valid_status_codes):
                 errors.append(self.create_error(
                     message=f"Invalid claim status code: {claim.status_code}. Must be one of: {', '.join(map(str, valid_status_codes))}",
                     code="835_INVALID_CLAIM_STATUS",
@@ -244,65 +239,52 @@ class Transaction835DataValidationRule(DataValidationRule):
         return errors
 
 
-class Transaction835BusinessRule(BusinessValidationRule):
-    """Validates business logic for 835 transactions."""
+class Transaction835BusinessRule(NodeRule, BusinessValidationRule):
+    """
+    Validates business logic for 835 transactions.
+    
+    Claims and service lines are checked as they close. The payment total
+    is compared with the claims a transaction still holds when it closes,
+    so it is skipped when the parser releases claims as it goes.
+    """
     
     def __init__(self):
         super().__init__(
             rule_name="835_business_validation",
             supported_transactions=["835"],
+            interests=[NODE_SERVICE, NODE_CLAIM, NODE_TRANSACTION],
             description="Validates business logic and rules for 835 transactions",
             severity="warning"
         )
     
-    def validate_business_logic(self, edi_root: EdiRoot, context: ValidationContext) -> List[Dict[str, Any]]:
-        """Validate business logic for 835 transactions."""
-        errors = []
-        
-        for i, interchange in enumerate(edi_root.interchanges):
-            for j, functional_group in enumerate(interchange.functional_groups):
-                for k, transaction in enumerate(functional_group.transactions):
-                    if transaction.header.get("transaction_set_code") == "835":
-                        tx_path = f"interchange[{i}].functional_group[{j}].transaction[{k}]"
-                        errors.extend(self._validate_835_business_rules(transaction, tx_path, context))
-        
-        return errors
-    
-    def _validate_835_business_rules(self, transaction: Transaction, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
-        """Validate 835-specific business rules."""
-        errors = []
-        
-        if not transaction.transaction_data:
-            return errors
+    def check_transaction(self, transaction: Transaction, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate total paid vs claim payments."""
+        if transaction.header.get("transaction_set_code") != "835" or not transaction.transaction_data:
+            return []
         
         transaction_835 = transaction.transaction_data
-        
-        # Validate total paid vs claim payments
         if (hasattr(transaction_835, 'financial_information') and transaction_835.financial_information and
             hasattr(transaction_835, 'claims') and transaction_835.claims):
-            
-            errors.extend(self._validate_payment_totals(
+            return self._validate_payment_totals(
                 transaction_835.financial_information,
                 transaction_835.claims,
                 path,
                 context
-            ))
-        
-        # Validate claim completeness
-        if hasattr(transaction_835, 'claims') and transaction_835.claims:
-            for claim_idx, claim in enumerate(transaction_835.claims):
-                claim_path = f"{path}.claims[{claim_idx}]"
-                errors.extend(self._validate_claim_completeness(claim, claim_path, context))
-        
-        return errors
+            )
+        return []
     
     def _validate_payment_totals(self, financial_info, claims, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
         """Validate that total payment matches sum of claim payments."""
         errors = []
         
         try:
-            total_paid = Decimal(str(financial_info.total_paid))
-            claim_payments_sum = sum(Decimal(str(claim.total_paid)) for claim in claims if hasattr(claim, 'total_paid'))
+            total_paid = to_decimal(financial_info.total_paid)
+            paid_amounts = [claim.total_paid for claim in claims if hasattr(claim, 'total_paid')]
+            claim_payments_cents = sum_cents(paid_amounts)
+            if claim_payments_cents is not None:
+                claim_payments_sum = cents_to_decimal(claim_payments_cents)
+            else:
+                claim_payments_sum = sum(to_decimal(amount) for amount in paid_amounts)
             
             tolerance = Decimal('0.01')  # 1 cent tolerance
             difference = abs(total_paid - claim_payments_sum)
@@ -329,7 +311,7 @@ class Transaction835BusinessRule(BusinessValidationRule):
         
         return errors
     
-    def _validate_claim_completeness(self, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+    def check_claim(self, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
         """Validate that claims have required information for processing."""
         errors = []
         
@@ -350,38 +332,100 @@ class Transaction835BusinessRule(BusinessValidationRule):
                 severity="info"
             ))
         
-        # Validate service lines if present
-        if hasattr(claim, 'services') and claim.services:
-            for svc_idx, service in enumerate(claim.services):
-                svc_path = f"{path}.services[{svc_idx}]"
+        return errors
+    
+    def check_service(self, service, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate a service line's code and amounts."""
+        errors = []
+        
+        # Check service code
+        if not hasattr(service, 'service_code') or not service.service_code:
+            errors.append(self.create_error(
+                message="Service line missing service code",
+                code="835_MISSING_SERVICE_CODE",
+                path=f"{path}.service_code"
+            ))
+        
+        # Check amounts are consistent
+        if (hasattr(service, 'charge_amount') and hasattr(service, 'paid_amount') and
+            service.charge_amount is not None and service.paid_amount is not None):
+            try:
+                charge = to_decimal(service.charge_amount)
+                paid = to_decimal(service.paid_amount)
                 
-                # Check service code
-                if not hasattr(service, 'service_code') or not service.service_code:
+                if paid > charge:
                     errors.append(self.create_error(
-                        message="Service line missing service code",
-                        code="835_MISSING_SERVICE_CODE",
-                        path=f"{svc_path}.service_code"
+                        message=f"Service paid amount ({paid}) exceeds charge amount ({charge})",
+                        code="835_SERVICE_OVERPAYMENT",
+                        path=path,
+                        context={
+                            'charge_amount': str(charge),
+                            'paid_amount': str(paid)
+                        },
+                        severity="info"
                     ))
-                
-                # Check amounts are consistent
-                if (hasattr(service, 'charge_amount') and hasattr(service, 'paid_amount') and
-                    service.charge_amount is not None and service.paid_amount is not None):
-                    try:
-                        charge = Decimal(str(service.charge_amount))
-                        paid = Decimal(str(service.paid_amount))
-                        
-                        if paid > charge:
-                            errors.append(self.create_error(
-                                message=f"Service paid amount ({paid}) exceeds charge amount ({charge})",
-                                code="835_SERVICE_OVERPAYMENT",
-                                path=svc_path,
-                                context={
-                                    'charge_amount': str(charge),
-                                    'paid_amount': str(paid)
-                                },
-                                severity="info"
-                            ))
-                    except (InvalidOperation, ValueError):
-                        pass  # Amount format errors handled by data validation rule
+            except (InvalidOperation, ValueError):
+                pass  # Amount format errors handled by data validation rule
         
-        return errors
\ No newline at end of file
+        return errors
+
+
+class Transaction835CodeSetRule(NodeRule):
+    """
+    Validates adjustment reason and procedure codes against compiled code sets.
+    
+    Each check runs only when the code set is compiled and available from
+    the code set registry; without it, codes are not reported.
+    """
+    
+    def __init__(self, registry=None):
+        super().__init__(
+            rule_name="835_code_set_validation",
+            supported_transactions=["835"],
+            interests=[NODE_CLAIM, NODE_SERVICE],
+            description="Validates CARC and CPT/HCPCS codes against compiled code sets",
+            severity="error"
+        )
+        self._registry = registry
+    
+    @property
+    def registry(self):
+        return self._registry or get_codesets()
+    
+    def check_claim(self, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Check CAS reason codes against the CARC code set."""
+        registry = self.registry
+        if not registry.is_compiled(CARC):
+            return []
+        
+        errors = []
+        for adj_idx, adjustment in enumerate(getattr(claim, 'adjustments', None) or []):
+            reason_code = getattr(adjustment, 'reason_code', None)
+            if reason_code and not registry.contains(CARC, reason_code):
+                errors.append(self.create_error(
+                    message=f"Unknown claim adjustment reason code: {reason_code}",
+                    code="835_UNKNOWN_REASON_CODE",
+                    path=f"{path}.adjustments[{adj_idx}].reason_code",
+                    segment_id="CAS",
+                    value=str(reason_code)
+                ))
+        return errors
+    
+    def check_service(self, service, claim, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Check HC procedure codes against the CPT and HCPCS code sets."""
+        registry = self.registry
+        sets = [name for name in (CPT, HCPCS) if registry.is_compiled(name)]
+        service_code = getattr(service, 'service_code', None) or ""
+        procedure_code = getattr(service, 'procedure_code', None)
+        if not sets or not procedure_code or not service_code.startswith("HC"):
+            return []
+        
+        if any(registry.contains(name, procedure_code) for name in sets):
+            return []
+        return [self.create_error(
+            message=f"Unknown procedure code: {procedure_code}",
+            code="835_UNKNOWN_PROCEDURE_CODE",
+            path=f"{path}.procedure_code",
+            segment_id="SVC",
+            value=procedure_code
+        )]
@@ -0,0 +1,223 @@
+"""
+Single-pass validation of EDI documents.
+
+Rules derived from NodeRule declare which nodes they are interested in
+(segments, service lines, claims, transactions) and are evaluated by a
+StreamingValidator while the parser closes each node, in the same pass as
+parsing. Combined with ``Parser835(retain_claims=False)`` a whole file is
+validated without holding its claims in memory.
+
+The same rules still work through ``ValidationEngine.validate``: on a
+parsed document NodeRule walks the tree and calls the same hooks.
+"""
+
+from typing import Any, BinaryIO, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+import logging
+import time
+
+from .engine import ValidationEngine, ValidationError, ValidationResult, ValidationSeverity
+from .rules import BaseValidationRule, ValidationContext, to_validation_context
+from ..base.edi_ast import EdiRoot
+from ..base.parser import NodeListener
+from ..telemetry import get_instrumentation, HISTOGRAM_VALIDATE, HISTOGRAM_VALIDATE_RULE
+
+logger = logging.getLogger(__name__)
+
+# Node kinds a NodeRule can declare interest in
+NODE_SEGMENT = "segment"
+NODE_SERVICE = "service"
+NODE_CLAIM = "claim"
+NODE_TRANSACTION = "transaction"
+
+NODE_KINDS = frozenset({NODE_SEGMENT, NODE_SERVICE, NODE_CLAIM, NODE_TRANSACTION})
+
+
+class NodeRule(BaseValidationRule):
+    """
+    Base class for rules evaluated node by node.
+
+    Subclasses list the node kinds they handle in ``interests`` and override
+    the matching ``check_*`` hooks; each hook returns error dictionaries
+    built with ``create_error``. Segment checks only run in single-pass
+    validation, since a parsed tree no longer holds its segments.
+    """
+
+    def __init__(self, rule_name: str, supported_transactions: List[str],
+                 interests: Iterable[str], description: str = "", severity: str = "error"):
+        super().__init__(rule_name, supported_transactions, description, severity)
+        interests = frozenset(interests)
+        unknown = interests - NODE_KINDS
+        if unknown:
+            raise ValueError(f"Unknown node kinds for rule {rule_name}: {sorted(unknown)}")
+        self._interests = interests
+
+    @property
+    def interests(self) -> FrozenSet[str]:
+        return self._interests
+
+    def check_segment(self, segment: List[str], segment_index: int,
+                      context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate a raw segment. Override in subclasses."""
+        return []
+
+    def check_service(self, service: Any, claim: Any, path: str,
+                      context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate a closed service line. Override in subclasses."""
+        return []
+
+    def check_claim(self, claim: Any, path: str, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate a closed claim. Override in subclasses."""
+        return []
+
+    def check_transaction(self, transaction: Any, path: str,
+                          context: ValidationContext) -> List[Dict[str, Any]]:
+        """Validate a closed transaction set. Override in subclasses."""
+        return []
+
+    def validate_document(self, edi_root: EdiRoot, context: ValidationContext) -> List[Dict[str, Any]]:
+        """Run the node hooks over an already parsed document."""
+        errors = []
+        for kind, node, parent, path in iter_nodes(edi_root):
+            if kind not in self._interests:
+                continue
+            if kind == NODE_SERVICE:
+                errors.extend(self.check_service(node, parent, path, context))
+            elif kind == NODE_CLAIM:
+                errors.extend(self.check_claim(node, path, context))
+            else:
+                errors.extend(self.check_transaction(node, path, context))
+        return errors
+
+
+def iter_nodes(edi_root: EdiRoot) -> Iterator[Tuple[str, Any, Any, str]]:
+    """
+    Yield ``(kind, node, parent, path)`` for every service, claim and
+    transaction of a parsed document, in the order a parser closes them.
+    """
+    for i, interchange in enumerate(edi_root.interchanges):
+        for j, functional_group in enumerate(interchange.functional_groups):
+            for k, transaction in enumerate(functional_group.transactions):
+                tx_path = f"interchange[{i}].functional_group[{j}].transaction[{k}]"
+                for c, claim in enumerate(getattr(transaction.transaction_data, "claims", None) or []):
+                    claim_path = f"{tx_path}.claims[{c}]"
+                    for s, service in enumerate(getattr(claim, "services", None) or []):
+                        yield NODE_SERVICE, service, claim, f"{claim_path}.services[{s}]"
+                    yield NODE_CLAIM, claim, transaction, claim_path
+                yield NODE_TRANSACTION, transaction, None, tx_path
+
+
+class StreamingValidator(NodeListener):
+    """
+    Node listener that evaluates NodeRules as the parser closes each node.
+
+    Findings accumulate in a ValidationResult; only the rules interested in
+    a node kind are called for it. A rule that raises is reported once as a
+    SYSTEM_ERROR and is not called again.
+    """
+
+    def __init__(self, engine: ValidationEngine, rules: Iterable[NodeRule],
+                 context: Optional[Dict[str, Any]] = None):
+        self.engine = engine
+        self.rules = list(rules)
+        self.context = to_validation_context(context or {})
+        self.result = ValidationResult(is_valid=True)
+        self.transaction_count = 0
+        self._rule_ns: Dict[str, int] = {rule.rule_name: 0 for rule in self.rules}
+        self._by_kind: Dict[str, List[NodeRule]] = {
+            kind: [rule for rule in self.rules if kind in rule.interests] for kind in NODE_KINDS
+        }
+        self.wants_segments = bool(self._by_kind[NODE_SEGMENT])
+
+    def on_segment(self, segment: List[str], segment_index: int) -> None:
+        for rule in self._by_kind[NODE_SEGMENT]:
+            self._run(rule, rule.check_segment, segment, segment_index, self.context)
+
+    def on_service(self, service: Any, claim: Any, path: str) -> None:
+        for rule in self._by_kind[NODE_SERVICE]:
+            self._run(rule, rule.check_service, service, claim, path, self.context)
+
+    def on_claim(self, claim: Any, path: str) -> None:
+        for rule in self._by_kind[NODE_CLAIM]:
+            self._run(rule, rule.check_claim, claim, path, self.context)
+
+    def on_transaction(self, transaction: Any, path: str) -> None:
+        self.transaction_count += 1
+        for rule in self._by_kind[NODE_TRANSACTION]:
+            self._run(rule, rule.check_transaction, transaction, path, self.context)
+
+    def replay(self, edi_root: EdiRoot) -> None:
+        """Feed an already parsed document, for parsers that emit no node events."""
+        for kind, node, parent, path in iter_nodes(edi_root):
+            if kind == NODE_SERVICE:
+                self.on_service(node, parent, path)
+            elif kind == NODE_CLAIM:
+                self.on_claim(node, path)
+            else:
+                self.on_transaction(node, path)
+
+    def finish(self) -> ValidationResult:
+        """Complete the result with executed rules and timings."""
+        result = self.result
+        result.executed_rules.extend(rule.rule_name for rule in self.rules
+                                     if rule.rule_name not in result.executed_rules)
+        result.execution_time_ms = sum(self._rule_ns.values()) / 1e6
+
+        instrumentation = get_instrumentation()
+        if instrumentation.enabled:
+            for rule_name, elapsed_ns in self._rule_ns.items():
+                instrumentation.record(HISTOGRAM_VALIDATE_RULE, elapsed_ns / 1e6, {"rule_name": rule_name})
+            instrumentation.record(HISTOGRAM_VALIDATE, result.execution_time_ms)
+        return result
+
+    def _run(self, rule: NodeRule, check, *args) -> None:
+        started = time.perf_counter_ns()
+        try:
+            errors = check(*args)
+        except Exception as e:
+            logger.error(f"Error executing validation rule {rule.rule_name}: {e}")
+            self.result.add_error(ValidationError(
+                rule_name=rule.rule_name,
+                severity=ValidationSeverity.ERROR,
+                message=f"Validation rule execution failed: {str(e)}",
+                code="SYSTEM_ERROR",
+                context={"exception": str(e)}
+            ))
+            for rules in self._by_kind.values():
+                if rule in rules:
+                    rules.remove(rule)
+            self.wants_segments = bool(self._by_kind[NODE_SEGMENT])
+            errors = []
+        for error_dict in errors:
+            self.result.add_error(self.engine._dict_to_validation_error(error_dict, rule.rule_name))
+        self._rule_ns[rule.rule_name] += time.perf_counter_ns() - started
+
+
+def validate_stream(source: Union[str, BinaryIO], engine: ValidationEngine,
+                    context: Optional[Dict[str, Any]] = None) -> ValidationResult:
+    """
+    Validate an 835 file in one pass without keeping its claims.
+
+    Segments are read incrementally and every enabled NodeRule of the engine
+    is evaluated as the parser closes each node; rules that need the whole
+    tree are not run.
+
+    Args:
+        source: Path or binary handle of the EDI file
+        engine: Engine holding the rules to run
+        context: Optional validation context
+
+    Returns:
+        ValidationResult with the node rules' findings
+    """
+    from ..streaming import SegmentReader
+    from ..transactions.t835.parser import Parser835
+
+    validator = engine.stream_validator(context, ["835"])
+    handle = open(source, "rb") if isinstance(source, str) else source
+    try:
+        segments = (segment.elements for segment in SegmentReader(handle))
+        Parser835(segments, listener=validator, retain_claims=False).parse()
+    finally:
+        if handle is not source:
+            handle.close()
+    return validator.finish()
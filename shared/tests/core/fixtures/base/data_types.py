@@ -8,6 +8,8 @@ from decimal import Decimal
 from typing import Dict, List, Optional, Union
 from enum import Enum
 
+from .generators import DataGenerator
+
 
 class PaymentMethod(Enum):
     """Payment method types."""
@@ -111,7 +113,7 @@ class EDIEnvelope:
     
     def __post_init__(self):
         """Set default dates if not provided.""" 
-        today = date.today()
+        today = DataGenerator.today()
         if self.interchange_date is None:
             self.interchange_date = today
         if self.production_date is None:
@@ -291,7 +293,7 @@ class PaymentInfo:
         if isinstance(self.payment_method, PaymentMethod):
             self.payment_method = self.payment_method.value
         if self.payment_date is None:
-            self.payment_date = date.today()
+            self.payment_date = DataGenerator.today()
     
     def to_bpr_segment(self) -> str:
         """Generate BPR beginning segment for payment order/remittance."""
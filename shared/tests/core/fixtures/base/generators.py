@@ -7,7 +7,6 @@ import string
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import List, Optional
-import uuid
 
 
 class DataGenerator:
@@ -32,6 +31,20 @@ class DataGenerator:
         "PR": ["1", "2", "3", "4", "5"],         # Patient responsibility
         "OA": ["23", "94", "109", "140"]         # Other adjustments
     }
+
+    # Date used in place of date.today() so seeded fixtures are reproducible
+    reference_date: Optional[date] = None
+
+    @classmethod
+    def seed(cls, seed: int, reference_date: Optional[date] = None) -> None:
+        """Seed the shared random generator and optionally pin "today"."""
+        random.seed(seed)
+        cls.reference_date = reference_date
+
+    @classmethod
+    def today(cls) -> date:
+        """Return the pinned reference date, or the current date."""
+        return cls.reference_date or date.today()
     
     @staticmethod
     def generate_npi(valid: bool = True) -> str:
@@ -79,9 +92,9 @@ class DataGenerator:
     ) -> date:
         """Generate a random date within range."""
         if start_date is None:
-            start_date = date.today() - timedelta(days=365)
+            start_date = DataGenerator.today() - timedelta(days=365)
         if end_date is None:
-            end_date = date.today()
+            end_date = DataGenerator.today()
         
         time_between = end_date - start_date
         days_between = time_between.days
@@ -182,7 +195,7 @@ class DataGenerator:
     @staticmethod
     def generate_trace_number() -> str:
         """Generate a trace number for transactions."""
-        return str(uuid.uuid4()).replace('-', '')[:15]
+        return ''.join(random.choices(string.hexdigits[:16], k=15))
 
 
 class NameGenerator:
@@ -161,7 +161,7 @@ class EDI270Builder(EDIBuilder):
         segments = []
         
         # BHT - Beginning of Hierarchical Transaction
-        inquiry_date = date.today().strftime("%Y%m%d")
+        inquiry_date = DataGenerator.today().strftime("%Y%m%d")
         inquiry_time = "1430"
         segments.append(f"BHT*0022*13*{DataGenerator.generate_control_number()}*{inquiry_date}*{inquiry_time}~")
         
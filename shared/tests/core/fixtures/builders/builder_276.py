@@ -128,7 +128,7 @@ class EDI276Builder(EDIBuilder):
         segments = []
         
         # BHT - Beginning of Hierarchical Transaction
-        inquiry_date = date.today().strftime("%Y%m%d")
+        inquiry_date = DataGenerator.today().strftime("%Y%m%d")
         inquiry_time = "1430"
         control_number = DataGenerator.generate_control_number()
         segments.append(f"BHT*0019*13*{control_number}*{inquiry_date}*{inquiry_time}~")
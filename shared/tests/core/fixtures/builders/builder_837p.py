@@ -209,7 +209,7 @@ class EDI837pBuilder(EDIBuilder):
         segments = []
         
         # BHT - Beginning of Hierarchical Transaction
-        creation_date = date.today().strftime("%Y%m%d")
+        creation_date = DataGenerator.today().strftime("%Y%m%d")
         creation_time = "1430"
         control_number = DataGenerator.generate_control_number()
         segments.append(f"BHT*0019*00*{control_number}*{creation_date}*{creation_time}*CH~")
@@ -0,0 +1,252 @@
+"""
+Benchmark runner with JSON baselines.
+
+Each case generates (or reuses) a synthetic file for one transaction type
+and size, then measures:
+
+- tokenize: raw SegmentReader throughput (segments/s, MB/s)
+- pipeline: parse -> validate -> emit throughput and per-stage latency
+- peak RSS of the process running the case, and its growth over the
+  interpreter's footprint before the case started
+
+Cases run in a fresh interpreter by default so peak RSS is not inflated
+by earlier cases. Results can be saved as a baseline and later runs
+compared against it; metrics that get worse by more than the tolerance
+are reported as regressions.
+
+Usage (from the shared/ directory):
+    python -m tests.performance.benchmark --types 835,837p --sizes 10mb
+    python -m tests.performance.benchmark --sizes 10mb --update-baseline
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+# Make the repository root importable when run as a module from shared/
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from core.pipeline import default_pipeline
+from core.streaming import SegmentReader
+
+from tests.performance.generators import DEFAULT_SEED, MB, SIZES, TRANSACTION_TYPES, generate_file
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "benchmarks.json")
+DEFAULT_TOLERANCE = 0.25
+
+# Metric path -> True when a larger value is better
+COMPARED_METRICS = {
+    "tokenize.segments_per_second": True,
+    "tokenize.mb_per_second": True,
+    "pipeline.segments_per_second": True,
+    "pipeline.mb_per_second": True,
+    "rss_growth_mb": False,
+}
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    if sys.platform == "darwin":
+        return peak / MB
+    return peak / 1024
+
+
+def _throughput(segments: int, size: int, seconds: float) -> Dict[str, float]:
+    return {
+        "seconds": round(seconds, 4),
+        "segments_per_second": round(segments / seconds, 1) if seconds else 0.0,
+        "mb_per_second": round(size / MB / seconds, 3) if seconds else 0.0,
+    }
+
+
+def measure_tokenize(path: str) -> Dict[str, float]:
+    """Time a full pass of the streaming tokenizer over a file."""
+    started = time.perf_counter()
+    with open(path, "rb") as handle:
+        reader = SegmentReader(handle)
+        for _ in reader:
+            pass
+    elapsed = time.perf_counter() - started
+    return _throughput(reader.segment_count, reader.bytes_read, elapsed)
+
+
+def measure_pipeline(path: str, segments: int, validate: bool = True) -> Dict[str, Any]:
+    """Run parse, validate and emit over a file and report stage latencies."""
+    pipeline = default_pipeline(output=os.devnull, validate=validate)
+    stats = pipeline.run_file(path)
+    result = _throughput(segments, os.path.getsize(path), stats.wall_seconds)
+    result["transactions"] = stats.items
+    result["failed"] = stats.failed
+    result["stages"] = {
+        stage.name: {
+            "average_latency_ms": round(stage.average_latency_ms, 3),
+            "busy_seconds": round(stage.busy_seconds, 4),
+            "utilization": round(stage.utilization, 3),
+        }
+        for stage in stats.stages
+    }
+    return result
+
+
+def run_case(transaction_type: str, size: str, data_dir: str = DEFAULT_DATA_DIR,
+             seed: int = DEFAULT_SEED, validate: bool = True) -> Dict[str, Any]:
+    """
+    Generate the input for a case and measure it in this process.
+
+    Returns:
+        Dictionary of measurements keyed as in COMPARED_METRICS
+    """
+    generated = generate_file(transaction_type, size, data_dir, seed=seed)
+    rss_before = peak_rss_mb()
+    result = {
+        "case": f"{transaction_type}-{size}",
+        "transaction_type": transaction_type,
+        "size": size,
+        "seed": seed,
+        "file_bytes": generated.bytes,
+        "segments": generated.segments,
+        "transactions": generated.transactions,
+        "tokenize": measure_tokenize(generated.path),
+        "pipeline": measure_pipeline(generated.path, generated.segments, validate=validate),
+    }
+    peak = peak_rss_mb()
+    result["peak_rss_mb"] = round(peak, 1)
+    result["rss_growth_mb"] = round(peak - rss_before, 1)
+    return result
+
+
+def run_case_isolated(transaction_type: str, size: str, **kwargs) -> Dict[str, Any]:
+    """Run a case in a freshly spawned interpreter so peak RSS is per case."""
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_case, transaction_type, size, **kwargs).result()
+
+
+def _metric(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_results(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare benchmark results against a baseline.
+
+    Args:
+        results: Results from run_case
+        baseline: Baseline document with a ``cases`` mapping
+        tolerance: Allowed relative change before a metric counts as regressed
+
+    Returns:
+        Human-readable regression messages; empty when nothing regressed
+    """
+    regressions = []
+    cases = baseline.get("cases", {})
+    for result in results:
+        expected = cases.get(result["case"])
+        if expected is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS.items():
+            current = _metric(result, path)
+            reference = _metric(expected, path)
+            if not current or not reference:
+                continue
+            change = (current - reference) / reference
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(
+                    f"{result['case']} {path}: {current} vs baseline {reference} ({change:+.1%})"
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"cases": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[Dict[str, Any]], baseline: Optional[Dict[str, Any]] = None):
+    """Merge results into a baseline file, replacing cases that were re-run."""
+    baseline = baseline or load_baseline(path)
+    cases = baseline.setdefault("cases", {})
+    for result in results:
+        cases[result["case"]] = result
+    baseline["python"] = sys.version.split()[0]
+    baseline["platform"] = sys.platform
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    tokenize = result["tokenize"]
+    pipeline = result["pipeline"]
+    stages = "  ".join(f"{name}={stage['average_latency_ms']:.2f}ms"
+                       for name, stage in pipeline["stages"].items())
+    return (
+        f"{result['case']:<12} {result['file_bytes'] / MB:>8.1f} MB  "
+        f"tokenize {tokenize['segments_per_second']:>11,.0f} seg/s {tokenize['mb_per_second']:>7.2f} MB/s  "
+        f"pipeline {pipeline['segments_per_second']:>9,.0f} seg/s {pipeline['mb_per_second']:>6.2f} MB/s  "
+        f"rss {result['peak_rss_mb']:>7.1f} MB  {stages}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run EDI throughput benchmarks.")
+    parser.add_argument("--types", default=",".join(TRANSACTION_TYPES),
+                        help="Comma-separated transaction types")
+    parser.add_argument("--sizes", default="10mb", help=f"Comma-separated sizes ({', '.join(SIZES)})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Cache directory for generated files")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to the baseline")
+    parser.add_argument("--output", help="Also write raw results to this JSON file")
+    parser.add_argument("--no-validate", action="store_true", help="Skip the validate stage")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run cases in this process (peak RSS becomes cumulative)")
+    args = parser.parse_args(argv)
+
+    run = run_case if args.in_process else run_case_isolated
+    results = []
+    for transaction_type in args.types.split(","):
+        for size in args.sizes.split(","):
+            result = run(transaction_type, size, data_dir=args.data_dir, seed=args.seed,
+                         validate=not args.no_validate)
+            print(format_result(result))
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare_results(results, load_baseline(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
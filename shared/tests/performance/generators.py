@@ -0,0 +1,242 @@
+"""
+Deterministic synthetic EDI files for benchmarking.
+
+Transaction bodies come from the fixture builders, seeded through
+DataGenerator so the same seed always yields byte-identical files. A pool
+of varied bodies is built once and cycled inside a single interchange
+until the requested size is reached, which keeps generation of 1 GB files
+fast while still exercising realistic segment mixes.
+"""
+
+from typing import Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass
+from datetime import date
+from decimal import Decimal
+import json
+import os
+import random
+
+from tests.core.fixtures.builders import EDI835Builder, EDI837pBuilder, EDI270Builder, EDI276Builder
+from tests.core.fixtures.base.generators import DataGenerator
+
+# Bump when generated content changes so cached files are rebuilt
+GENERATOR_VERSION = 1
+
+MB = 1024 * 1024
+
+SIZES = {
+    "10mb": 10 * MB,
+    "100mb": 100 * MB,
+    "1gb": 1024 * MB,
+}
+
+DEFAULT_SEED = 835
+REFERENCE_DATE = date(2024, 1, 15)
+
+
+def _body_835() -> List[str]:
+    builder = (EDI835Builder()
+               .with_realistic_payer()
+               .with_realistic_payee()
+               .with_ach_payment(Decimal("0"))
+               .with_trace_number(DataGenerator.generate_trace_number()))
+    total_paid = Decimal("0")
+    for _ in range(random.randint(5, 25)):
+        charge = DataGenerator.generate_amount(100, 2000)
+        paid = (charge * Decimal("0.8")).quantize(Decimal("0.01"))
+        patient_resp = charge - paid
+        deductible = (patient_resp / 2).quantize(Decimal("0.01"))
+        builder.with_claim(DataGenerator.generate_claim_id(), 1, charge, paid, patient_resp)
+        builder.with_patient_responsibility_adjustment(amount=deductible)
+        builder.with_contractual_adjustment(amount=patient_resp - deductible)
+        total_paid += paid
+    builder.with_service(DataGenerator.generate_procedure_code(), Decimal("150.00"), Decimal("120.00"))
+    builder.payment.amount = total_paid
+    return builder.get_transaction_segments()
+
+
+def _body_837p() -> List[str]:
+    builder = EDI837pBuilder.standard() if random.random() < 0.8 else EDI837pBuilder.emergency_visit()
+    for _ in range(random.randint(0, 4)):
+        builder.with_office_visit(DataGenerator.generate_procedure_code())
+    return builder.get_transaction_segments()
+
+
+def _body_270() -> List[str]:
+    builder = EDI270Builder.standard()
+    if random.random() < 0.5:
+        builder.with_benefit_inquiry()
+    return builder.get_transaction_segments()
+
+
+def _body_276() -> List[str]:
+    return EDI276Builder.batch_inquiry(random.randint(1, 10)).get_transaction_segments()
+
+
+# Transaction type -> (ST01, GS01, GS08, body factory)
+TRANSACTION_TYPES: Dict[str, tuple] = {
+    "835": ("835", "HP", "005010X221A1", _body_835),
+    "837p": ("837", "HC", "005010X222A1", _body_837p),
+    "270": ("270", "HS", "005010X279A1", _body_270),
+    "276": ("276", "HR", "005010X212", _body_276),
+}
+
+
+@dataclass
+class GeneratedFile:
+    """Description of a generated benchmark input."""
+    path: str
+    transaction_type: str
+    seed: int
+    target_bytes: int
+    bytes: int
+    segments: int
+    transactions: int
+    generator_version: int = GENERATOR_VERSION
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+class SyntheticFileGenerator:
+    """
+    Write reproducible EDI files of a target size.
+
+    Example:
+        generator = SyntheticFileGenerator("835", seed=835)
+        info = generator.write("835-10mb.edi", SIZES["10mb"])
+    """
+
+    def __init__(self, transaction_type: str, seed: int = DEFAULT_SEED, pool_size: int = 64,
+                 transactions_per_group: int = 5000):
+        """
+        Initialize the generator.
+
+        Args:
+            transaction_type: One of TRANSACTION_TYPES
+            seed: Seed for the fixture builders
+            pool_size: Number of distinct transaction bodies to cycle through
+            transactions_per_group: Transactions per GS/GE functional group
+        """
+        if transaction_type not in TRANSACTION_TYPES:
+            raise ValueError(f"Unknown transaction type: {transaction_type}. "
+                             f"Available: {', '.join(TRANSACTION_TYPES)}")
+        self.transaction_type = transaction_type
+        self.seed = seed
+        self.pool_size = pool_size
+        self.transactions_per_group = transactions_per_group
+        self._pool: Optional[List[tuple]] = None
+
+    def _build_pool(self) -> List[tuple]:
+        body_factory: Callable[[], List[str]] = TRANSACTION_TYPES[self.transaction_type][3]
+        previous_date = DataGenerator.reference_date
+        state = random.getstate()
+        DataGenerator.seed(self.seed, REFERENCE_DATE)
+        try:
+            pool = []
+            for _ in range(self.pool_size):
+                segments = body_factory()
+                pool.append(("".join(segments), len(segments)))
+            return pool
+        finally:
+            DataGenerator.reference_date = previous_date
+            random.setstate(state)
+
+    @property
+    def pool(self) -> List[tuple]:
+        if self._pool is None:
+            self._pool = self._build_pool()
+        return self._pool
+
+    def write(self, path: str, target_bytes: int) -> GeneratedFile:
+        """
+        Write a file of at least ``target_bytes`` bytes.
+
+        The file is a single interchange; transactions are appended until
+        the target is reached, then the envelope is closed.
+        """
+        code, functional_id, version, _ = TRANSACTION_TYPES[self.transaction_type]
+        interchange_date = REFERENCE_DATE.strftime("%y%m%d")
+        group_date = REFERENCE_DATE.strftime("%Y%m%d")
+        isa = (f"ISA*00*          *00*          *ZZ*{'SENDER':<15}*ZZ*{'RECEIVER':<15}"
+               f"*{interchange_date}*1200*^*00501*000000001*0*P*:~")
+
+        written = 0
+        segments = 2
+        transactions = 0
+        groups = 0
+        in_group = 0
+        pool = self.pool
+
+        with open(path, "w", encoding="ascii", newline="") as handle:
+            def emit(text: str):
+                nonlocal written
+                handle.write(text)
+                written += len(text)
+
+            emit(isa)
+            while written < target_bytes or transactions == 0:
+                if in_group == 0:
+                    groups += 1
+                    emit(f"GS*{functional_id}*SENDER*RECEIVER*{group_date}*1200*{groups}*X*{version}~")
+                    segments += 1
+
+                body, body_segments = pool[transactions % len(pool)]
+                transactions += 1
+                in_group += 1
+                control = f"{transactions:04d}"
+                emit(f"ST*{code}*{control}~{body}SE*{body_segments + 2}*{control}~")
+                segments += body_segments + 2
+
+                if in_group == self.transactions_per_group:
+                    emit(f"GE*{in_group}*{groups}~")
+                    segments += 1
+                    in_group = 0
+
+            if in_group:
+                emit(f"GE*{in_group}*{groups}~")
+                segments += 1
+            emit(f"IEA*{groups}*000000001~")
+
+        return GeneratedFile(
+            path=path,
+            transaction_type=self.transaction_type,
+            seed=self.seed,
+            target_bytes=target_bytes,
+            bytes=written,
+            segments=segments,
+            transactions=transactions,
+        )
+
+
+def generate_file(transaction_type: str, size: str, directory: str,
+                  seed: int = DEFAULT_SEED) -> GeneratedFile:
+    """
+    Return a generated benchmark file, reusing a cached copy when possible.
+
+    Args:
+        transaction_type: One of TRANSACTION_TYPES
+        size: A key of SIZES, or a byte count
+        directory: Cache directory for generated files
+        seed: Builder seed
+
+    Returns:
+        GeneratedFile describing the file on disk
+    """
+    target_bytes = SIZES[size] if size in SIZES else int(size)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{transaction_type}-{size}-seed{seed}.edi")
+    manifest_path = path + ".json"
+
+    if os.path.exists(path) and os.path.exists(manifest_path):
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+        if (manifest.get("generator_version") == GENERATOR_VERSION
+                and manifest.get("bytes") == os.path.getsize(path)):
+            manifest["path"] = path
+            return GeneratedFile(**manifest)
+
+    info = SyntheticFileGenerator(transaction_type, seed=seed).write(path, target_bytes)
+    with open(manifest_path, "w") as f:
+        json.dump(info.to_dict(), f, indent=2)
+    return info
@@ -0,0 +1,318 @@
+"""
+Memory profiling harness.
+
+Parses a generated file the way ``edi convert`` does (whole document in
+memory) and reports, using tracemalloc:
+
+- the peak traced memory during tokenize, parse, validate and emit
+- bytes retained per AST node type (Claim, Service, Adjustment, ...),
+  header dicts, other dicts and lists, and the tokenized segment lists
+- optionally, the allocation sites that retain the most memory after parsing
+
+Reports can be saved as a baseline and compared in CI; any stage peak or
+footprint category that grows by more than the tolerance is a regression.
+
+Usage (from the shared/ directory):
+    python -m tests.performance.memory --type 835 --size 10mb --allocations 15
+    python -m tests.performance.memory --type 835 --size 10mb --update-baseline
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import defaultdict
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+# Make the repository root importable when run as a module from shared/
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
+
+from core.base.edi_ast import Node
+from core.emitter import EdiEmitter
+from core.plugins.api import plugin_registry
+from core.streaming import SegmentReader
+
+from tests.performance.generators import DEFAULT_SEED, MB, TRANSACTION_TYPES, generate_file
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(__file__), ".data")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "memory.json")
+DEFAULT_TOLERANCE = 0.10
+
+# Shared immutable singletons are never attributed to an owner
+_SKIP_TYPES = (type(None), bool)
+
+
+def _attribute(obj: Any, category: str, totals: Dict[str, List[int]], seen: set):
+    """Add obj and everything it exclusively reaches to a category."""
+    stack = [(obj, category)]
+    while stack:
+        current, owner = stack.pop()
+        if isinstance(current, _SKIP_TYPES) or id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if isinstance(current, Node):
+            # Every node type is its own category; its scalars count towards it
+            owner = type(current).__name__
+            totals[owner][0] += 1
+            totals[owner][1] += sys.getsizeof(current)
+            attributes = getattr(current, "__dict__", None)
+            if attributes is None:
+                continue
+            seen.add(id(attributes))
+            totals[owner][1] += sys.getsizeof(attributes)
+            for name, value in attributes.items():
+                if isinstance(value, dict):
+                    stack.append((value, "header dict" if name == "header" else "dict"))
+                elif isinstance(value, list):
+                    stack.append((value, "list"))
+                else:
+                    stack.append((value, owner))
+            continue
+
+        totals[owner][1] += sys.getsizeof(current)
+        if owner in ("dict", "header dict", "list"):
+            totals[owner][0] += isinstance(current, (dict, list))
+        if isinstance(current, dict):
+            for key, value in current.items():
+                stack.append((key, owner))
+                stack.append((value, "dict" if isinstance(value, dict) else owner))
+        elif isinstance(current, (list, tuple)):
+            for value in current:
+                stack.append((value, owner))
+
+
+def footprint(root: Any) -> Dict[str, Dict[str, int]]:
+    """
+    Bytes reachable from an AST, grouped by node type and container kind.
+
+    Each object is counted once, towards the first owner that reaches it;
+    strings and numbers held by a node count towards that node's type.
+
+    Returns:
+        Mapping of category -> {"count": ..., "bytes": ...}, largest first
+    """
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    _attribute(root, "EdiRoot", totals, set())
+    ordered = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    return {name: {"count": count, "bytes": size} for name, (count, size) in ordered}
+
+
+def segments_footprint(segments: List[List[str]]) -> Dict[str, int]:
+    """Bytes held by tokenized segment lists, including their element strings."""
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    _attribute(segments, "segment lists", totals, set())
+    return {"count": len(segments), "bytes": totals["segment lists"][1]}
+
+
+def _measure(func: Callable[[], Any]) -> Tuple[Any, Dict[str, int]]:
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    return result, {
+        "peak_bytes": peak,
+        "peak_over_start_bytes": peak - start,
+        "retained_bytes": current - start,
+    }
+
+
+def _tokenize(path: str) -> List[List[str]]:
+    with open(path, "rb") as handle:
+        return [segment.elements for segment in SegmentReader(handle)]
+
+
+def _load_plugins():
+    """Load the built-in parser and validation plugins once per process."""
+    from core.validation.integration import validation_manager, setup_validation_integration
+    if not plugin_registry.get_parser_for_transaction("835"):
+        setup_validation_integration()
+    return validation_manager
+
+
+def profile_file(path: str, transaction_code: str, validate: bool = True,
+                 top_allocations: int = 0) -> Dict[str, Any]:
+    """
+    Profile memory for each processing stage of one file.
+
+    Args:
+        path: EDI file to process
+        transaction_code: ST01 code used to pick the parser plugin
+        validate: Whether to run the validate stage
+        top_allocations: Number of allocation sites to report after parsing;
+            snapshots hold every live trace, so this is off by default
+
+    Returns:
+        Report with ``stages``, ``footprint`` and ``top_allocations``
+    """
+    manager = _load_plugins()
+    engine = manager.validation_engine if validate else None
+    plugin = plugin_registry.get_parser_for_transaction(transaction_code)
+    if plugin is None:
+        raise ValueError(f"No parser plugin for transaction code {transaction_code}")
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        stages: Dict[str, Dict[str, int]] = {}
+        segments, stages["tokenize"] = _measure(lambda: _tokenize(path))
+
+        before_parse = tracemalloc.take_snapshot() if top_allocations else None
+        edi_root, stages["parse"] = _measure(lambda: plugin.parse(segments))
+        after_parse = tracemalloc.take_snapshot() if top_allocations else None
+
+        if engine is not None:
+            _, stages["validate"] = _measure(lambda: engine.validate(edi_root))
+        _, stages["emit"] = _measure(lambda: EdiEmitter(edi_root).to_json())
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    allocations = []
+    differences = after_parse.compare_to(before_parse, "lineno") if top_allocations else []
+    for stat in differences[:top_allocations]:
+        frame = stat.traceback[0]
+        allocations.append({
+            "site": f"{os.path.relpath(frame.filename, _REPO_ROOT)}:{frame.lineno}",
+            "bytes": stat.size_diff,
+            "count": stat.count_diff,
+        })
+
+    objects = footprint(edi_root)
+    objects["segment lists"] = segments_footprint(segments)
+    return {
+        "file_bytes": os.path.getsize(path),
+        "segments": len(segments),
+        "stages": stages,
+        "footprint": objects,
+        "top_allocations": allocations,
+    }
+
+
+def run_case(transaction_type: str, size: str, data_dir: str = DEFAULT_DATA_DIR,
+             seed: int = DEFAULT_SEED, validate: bool = True, top_allocations: int = 0) -> Dict[str, Any]:
+    """Generate the input for a case and profile it."""
+    generated = generate_file(transaction_type, size, data_dir, seed=seed)
+    report = profile_file(generated.path, TRANSACTION_TYPES[transaction_type][0], validate=validate,
+                          top_allocations=top_allocations)
+    report.update({"case": f"{transaction_type}-{size}", "transaction_type": transaction_type,
+                   "size": size, "seed": seed})
+    return report
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare a report with the baseline entry for the same case.
+
+    Stage peaks and per-category footprints that grow by more than
+    ``tolerance`` are returned as regression messages.
+    """
+    expected = baseline.get("cases", {}).get(report["case"])
+    if expected is None:
+        return []
+
+    checks = []
+    for stage, values in report["stages"].items():
+        reference = expected.get("stages", {}).get(stage, {}).get("peak_over_start_bytes")
+        checks.append((f"{stage} peak", values["peak_over_start_bytes"], reference))
+    for category, values in report["footprint"].items():
+        reference = expected.get("footprint", {}).get(category, {}).get("bytes")
+        checks.append((f"{category} bytes", values["bytes"], reference))
+
+    regressions = []
+    for label, current, reference in checks:
+        if not reference:
+            continue
+        change = (current - reference) / reference
+        if change > tolerance:
+            regressions.append(f"{report['case']} {label}: {current:,} vs baseline {reference:,} ({change:+.1%})")
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"cases": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, reports: List[Dict[str, Any]]):
+    """Merge reports into a baseline file, replacing cases that were re-run."""
+    baseline = load_baseline(path)
+    cases = baseline.setdefault("cases", {})
+    for report in reports:
+        cases[report["case"]] = {key: report[key] for key in ("file_bytes", "segments", "stages", "footprint")}
+    baseline["python"] = sys.version.split()[0]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as fixed-width tables."""
+    lines = [f"{report['case']}: {report['file_bytes'] / MB:.1f} MB, {report['segments']:,} segments",
+             f"{'STAGE':<10}{'PEAK MB':>12}{'RETAINED MB':>14}"]
+    for stage, values in report["stages"].items():
+        lines.append(f"{stage:<10}{values['peak_over_start_bytes'] / MB:>12.2f}"
+                     f"{values['retained_bytes'] / MB:>14.2f}")
+    lines.append(f"{'OBJECT':<24}{'COUNT':>10}{'MB':>10}{'BYTES/OBJ':>11}")
+    for category, values in report["footprint"].items():
+        per_object = values["bytes"] // values["count"] if values["count"] else 0
+        lines.append(f"{category:<24}{values['count']:>10,}{values['bytes'] / MB:>10.2f}{per_object:>11,}")
+    if report["top_allocations"]:
+        lines.append("Top allocation sites retained by parse:")
+        for allocation in report["top_allocations"]:
+            lines.append(f"  {allocation['bytes'] / MB:>8.2f} MB {allocation['count']:>9,}  {allocation['site']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Profile memory use per stage and AST node type.")
+    parser.add_argument("--type", dest="types", default="835",
+                        help=f"Comma-separated transaction types ({', '.join(TRANSACTION_TYPES)})")
+    parser.add_argument("--size", dest="sizes", default="10mb", help="Comma-separated sizes")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Cache directory for generated files")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write reports to the baseline")
+    parser.add_argument("--output", help="Also write raw reports to this JSON file")
+    parser.add_argument("--no-validate", action="store_true", help="Skip the validate stage")
+    parser.add_argument("--allocations", type=int, default=0, metavar="N",
+                        help="Report the N allocation sites retaining the most memory after parse")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for transaction_type in args.types.split(","):
+        for size in args.sizes.split(","):
+            report = run_case(transaction_type, size, data_dir=args.data_dir, seed=args.seed,
+                              validate=not args.no_validate, top_allocations=args.allocations)
+            print(format_report(report))
+            print()
+            reports.append(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, reports)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    regressions = [message for report in reports
+                   for message in compare_reports(report, baseline, args.tolerance)]
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
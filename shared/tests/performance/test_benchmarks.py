@@ -0,0 +1,121 @@
+"""
+Tests for the synthetic file generators and the benchmark runner.
+
+The large 10 MB / 100 MB / 1 GB cases only run when EDI_BENCHMARK_SIZES is
+set, e.g. ``EDI_BENCHMARK_SIZES=10mb pytest -m benchmark``.
+"""
+
+import os
+
+import pytest
+
+from core.streaming import SegmentReader, TransactionSplitter
+
+from tests.performance.benchmark import (
+    DEFAULT_BASELINE,
+    DEFAULT_TOLERANCE,
+    compare_results,
+    format_result,
+    load_baseline,
+    run_case,
+    run_case_isolated,
+)
+from tests.performance.generators import TRANSACTION_TYPES, SyntheticFileGenerator, generate_file
+
+SMALL = 64 * 1024
+
+
+class TestSyntheticFileGenerator:
+    """Test cases for deterministic file generation."""
+
+    @pytest.mark.parametrize("transaction_type", list(TRANSACTION_TYPES))
+    def test_same_seed_is_byte_identical(self, tmp_path, transaction_type):
+        first = SyntheticFileGenerator(transaction_type, seed=7).write(str(tmp_path / "a.edi"), SMALL)
+        second = SyntheticFileGenerator(transaction_type, seed=7).write(str(tmp_path / "b.edi"), SMALL)
+
+        assert (tmp_path / "a.edi").read_bytes() == (tmp_path / "b.edi").read_bytes()
+        assert first.bytes == second.bytes >= SMALL
+
+    def test_different_seed_differs(self, tmp_path):
+        SyntheticFileGenerator("835", seed=1).write(str(tmp_path / "a.edi"), SMALL)
+        SyntheticFileGenerator("835", seed=2).write(str(tmp_path / "b.edi"), SMALL)
+
+        assert (tmp_path / "a.edi").read_bytes() != (tmp_path / "b.edi").read_bytes()
+
+    @pytest.mark.parametrize("transaction_type", list(TRANSACTION_TYPES))
+    def test_envelope_counts_match(self, tmp_path, transaction_type):
+        path = str(tmp_path / "out.edi")
+        info = SyntheticFileGenerator(transaction_type, transactions_per_group=10).write(path, SMALL)
+
+        with open(path, "rb") as handle:
+            reader = SegmentReader(handle)
+            splitter = TransactionSplitter(reader)
+            chunks = list(splitter)
+
+        assert reader.bytes_read == info.bytes == os.path.getsize(path)
+        assert reader.segment_count == info.segments
+        assert len(chunks) == info.transactions
+        assert splitter.group_count == -(-info.transactions // 10)
+        assert all(chunk.segment_count == len(chunk.segments) - 4 for chunk in chunks)
+
+    def test_generate_file_reuses_cache(self, tmp_path):
+        first = generate_file("276", str(SMALL), str(tmp_path))
+        mtime = os.path.getmtime(first.path)
+        second = generate_file("276", str(SMALL), str(tmp_path))
+
+        assert second == first
+        assert os.path.getmtime(second.path) == mtime
+
+    def test_unknown_type_rejected(self):
+        with pytest.raises(ValueError):
+            SyntheticFileGenerator("999")
+
+
+class TestBenchmarkRunner:
+    """Test cases for measurements and baseline comparison."""
+
+    def test_run_case_reports_throughput_and_stages(self, tmp_path):
+        result = run_case("835", str(SMALL), data_dir=str(tmp_path))
+
+        assert result["case"] == f"835-{SMALL}"
+        assert result["tokenize"]["segments_per_second"] > 0
+        assert result["pipeline"]["mb_per_second"] > 0
+        assert result["pipeline"]["failed"] == 0
+        assert result["pipeline"]["transactions"] == result["transactions"]
+        assert set(result["pipeline"]["stages"]) == {"parse", "validate", "emit"}
+        assert result["peak_rss_mb"] >= result["rss_growth_mb"] >= 0
+        assert "835-" in format_result(result)
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        baseline = {"cases": {"835-10mb": {
+            "tokenize": {"segments_per_second": 1000.0},
+            "pipeline": {"mb_per_second": 2.0},
+            "rss_growth_mb": 100.0,
+        }}}
+        within = {"case": "835-10mb", "tokenize": {"segments_per_second": 900.0},
+                  "pipeline": {"mb_per_second": 2.5}, "rss_growth_mb": 110.0}
+        slower = {"case": "835-10mb", "tokenize": {"segments_per_second": 500.0},
+                  "pipeline": {"mb_per_second": 2.0}, "rss_growth_mb": 200.0}
+
+        assert compare_results([within], baseline, tolerance=0.2) == []
+        regressions = compare_results([slower], baseline, tolerance=0.2)
+        assert len(regressions) == 2
+        assert "tokenize.segments_per_second" in regressions[0]
+        assert "rss_growth_mb" in regressions[1]
+
+    def test_compare_ignores_cases_without_baseline(self):
+        result = {"case": "270-1gb", "tokenize": {"segments_per_second": 1.0}}
+        assert compare_results([result], {"cases": {}}) == []
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+@pytest.mark.parametrize("transaction_type", list(TRANSACTION_TYPES))
+def test_large_file_benchmark(transaction_type):
+    sizes = [size for size in os.environ.get("EDI_BENCHMARK_SIZES", "").split(",") if size]
+    if not sizes:
+        pytest.skip("Set EDI_BENCHMARK_SIZES (e.g. 10mb,100mb,1gb) to run large benchmarks")
+
+    results = [run_case_isolated(transaction_type, size) for size in sizes]
+    regressions = compare_results(results, load_baseline(DEFAULT_BASELINE), DEFAULT_TOLERANCE)
+    assert not regressions, "\n".join(regressions)
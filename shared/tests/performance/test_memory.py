@@ -0,0 +1,115 @@
+"""
+Tests for the memory profiling harness.
+
+The saved-baseline comparison runs only when EDI_BENCHMARK_SIZES is set,
+e.g. ``EDI_BENCHMARK_SIZES=10mb pytest -m benchmark``.
+"""
+
+import os
+
+import pytest
+
+from core.base.edi_ast import EdiRoot, FunctionalGroup, Interchange, Transaction
+from core.transactions.t835.ast import Adjustment, Claim, Service, Transaction835
+
+from tests.performance.generators import SyntheticFileGenerator
+from tests.performance.memory import (
+    DEFAULT_BASELINE,
+    compare_reports,
+    footprint,
+    format_report,
+    load_baseline,
+    profile_file,
+    run_case,
+    segments_footprint,
+)
+
+
+def build_root(claims: int = 3) -> EdiRoot:
+    root = EdiRoot()
+    interchange = Interchange("SENDER", "RECEIVER", "2024-01-15", "12:00", "000000001")
+    group = FunctionalGroup("HP", "SENDER", "RECEIVER", "2024-01-15", "12:00", "1")
+    data = Transaction835(header={"transaction_set_code": "835", "control_number": "0001"})
+    for index in range(claims):
+        claim = Claim(f"CLM{index}", "1", 100.0, 80.0, 20.0, f"PCN{index}")
+        claim.adjustments.append(Adjustment("PR", "1", 20.0))
+        claim.services.append(Service("HC:99213", 100.0, 80.0, "", "2024-01-10"))
+        data.claims.append(claim)
+    group.transactions.append(Transaction("835", "0001", data))
+    interchange.functional_groups.append(group)
+    root.interchanges.append(interchange)
+    return root
+
+
+class TestFootprint:
+    """Test cases for per-type footprint attribution."""
+
+    def test_counts_each_node_type(self):
+        objects = footprint(build_root(claims=3))
+
+        assert objects["Claim"]["count"] == 3
+        assert objects["Adjustment"]["count"] == 3
+        assert objects["Service"]["count"] == 3
+        assert objects["Transaction835"]["count"] == 1
+        assert objects["header dict"]["count"] == 4
+        assert all(values["bytes"] > 0 for values in objects.values())
+
+    def test_scales_with_claims(self):
+        small = footprint(build_root(claims=2))
+        large = footprint(build_root(claims=20))
+
+        assert large["Claim"]["bytes"] > small["Claim"]["bytes"] * 5
+        assert large["header dict"] == small["header dict"]
+
+    def test_shared_objects_counted_once(self):
+        shared = ["ST", "835", "0001"]
+        copied = ["ST", "835", "0002"]
+        assert segments_footprint([shared, shared])["bytes"] < segments_footprint([shared, copied])["bytes"]
+
+
+class TestMemoryHarness:
+    """Test cases for stage profiling and baseline comparison."""
+
+    def test_profile_file_reports_every_stage(self, tmp_path):
+        path = str(tmp_path / "small.edi")
+        SyntheticFileGenerator("835").write(path, 32 * 1024)
+
+        report = profile_file(path, "835", top_allocations=5)
+
+        assert set(report["stages"]) == {"tokenize", "parse", "validate", "emit"}
+        assert all(stage["peak_over_start_bytes"] > 0 for stage in report["stages"].values())
+        assert report["footprint"]["Claim"]["count"] > 0
+        assert report["footprint"]["segment lists"]["count"] == report["segments"]
+        assert report["top_allocations"]
+        assert "Claim" in format_report({**report, "case": "835-small"})
+
+    def test_compare_flags_growth_only(self):
+        baseline = {"cases": {"835-10mb": {
+            "stages": {"parse": {"peak_over_start_bytes": 1000}},
+            "footprint": {"Claim": {"bytes": 500}},
+        }}}
+        smaller = {"case": "835-10mb", "stages": {"parse": {"peak_over_start_bytes": 500}},
+                   "footprint": {"Claim": {"bytes": 100}}}
+        larger = {"case": "835-10mb", "stages": {"parse": {"peak_over_start_bytes": 1200}},
+                  "footprint": {"Claim": {"bytes": 520}}}
+
+        assert compare_reports(smaller, baseline, tolerance=0.1) == []
+        regressions = compare_reports(larger, baseline, tolerance=0.1)
+        assert len(regressions) == 1
+        assert "parse peak" in regressions[0]
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_memory_baseline():
+    sizes = [size for size in os.environ.get("EDI_BENCHMARK_SIZES", "").split(",") if size]
+    if not sizes:
+        pytest.skip("Set EDI_BENCHMARK_SIZES (e.g. 10mb) to compare memory against the baseline")
+
+    baseline = load_baseline(DEFAULT_BASELINE)
+    regressions = []
+    for case in baseline.get("cases", {}):
+        transaction_type, size = case.rsplit("-", 1)
+        if size in sizes:
+            regressions.extend(compare_reports(run_case(transaction_type, size), baseline))
+    assert not regressions, "\n".join(regressions)
@@ -8,8 +8,8 @@ for critical EDI parsing operations.
 import pytest
 import time
 from decimal import Decimal
-from packages.core.transactions.t835.parser import Parser835
-from tests.fixtures import EDIFixtures, IntegrationScenarios
+from core.transactions.t835.parser import Parser835
+from tests.core.fixtures import EDIFixtures, IntegrationScenarios
 
 
 class TestParsingPerformance:
@@ -24,14 +24,14 @@ class TestParsingPerformance:
         parser.parse(edi_content)
         
         # Measure performance
-        start_time = time.time()
+        start_time = time.perf_counter()
         iterations = 100
         
         for _ in range(iterations):
             result = parser.parse(edi_content)
             assert result is not None
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         avg_time = total_time / iterations
         
@@ -48,7 +48,7 @@ class TestParsingPerformance:
         parser.parse(edi_content)
         
         # Measure performance
-        start_time = time.time()
+        start_time = time.perf_counter()
         iterations = 50
         
         for _ in range(iterations):
@@ -56,7 +56,7 @@ class TestParsingPerformance:
             assert result is not None
             assert len(result.interchanges[0].functional_groups[0].transactions[0].claims) >= 2
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         avg_time = total_time / iterations
         
@@ -70,9 +70,9 @@ class TestParsingPerformance:
         parser = Parser835()
         
         # Measure performance
-        start_time = time.time()
+        start_time = time.perf_counter()
         result = parser.parse(edi_content)
-        end_time = time.time()
+        end_time = time.perf_counter()
         
         parsing_time = end_time - start_time
         
@@ -135,13 +135,13 @@ class TestParsingPerformance:
             """Worker function for concurrent parsing."""
             try:
                 parser = Parser835()
-                worker_start = time.time()
+                worker_start = time.perf_counter()
                 
                 for i in range(iterations):
                     result = parser.parse(edi_content)
                     assert result is not None
                 
-                worker_end = time.time()
+                worker_end = time.perf_counter()
                 worker_time = worker_end - worker_start
                 results_queue.put((worker_id, worker_time, iterations))
                 
@@ -153,7 +153,7 @@ class TestParsingPerformance:
         num_workers = 4
         iterations_per_worker = 25
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         for worker_id in range(num_workers):
             thread = threading.Thread(
@@ -167,7 +167,7 @@ class TestParsingPerformance:
         for thread in threads:
             thread.join()
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         
         # Collect results
@@ -196,7 +196,7 @@ class TestValidationPerformance:
 
     def test_npi_validation_performance(self):
         """Test NPI validation performance."""
-        from packages.core.utils.validators import validate_npi
+        from core.utils.validators import validate_npi
         
         test_npis = [
             "1234567893",
@@ -207,13 +207,13 @@ class TestValidationPerformance:
             "123"
         ] * 1000  # Repeat for performance testing
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         for npi in test_npis:
             result = validate_npi(npi)
             assert isinstance(result, bool)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         validations_per_second = len(test_npis) / total_time
         
@@ -223,7 +223,7 @@ class TestValidationPerformance:
 
     def test_amount_validation_performance(self):
         """Test amount validation performance."""
-        from packages.core.utils.validators import validate_amount_format
+        from core.utils.validators import validate_amount_format
         
         test_amounts = [
             "123.45",
@@ -235,13 +235,13 @@ class TestValidationPerformance:
             0
         ] * 1000
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         for amount in test_amounts:
             result = validate_amount_format(amount)
             assert isinstance(result, bool)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         validations_per_second = len(test_amounts) / total_time
         
@@ -255,7 +255,7 @@ class TestFormattingPerformance:
 
     def test_date_formatting_performance(self):
         """Test date formatting performance."""
-        from packages.core.utils.formatters import format_edi_date
+        from core.utils.formatters import format_edi_date
         
         test_dates = [
             "20241226",
@@ -265,13 +265,13 @@ class TestFormattingPerformance:
             "invalid"
         ] * 1000
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         for date in test_dates:
             result = format_edi_date(date)
             assert isinstance(result, str)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         formats_per_second = len(test_dates) / total_time
         
@@ -281,7 +281,7 @@ class TestFormattingPerformance:
 
     def test_time_formatting_performance(self):
         """Test time formatting performance."""
-        from packages.core.utils.formatters import format_edi_time
+        from core.utils.formatters import format_edi_time
         
         test_times = [
             "1430",
@@ -290,13 +290,13 @@ class TestFormattingPerformance:
             "invalid"
         ] * 1000
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         for time_val in test_times:
             result = format_edi_time(time_val)
             assert isinstance(result, str)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         formats_per_second = len(test_times) / total_time
         
@@ -319,13 +319,13 @@ class TestRegressionBenchmarks:
             parser.parse(edi_content)
         
         # Benchmark
-        start_time = time.time()
+        start_time = time.perf_counter()
         iterations = 1000
         
         for _ in range(iterations):
             result = parser.parse(edi_content)
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         total_time = end_time - start_time
         avg_time = total_time / iterations
         
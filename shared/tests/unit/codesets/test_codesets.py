@@ -0,0 +1,140 @@
+"""
+Unit tests for memory-mapped code set indexes and the code set registry.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.codesets import (
+    CARC, CLAIM_STATUS, CPT, CodeSetIndex, CodeSetRegistry, compile_codeset, compile_csv, get_codesets,
+    set_codesets,
+)
+from core.healthcare.transformations import HealthcareTransformer
+from core.utils.validators import validate_adjustment_reason_code
+from core.validation import ValidationEngine, validate_stream
+from core.validation.integration import ValidationIntegrationManager
+from core.validation.rules_835 import Transaction835CodeSetRule
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+
+@pytest.fixture
+def codeset_dir(tmp_path):
+    compile_codeset([("1", "Deductible Amount"), ("2", "Coinsurance Amount"), ("45", "Charge exceeds fee schedule")],
+                    str(tmp_path / "carc.csi"), "carc")
+    compile_codeset([("99213", "Office visit, low"), ("99214", "Office visit, moderate")],
+                    str(tmp_path / "cpt.csi"), "cpt")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(codeset_dir):
+    registry = CodeSetRegistry(str(codeset_dir))
+    previous = set_codesets(registry)
+    yield registry
+    set_codesets(previous)
+    registry.close()
+
+
+class TestCodeSetIndex:
+    """Test cases for compiled index files."""
+
+    def test_compile_csv_and_lookup(self, tmp_path):
+        csv_path = tmp_path / "icd10.csv"
+        csv_path.write_text("Code,Description\nE11.9,Type 2 diabetes mellitus without complications\n"
+                            "I10,Essential (primary) hypertension\n,blank code is skipped\n", encoding="utf-8")
+
+        count = compile_csv(str(csv_path), str(tmp_path / "icd10.csi"), code_column="Code",
+                            description_column="Description")
+
+        with CodeSetIndex(str(tmp_path / "icd10.csi")) as index:
+            assert count == len(index) == 2
+            assert index.name == "icd10"
+            assert "E119" in index and "e11.9" in index
+            assert index.get("I10") == "Essential (primary) hypertension"
+            assert "Z00" not in index and 45 not in index
+            assert index.get("Z00", "unknown") == "unknown"
+            assert sorted(index) == ["E119", "I10"]
+
+    def test_many_codes_with_collisions(self, tmp_path):
+        entries = [(f"{n:05d}", f"code {n}") for n in range(5000)]
+        compile_codeset(entries, str(tmp_path / "big.csi"))
+
+        with CodeSetIndex(str(tmp_path / "big.csi")) as index:
+            assert len(index) == 5000
+            assert all(index.get(code) == description for code, description in entries[::97])
+            assert "05000" not in index
+
+    def test_not_an_index(self, tmp_path):
+        path = tmp_path / "bogus.csi"
+        path.write_bytes(b"code,description\n" * 10)
+
+        with pytest.raises(ValueError):
+            CodeSetIndex(str(path))
+
+
+class TestCodeSetRegistry:
+    """Test cases for CodeSetRegistry."""
+
+    def test_compiled_sets_load_from_directory(self, registry):
+        assert registry.is_compiled(CARC)
+        assert registry.contains(CARC, "45") is True
+        assert registry.contains(CARC, "999") is False
+        assert registry.describe(CPT, "99213") == "Office visit, low"
+
+    def test_builtin_fallback_without_index(self):
+        registry = CodeSetRegistry()
+
+        assert not registry.is_compiled(CARC)
+        assert registry.contains(CARC, "45") is None
+        assert registry.describe(CLAIM_STATUS, "1") is not None
+        assert registry.describe(CARC, "no-such-code", "fallback") == "fallback"
+
+    def test_global_registry_follows_environment(self, codeset_dir, monkeypatch):
+        monkeypatch.setenv("EDI_CODESET_DIR", str(codeset_dir))
+        previous = set_codesets(None)
+        try:
+            assert get_codesets().contains(CPT, "99214") is True
+        finally:
+            set_codesets(previous).close()
+
+
+class TestCodeSetConsumers:
+    """Validators, transformations and rules backed by compiled code sets."""
+
+    def test_adjustment_reason_validator(self, registry):
+        assert validate_adjustment_reason_code("45")
+        assert not validate_adjustment_reason_code("97")
+
+    def test_transformer_describes_from_index(self, registry):
+        transformer = HealthcareTransformer()
+
+        assert transformer._decode_adjustment_reason("2") == "Coinsurance Amount"
+
+    def test_code_set_rule_flags_unknown_codes(self, registry):
+        engine = ValidationEngine()
+        engine.register_rule_plugin(Transaction835CodeSetRule())
+        with open(os.path.join(TEST_DATA, "sample-835.edi"), "rb") as f:
+            result = validate_stream(io.BytesIO(f.read()), engine)
+
+        assert sorted((e.code, e.value) for e in result.errors) == [
+            ("835_UNKNOWN_PROCEDURE_CODE", "99215"),
+            ("835_UNKNOWN_PROCEDURE_CODE", "99215"),
+            ("835_UNKNOWN_REASON_CODE", "97"),
+        ]
+
+    def test_default_engine_checks_code_sets(self):
+        engine = ValidationIntegrationManager().validation_engine
+        rule_names = [rule.rule_name for rule in engine.rule_plugins["835"]]
+
+        assert "835_code_set_validation" in rule_names
+
+    def test_code_set_rule_is_silent_without_indexes(self):
+        engine = ValidationEngine()
+        engine.register_rule_plugin(Transaction835CodeSetRule(CodeSetRegistry()))
+        with open(os.path.join(TEST_DATA, "sample-835.edi"), "rb") as f:
+            result = validate_stream(io.BytesIO(f.read()), engine)
+
+        assert result.errors == []
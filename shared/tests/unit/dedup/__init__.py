@@ -0,0 +1,3 @@
+"""
+Unit tests for duplicate claim and payment detection.
+"""
@@ -0,0 +1,189 @@
+"""
+Unit tests for duplicate claim and payment detection.
+"""
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from core.dedup import (
+    BloomFilter, FingerprintIndex, DuplicateDetector, find_duplicates, optimal_parameters,
+    BLOOM_SUFFIX, CLAIM, PAYMENT
+)
+
+
+def remittance(claims, trace="TRACE1", payer="PAYER"):
+    segments = [
+        "ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+        "*230315*1030*^*00501*000000001*0*P*:",
+        "GS*HP*PAYER*PROVIDER*20230315*1030*1*X*005010X221A1",
+        "ST*835*0001",
+        "BPR*I*100.00*C*CHK*CCP*01*999999999*DA*123456*1234567890**01*999999999*DA*654321*20230315",
+        f"TRN*1*{trace}*1234567890",
+        f"N1*PR*{payer}",
+        "N1*PE*CLINIC*XX*1234567893",
+    ]
+    for claim in claims:
+        segments.extend(claim)
+    segments.extend([f"SE*{len(segments) - 1}*0001", "GE*1*1", "IEA*1*000000001"])
+    return ("~\n".join(segments) + "~\n").encode()
+
+
+def claim(claim_id, paid="100.00", status="1"):
+    return [
+        f"CLP*{claim_id}*{status}*150.00*{paid}*0*12*ICN{claim_id}",
+        "CAS*CO*45*50.00",
+        "SVC*HC:99213*150.00*100.00**1",
+        "DTM*472*20230301",
+    ]
+
+
+def digest(value):
+    return hashlib.blake2b(str(value).encode(), digest_size=16).digest()
+
+
+def check(data, index, source="remit.835", **options):
+    return find_duplicates(io.BytesIO(data), index, source_name=source, **options)
+
+
+class TestBloomFilter:
+    """Test cases for BloomFilter."""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [digest(i) for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        assert all(key in bloom for key in keys)
+        false_positives = sum(digest(f"other-{i}") in bloom for i in range(10000))
+        assert false_positives < 300
+
+    def test_round_trip(self):
+        bloom = BloomFilter(100, 0.01)
+        bloom.add(digest("a"))
+        handle = io.BytesIO()
+        bloom.write(handle)
+        handle.seek(0)
+
+        loaded = BloomFilter.read(handle)
+
+        assert digest("a") in loaded
+        assert loaded.count == 1
+        assert loaded.hash_count == bloom.hash_count
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            BloomFilter.read(io.BytesIO(b"not a bloom filter at all, not at all"))
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            optimal_parameters(0, 0.01)
+        with pytest.raises(ValueError):
+            optimal_parameters(100, 1.5)
+
+
+class TestFingerprintIndex:
+    """Test cases for FingerprintIndex."""
+
+    def test_add_and_get(self, tmp_path):
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000, batch_size=2) as index:
+            assert index.add(digest(1), CLAIM, "A", "first.835") is None
+            assert index.add(digest(2), CLAIM, "B", "first.835") is None
+            assert index.add(digest(3), PAYMENT, "T", "first.835") is None
+
+            existing = index.add(digest(1), CLAIM, "A", "second.835")
+            assert existing.reference == "A"
+            assert existing.source == "first.835"
+            assert index.get(digest(4)) is None
+            assert index.stats()["fingerprints"] == 3
+
+    def test_persists_across_opens(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        with FingerprintIndex(path, capacity=1000) as index:
+            index.add(digest(1), CLAIM, "A", "first.835")
+
+        assert os.path.exists(path + BLOOM_SUFFIX)
+        with FingerprintIndex(path, capacity=1000) as index:
+            assert index.get(digest(1)).source == "first.835"
+            assert index.count == 1
+
+    def test_rebuilds_missing_bloom_filter(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        with FingerprintIndex(path, capacity=1000) as index:
+            index.add(digest(1), CLAIM, "A", "first.835")
+        os.unlink(path + BLOOM_SUFFIX)
+
+        with FingerprintIndex(path, capacity=1000) as index:
+            assert digest(1) in index
+
+    def test_rollback_discards_additions(self, tmp_path):
+        path = str(tmp_path / "index.db")
+        with FingerprintIndex(path, capacity=1000) as index:
+            index.add(digest(1), CLAIM, "A", "first.835")
+
+        with pytest.raises(RuntimeError):
+            with FingerprintIndex(path, capacity=1000) as index:
+                index.add(digest(2), CLAIM, "B", "second.835")
+                raise RuntimeError("interrupted")
+
+        with FingerprintIndex(path, capacity=1000) as index:
+            assert digest(1) in index
+            assert digest(2) not in index
+
+
+class TestDuplicateDetection:
+    """Test cases for duplicate claim and payment detection."""
+
+    def test_resent_remit_is_flagged(self, tmp_path):
+        data = remittance([claim("A"), claim("B")])
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            assert check(data, index, "first.835") == []
+            duplicates = check(data, index, "second.835")
+
+        assert [(d.kind, d.reference) for d in duplicates] == [(CLAIM, "A"), (CLAIM, "B"), (PAYMENT, "TRACE1")]
+        assert all(d.first_seen.source == "first.835" for d in duplicates)
+
+    def test_claim_resent_under_new_trace_number(self, tmp_path):
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            check(remittance([claim("A")], trace="TRACE1"), index)
+            duplicates = check(remittance([claim("A"), claim("B")], trace="TRACE2"), index)
+
+        assert [(d.kind, d.reference) for d in duplicates] == [(CLAIM, "A")]
+
+    def test_changed_claims_are_not_duplicates(self, tmp_path):
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            check(remittance([claim("A")], trace="TRACE1"), index)
+            duplicates = check(remittance([claim("A", paid="90.00"), claim("A", status="22")],
+                                          trace="TRACE2"), index)
+
+        assert duplicates == []
+
+    def test_other_payer_is_not_a_duplicate(self, tmp_path):
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            check(remittance([claim("A")]), index)
+            duplicates = check(remittance([claim("A")], payer="OTHER PAYER"), index)
+
+        assert duplicates == []
+
+    def test_check_only_does_not_record(self, tmp_path):
+        data = remittance([claim("A")])
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            assert check(data, index, record=False) == []
+            assert check(data, index, record=False) == []
+            assert index.count == 0
+
+    def test_detector_summary(self, tmp_path):
+        from core.transactions.t835.parser import Parser835
+        from core.streaming import SegmentReader
+
+        data = remittance([claim("A"), claim("A")])
+        with FingerprintIndex(str(tmp_path / "index.db"), capacity=1000) as index:
+            detector = DuplicateDetector(index, source="remit.835")
+            segments = (segment.elements for segment in SegmentReader(io.BytesIO(data)))
+            Parser835(segments, listener=detector, retain_claims=False).parse()
+
+        assert detector.summary() == {"claims_checked": 2, "payments_checked": 1,
+                                      "duplicate_claims": 1, "duplicate_payments": 0}
@@ -0,0 +1,90 @@
+"""
+Unit tests for bounded error collection and windowed parse contexts.
+"""
+
+from core.base.enhanced_parser import EnhancedParser
+from core.errors import BoundedErrorHandler, EDIError, EDIParseError, create_parse_context
+
+
+class FailingParser(EnhancedParser):
+    """Parser that reports one segment error per parse."""
+
+    def get_transaction_codes(self):
+        return ["999"]
+
+    def parse(self):
+        if not self._handle_segment_error(["ST", "999", "0001"], 0, "Invalid transaction code"):
+            raise EDIParseError("Parsing failed")
+        return {"transaction": "999"}
+
+
+class AbortingParser(EnhancedParser):
+    """Parser that gives up partway through the document."""
+
+    def get_transaction_codes(self):
+        return ["999"]
+
+    def parse(self):
+        self.current_index = 500
+        raise ValueError("unexpected segment")
+
+
+def test_bounded_error_handler():
+    handler = BoundedErrorHandler(sample_size=10, seed=7)
+
+    for index in range(1000):
+        code = "BAD_AMOUNT" if index % 4 else "BAD_DATE"
+        handler.handle_error(EDIError(f"Error {index}", code))
+
+    assert handler.error_count == 1000
+    assert handler.counts_by_code == {"BAD_AMOUNT": 750, "BAD_DATE": 250}
+    assert handler.first_by_code["BAD_DATE"].message == "Error 0"
+    assert len(handler.get_errors()) == 10
+    # The reservoir is a sample of the whole run, not just its start
+    assert max(int(error.message.split()[1]) for error in handler.get_errors()) >= 10
+    assert handler.summary()["sampled"] == 10
+
+    handler.reset()
+    assert not handler.has_errors()
+
+
+def test_segment_window_context():
+    segments = [["SEG", str(index)] for index in range(100)]
+    context = create_parse_context().segment_window(segments, 50, radius=2).build()
+
+    assert len(context.segments) == 5
+    assert context.current_segment == ["SEG", "50"]
+    assert context.segment_count == 100
+    assert context.to_dict()["current_segment_index"] == 50
+
+    edge = create_parse_context().segment_window(segments, 0).build()
+    assert edge.current_segment == ["SEG", "0"]
+
+
+def test_enhanced_parser_bounded_errors():
+    segments = [["ST", "999", "0001"]] * 1000
+    handler = BoundedErrorHandler(sample_size=5)
+    parser = FailingParser(segments, handler)
+
+    for _ in range(20):
+        parser.parse_with_error_handling()
+
+    error_summary = parser.get_error_summary()
+    assert error_summary["total_errors"] == 20
+    assert len(error_summary["errors"]) == 5
+    _, context = handler.get_samples()[0]
+    assert context.segment_count == 1000
+    assert len(context.segments) <= 3
+
+
+def test_parse_failure_context_is_windowed():
+    segments = [["SEG", str(index)] for index in range(1000)]
+    handler = BoundedErrorHandler(sample_size=5)
+
+    assert AbortingParser(segments, handler).parse_with_error_handling() is None
+
+    (error, context), = handler.get_samples()
+    assert isinstance(error, EDIParseError)
+    assert context.current_segment == ["SEG", "500"]
+    assert context.segment_count == 1000
+    assert len(context.segments) < 100
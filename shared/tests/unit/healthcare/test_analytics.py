@@ -0,0 +1,179 @@
+"""
+Unit tests for streaming remittance analytics.
+"""
+
+import io
+import os
+import pickle
+from datetime import date
+
+import pytest
+
+from core.healthcare.analytics import (
+    GROUP_BY_PAYER, AdjustmentReasons, AgingBuckets, PaymentTotals, RemittanceAnalytics,
+    aggregate_file, aggregate_files,
+)
+from core.healthcare.transformations import HealthcareTransformer, StandardizedClaim
+from core.transactions.t835.parser import Parser835
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+AS_OF = date(2024, 4, 30)
+
+
+def remittance(claims, payer="ACME HEALTH", plb=None):
+    """An 835 file with one claim per (claim_id, status, charge, paid, patient_responsibility, cas, service_date)."""
+    segments = [
+        "ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+        "*240401*1030*^*00501*000000001*0*P*:",
+        "GS*HP*PAYER*PROVIDER*20240401*1030*1*X*005010X221A1",
+        "ST*835*0001",
+        "BPR*I*0*C*CHK*CCP*01*999999999*DA*123456*1234567890**01*999999999*DA*654321*20240401",
+        "TRN*1*TRACE1*1234567890",
+        f"N1*PR*{payer}",
+        "N1*PE*CLINIC*XX*1234567893",
+    ]
+    for claim_id, status, charge, paid, patient_responsibility, cas, service_date in claims:
+        segments.append(f"CLP*{claim_id}*{status}*{charge}*{paid}*{patient_responsibility}*12*ICN{claim_id}")
+        if cas:
+            segments.append(f"CAS*{cas}")
+        segments.append(f"SVC*HC:99213*{charge}*{paid}**1")
+        segments.append(f"DTM*472*{service_date}")
+    if plb:
+        segments.append(f"PLB*1234567893*20241231*{plb}")
+    segments.extend([f"SE*{len(segments) - 1}*0001", "GE*1*1", "IEA*1*000000001"])
+    return ("~".join(segments) + "~").encode()
+
+
+FIRST = remittance([
+    ("A", "1", "100.00", "80.00", "10.00", "CO*45*10.00", "20240420"),
+    ("B", "4", "50.00", "0", "0", "CO*50*50.00", "20240301"),
+], plb="WO*REF1*-5.00")
+SECOND = remittance([
+    ("C", "1", "200.10", "150.05", "20.00", "CO*45*30.05", "20231201"),
+], payer="OTHER PAYER")
+
+
+def parse(data):
+    segments = [segment.split("*") for segment in data.decode().split("~") if segment]
+    root = Parser835(segments).parse()
+    return root.interchanges[0].functional_groups[0].transactions[0].transaction_data
+
+
+class TestAccumulators:
+    """Test cases for the mergeable accumulators."""
+
+    def test_payment_totals_match_payment_summary(self):
+        transaction = parse(FIRST)
+        totals = PaymentTotals()
+        for claim in transaction.claims:
+            totals.add_claim(claim)
+        totals.add_plb(transaction.plb)
+
+        assert totals.summary() == HealthcareTransformer.calculate_payment_summary(transaction)
+        assert totals.total_claims == 2
+        assert totals.paid_cents == 8000
+        # Claim adjustments plus the PLB adjustment
+        assert totals.adjustment_cents == 5500
+        assert totals.claims_paid == 2
+
+    def test_merge_equals_single_pass(self):
+        claims = parse(FIRST).claims + parse(SECOND).claims
+        single = PaymentTotals()
+        for claim in claims:
+            single.add_claim(claim)
+        merged = PaymentTotals()
+        for claim in claims:
+            part = PaymentTotals()
+            part.add_claim(claim)
+            merged.merge(part)
+
+        assert merged == single
+        assert merged.summary().total_charges == 350.10
+
+    def test_adjustment_reasons(self):
+        reasons = AdjustmentReasons()
+        for claim in parse(FIRST).claims:
+            reasons.add_claim(claim)
+        other = AdjustmentReasons()
+        for claim in parse(SECOND).claims:
+            other.add_claim(claim)
+
+        histogram = reasons.merge(other).to_list()
+
+        assert [(r["group_code"], r["reason_code"], r["count"], r["amount"]) for r in histogram] == [
+            ("CO", "50", 1, 50.0), ("CO", "45", 2, 40.05),
+        ]
+        assert histogram[0]["type"] == "Contractual Obligation"
+
+    def test_aging_matches_aging_report(self):
+        claims = [
+            StandardizedClaim(claim_id="A", transaction_type="835", service_date="20240420", total_charge=100.0),
+            StandardizedClaim(claim_id="B", transaction_type="835", service_date="20231201", total_charge=50.0),
+            StandardizedClaim(claim_id="C", transaction_type="835", service_date="20241340", total_charge=75.0),
+        ]
+        aging = AgingBuckets(AS_OF)
+        for claim in claims:
+            aging.add(claim.service_date, claim.total_charge)
+
+        report = HealthcareTransformer.generate_claim_aging_report(claims, as_of=AS_OF)
+
+        assert aging.to_dict() == report
+        assert report["aging_buckets"]["0-30"] == {"count": 1, "amount": 100.0}
+        assert report["aging_buckets"]["120+"] == {"count": 1, "amount": 50.0}
+
+    def test_aging_merge_requires_same_date(self):
+        with pytest.raises(ValueError):
+            AgingBuckets(AS_OF).merge(AgingBuckets(date(2024, 5, 1)))
+
+    def test_accumulators_pickle(self):
+        analytics = aggregate_file(io.BytesIO(FIRST), as_of=AS_OF)
+
+        restored = pickle.loads(pickle.dumps(analytics))
+
+        assert restored.to_dict() == analytics.to_dict()
+
+
+class TestRemittanceAnalytics:
+    """Test cases for RemittanceAnalytics and file aggregation."""
+
+    def test_groups_by_payer(self):
+        analytics = aggregate_file(io.BytesIO(FIRST), group_by=GROUP_BY_PAYER, as_of=AS_OF)
+        analytics.merge(aggregate_file(io.BytesIO(SECOND), group_by=GROUP_BY_PAYER, as_of=AS_OF))
+
+        report = analytics.to_dict()
+
+        assert set(report["groups"]) == {"ACME HEALTH", "OTHER PAYER"}
+        assert report["files"] == 2
+        assert report["groups"]["ACME HEALTH"]["payment_summary"]["total_claims"] == 2
+        assert report["total"]["payment_summary"]["total_claims"] == 3
+        assert report["total"]["aging"]["aging_buckets"]["0-30"]["count"] == 1
+        assert report["total"]["aging"]["aging_buckets"]["31-60"]["count"] == 1
+        assert report["total"]["aging"]["aging_buckets"]["120+"]["amount"] == 200.10
+
+    def test_merge_requires_same_grouping(self):
+        with pytest.raises(ValueError):
+            RemittanceAnalytics(group_by="payer").merge(RemittanceAnalytics())
+        with pytest.raises(ValueError):
+            RemittanceAnalytics(group_by="provider")
+
+    @pytest.mark.parametrize("use_processes", [False, True])
+    def test_aggregate_files_in_parallel(self, tmp_path, use_processes):
+        paths = []
+        for number, data in enumerate([FIRST, SECOND, FIRST]):
+            path = tmp_path / f"remit-{number}.835"
+            path.write_bytes(data)
+            paths.append(str(path))
+
+        analytics = aggregate_files(paths, group_by=GROUP_BY_PAYER, as_of=AS_OF, max_workers=2,
+                                    use_processes=use_processes)
+
+        sequential = RemittanceAnalytics(group_by=GROUP_BY_PAYER, as_of=AS_OF)
+        for path in paths:
+            sequential.merge(aggregate_file(path, group_by=GROUP_BY_PAYER, as_of=AS_OF))
+        assert analytics.to_dict() == sequential.to_dict()
+        assert analytics.to_dict()["groups"]["ACME HEALTH"]["payment_summary"]["total_claims"] == 4
+
+    def test_sample_file(self):
+        analytics = aggregate_file(os.path.join(TEST_DATA, "sample-835.edi"), as_of=AS_OF)
+
+        assert analytics.to_dict()["total"]["payment_summary"]["total_claims"] == 3
@@ -0,0 +1,140 @@
+"""
+Unit tests for provider master-data enrichment.
+"""
+
+import io
+import os
+import sqlite3
+
+import pytest
+
+from core.healthcare.enrichment import (
+    BILLING_PROVIDER, PAYEE, RENDERING_PROVIDER, CsvProviderLookup, ProviderEnricher, SqliteProviderLookup,
+)
+from core.healthcare.transformations import HealthcareTransformer
+from core.pipeline import EnrichStage, ParseStage, Pipeline, TransformStage, build_stage
+from core.streaming import SegmentReader, TransactionSplitter
+from core.transactions.t835.parser import Parser835
+from core.transactions.t837p.parser import Parser837P
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+
+def read(name: str) -> str:
+    with open(os.path.join(TEST_DATA, name)) as f:
+        return f.read()
+
+
+def split(text: str):
+    return [s.strip().split("*") for s in text.split("~") if s.strip()]
+
+
+def transaction_data(root):
+    return root.interchanges[0].functional_groups[0].transactions[0].transaction_data
+
+
+@pytest.fixture
+def provider_db(tmp_path):
+    path = str(tmp_path / "providers.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE providers (npi TEXT PRIMARY KEY, provider_key TEXT, name TEXT, "
+                       "taxonomy TEXT, \"group\" TEXT, region TEXT)")
+    connection.executemany("INSERT INTO providers VALUES (?, ?, ?, ?, ?, ?)", [
+        ("1234567893", "P-0001", "Provider Clinic", "207Q00000X", "NORTH", "R1"),
+        ("1234567890", "P-0003", "Sample Medical Clinic", "261QP2300X", "SOUTH", "R2"),
+        ("9876543210", "P-0002", "Robert Smith", "207R00000X", "NORTH", "R1"),
+    ])
+    connection.commit()
+    connection.close()
+    return path
+
+
+class TestLookups:
+    """Test cases for lookup backends."""
+
+    def test_sqlite_lookup_maps_columns(self, provider_db):
+        lookup = SqliteProviderLookup(provider_db, columns={"internal_id": "provider_key"}, batch_size=1)
+        try:
+            records = lookup.lookup_many(["1234567893", "9876543210", "1111111111"])
+        finally:
+            lookup.close()
+
+        assert sorted(records) == ["1234567893", "9876543210"]
+        record = records["1234567893"]
+        assert (record.internal_id, record.taxonomy, record.group) == ("P-0001", "207Q00000X", "NORTH")
+        assert record.attributes == {"region": "R1"}
+
+    def test_csv_lookup(self, tmp_path):
+        path = tmp_path / "providers.csv"
+        path.write_text("NPI,internal_id,taxonomy\n1234567890,P-0001,207Q00000X\n", encoding="utf-8")
+
+        lookup = CsvProviderLookup(str(path), npi_column="NPI")
+
+        assert lookup.lookup_many(["1234567890"])["1234567890"].internal_id == "P-0001"
+        with pytest.raises(ValueError):
+            CsvProviderLookup(str(path))
+
+
+class TestProviderEnricher:
+    """Test cases for the cached, batched enricher."""
+
+    def test_cache_and_batching(self, provider_db):
+        backend = SqliteProviderLookup(provider_db)
+        calls = []
+        original = backend.lookup_many
+        backend.lookup_many = lambda npis: calls.append(list(npis)) or original(npis)
+        enricher = ProviderEnricher(backend, cache_size=2)
+
+        first = enricher.lookup_many(["1234567890", "9876543210", "1234567890", "5555555555"])
+        enricher.lookup_many(["5555555555", "9876543210"])
+        enricher.close()
+
+        assert calls == [["1234567890", "9876543210", "5555555555"]]
+        assert first["5555555555"] is None
+        assert enricher.stats() == {"hits": 2, "misses": 3, "queries": 1, "cached": 2}
+
+    def test_transaction_roles(self, provider_db):
+        enricher = ProviderEnricher(SqliteProviderLookup(provider_db))
+        remit = transaction_data(Parser835().parse(read("sample-835.edi")))
+        claim = transaction_data(Parser837P(split(read("sample-837.edi"))).parse())
+
+        providers = enricher.enrich_transactions([remit, claim])
+        enricher.close()
+
+        assert providers[0][PAYEE]["name"] == "Provider Clinic"
+        assert providers[1][BILLING_PROVIDER]["name"] == "Sample Medical Clinic"
+        assert providers[1][RENDERING_PROVIDER]["name"] == "Robert Smith"
+        assert enricher.queries == 1
+
+    def test_normalize_provider_data(self, provider_db):
+        enricher = ProviderEnricher(SqliteProviderLookup(provider_db))
+
+        normalized = HealthcareTransformer.normalize_provider_data({"name": "clinic", "npi": "1234567893"},
+                                                                   enricher)
+        enricher.close()
+
+        assert normalized["master"]["taxonomy"] == "207Q00000X"
+
+
+class TestEnrichStage:
+    """Test cases for the enrich pipeline stage."""
+
+    def test_annotates_standardized_claims(self, provider_db):
+        stage = build_stage({"type": "enrich", "backend": "sqlite", "path": provider_db})
+        pipeline = Pipeline([ParseStage(), TransformStage(), stage])
+        data = read("sample-835.edi").encode()
+
+        items = []
+        pipeline.run(TransactionSplitter(SegmentReader(io.BytesIO(data))), on_item=items.append)
+
+        assert items[0].outputs["providers"] == [{PAYEE: {
+            "npi": "1234567893", "internal_id": None, "name": "Provider Clinic", "taxonomy": "207Q00000X",
+            "group": "NORTH", "attributes": {"provider_key": "P-0001", "region": "R1"},
+        }}]
+        claims = items[0].outputs["standardize_claims"][0]
+        assert len(claims) == 3
+        assert all(claim["provider_details"]["name"] == "Provider Clinic" for claim in claims)
+
+    def test_requires_path(self):
+        with pytest.raises(ValueError):
+            EnrichStage()
@@ -0,0 +1,208 @@
+"""
+Unit tests for 835-to-837P claim reconciliation.
+"""
+
+import io
+
+import pytest
+
+from core.healthcare.reconciliation import (
+    DENIED, OPEN, PAID, PARTIALLY_PAID, REVERSED, UNMATCHED, ClaimStore, SubmittedClaim,
+    index_claims, reconcile_remittance,
+)
+
+ISA = ("ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       "
+       "*240326*1430*^*00501*000000001*1*T*:")
+
+
+def submission(*claims):
+    """An 837P file with one transaction set per (claim_id, charge)."""
+    segments = [ISA, "GS*HC*SENDER*RECEIVER*20240326*1430*1*X*005010X222A1"]
+    for number, (claim_id, charge) in enumerate(claims, 1):
+        body = [
+            f"ST*837*{number:04d}",
+            "BHT*0019*00*BATCH*20240326*1430*CH",
+            "NM1*40*2*SAMPLE INSURANCE COMPANY*****46*66783JJT",
+            "HL*1**20*1",
+            "NM1*85*2*SAMPLE MEDICAL CLINIC*****XX*1234567893",
+            "HL*2*1*22*0",
+            "SBR*P*18*GROUP123******CI",
+            "NM1*IL*1*DOE*JANE****MI*MEMBER123",
+            f"CLM*{claim_id}*{charge}***11:B:1*Y*A*Y*Y",
+            "LX*1",
+            f"SV1*HC:99213*{charge}*UN*1***1",
+        ]
+        segments.extend(body)
+        segments.append(f"SE*{len(body) + 1}*{number:04d}")
+    segments.extend(["GE*1*1", "IEA*1*000000001"])
+    return ("~".join(segments) + "~").encode()
+
+
+def batch_submission(*claims):
+    """An 837P file with a single transaction set carrying one subscriber loop per (claim_id, charge, payer)."""
+    body = [
+        "ST*837*0001",
+        "BHT*0019*00*BATCH*20240326*1430*CH",
+        "NM1*40*2*CLEARINGHOUSE*****46*CH1",
+        "HL*1**20*1",
+        "NM1*85*2*SAMPLE MEDICAL CLINIC*****XX*1234567893",
+    ]
+    for number, (claim_id, charge, payer) in enumerate(claims, 2):
+        body.extend([
+            f"HL*{number}*1*22*0",
+            "SBR*P*18*GROUP123******CI",
+            f"NM1*IL*1*PATIENT*{claim_id}****MI*MEMBER{number}",
+            f"NM1*PR*2*{payer}*****PI*{number}",
+            f"CLM*{claim_id}*{charge}***11:B:1*Y*A*Y*Y",
+            "LX*1",
+            f"SV1*HC:99213*{charge}*UN*1***1",
+        ])
+    segments = [ISA, "GS*HC*SENDER*RECEIVER*20240326*1430*1*X*005010X222A1"] + body
+    segments.extend([f"SE*{len(body) + 1}*0001", "GE*1*1", "IEA*1*000000001"])
+    return ("~".join(segments) + "~").encode()
+
+
+def remittance(*claims):
+    """An 835 file with one claim per (claim_id, status, charge, paid, patient_responsibility, co)."""
+    segments = [
+        ISA,
+        "GS*HP*PAYER*PROVIDER*20240401*1030*1*X*005010X221A1",
+        "ST*835*0001",
+        "BPR*I*0*C*CHK*CCP*01*999999999*DA*123456*1234567890**01*999999999*DA*654321*20240401",
+        "TRN*1*TRACE1*1234567890",
+        "N1*PR*ACME HEALTH",
+        "N1*PE*SAMPLE MEDICAL CLINIC*XX*1234567893",
+    ]
+    for claim_id, status, charge, paid, patient_responsibility, contractual in claims:
+        segments.append(f"CLP*{claim_id}*{status}*{charge}*{paid}*{patient_responsibility}*12*ICN{claim_id}")
+        if contractual:
+            segments.append(f"CAS*CO*45*{contractual}")
+    segments.extend([f"SE*{len(segments) - 1}*0001", "GE*1*1", "IEA*1*000000001"])
+    return ("~".join(segments) + "~").encode()
+
+
+def reconcile(store, data, name="remit.835"):
+    results = []
+    summary = reconcile_remittance(io.BytesIO(data), store, on_result=results.append, source_name=name)
+    return summary, {result.claim_id: result for result in results}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ClaimStore(str(tmp_path / "claims.db")) as store:
+        index_claims(io.BytesIO(submission(("A", "150.00"), ("B", "200.00"), ("C", "100.00"), ("D", "80.00"))),
+                     store, source_name="outbound.837")
+        yield store
+
+
+class TestClaimStore:
+    """Test cases for ClaimStore."""
+
+    def test_indexes_837p_claims(self, store):
+        claim = store.get("A")
+
+        assert claim.charge_cents == 15000
+        assert claim.payer_name == "SAMPLE INSURANCE COMPANY"
+        assert claim.source == "outbound.837"
+        assert claim.status == OPEN
+        assert store.counts()[OPEN] == 4
+
+    def test_indexes_every_claim_of_a_transaction_set(self, tmp_path):
+        data = batch_submission(("A", "150.00", "ACME HEALTH"), ("B", "200.00", "OTHER PAYER"),
+                                ("C", "75.50", "ACME HEALTH"))
+        with ClaimStore(str(tmp_path / "claims.db")) as store:
+            assert index_claims(io.BytesIO(data), store, source_name="batch.837") == 3
+
+            claims = store.lookup_many(["A", "B", "C"])
+            assert [claims[claim_id].charge_cents for claim_id in "ABC"] == [15000, 20000, 7550]
+            assert claims["B"].payer_name == "OTHER PAYER"
+            assert claims["B"].patient_name == "B PATIENT"
+            assert claims["C"].provider_npi == "1234567893"
+
+            _, results = reconcile(store, remittance(("C", "1", "75.50", "75.50", "0", None)))
+            assert results["C"].outcome == PAID
+
+    def test_persists_across_opens(self, tmp_path):
+        path = str(tmp_path / "claims.db")
+        with ClaimStore(path) as store:
+            store.add(SubmittedClaim("A", charge_cents=100, source="a.837", submitted_at="2024-03-26"))
+
+        with ClaimStore(path) as store:
+            assert store.get("A").charge_cents == 100
+
+    def test_rollback_discards_claims(self, tmp_path):
+        path = str(tmp_path / "claims.db")
+        with pytest.raises(RuntimeError):
+            with ClaimStore(path) as store:
+                store.add(SubmittedClaim("A", source="a.837", submitted_at="2024-03-26"))
+                raise RuntimeError("interrupted")
+
+        with ClaimStore(path) as store:
+            assert store.get("A") is None
+
+    def test_lookup_is_batched(self, tmp_path):
+        with ClaimStore(str(tmp_path / "claims.db"), batch_size=10, lookup_batch_size=7) as store:
+            for number in range(25):
+                store.add(SubmittedClaim(f"C{number}", source="a.837", submitted_at=f"2024-03-{number:02d}"))
+
+            claims = store.lookup_many([f"C{number}" for number in range(30)])
+
+            assert len(claims) == 25
+            assert [claim.claim_id for claim in store.open_claims(submitted_before="2024-03-03")] == \
+                ["C0", "C1", "C2"]
+
+
+class TestReconciliation:
+    """Test cases for reconciling remittances against submitted claims."""
+
+    def test_outcomes(self, store):
+        summary, results = reconcile(store, remittance(
+            ("A", "1", "150.00", "120.00", "20.00", "10.00"),
+            ("B", "1", "200.00", "100.00", "20.00", "10.00"),
+            ("C", "4", "100.00", "0", "0", None),
+            ("Z", "1", "50.00", "50.00", "0", None),
+        ))
+
+        assert results["A"].outcome == PAID
+        assert results["A"].outstanding == 0
+        assert results["B"].outcome == PARTIALLY_PAID
+        assert results["B"].outstanding == 70.0
+        assert results["C"].outcome == DENIED
+        assert results["Z"].outcome == UNMATCHED
+        assert results["Z"].submitted_charge is None
+        assert results["A"].payer_name == "ACME HEALTH"
+        assert summary == {PAID: 1, PARTIALLY_PAID: 1, DENIED: 1, REVERSED: 0, UNMATCHED: 1, "remitted": 4}
+
+    def test_updates_store(self, store):
+        reconcile(store, remittance(("A", "1", "150.00", "120.00", "20.00", "10.00")), name="april.835")
+
+        claim = store.get("A")
+        assert claim.status == PAID
+        assert claim.paid_cents == 12000
+        assert claim.remit_source == "april.835"
+        assert [claim.claim_id for claim in store.open_claims()] == ["B", "C", "D"]
+
+    def test_later_payment_completes_partial_claim(self, store):
+        reconcile(store, remittance(("B", "1", "200.00", "100.00", "20.00", "10.00")))
+        _, results = reconcile(store, remittance(("B", "1", "200.00", "70.00", "0", None)))
+
+        assert results["B"].outcome == PAID
+        assert store.get("B").paid_cents == 17000
+        assert store.get("B").remit_count == 2
+
+    def test_reversal_reopens_claim(self, store):
+        reconcile(store, remittance(("A", "1", "150.00", "120.00", "20.00", "10.00")))
+        _, results = reconcile(store, remittance(("A", "22", "-150.00", "-120.00", "-20.00", None)))
+
+        assert results["A"].outcome == REVERSED
+        assert store.get("A").status == OPEN
+        assert store.get("A").paid_cents == 0
+
+    def test_claims_submitted_after_remittance(self, tmp_path):
+        with ClaimStore(str(tmp_path / "claims.db")) as store:
+            _, results = reconcile(store, remittance(("A", "1", "150.00", "150.00", "0", None)))
+            assert results["A"].outcome == UNMATCHED
+
+            index_claims(io.BytesIO(submission(("A", "150.00"))), store)
+            _, results = reconcile(store, remittance(("A", "1", "150.00", "150.00", "0", None)))
+            assert results["A"].outcome == PAID
@@ -0,0 +1,187 @@
+"""
+Unit tests for pipeline stages, the concurrent runner and configuration.
+"""
+
+import io
+import json
+import threading
+
+import pytest
+
+from core.pipeline import (
+    PipelineStage,
+    Pipeline,
+    ParseStage,
+    EmitStage,
+    build_pipeline,
+    load_pipeline,
+)
+from core.streaming import SegmentReader, TransactionSplitter
+
+
+def make_interchange(transaction_count: int, transaction_code: str = "835") -> bytes:
+    segments = [
+        "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       "
+        "*230315*1030*^*00501*000000001*0*P*:",
+        "GS*HP*SENDER*RECEIVER*20230315*1030*1*X*005010X221A1",
+    ]
+    for number in range(1, transaction_count + 1):
+        control = f"{number:04d}"
+        segments.extend([
+            f"ST*{transaction_code}*{control}",
+            "BPR*I*100.00*C*CHK*20230315",
+            f"CLP*CLAIM{number}*1*100*100*0*12",
+            "CAS*CO*45*0",
+            f"SE*5*{control}",
+        ])
+    segments.extend([f"GE*{transaction_count}*1", "IEA*1*000000001"])
+    return ("~".join(segments) + "~").encode()
+
+
+def chunks_for(data: bytes):
+    return TransactionSplitter(SegmentReader(io.BytesIO(data)))
+
+
+class SlowFirstItemStage(PipelineStage):
+    """Delays the first item so later items overtake it."""
+
+    stage_type = "slow"
+
+    def __init__(self, concurrency: int = 1):
+        super().__init__(concurrency=concurrency)
+        self.release = threading.Event()
+
+    def process(self, item):
+        if item.index == 0:
+            self.release.wait(1)
+        elif item.index == 5:
+            self.release.set()
+
+
+class TestPipeline:
+    """Test cases for running stage graphs."""
+
+    def test_full_pipeline_from_config(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        pipeline = build_pipeline({
+            "pipeline": {
+                "queue_size": 2,
+                "stages": [
+                    {"type": "parse", "concurrency": 2},
+                    {"type": "validate", "concurrency": 2},
+                    {"type": "transform", "function": "payment_summary"},
+                    {"type": "emit", "output": str(output), "include": ["payment_summary"]},
+                ],
+            }
+        })
+
+        stats = pipeline.run(chunks_for(make_interchange(10)))
+
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert [line["index"] for line in lines] == list(range(10))
+        assert lines[3]["control_number"] == "0004"
+        assert lines[0]["payment_summary"][0]["total_claims"] == 1
+        assert stats.items == 10 and stats.failed == 0
+        assert [stage.items for stage in stats.stages] == [10, 10, 10, 10]
+
+    def test_emit_preserves_order_with_concurrent_upstream(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        pipeline = Pipeline([
+            ParseStage(),
+            SlowFirstItemStage(concurrency=4),
+            EmitStage(output=str(output), include=[]),
+        ], queue_size=4)
+
+        pipeline.run(chunks_for(make_interchange(8)))
+
+        indexes = [json.loads(line)["index"] for line in output.read_text().splitlines()]
+        assert indexes == list(range(8))
+
+    def test_stage_errors_skip_later_stages_but_are_emitted(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        pipeline = build_pipeline({"stages": [
+            {"type": "parse"},
+            {"type": "validate"},
+            {"type": "emit", "output": str(output)},
+        ]})
+
+        stats = pipeline.run(chunks_for(make_interchange(2, transaction_code="999")))
+
+        lines = [json.loads(line) for line in output.read_text().splitlines()]
+        assert stats.failed == 2
+        assert stats.stages[0].errors == 2
+        assert stats.stages[1].skipped == 2
+        assert "No parser plugin" in lines[0]["errors"][0]
+
+    def test_acknowledge_stage_reports_failures_from_run_file(self, tmp_path):
+        source = tmp_path / "in.edi"
+        source.write_bytes(make_interchange(2, transaction_code="999"))
+        output = tmp_path / "out.999"
+        pipeline = build_pipeline({"stages": [
+            {"type": "parse"},
+            {"type": "acknowledge", "output": str(output), "ta1": "never"},
+        ]})
+
+        pipeline.run_file(str(source))
+
+        text = output.read_text()
+        assert "AK2*999*0001~\nIK5*R*5~" in text
+        assert "AK9*R*2*2*0~" in text
+
+    def test_on_item_callback(self):
+        seen = []
+        pipeline = Pipeline([ParseStage(concurrency=2)])
+        pipeline.run(chunks_for(make_interchange(3)), on_item=seen.append)
+        assert sorted(item.index for item in seen) == [0, 1, 2]
+        assert all(item.edi_root is not None for item in seen)
+
+
+class TestPipelineConfig:
+    """Test cases for declarative pipeline configuration."""
+
+    def test_load_yaml(self, tmp_path):
+        config = tmp_path / "pipeline.yml"
+        config.write_text(
+            "pipeline:\n"
+            "  queue_size: 8\n"
+            "  stages:\n"
+            "    - type: parse\n"
+            "      concurrency: 3\n"
+            "    - type: emit\n"
+        )
+        pipeline = load_pipeline(str(config))
+        assert pipeline.queue_size == 8
+        assert [stage.concurrency for stage in pipeline.stages] == [3, 1]
+
+    def test_output_overrides_emit_stage(self, tmp_path):
+        configured = tmp_path / "configured.jsonl"
+        config = tmp_path / "pipeline.yml"
+        config.write_text(
+            "stages:\n"
+            "  - type: parse\n"
+            "  - type: emit\n"
+            f"    output: {configured}\n"
+        )
+        output = tmp_path / "out.jsonl"
+
+        pipeline = load_pipeline(str(config), output=str(output))
+        stats = pipeline.run(chunks_for(make_interchange(3)))
+
+        assert stats.items == 3
+        assert len(output.read_text().splitlines()) == 3
+        assert not configured.exists()
+
+    @pytest.mark.parametrize("stage_types", [["parse"], ["parse", "emit", "emit"]])
+    def test_output_needs_one_emit_stage(self, stage_types):
+        with pytest.raises(ValueError):
+            build_pipeline({"stages": [{"type": stage_type} for stage_type in stage_types]}, output="out.jsonl")
+
+    @pytest.mark.parametrize("stage_config", [
+        {"type": "unknown"},
+        {"type": "transform", "function": "missing"},
+        {"type": "parse", "output": "x"},
+        {"type": "parse", "concurrency": 0},
+    ])
+    def test_invalid_stage_config(self, stage_config):
+        with pytest.raises(ValueError):
+            build_pipeline({"stages": [stage_config]})
@@ -0,0 +1,6 @@
+"""
+Unit tests for streaming EDI processing.
+
+This package contains tests for the chunked segment reader, the
+transaction splitter, parallel execution and the batch job queue.
+"""
@@ -0,0 +1,169 @@
+"""
+Unit tests for 999/TA1 acknowledgment generation.
+"""
+
+import io
+
+import pytest
+
+from core.errors import EDISegmentError, create_parse_context
+from core.streaming import AcknowledgmentCollector, SegmentReader, TransactionSplitter, X12Writer
+from core.transactions.t835.parser import Parser835
+from core.validation.engine import ValidationError, ValidationResult, ValidationSeverity
+
+ISA = ("ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+       "*230315*1030*^*00501*000000007*{ack}*P*:")
+
+
+def interchange(*transactions: str, ge: str = "GE*{count}*1", iea: str = "IEA*1*000000007",
+                ack: str = "0") -> bytes:
+    segments = [ISA.format(ack=ack), "GS*HP*PAYER*PROVIDER*20230315*1030*1*X*005010X221A1"]
+    for transaction in transactions:
+        segments.extend(transaction.split("|"))
+    if ge:
+        segments.append(ge.format(count=len(transactions)))
+    if iea:
+        segments.append(iea)
+    return ("~".join(segments) + "~").encode()
+
+
+def remittance(control: str, count: int = 4, se_control: str = None) -> str:
+    return "|".join([
+        f"ST*835*{control}*005010X221A1",
+        "BPR*I*100.00*C*CHK",
+        "CLP*CLAIM1*1*100*100*0*12",
+        f"SE*{count}*{se_control or control}",
+    ])
+
+
+def acknowledge(data: bytes, record=None, **write_options):
+    collector = AcknowledgmentCollector()
+    for chunk in TransactionSplitter(collector.observe(SegmentReader(io.BytesIO(data)))):
+        if record:
+            record(collector, chunk)
+    output = io.StringIO()
+    writer = X12Writer(output, line_ending="")
+    collector.write(writer, **write_options)
+    writer.flush()
+    return collector, [segment.split("*") for segment in output.getvalue().split("~") if segment]
+
+
+def loops(segments, segment_id):
+    return [segment for segment in segments if segment[0] == segment_id]
+
+
+class TestEnvelopeChecks:
+    """Errors found while observing the segment stream."""
+
+    def test_clean_interchange(self):
+        collector, segments = acknowledge(interchange(remittance("0001"), remittance("0002")))
+
+        assert segments[0][6].strip() == "PROVIDER" and segments[0][8].strip() == "PAYER"
+        assert segments[1][:4] == ["GS", "FA", "PROVIDER", "PAYER"]
+        assert not loops(segments, "TA1")
+        assert loops(segments, "AK1") == [["AK1", "HP", "1", "005010X221A1"]]
+        assert loops(segments, "AK2")[1] == ["AK2", "835", "0002", "005010X221A1"]
+        assert loops(segments, "IK5") == [["IK5", "A"], ["IK5", "A"]]
+        assert loops(segments, "AK9") == [["AK9", "A", "2", "2", "2"]]
+        assert collector.summary() == {"interchanges": 1, "groups": 1, "transactions": 2,
+                                       "accepted": 2, "rejected": 0}
+
+    def test_transaction_errors(self):
+        data = interchange(
+            remittance("0001", count=9),
+            remittance("0002", se_control="0003"),
+            remittance("0004"),
+            remittance("0004"),
+            "ST*835*0005*005010X221A1|BPR*I*100.00*C*CHK",
+        )
+        _, segments = acknowledge(data)
+
+        assert loops(segments, "IK5") == [["IK5", "R", "4"], ["IK5", "R", "3"], ["IK5", "A"],
+                                          ["IK5", "R", "23"], ["IK5", "R", "2"]]
+        assert loops(segments, "AK9") == [["AK9", "P", "5", "5", "1"]]
+
+    def test_group_and_interchange_errors(self):
+        data = interchange(remittance("0001"), ge="GE*3*2", iea="IEA*1*000000008")
+        _, segments = acknowledge(data)
+
+        assert loops(segments, "TA1") == [["TA1", "000000007", "230315", "1030", "R", "001"]]
+        # A rejected interchange gets no 999
+        assert not loops(segments, "ST")
+
+    def test_group_count_mismatch_and_requested_ta1(self):
+        data = interchange(remittance("0001"), ge="GE*2*1", iea="IEA*2*000000007", ack="1")
+        _, segments = acknowledge(data)
+
+        assert loops(segments, "TA1")[0][4:] == ["E", "021"]
+        assert loops(segments, "AK9") == [["AK9", "E", "2", "1", "1", "5"]]
+
+    def test_truncated_file(self):
+        _, segments = acknowledge(interchange(remittance("0001"), ge="", iea=""))
+
+        assert loops(segments, "TA1")[0][4:] == ["R", "023"]
+
+    def test_unsupported_transaction_codes(self):
+        collector = AcknowledgmentCollector(supported_codes=["837"])
+        list(collector.observe(SegmentReader(io.BytesIO(interchange(remittance("0001"))))))
+
+        assert collector.interchanges[0].groups[0].transactions[0].codes == ["1"]
+
+
+class TestRecordedErrors:
+    """Parser and validation errors added per transaction."""
+
+    def test_parser_errors_from_context_metadata(self):
+        def record(collector, chunk):
+            context = create_parse_context().metadata(segment_index=4, segment_id="CLP").build()
+            errors = [EDISegmentError("Error processing CLP segment: bad amount", context),
+                      EDISegmentError("SE control number mismatch", create_parse_context().metadata(
+                          segment_index=5, segment_id="SE").build())]
+            collector.record_chunk(chunk, errors=errors)
+
+        _, segments = acknowledge(interchange(remittance("0001")), record)
+
+        assert loops(segments, "IK3") == [["IK3", "CLP", "3", "", "8"]]
+        assert loops(segments, "IK5") == [["IK5", "R", "5"]]
+
+    def test_validation_errors(self):
+        def record(collector, chunk):
+            result = ValidationResult(is_valid=False, errors=[
+                ValidationError("amount", ValidationSeverity.ERROR, "Invalid date", "INVALID_DATE",
+                                segment_id="BPR", element_position=16, value="2023*13~01"),
+                ValidationError("balance", ValidationSeverity.ERROR, "Out of balance", "BALANCE"),
+            ])
+            collector.record_chunk(chunk, validation=result.to_dict())
+
+        _, segments = acknowledge(interchange(remittance("0001")), record)
+
+        assert loops(segments, "IK3") == [["IK3", "BPR", "2", "", "8"]]
+        assert loops(segments, "IK4") == [["IK4", "16", "", "8", "20231301"]]
+        assert loops(segments, "IK5") == [["IK5", "R", "I5"]]
+
+    def test_parsed_chunks_and_errors_only(self):
+        data = interchange(remittance("0001"), remittance("0002"))
+
+        def record(collector, chunk):
+            root = Parser835(chunk.segments).parse()
+            failures = ["validate: boom"] if chunk.control_number == "0002" else []
+            collector.record_chunk(chunk, errors=root.errors, failures=failures)
+
+        _, segments = acknowledge(data, record, report_accepted=False, ta1="always")
+
+        assert loops(segments, "TA1")[0][4:] == ["A", "000"]
+        assert loops(segments, "AK2") == [["AK2", "835", "0002", "005010X221A1"]]
+        assert loops(segments, "AK9") == [["AK9", "P", "2", "2", "1"]]
+
+    def test_segment_errors_are_capped(self):
+        collector = AcknowledgmentCollector(max_segment_errors=2)
+        list(collector.observe(SegmentReader(io.BytesIO(interchange(remittance("0001"))))))
+        transaction = collector.interchanges[0].groups[0].transactions[0]
+
+        collector.record(transaction.start, errors=[{"segment_id": "CLP", "segment_index": 1}] * 5,
+                         st_index=0)
+
+        assert len(transaction.notes) == 2 and transaction.dropped_notes == 3
+
+    def test_invalid_ta1_policy(self):
+        with pytest.raises(ValueError):
+            AcknowledgmentCollector().write(X12Writer(io.StringIO()), ta1="sometimes")
@@ -0,0 +1,146 @@
+"""
+Unit tests for the streaming structural diff.
+"""
+
+import io
+
+import pytest
+
+from core.streaming import EdiDiff, diff_files
+from core.streaming.diff import ADDED, CHANGED, CLAIM, REMOVED, TRANSACTION, segment_deltas
+
+
+def remittance(claims, control="0001", trace="TRACE1", element="*", terminator="~\n"):
+    segments = [
+        "ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+        "*230315*1030*^*00501*000000001*0*P*:",
+        "GS*HP*PAYER*PROVIDER*20230315*1030*1*X*005010X221A1",
+        f"ST*835*{control}",
+        "BPR*I*100.00*C*CHK*CCP*01*999999999*DA*123456*1234567890**01*999999999*DA*654321*20230315",
+        f"TRN*1*{trace}*1234567890",
+        "N1*PR*PAYER",
+        "N1*PE*CLINIC*XX*1234567893",
+    ]
+    for claim in claims:
+        segments.extend(claim)
+    segments.extend([f"SE*{len(segments) - 1}*{control}", "GE*1*1", "IEA*1*000000001"])
+    text = terminator.join(segments) + terminator
+    if element != "*":
+        # The ISA fixes its own delimiters, so swap every separator consistently
+        text = text.replace("*", element)
+    return text.encode()
+
+
+def claim(claim_id, paid="100.00", reason="45", payer_icn=None):
+    return [
+        f"CLP*{claim_id}*1*150.00*{paid}*0*12*{payer_icn or 'ICN' + claim_id}",
+        f"CAS*CO*{reason}*50.00",
+        "NM1*QC*1*DOE*JANE",
+        "SVC*HC:99213*150.00*100.00**1",
+    ]
+
+
+def differences(old, new, **options):
+    return list(EdiDiff(io.BytesIO(old), io.BytesIO(new), **options))
+
+
+class TestEdiDiff:
+    """Test cases for EdiDiff."""
+
+    def test_identical_files(self):
+        data = remittance([claim("A"), claim("B")])
+        diff = EdiDiff(io.BytesIO(data), io.BytesIO(data))
+
+        assert list(diff) == []
+        assert diff.summary()["claims"] == {"compared": 2, "unchanged": 2, CHANGED: 0, ADDED: 0, REMOVED: 0}
+
+    def test_delimiters_and_trailing_separators_do_not_matter(self):
+        old = remittance([claim("A")])
+        new = remittance([claim("A")], element="|", terminator="~")
+
+        assert differences(old, new) == []
+
+    def test_field_level_deltas(self):
+        old = remittance([claim("A"), claim("B"), claim("C")])
+        new = remittance([claim("A"), claim("B", paid="90.00", reason="97"), claim("C")])
+
+        (changed,) = differences(old, new)
+
+        assert (changed.kind, changed.status, changed.claim_id) == (CLAIM, CHANGED, "B")
+        assert [(d.location, d.old, d.new) for d in changed.deltas] == [
+            ("CLP[0]04", "100.00", "90.00"),
+            ("CAS[0]02", "45", "97"),
+        ]
+
+    def test_added_removed_and_reordered_claims(self):
+        old = remittance([claim("A"), claim("B"), claim("C"), claim("D")])
+        new = remittance([claim("D"), claim("C"), claim("A"), claim("E")])
+
+        diff = EdiDiff(io.BytesIO(old), io.BytesIO(new))
+        found = {(d.status, d.claim_id) for d in diff}
+
+        assert found == {(REMOVED, "B"), (ADDED, "E")}
+        assert diff.summary()["claims"]["unchanged"] == 3
+
+    def test_claims_align_by_payer_control_number(self):
+        old = remittance([claim("A", payer_icn="ICN1")])
+        new = remittance([claim("A", payer_icn="ICN2")])
+
+        assert {(d.status, tuple(d.key)) for d in differences(old, new)} == {
+            (REMOVED, ("A", "ICN1", "0")),
+            (ADDED, ("A", "ICN2", "0")),
+        }
+
+    def test_claim_repeated_in_two_transaction_sets(self):
+        first = remittance([claim("A")], control="0001").split(b"~\n")
+        second = remittance([claim("A")], control="0002").split(b"~\n")
+        # One interchange with both transaction sets
+        old = b"~\n".join(first[:-3] + second[2:-3] + [b"GE*2*1", b"IEA*1*000000001", b""])
+        new = remittance([claim("B"), claim("C"), claim("D"), claim("E")])
+
+        diff = EdiDiff(io.BytesIO(old), io.BytesIO(new))
+        removed = [(tuple(d.key), d.old_control_number) for d in diff if (d.kind, d.status) == (CLAIM, REMOVED)]
+
+        assert sorted(removed) == [(("A", "ICNA", "0"), "0001"), (("A", "ICNA", "1"), "0002")]
+        assert diff.summary()["claims"]["removed"] == 2
+
+    def test_transaction_level_changes(self):
+        old = remittance([claim("A")], trace="TRACE1")
+        new = remittance([claim("A")], trace="TRACE2")
+
+        (changed,) = differences(old, new)
+
+        assert (changed.kind, changed.key) == (TRANSACTION, ("0001", "0"))
+        assert [(d.location, d.new) for d in changed.deltas] == [("TRN[0]02", "TRACE2")]
+        assert differences(old, new, include_transactions=False) == []
+
+    def test_segment_added_to_claim(self):
+        extra = claim("A") + ["DTM*232*20230301"]
+
+        (changed,) = differences(remittance([claim("A")]), remittance([extra]))
+
+        assert [(d.location, d.old, d.new) for d in changed.deltas] == [("DTM[0]", None, "DTM*232*20230301")]
+
+    def test_diff_files_from_disk(self, tmp_path):
+        old_path = tmp_path / "old.835"
+        new_path = tmp_path / "new.835"
+        old_path.write_bytes(remittance([claim(f"C{n}") for n in range(50)]))
+        new_path.write_bytes(remittance([claim(f"C{n}", paid="1.00" if n == 25 else "100.00")
+                                         for n in range(50)]))
+
+        found, summary = diff_files(str(old_path), str(new_path), chunk_size=64)
+
+        assert [(d.claim_id, d.deltas[0].location) for d in found] == [("C25", "CLP[0]04")]
+        assert summary["max_pending"] <= 2
+
+
+class TestSegmentDeltas:
+    """Test cases for segment_deltas."""
+
+    @pytest.mark.parametrize("old, new, expected", [
+        ([["CLP", "A", "1"]], [["CLP", "A", "1", ""]], []),
+        ([["CLP", "A", "1"]], [["CLP", "A", "1", "5"]], [("CLP[0]03", "", "5")]),
+        ([["CAS", "CO", "45"], ["CAS", "PR", "1"]], [["CAS", "CO", "45"]], [("CAS[1]", "CAS*PR*1", None)]),
+    ])
+    def test_deltas(self, old, new, expected):
+        assert [(d.location, d.old, d.new) for d in segment_deltas(old, new)] == expected
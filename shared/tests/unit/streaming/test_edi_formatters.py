@@ -0,0 +1,26 @@
+"""
+Unit tests for converting formatted dates and times back to EDI elements,
+as the X12 writer and AST serializers do.
+"""
+
+from core.utils.formatters import format_edi_date, to_edi_date, to_edi_time
+
+
+def test_to_edi_date():
+    assert to_edi_date("2024-12-26") == "20241226"
+    assert to_edi_date("2024-12-26", "YYMMDD") == "241226"
+    assert to_edi_date("20241226") == "20241226"
+    assert to_edi_date("991231") == "19991231"
+    assert to_edi_date("") == ""
+    assert to_edi_date(None) == ""
+
+
+def test_to_edi_date_round_trip():
+    assert to_edi_date(format_edi_date("20240229", "CCYYMMDD")) == "20240229"
+    assert to_edi_date(format_edi_date("240229", "YYMMDD"), "YYMMDD") == "240229"
+
+
+def test_to_edi_time():
+    assert to_edi_time("14:30") == "1430"
+    assert to_edi_time("14:30:45") == "143045"
+    assert to_edi_time("") == ""
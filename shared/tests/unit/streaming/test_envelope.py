@@ -0,0 +1,110 @@
+"""
+Unit tests for the envelope-only scanner.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.streaming import EnvelopeScanner, SegmentReader, scan_envelopes
+from core.streaming.envelope import (
+    ISSUE_DUPLICATE_ST_CONTROL,
+    ISSUE_GE_TRANSACTION_COUNT_MISMATCH,
+    ISSUE_ISA_IEA_CONTROL_MISMATCH,
+    ISSUE_MISSING_TRAILER,
+    ISSUE_SE_SEGMENT_COUNT_MISMATCH,
+    ISSUE_ST_SE_CONTROL_MISMATCH,
+)
+
+SAMPLE_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data", "sample-835.edi")
+
+ISA = "ISA|00|          |00|          |ZZ|SENDER         |ZZ|RECEIVER       |230315|1030|^|00501|000000001|0|P|>!"
+
+MIXED = (
+    ISA
+    + "GS|HP|SENDER|RECEIVER|20230315|1030|1|X|005010X221A1!"
+    "ST|835|0001!BPR|I|100.00|C|CHK|20230315!CLP|A1|1|100|100|0|12!SE|4|0001!"
+    "GE|1|1!"
+    "GS|HS|SENDER|RECEIVER|20230315|1030|2|X|005010X279A1!"
+    "ST|270|0001!BHT|0022|13|1|20230315!SE|3|0001!"
+    "ST|276|0002!BHT|0010|13|2|20230315!SE|3|0002!"
+    "GE|2|2!IEA|2|000000001!"
+)
+
+
+def scan(content: str, **kwargs):
+    return EnvelopeScanner(io.BytesIO(content.encode()), **kwargs).scan()
+
+
+class TestEnvelopeScanner:
+    """Test cases for EnvelopeScanner."""
+
+    def test_mixed_transaction_types(self):
+        result = scan(MIXED)
+
+        assert result.is_consistent
+        assert dict(result.transaction_codes) == {"835": 1, "270": 1, "276": 1}
+        interchange = result.interchanges[0]
+        assert interchange.sender_id == "SENDER"
+        assert interchange.receiver_id == "RECEIVER"
+        assert [group.functional_id for group in interchange.groups] == ["HP", "HS"]
+        assert [t.code for t in interchange.groups[1].transactions] == ["270", "276"]
+
+    def test_byte_ranges_and_counts(self):
+        data = MIXED.encode()
+        result = scan(MIXED)
+        transaction = result.interchanges[0].groups[0].transactions[0]
+
+        assert data[transaction.start:transaction.end] == (
+            b"ST|835|0001!BPR|I|100.00|C|CHK|20230315!CLP|A1|1|100|100|0|12!SE|4|0001!")
+        assert transaction.segment_count == transaction.declared_segment_count == 4
+        assert result.interchanges[0].end == len(data)
+        assert result.segment_count == len(list(SegmentReader(io.BytesIO(data))))
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 64, 1 << 20])
+    def test_independent_of_chunk_size(self, chunk_size):
+        assert scan(MIXED, chunk_size=chunk_size).to_dict() == scan(MIXED).to_dict()
+
+    def test_control_number_and_count_mismatches(self):
+        content = (
+            MIXED.replace("SE|4|0001!", "SE|5|0009!")
+            .replace("ST|276|0002!", "ST|276|0001!").replace("SE|3|0002!", "SE|3|0001!")
+            .replace("GE|2|2!", "GE|3|2!")
+            .replace("IEA|2|000000001!", "IEA|2|000000002!")
+        )
+        codes = [issue.code for issue in scan(content).issues]
+
+        assert codes == [
+            ISSUE_ST_SE_CONTROL_MISMATCH,
+            ISSUE_SE_SEGMENT_COUNT_MISMATCH,
+            ISSUE_DUPLICATE_ST_CONTROL,
+            ISSUE_GE_TRANSACTION_COUNT_MISMATCH,
+            ISSUE_ISA_IEA_CONTROL_MISMATCH,
+        ]
+
+    def test_truncated_file_reports_missing_trailers(self):
+        content = MIXED[:MIXED.index("ST|276")]
+        result = scan(content)
+
+        assert [issue.code for issue in result.issues] == [ISSUE_MISSING_TRAILER] * 2
+        assert result.interchanges[0].end == len(content)
+
+    def test_counts_only_mode(self):
+        group = scan(MIXED, include_transactions=False).interchanges[0].groups[1]
+
+        assert group.transactions == []
+        assert group.transaction_count == 2
+
+    def test_sample_file(self):
+        result = scan_envelopes(SAMPLE_835)
+
+        assert result.is_consistent
+        assert result.segment_count == 28
+        assert dict(result.transaction_codes) == {"835": 1}
+
+    def test_empty_stream(self):
+        result = scan("")
+
+        assert result.interchanges == []
+        assert result.segment_count == 0
@@ -0,0 +1,134 @@
+"""
+Unit tests for byte-range file splitting and merging.
+"""
+
+import pytest
+
+from core.streaming import SegmentReader, merge_files, scan_envelopes, split_file
+from core.streaming.partition import parse_size
+
+ISA = "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       *230315*1030*^*00501*000000042*0*P*:~\n"
+
+
+def remittance(control: str, payer: str, payee_npi: str, amount: str) -> str:
+    return (
+        f"ST*835*{control}~\n"
+        f"BPR*I*{amount}*C*CHK*20230315~\n"
+        f"N1*PR*{payer}~\n"
+        f"N1*PE*CLINIC {payee_npi}*XX*{payee_npi}~\n"
+        f"CLP*{control}A*1*{amount}*{amount}*0*12~\n"
+        f"N1*PE*CLAIM LEVEL*XX*9999999999~\n"
+        f"SE*7*{control}~\n"
+    )
+
+
+CONTENT = (
+    ISA
+    + "GS*HP*SENDER*RECEIVER*20230315*1030*7*X*005010X221A1~\n"
+    + remittance("1001", "ACME", "1111111111", "100.00")
+    + remittance("1002", "BETA", "2222222222", "200.00")
+    + remittance("1003", "ACME", "2222222222", "300.00")
+    + "GE*3*7~\nIEA*1*000000042~\n"
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "in.edi"
+    path.write_text(CONTENT)
+    return str(path)
+
+
+def segments(path):
+    with open(path, "rb") as handle:
+        return [segment.elements for segment in SegmentReader(handle)]
+
+
+class TestSplitFile:
+    """Test cases for split_file."""
+
+    def test_split_by_transaction(self, source, tmp_path):
+        written = split_file(source, str(tmp_path / "out"), control_start=500)
+
+        assert [w.transactions for w in written] == [1, 1, 1]
+        assert [w.control_numbers for w in written] == [["000000500"], ["000000501"], ["000000502"]]
+        for output in written:
+            scan = scan_envelopes(output.path)
+            assert scan.is_consistent
+            content = segments(output.path)
+            assert content[0][13] == output.control_numbers[0]
+            assert content[1][6] == "1"
+            assert content[2][:3] == ["ST", "835", "0001"]
+            assert content[-3] == ["SE", "7", "0001"]
+
+    def test_split_by_payee_uses_header_n1(self, source, tmp_path):
+        written = split_file(source, str(tmp_path / "out"), by="payee")
+
+        assert [(w.key, w.transactions) for w in written] == [("1111111111", 1), ("2222222222", 2)]
+        second = segments(written[1].path)
+        assert [s[2] for s in second if s[0] == "ST"] == ["0001", "0002"]
+        assert [s[2] for s in second if s[0] == "BPR"] == ["200.00", "300.00"]
+        assert scan_envelopes(written[1].path).is_consistent
+
+    def test_split_by_payer(self, source, tmp_path):
+        written = split_file(source, str(tmp_path / "out"), by="payer")
+
+        assert [(w.key, w.transactions) for w in written] == [("ACME", 2), ("BETA", 1)]
+
+    def test_split_by_size(self, source, tmp_path):
+        transaction_bytes = len(remittance("1001", "ACME", "1111111111", "100.00"))
+        written = split_file(source, str(tmp_path / "out"), by="size", max_bytes=2 * transaction_bytes)
+
+        assert [w.transactions for w in written] == [2, 1]
+
+    def test_body_bytes_are_copied_verbatim(self, source, tmp_path):
+        written = split_file(source, str(tmp_path / "out"))
+
+        body = remittance("1002", "BETA", "2222222222", "200.00").split("\n", 1)[1].rsplit("SE*", 1)[0]
+        with open(written[1].path) as f:
+            assert body in f.read()
+
+    def test_unknown_strategy(self, source, tmp_path):
+        with pytest.raises(ValueError):
+            split_file(source, str(tmp_path / "out"), by="color")
+
+
+class TestMergeFiles:
+    """Test cases for merge_files."""
+
+    def test_split_then_merge_round_trips(self, source, tmp_path):
+        written = split_file(source, str(tmp_path / "out"), control_start=42)
+        merged = str(tmp_path / "merged.edi")
+
+        result = merge_files([w.path for w in written], merged, control_start=42)
+
+        assert result.transactions == 3
+        assert result.groups == 1
+        with open(merged) as f:
+            assert f.read() == CONTENT.replace("GS*HP*SENDER*RECEIVER*20230315*1030*7",
+                                               "GS*HP*SENDER*RECEIVER*20230315*1030*1").replace(
+                "GE*3*7~", "GE*3*1~").replace("1001~", "0001~").replace("1002~", "0002~").replace("1003~", "0003~")
+
+    def test_different_functional_groups_stay_separate(self, source, tmp_path):
+        other = tmp_path / "eligibility.edi"
+        other.write_text(
+            ISA + "GS*HS*SENDER*RECEIVER*20230315*1030*1*X*005010X279A1~\n"
+            "ST*270*0001~\nBHT*0022*13*1*20230315~\nSE*3*0001~\nGE*1*1~\nIEA*1*000000042~\n"
+        )
+        merged = str(tmp_path / "merged.edi")
+
+        result = merge_files([source, str(other)], merged)
+        scan = scan_envelopes(merged)
+
+        assert result.groups == 2
+        assert scan.is_consistent
+        assert [g.functional_id for g in scan.interchanges[0].groups] == ["HP", "HS"]
+        assert dict(scan.transaction_codes) == {"835": 3, "270": 1}
+
+
+def test_parse_size():
+    assert parse_size("500") == 500
+    assert parse_size("2kb") == 2048
+    assert parse_size("50MB") == 50 * 1024 * 1024
+    with pytest.raises(ValueError):
+        parse_size("fast")
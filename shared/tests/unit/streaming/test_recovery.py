@@ -0,0 +1,169 @@
+"""
+Unit tests for error-tolerant parsing with quarantine.
+"""
+
+import io
+import os
+
+from core.base.edi_ast import EdiRoot
+from core.parser import EdiParser
+from core.streaming import QuarantineManifest, RecoveringParser, SegmentReader, extract_quarantined
+
+SCHEMA_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "schemas", "x12", "835.json")
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+ISA = ("ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+       "*230315*1030*^*00501*000000007*0*P*:")
+GS = "GS*HP*PAYER*PROVIDER*20230315*1030*1*X*005010X221A1"
+
+
+def remittance(control: str, claim: str = "CLAIM", count: int = 5) -> list:
+    return [
+        f"ST*835*{control}",
+        "BPR*I*100.00*C*CHK*20230315",
+        f"CLP*{claim}{control}*1*100*100*0*12",
+        "CAS*CO*45*0",
+        f"SE*{count}*{control}",
+    ]
+
+
+def document(*segments) -> bytes:
+    return ("~\n".join(segments) + "~\n").encode()
+
+
+def claims(root) -> list:
+    return [claim.claim_id
+            for interchange in root.interchanges
+            for group in interchange.functional_groups
+            for transaction in group.transactions
+            for claim in transaction.transaction_data.claims]
+
+
+def recover(data: bytes):
+    return RecoveringParser().parse_stream(io.BytesIO(data), source="test.835")
+
+
+class EmptyPlugin:
+    """Parser plugin that finds no transaction set in its segments."""
+
+    plugin_name = "empty"
+
+    def parse(self, segments):
+        return EdiRoot()
+
+
+class EmptyRegistry:
+    def get_parser_for_transaction(self, code):
+        return EmptyPlugin()
+
+
+class TestRecoveringParser:
+    """Test cases for RecoveringParser."""
+
+    def test_clean_file_is_complete(self):
+        data = document(ISA, GS, *remittance("0001"), *remittance("0002"), "GE*2*1", "IEA*1*000000007")
+        result = recover(data)
+
+        assert result.complete
+        assert result.transactions == 2
+        assert claims(result.root) == ["CLAIM0001", "CLAIM0002"]
+        assert len(result.root.interchanges) == 1
+        assert len(result.root.interchanges[0].functional_groups) == 1
+
+    def test_missing_se_resynchronizes_at_next_st(self):
+        broken = remittance("0002")[:-1]
+        data = document(ISA, GS, *remittance("0001"), *broken, *remittance("0003"), "GE*3*1", "IEA*1*000000007")
+        result = recover(data)
+
+        assert claims(result.root) == ["CLAIM0001", "CLAIM0003"]
+        [span] = result.manifest.spans
+        assert span.control_number == "0002" and span.segment_count == 4
+        assert "before the SE" in span.reason
+        assert data[span.start:span.end].startswith(b"ST*835*0002")
+        assert data[span.start:span.end].endswith(b"CAS*CO*45*0~")
+
+    def test_trailer_mismatches_and_stray_segments(self):
+        data = document(
+            ISA, GS,
+            *remittance("0001", count=9),
+            "NOISE*1", "NOISE*2",
+            *remittance("0002")[:-1], "SE*5*0099",
+            *remittance("0003"),
+            "GE*3*1", "IEA*1*000000007",
+        )
+        result = recover(data)
+
+        reasons = [span.reason for span in result.manifest.spans]
+        assert claims(result.root) == ["CLAIM0003"]
+        assert reasons[0] == "SE declares 9 segments, found 5"
+        assert reasons[1] == "segments outside a transaction set"
+        assert "does not match" in reasons[2]
+        assert result.manifest.spans[1].segment_count == 2
+
+    def test_malformed_isa_quarantines_until_next_interchange(self):
+        data = document(
+            ISA, GS, *remittance("0001"), "GE*1*1", "IEA*1*000000007",
+            "ISA*00*BROKEN", GS, *remittance("0002"), "GE*1*1", "IEA*1*000000008",
+            ISA, GS, *remittance("0003"), "GE*1*1", "IEA*1*000000007",
+        )
+        result = recover(data)
+
+        assert claims(result.root) == ["CLAIM0001", "CLAIM0003"]
+        assert len(result.root.interchanges) == 2
+        assert [span.reason for span in result.manifest.spans] == [
+            "malformed ISA header", "transaction set outside an interchange or functional group"]
+
+    def test_recovers_837p(self):
+        with open(os.path.join(TEST_DATA, "sample-837.edi"), "rb") as handle:
+            data = handle.read().replace(b"SE*32*0001", b"SE*35*0001")
+        result = recover(data)
+
+        assert result.complete
+        assert result.transactions == 1
+        [interchange] = result.root.interchanges
+        assert interchange.header["control_number"] == "000000001"
+        [transaction] = interchange.functional_groups[0].transactions
+        assert transaction.header["transaction_set_code"] == "837"
+        assert transaction.transaction_data.claim.claim_id == "CLAIM123"
+
+    def test_span_without_transactions_is_quarantined(self):
+        data = document(ISA, GS, *remittance("0001"), "GE*1*1", "IEA*1*000000007")
+        result = RecoveringParser(EmptyRegistry()).parse_stream(io.BytesIO(data))
+
+        assert not result.complete
+        assert result.transactions == 0
+        assert result.root.interchanges == []
+        [span] = result.manifest.spans
+        assert span.reason == "parser plugin empty returned no transaction set"
+        assert span.control_number == "0001"
+
+    def test_manifest_round_trip_and_extraction(self, tmp_path):
+        source = tmp_path / "corrupted.835"
+        source.write_bytes(document(ISA, GS, *remittance("0001")[:-1], *remittance("0002"),
+                                    "GE*2*1", "IEA*1*000000007"))
+        result = RecoveringParser().parse_file(str(source))
+        manifest_path = tmp_path / "manifest.json"
+
+        result.manifest.write(str(manifest_path))
+        manifest = QuarantineManifest.load(str(manifest_path))
+        [path] = extract_quarantined(str(source), manifest, str(tmp_path / "quarantine"))
+
+        assert manifest.spans == result.manifest.spans
+        with open(path, "rb") as handle:
+            ids = [segment.segment_id for segment in SegmentReader(handle)]
+        assert ids == ["ISA", "GS", "ST", "BPR", "CLP", "CAS", "GE", "IEA"]
+
+
+class TestEdiParserRecovery:
+    """Test cases for EdiParser's recovery mode."""
+
+    def test_recover_mode_keeps_good_transactions(self):
+        content = document(ISA, GS, *remittance("0001"), *remittance("0002")[:-1],
+                           "GE*2*1", "IEA*1*000000007").decode()
+        parser = EdiParser(content, SCHEMA_835, recover=True)
+
+        root = parser.parse()
+
+        assert claims(root) == ["CLAIM0001"]
+        assert len(parser.quarantine.spans) == 1
+        assert content[parser.quarantine.spans[0].start:].startswith("ST*835*0002")
@@ -0,0 +1,144 @@
+"""
+Unit tests for compiled segment schema validation.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.streaming import (
+    AcknowledgmentCollector, RawSegment, SegmentReader, SegmentValidator, TransactionSplitter, X12Writer,
+)
+from core.streaming.schema import (
+    ELEMENT_MISSING, ELEMENT_TOO_LONG, ELEMENT_TOO_SHORT, INVALID_CHARACTER, INVALID_CODE_VALUE,
+    INVALID_DATE, INVALID_TIME, TOO_MANY_ELEMENTS, compile_element,
+)
+
+SCHEMAS = os.path.join(os.path.dirname(__file__), "..", "..", "..", "schemas", "x12")
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+SCHEMA = {
+    "schema": {
+        "delimiters": {"segment": "~", "element": "*", "sub_element": ":"},
+        "segments": {
+            "CLP": {"name": "Claim", "elements": [
+                {"name": "ClaimId", "type": "string", "min_length": 2, "length": 10, "required": True},
+                {"name": "Status", "type": "integer", "codes": ["1", "2", "22"]},
+                {"name": "Charge", "type": "number", "max_length": 6},
+            ]},
+            "DTP": {"name": "Date", "elements": [
+                {"name": "Qualifier", "type": "string"},
+                {"name": "Date", "type": "date"},
+                {"name": "Time", "type": "time"},
+            ]},
+        },
+    }
+}
+
+
+class TestCompiledChecks:
+    """Test cases for element checks."""
+
+    @pytest.mark.parametrize("definition, value, expected", [
+        ({"type": "integer"}, "-12", None),
+        ({"type": "integer"}, "1.5", INVALID_CHARACTER),
+        ({"type": "number"}, "-100.25", None),
+        ({"type": "number"}, ".5", None),
+        ({"type": "number"}, "1,000", INVALID_CHARACTER),
+        ({"type": "number", "length": 4}, "-99.99", None),
+        ({"type": "number", "length": 4}, "100.00", ELEMENT_TOO_LONG),
+        ({"type": "date"}, "20230315", None),
+        ({"type": "date"}, "230315", None),
+        ({"type": "date"}, "20231315", INVALID_DATE),
+        ({"type": "time"}, "1030", None),
+        ({"type": "time"}, "103059", None),
+        ({"type": "time"}, "2460", INVALID_TIME),
+        ({"type": "string", "length": 3}, "ABCD", ELEMENT_TOO_LONG),
+        ({"type": "string", "length": 3}, "BK:Z87891", None),
+        ({"type": "string", "min_length": 2}, "A", ELEMENT_TOO_SHORT),
+        ({"type": "string", "codes": ["C", "D"]}, "X", INVALID_CODE_VALUE),
+    ])
+    def test_element_checks(self, definition, value, expected):
+        assert compile_element(definition)(value) == expected
+
+    def test_unconstrained_string_has_no_check(self):
+        assert compile_element({"name": "Anything", "type": "string"}) is None
+
+
+class TestSegmentValidator:
+    """Test cases for SegmentValidator."""
+
+    def test_positioned_errors(self):
+        validator = SegmentValidator(SCHEMA)
+
+        errors = validator.validate([
+            ["CLP", "CLAIM1", "1", "100.00"],
+            ["CLP", "", "5", "1234567.00"],
+            ["DTP", "472", "20231301", "2500"],
+            ["NM1", "QC", "1", "ANYTHING GOES"],
+        ])
+
+        assert [(e.segment_index, e.segment_id, e.element_position, e.code) for e in errors] == [
+            (1, "CLP", 1, ELEMENT_MISSING),
+            (1, "CLP", 2, INVALID_CODE_VALUE),
+            (1, "CLP", 3, ELEMENT_TOO_LONG),
+            (2, "DTP", 2, INVALID_DATE),
+            (2, "DTP", 3, INVALID_TIME),
+        ]
+        assert errors[1].value == "5"
+        assert errors[1].message == "Invalid code value: CLP02 Status"
+
+    def test_extra_elements_only_in_strict_mode(self):
+        segment = ["CLP", "CLAIM1", "1", "100", "EXTRA"]
+
+        assert SegmentValidator(SCHEMA).check(segment) == ()
+        assert SegmentValidator(SCHEMA, strict_element_count=True).check(segment) == \
+            [(4, TOO_MANY_ELEMENTS, "EXTRA")]
+
+    def test_observe_records_offsets(self):
+        segments = [RawSegment(["CLP", "CLAIM1", "1", "100"], 0, 17),
+                    RawSegment(["CLP", "C", "9", "100"], 17, 29)]
+        validator = SegmentValidator(SCHEMA, max_errors=1)
+
+        passed = list(validator.observe(segments))
+
+        assert len(passed) == 2
+        assert validator.error_count == 2
+        assert [(e.segment_index, e.offset, e.code) for e in validator.errors] == [(1, 17, ELEMENT_TOO_SHORT)]
+
+    @pytest.mark.parametrize("schema, sample", [
+        ("835.json", "sample-835.edi"),
+        ("837.json", "sample-837.edi"),
+        ("270.json", "sample-270.edi"),
+        ("276.json", "sample-276.edi"),
+    ])
+    def test_bundled_samples_are_clean(self, schema, sample):
+        validator = SegmentValidator.from_file(os.path.join(SCHEMAS, schema))
+
+        with open(os.path.join(TEST_DATA, sample), "rb") as handle:
+            assert validator.validate(SegmentReader(handle)) == []
+
+
+class TestAcknowledgedElementErrors:
+    """Schema errors reported through the acknowledgment collector."""
+
+    def test_ik4_from_schema(self):
+        data = ("ISA*00*          *00*          *ZZ*PAYER          *ZZ*PROVIDER       "
+                "*230315*1030*^*00501*000000007*0*P*:~GS*HP*PAYER*PROVIDER*20230315*1030*1*X*005010X221A1~"
+                "ST*835*0001*005010X221A1~BPR*I*100.00*C*CHK~CLP*CLAIM1*9*100*100*0*12~SE*4*0001~"
+                "GE*1*1~IEA*1*000000007~").encode()
+        schema = SegmentValidator.from_file(os.path.join(SCHEMAS, "835.json"))
+        collector = AcknowledgmentCollector(schema=schema)
+        for _ in TransactionSplitter(collector.observe(SegmentReader(io.BytesIO(data)))):
+            pass
+
+        output = io.StringIO()
+        writer = X12Writer(output, line_ending="")
+        collector.write(writer)
+        writer.flush()
+        segments = [segment.split("*") for segment in output.getvalue().split("~") if segment]
+
+        assert [s for s in segments if s[0] == "IK3"] == [["IK3", "CLP", "3", "", "8"]]
+        assert [s for s in segments if s[0] == "IK4"] == [["IK4", "2", "", "7", "9"]]
+        assert [s for s in segments if s[0] == "IK5"] == [["IK5", "R", "5"]]
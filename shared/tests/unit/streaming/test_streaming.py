@@ -0,0 +1,144 @@
+"""
+Unit tests for the streaming reader, splitter and job queue.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.streaming import (
+    JobRunner,
+    JobStore,
+    SegmentReader,
+    TransactionSplitter,
+    detect_delimiters,
+    process_chunks,
+)
+
+SAMPLE_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data", "sample-835.edi")
+
+TWO_TRANSACTIONS = (
+    "ISA|00|          |00|          |ZZ|SENDER         |ZZ|RECEIVER       |230315|1030|^|00501|000000001|0|P|>!"
+    "GS|HP|SENDER|RECEIVER|20230315|1030|1|X|005010X221A1!"
+    "ST|835|0001!BPR|I|100.00|C|CHK|20230315!CLP|A1|1|100|100|0|12!SE|4|0001!"
+    "ST|835|0002!BPR|I|50.00|C|CHK|20230315!CLP|B1|1|50|50|0|12!SE|4|0002!"
+    "GE|2|1!IEA|1|000000001!"
+)
+
+
+class TestSegmentReader:
+    """Test cases for the chunked segment reader."""
+
+    def test_detect_delimiters(self):
+        delimiters = detect_delimiters(TWO_TRANSACTIONS.encode())
+        assert delimiters.element == "|"
+        assert delimiters.component == ">"
+        assert delimiters.segment == "!"
+        assert delimiters.repetition == "^"
+
+    def test_detect_delimiters_requires_isa(self):
+        with pytest.raises(ValueError):
+            detect_delimiters(b"GS*HP*SENDER~")
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 20])
+    def test_segments_independent_of_chunk_size(self, chunk_size):
+        data = TWO_TRANSACTIONS.encode()
+        segments = list(SegmentReader(io.BytesIO(data), chunk_size=chunk_size))
+
+        assert len(segments) == 12
+        assert segments[2].elements == ["ST", "835", "0001"]
+        for segment in segments:
+            assert data[segment.start:segment.end].rstrip(b"!") == "|".join(segment.elements).encode()
+
+    def test_newline_separated_segments(self):
+        with open(SAMPLE_835, "rb") as handle:
+            segments = list(SegmentReader(handle, chunk_size=16))
+        assert segments[0].segment_id == "ISA"
+        assert segments[-1].segment_id == "IEA"
+        assert all("\n" not in element for segment in segments for element in segment.elements)
+
+
+class TestTransactionSplitter:
+    """Test cases for splitting segment streams into transactions."""
+
+    def test_each_transaction_is_wrapped(self):
+        reader = SegmentReader(io.BytesIO(TWO_TRANSACTIONS.encode()))
+        chunks = list(TransactionSplitter(reader))
+
+        assert [chunk.control_number for chunk in chunks] == ["0001", "0002"]
+        assert chunks[1].segments[0][0] == "ISA"
+        assert chunks[1].segments[1][0] == "GS"
+        assert chunks[1].segments[-2] == ["GE", "1", "1"]
+        assert chunks[1].segments[-1] == ["IEA", "1", "000000001"]
+        assert chunks[1].segment_count == 4
+
+    def test_parallel_results_keep_order(self):
+        reader = SegmentReader(io.BytesIO(TWO_TRANSACTIONS.encode()))
+        results = list(process_chunks(TransactionSplitter(reader), validate=False, max_workers=2))
+
+        assert [result.control_number for result in results] == ["0001", "0002"]
+        assert all(result.parse_success for result in results)
+        assert [claim["claim_id"] for claim in results[1].claims] == ["B1"]
+
+
+class TestJobQueue:
+    """Test cases for the SQLite-backed job store and runner."""
+
+    def test_job_lifecycle_and_paging(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job = store.create_job(SAMPLE_835)
+        assert job["status"] == "queued"
+
+        runner = JobRunner(store, max_workers=2, batch_size=1)
+        assert runner.run_pending() is True
+        assert runner.run_pending() is False
+
+        job = store.get_job(job["id"])
+        assert job["status"] == "completed"
+        assert job["transaction_count"] == 1
+        assert job["claim_count"] == 3
+        assert job["progress"] == 1.0
+
+        first = store.get_results(job["id"], kind="claims", page=1, page_size=2)
+        second = store.get_results(job["id"], kind="claims", page=2, page_size=2)
+        assert len(first["items"]) == 2 and first["has_more"]
+        assert len(second["items"]) == 1 and not second["has_more"]
+
+    def test_failed_job_records_error(self, tmp_path):
+        bad_file = tmp_path / "bad.edi"
+        bad_file.write_text("not an edi file")
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job = store.create_job(str(bad_file))
+
+        JobRunner(store).run_pending()
+
+        job = store.get_job(job["id"])
+        assert job["status"] == "failed"
+        assert "ISA" in job["error"]
+
+    def test_spooled_sources_are_deleted_when_finished(self, tmp_path):
+        spool_dir = tmp_path / "uploads"
+        spool_dir.mkdir()
+        good = spool_dir / "good.edi"
+        good.write_bytes(open(SAMPLE_835, "rb").read())
+        bad = spool_dir / "bad.edi"
+        bad.write_text("not an edi file")
+        store = JobStore(str(tmp_path / "jobs.db"))
+        store.create_job(str(good))
+        store.create_job(str(bad))
+        store.create_job(SAMPLE_835)
+
+        runner = JobRunner(store, spool_dir=str(spool_dir))
+        while runner.run_pending():
+            pass
+
+        assert not good.exists()
+        assert not bad.exists()
+        assert os.path.exists(SAMPLE_835)
+
+    def test_unknown_result_kind(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job = store.create_job(SAMPLE_835)
+        with pytest.raises(ValueError):
+            store.get_results(job["id"], kind="payers")
@@ -0,0 +1,169 @@
+"""
+Unit tests for the directory watcher ingestion daemon.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from core.emitter import EdiEmitter
+from core.streaming import SegmentReader
+from core.streaming.executor import _get_validation_manager
+from core.streaming.watcher import PollingWatcher, WatchConfig, WatchDaemon
+
+SAMPLE_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data", "sample-835.edi")
+
+
+@pytest.fixture
+def config(tmp_path):
+    return WatchConfig(
+        input_dirs=[str(tmp_path / "inbound")],
+        output_dir=str(tmp_path / "outbound"),
+        error_dir=str(tmp_path / "rejected"),
+        max_workers=2,
+        queue_size=2,
+        poll_interval=0.05,
+        settle_time=0.0,
+    )
+
+
+class TestWatchDaemon:
+    """Test cases for ingesting files dropped into watched directories."""
+
+    def test_process_file_writes_output(self, config):
+        daemon = WatchDaemon(config)
+        path = shutil.copy(SAMPLE_835, config.input_dirs[0])
+
+        outcome = daemon.process_file(path)
+
+        assert outcome.status == "processed"
+        assert outcome.transaction_count == 1
+        with open(outcome.output_path) as handle:
+            transactions = json.load(handle)
+        assert len(transactions[0]["claims"]) == 3
+        with open(SAMPLE_835, "rb") as handle:
+            segments = [segment.elements for segment in SegmentReader(handle)]
+        emitted = json.loads(EdiEmitter(_get_validation_manager().parse(segments)).to_json())
+        assert transactions == emitted["interchanges"][0]["functional_groups"][0]["transactions"]
+
+    def test_failed_file_goes_to_error_dir(self, config):
+        daemon = WatchDaemon(config)
+        path = os.path.join(config.input_dirs[0], "broken.edi")
+        with open(path, "w") as handle:
+            handle.write("not edi")
+
+        outcome = daemon.process_file(path)
+
+        assert outcome.status == "failed"
+        assert os.path.exists(os.path.join(config.error_dir, "inbound", "broken.edi"))
+        assert os.path.exists(os.path.join(config.error_dir, "inbound", "broken.edi.errors.json"))
+
+    def test_same_names_in_different_directories(self, config, tmp_path):
+        config.input_dirs.append(str(tmp_path / "other" / "inbound"))
+        daemon = WatchDaemon(config)
+        first = shutil.copy(SAMPLE_835, os.path.join(config.input_dirs[0], "remit.edi"))
+        second = shutil.copy(SAMPLE_835, os.path.join(config.input_dirs[1], "remit.edi"))
+
+        outputs = {daemon.process_file(first).output_path, daemon.process_file(second).output_path}
+
+        assert len(outputs) == 2
+        assert all(os.path.exists(output) for output in outputs)
+
+    def test_vanished_file_fails_without_raising(self, config):
+        daemon = WatchDaemon(config)
+
+        outcome = daemon.process_file(os.path.join(config.input_dirs[0], "gone.edi"))
+
+        assert outcome.status == "failed"
+
+    def test_worker_survives_errors(self, config):
+        calls = []
+
+        def on_complete(outcome):
+            calls.append(outcome)
+            raise RuntimeError("callback failed")
+
+        config.max_workers = 1
+        daemon = WatchDaemon(config, on_complete=on_complete)
+        daemon._start_workers()
+        try:
+            for name in ("a.edi", "b.edi"):
+                path = shutil.copy(SAMPLE_835, os.path.join(config.input_dirs[0], name))
+                assert daemon.submit(path)
+        finally:
+            daemon._stop_workers()
+
+        assert [os.path.basename(outcome.path) for outcome in calls] == ["a.edi", "b.edi"]
+
+    def test_processed_files_are_not_resubmitted(self, config):
+        daemon = WatchDaemon(config)
+        path = shutil.copy(SAMPLE_835, config.input_dirs[0])
+        daemon.process_file(path)
+
+        restarted = WatchDaemon(config)
+        assert restarted.submit(path) is False
+
+    def test_submit_while_stopping_releases_path(self, config):
+        config.queue_size = 1
+        daemon = WatchDaemon(config)
+        first = shutil.copy(SAMPLE_835, os.path.join(config.input_dirs[0], "a.edi"))
+        second = shutil.copy(SAMPLE_835, os.path.join(config.input_dirs[0], "b.edi"))
+        assert daemon.submit(first)
+
+        daemon.stop()
+
+        assert daemon.submit(second) is False
+        assert second not in daemon._in_flight
+
+    def test_pattern_filter(self, config):
+        config.patterns = ["*.835"]
+        daemon = WatchDaemon(config)
+        path = shutil.copy(SAMPLE_835, config.input_dirs[0])
+        assert daemon.submit(path) is False
+
+    @pytest.mark.parametrize("use_polling", [True, False])
+    def test_run_ingests_new_files(self, config, use_polling):
+        config.use_polling = use_polling
+        outcomes = []
+        daemon = WatchDaemon(config, on_complete=outcomes.append)
+        thread = threading.Thread(target=daemon.run)
+        thread.start()
+        try:
+            time.sleep(0.2)
+            staging = os.path.join(config.output_dir, "staging.edi")
+            shutil.copy(SAMPLE_835, staging)
+            os.replace(staging, os.path.join(config.input_dirs[0], "landed.edi"))
+
+            deadline = time.monotonic() + 5
+            while not outcomes and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            daemon.stop()
+            thread.join(5)
+
+        assert [os.path.basename(outcome.path) for outcome in outcomes] == ["landed.edi"]
+
+
+class TestPollingWatcher:
+    """Test cases for completed-file detection by polling."""
+
+    def test_file_reported_once_after_settling(self, tmp_path):
+        watcher = PollingWatcher([str(tmp_path)], settle_time=0.0)
+        (tmp_path / "a.edi").write_text("ISA")
+
+        assert watcher.poll() == []
+        assert watcher.poll() == [str(tmp_path / "a.edi")]
+        assert watcher.poll() == []
+
+    def test_growing_file_not_reported(self, tmp_path):
+        watcher = PollingWatcher([str(tmp_path)], settle_time=0.0)
+        target = tmp_path / "a.edi"
+        target.write_text("ISA")
+        watcher.poll()
+        target.write_text("ISA*00")
+
+        assert watcher.poll() == []
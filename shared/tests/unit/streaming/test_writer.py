@@ -0,0 +1,164 @@
+"""
+Unit tests for the streaming X12 writer.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.plugins.api import PluginRegistry
+from core.plugins.implementations.plugin_837p import Plugin837P
+from core.streaming import Delimiters, EnvelopeScanner, SegmentReader, X12Writer, write_x12
+from core.transactions.t835.parser import Parser835
+from core.transactions.t837p.parser import Parser837P
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+
+def read(name: str) -> str:
+    with open(os.path.join(TEST_DATA, name)) as f:
+        return f.read()
+
+
+def segments(data: bytes):
+    return [segment.elements for segment in SegmentReader(io.BytesIO(data))]
+
+
+def write_two_remittances(handle, **options) -> X12Writer:
+    writer = X12Writer(handle, **options)
+    with writer:
+        with writer.interchange("PAYER", "PROVIDER", date="2023-03-15", time="10:30"):
+            with writer.group("HP", "PAYER", "PROVIDER", "005010X221A1", date="20230315", time="1030"):
+                for amount in (100.0, 250.5):
+                    with writer.transaction("835"):
+                        writer.segment("BPR", "I", amount, "C", "CHK")
+                        writer.segment("CLP", "A1", "1", amount, amount, 0.0, "", "", "")
+    return writer
+
+
+class TestX12Writer:
+    """Test cases for X12Writer."""
+
+    def test_envelopes_counts_and_control_numbers(self):
+        handle = io.BytesIO()
+        writer = write_two_remittances(handle, control_start=42)
+        data = handle.getvalue()
+        content = segments(data)
+
+        assert content[0][9:14] == ["230315", "1030", "^", "00501", "000000042"]
+        assert content[1] == ["GS", "HP", "PAYER", "PROVIDER", "20230315", "1030", "1", "X", "005010X221A1"]
+        assert content[2] == ["ST", "835", "0001", "005010X221A1"]
+        assert content[3] == ["BPR", "I", "100.00", "C", "CHK"]
+        assert content[4] == ["CLP", "A1", "1", "100.00", "100.00", "0.00"]
+        assert content[5] == ["SE", "4", "0001"]
+        assert content[6][:3] == ["ST", "835", "0002"]
+        assert content[-2:] == [["GE", "2", "1"], ["IEA", "1", "000000042"]]
+        assert writer.segment_count == len(content)
+        assert writer.bytes_written == len(data)
+        assert EnvelopeScanner(io.BytesIO(data)).scan().is_consistent
+
+    def test_custom_delimiters_and_text_handle(self):
+        handle = io.StringIO()
+        delimiters = Delimiters(element="|", component=">", segment="!", repetition=None)
+        write_two_remittances(handle, delimiters=delimiters, line_ending="")
+        text = handle.getvalue()
+
+        assert "\n" not in text
+        assert text.startswith("ISA|00|")
+        assert "|U|00501|000000001|0|P|>!GS|HP|" in text
+        assert EnvelopeScanner(io.BytesIO(text.encode())).scan().is_consistent
+
+    def test_composites_and_trailing_empty_elements(self):
+        handle = io.StringIO()
+        writer = X12Writer(handle, line_ending="")
+        writer.segment("SV1", ("HC", "99213", "25", ""), 100, "UN", None, "", ("1", "2"), "")
+        writer.flush()
+
+        assert handle.getvalue() == "SV1*HC:99213:25*100*UN***1:2~"
+
+    def test_delimiters_inside_elements_are_rejected(self):
+        writer = X12Writer(io.StringIO())
+
+        with pytest.raises(ValueError):
+            writer.segment("NM1", "85", "2", "SMITH*JONES")
+        with pytest.raises(ValueError):
+            writer.segment("NM1", "85", "2", "SMITH~JONES")
+
+    def test_output_is_streamed_in_bounded_buffers(self):
+        handle = io.BytesIO()
+        writer = X12Writer(handle, buffer_size=256)
+        writer.begin_interchange("PAYER", "PROVIDER")
+        writer.begin_group("HP", "PAYER", "PROVIDER", "005010X221A1")
+        writer.begin_transaction("835")
+        for index in range(100):
+            writer.segment("REF", "EV", f"REFERENCE{index:04d}")
+            assert writer._pending_size < 256
+
+        assert handle.tell() > 0
+        writer.close()
+        assert segments(handle.getvalue())[-3] == ["SE", "102", "0001"]
+
+    def test_envelope_misuse(self):
+        writer = X12Writer(io.StringIO())
+
+        with pytest.raises(ValueError):
+            writer.begin_group("HP", "A", "B", "005010X221A1")
+        writer.begin_interchange("A", "B")
+        writer.begin_group("HP", "A", "B", "005010X221A1")
+        writer.begin_transaction("835")
+        with pytest.raises(ValueError):
+            writer.end_group()
+        with pytest.raises(ValueError):
+            writer.begin_interchange("A", "B")
+        with pytest.raises(ValueError):
+            X12Writer(io.StringIO()).begin_interchange("A" * 16, "B")
+
+
+class TestAstRoundTrip:
+    """Parsed documents written back to X12 parse to the same AST."""
+
+    def test_835(self, tmp_path):
+        root = Parser835().parse(read("sample-835.edi"))
+        path = str(tmp_path / "out.835")
+
+        size = write_x12(root, path)
+
+        with open(path) as f:
+            written = f.read()
+        assert size == len(written)
+        assert Parser835().parse(written).to_dict() == root.to_dict()
+        with open(path, "rb") as handle:
+            assert EnvelopeScanner(handle).scan().is_consistent
+
+    def test_837p(self):
+        text = read("sample-837.edi")
+        root = Parser837P([s.split("*") for s in text.split("~") if s.strip()]).parse()
+        output = io.StringIO()
+
+        X12Writer(output, line_ending="").write_root(root)
+
+        written = output.getvalue()
+        reparsed = Parser837P([s.split("*") for s in written.split("~") if s.strip()]).parse()
+        assert reparsed.to_dict() == root.to_dict()
+
+    def test_837p_from_parser_plugin(self):
+        # edi convert --schema 837p parses through the registered plugin
+        registry = PluginRegistry()
+        registry.register_transaction_parser(Plugin837P())
+        text = read("sample-837.edi")
+        root = registry.get_parser_for_transaction("837").parse([s.split("*") for s in text.split("~") if s.strip()])
+        output = io.StringIO()
+
+        X12Writer(output, line_ending="").write_root(root)
+
+        ids = [segment.elements[0] for segment in SegmentReader(io.BytesIO(output.getvalue().encode()))]
+        assert ids.count("CLM") == 1 and ids.count("SV1") == 2
+        assert output.getvalue().startswith("ISA*00*          *00*          *ZZ*123456789      *ZZ*987654321")
+
+    def test_unregistered_transaction_type(self):
+        root = Parser835().parse(read("sample-835.edi"))
+        root.interchanges[0].functional_groups[0].transactions[0].transaction_data = object()
+
+        with pytest.raises(ValueError):
+            X12Writer(io.StringIO()).write_root(root)
@@ -0,0 +1,122 @@
+"""
+Unit tests for instrumentation adapters and the instrumented code paths.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.emitter import EdiEmitter
+from core.parser import EdiParser
+from core.telemetry import (
+    COUNTER_BYTES,
+    COUNTER_CLAIMS,
+    COUNTER_SEGMENTS,
+    COUNTER_TRANSACTIONS,
+    HISTOGRAM_TOKENIZE,
+    HISTOGRAM_VALIDATE_RULE,
+    OPENTELEMETRY_AVAILABLE,
+    InMemoryInstrumentation,
+    Instrumentation,
+    OpenTelemetryInstrumentation,
+    get_instrumentation,
+    set_instrumentation,
+)
+from core.streaming import SegmentReader
+from core.validation.integration import validation_manager
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+SCHEMA_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "schemas", "x12", "835.json")
+
+
+@pytest.fixture
+def memory():
+    instrumentation = InMemoryInstrumentation()
+    previous = set_instrumentation(instrumentation)
+    yield instrumentation
+    set_instrumentation(previous)
+
+
+def parse_sample():
+    with open(os.path.join(TEST_DATA, "sample-835.edi")) as handle:
+        content = handle.read()
+    return content, EdiParser(content, SCHEMA_835).parse()
+
+
+class TestNoOpInstrumentation:
+    """Test cases for the default instrumentation."""
+
+    def test_default_is_noop(self):
+        instrumentation = get_instrumentation()
+        assert type(instrumentation) is Instrumentation
+        assert instrumentation.enabled is False
+
+    def test_noop_contexts_are_shared(self):
+        instrumentation = Instrumentation()
+        assert instrumentation.span("a") is instrumentation.timed("a", "b")
+        with instrumentation.timed("a", "b", {"k": "v"}):
+            pass
+
+
+class TestInstrumentedPipeline:
+    """Test cases for metrics emitted while parsing, validating and emitting."""
+
+    def test_parse_counters(self, memory):
+        content, _ = parse_sample()
+
+        assert memory.counter_total(COUNTER_BYTES) == len(content)
+        assert memory.counter_total(COUNTER_SEGMENTS) == 28
+        assert memory.counter_total(COUNTER_TRANSACTIONS) == 1
+        assert memory.counter_total(COUNTER_CLAIMS) == 3
+
+    def test_per_rule_validation_histograms(self, memory):
+        _, edi_root = parse_sample()
+        result = validation_manager.validate_document(edi_root)
+
+        rules = {dict(key)["rule_name"] for key in memory.histograms[HISTOGRAM_VALIDATE_RULE]}
+        assert rules == set(result.executed_rules)
+
+    def test_spans_cover_every_stage(self, memory):
+        _, edi_root = parse_sample()
+        validation_manager.validate_document(edi_root)
+        EdiEmitter(edi_root).to_json()
+
+        names = {span["name"] for span in memory.spans}
+        assert {"edi.tokenize", "edi.parse", "edi.validate", "edi.validate.rule", "edi.emit"} <= names
+
+    def test_streaming_reader_times_each_chunk(self, memory):
+        with open(os.path.join(TEST_DATA, "sample-835.edi"), "rb") as handle:
+            content = handle.read()
+
+        segments = list(SegmentReader(io.BytesIO(content), chunk_size=256))
+
+        (count, total, _), = memory.histograms[HISTOGRAM_TOKENIZE].values()
+        assert len(segments) == 28
+        # 877 bytes: the first 512 are read together for the ISA header, then two more chunks
+        assert count == 3
+        assert total > 0
+        assert memory.counter_total(COUNTER_BYTES) == len(content)
+
+    def test_span_records_errors(self, memory):
+        with pytest.raises(RuntimeError):
+            with memory.span("failing"):
+                raise RuntimeError("boom")
+        assert memory.spans[-1]["error"] == "boom"
+
+
+@pytest.mark.skipif(not OPENTELEMETRY_AVAILABLE, reason="opentelemetry-api not installed")
+class TestOpenTelemetryInstrumentation:
+    """Test cases for the OpenTelemetry adapter against the API's default providers."""
+
+    def test_records_through_otel_api(self):
+        instrumentation = OpenTelemetryInstrumentation()
+        previous = set_instrumentation(instrumentation)
+        try:
+            _, edi_root = parse_sample()
+            EdiEmitter(edi_root).to_csv()
+        finally:
+            set_instrumentation(previous)
+
+        assert COUNTER_CLAIMS in instrumentation._counters
+        assert "edi.emit.duration" in instrumentation._histograms
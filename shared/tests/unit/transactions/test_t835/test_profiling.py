@@ -0,0 +1,81 @@
+"""
+Unit tests for Parser835 segment handler profiling.
+"""
+
+import os
+
+from core.base.profiling import HandlerProfiler
+from core.transactions.t835.parser import Parser835
+
+SAMPLE_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test-data", "sample-835.edi")
+
+
+def load_sample() -> str:
+    with open(SAMPLE_835) as handle:
+        return handle.read()
+
+
+class TestParser835Profiling:
+    """Test cases for per-handler profiling in Parser835."""
+
+    def test_disabled_by_default(self):
+        parser = Parser835()
+        assert parser.profiler is None
+        assert parser.profile_report() is None
+        assert parser.segment_handlers["CLP"] == parser._handle_clp
+
+    def test_report_counts_calls_per_handler(self):
+        parser = Parser835(profile=True)
+        parser.parse(load_sample())
+
+        report = parser.profile_report()
+        handlers = {(entry["segment_id"], entry["handler"]): entry for entry in report["handlers"]}
+
+        assert handlers[("CLP", "_handle_clp")]["calls"] == 3
+        assert handlers[("CAS", "_handle_cas")]["calls"] == 4
+        assert handlers[("SVC", "_handle_svc")]["calls"] == 5
+        assert handlers[("*", "_perform_balancing_checks")]["calls"] == 1
+        assert report["segments"] == 28
+        assert report["wall_ms"] >= report["handler_ms"] > 0
+
+    def test_profiled_parse_matches_unprofiled(self):
+        content = load_sample()
+        plain = Parser835().parse(content).to_dict()
+        profiled = Parser835(profile=True).parse(content).to_dict()
+        assert plain == profiled
+
+    def test_shared_profiler_accumulates(self):
+        profiler = HandlerProfiler()
+        for _ in range(3):
+            parser = Parser835()
+            parser.enable_profiling(profiler)
+            parser.parse(load_sample())
+
+        clp = next(stats for stats in profiler.handler_stats() if stats.handler == "_handle_clp")
+        assert clp.calls == 9
+        assert "_handle_clp" in profiler.format_report()
+
+
+class TestHandlerProfiler:
+    """Test cases for the profiler itself, using a fake clock."""
+
+    def test_wrap_records_elapsed_time_even_on_error(self):
+        ticks = iter([0, 500, 1000, 4000])
+        profiler = HandlerProfiler(clock=lambda: next(ticks))
+
+        def handler(value):
+            if value < 0:
+                raise ValueError("negative")
+            return value
+
+        timed = profiler.wrap("XYZ", handler)
+        assert timed(1) == 1
+        try:
+            timed(-1)
+        except ValueError:
+            pass
+
+        stats = profiler.handler_stats()[0]
+        assert stats.calls == 2
+        assert stats.total_ns == 3500
+        assert stats.max_ns == 3000
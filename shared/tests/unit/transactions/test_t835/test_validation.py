@@ -73,7 +73,7 @@ class Test835Validation:
         
         # Add payer/payee
         transaction_835.payer = Payer(name="TEST PAYER")
-        transaction_835.payee = Payee(name="TEST PROVIDER", npi="1234567897")
+        transaction_835.payee = Payee(name="TEST PROVIDER", npi="1234567893")
         
         # Add sample claim
         claim = Claim(
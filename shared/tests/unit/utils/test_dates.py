@@ -0,0 +1,97 @@
+"""
+Unit tests for memoized EDI date parsing.
+"""
+
+from datetime import date, datetime, timedelta
+
+from core.healthcare.transformations import HealthcareTransformer, StandardizedClaim
+from core.utils.dates import (
+    aging_bucket,
+    days_since_column,
+    is_valid_edi_date,
+    parse_date,
+    parse_date_column,
+    parse_edi_date,
+)
+
+
+class TestParseEdiDate:
+    """Test cases for parse_edi_date."""
+
+    def test_formats(self):
+        assert parse_edi_date("20241226") == date(2024, 12, 26)
+        assert parse_edi_date("241226", "YYMMDD") == date(2024, 12, 26)
+        assert parse_edi_date("991231", "YYMMDD") == date(1999, 12, 31)
+        assert parse_edi_date("122624", "MMDDYY") == date(2024, 12, 26)
+        assert parse_edi_date("12262024", "MMDDCCYY") == date(2024, 12, 26)
+        assert parse_edi_date("2024-12-26", "ISO") == date(2024, 12, 26)
+
+    def test_rejects_malformed_and_impossible_dates(self):
+        assert parse_edi_date("20240230") is None
+        assert parse_edi_date("20241301") is None
+        assert parse_edi_date("2024122") is None
+        assert parse_edi_date("2024-1-26", "ISO") is None
+        assert parse_edi_date("") is None
+        assert parse_edi_date(None) is None
+        assert is_valid_edi_date("20240229")
+        assert not is_valid_edi_date("20230229")
+
+    def test_memoized(self):
+        assert parse_edi_date("20240115") is parse_edi_date("20240115")
+
+
+class TestParseDate:
+    """parse_date agrees with datetime.strptime."""
+
+    def test_matches_strptime(self):
+        values = ["20241226", "20240230", "2024-12-26", "2024-1-5", "241226", "abc", ""]
+        formats = ["%Y%m%d", "%Y-%m-%d", "%y%m%d", "%m%d%Y"]
+        for value in values:
+            for format_str in formats:
+                try:
+                    expected = datetime.strptime(value, format_str).date()
+                except ValueError:
+                    expected = None
+                assert parse_date(value, format_str) == expected, (value, format_str)
+
+    def test_non_string(self):
+        assert parse_date(None) is None
+
+
+class TestColumns:
+    """Test cases for the columnar helpers."""
+
+    def test_parse_date_column(self):
+        column = ["20240101", None, "bad", "20240101"]
+
+        assert parse_date_column(column) == [date(2024, 1, 1), None, None, date(2024, 1, 1)]
+
+    def test_days_since_and_buckets(self):
+        ages = days_since_column(["20240101", "20231201", "20230101", ""], reference=date(2024, 1, 31))
+
+        assert ages == [30, 61, 395, None]
+        assert [aging_bucket(age) for age in ages[:3]] == ["0-30", "61-90", "120+"]
+        assert aging_bucket(31) == "31-60"
+        assert aging_bucket(120) == "91-120"
+
+
+class TestClaimAgingReport:
+    """generate_claim_aging_report uses the columnar date path."""
+
+    def test_buckets(self):
+        today = date.today()
+        claims = [
+            StandardizedClaim(claim_id="A", transaction_type="835",
+                              service_date=(today - timedelta(days=10)).strftime("%Y%m%d"), total_charge=100.0),
+            StandardizedClaim(claim_id="B", transaction_type="835",
+                              service_date=(today - timedelta(days=45)).strftime("%Y%m%d"), total_charge=50.0),
+            StandardizedClaim(claim_id="C", transaction_type="835", service_date="20241340", total_charge=75.0),
+            StandardizedClaim(claim_id="D", transaction_type="835", service_date=None, total_charge=25.0),
+        ]
+
+        report = HealthcareTransformer.generate_claim_aging_report(claims)
+
+        assert report["aging_buckets"]["0-30"] == {"count": 1, "amount": 100.0}
+        assert report["aging_buckets"]["31-60"] == {"count": 1, "amount": 50.0}
+        assert report["total_claims"] == 2
+        assert report["total_amount"] == 150.0
@@ -0,0 +1,82 @@
+"""
+Unit tests for batch identifier validation.
+"""
+
+import random
+
+import pytest
+
+from core.base.validation import validate_npi as base_validate_npi
+from core.healthcare.transformations import HealthcareTransformer
+from core.utils.identifiers import (
+    CONTROL_NUMBER, EIN, NPI, IdentifierValidator, is_valid_npi, luhn_valid, validate_control_numbers,
+    validate_eins, validate_npis,
+)
+from core.utils.validators import validate_npi
+
+
+def reference_luhn(digits: str) -> bool:
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        n = int(digit)
+        if position % 2 == 1:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return total % 10 == 0
+
+
+class TestLuhn:
+    """Test cases for the table-driven Luhn checksum."""
+
+    def test_matches_reference_implementation(self):
+        generator = random.Random(46)
+        for _ in range(2000):
+            digits = "".join(generator.choice("0123456789") for _ in range(generator.randint(1, 19)))
+            assert luhn_valid(digits) == reference_luhn(digits), digits
+
+    @pytest.mark.parametrize("value", ["", "12a4", "１２３４", "12 34"])
+    def test_rejects_non_digits(self, value):
+        assert not luhn_valid(value)
+
+    def test_npi_entry_points_agree(self):
+        for npi in ("1234567893", "1234567890", "123456789", "12345678930", "9876543210", None, ""):
+            expected = bool(npi) and len(npi) == 10 and reference_luhn("80840" + npi)
+            assert validate_npi(npi) == expected
+            assert base_validate_npi(npi) == expected
+            assert HealthcareTransformer.validate_npi(npi) == expected
+        assert validate_npi(" 123-456-7893 ")
+        assert is_valid_npi("1234567893")
+
+    @pytest.mark.parametrize("npi", ["1234567893", "1245319599", "1003000126", "1497758544", "1023011178"])
+    def test_known_valid_npis(self, npi):
+        assert is_valid_npi(npi)
+
+    @pytest.mark.parametrize("npi", ["1234567897", "1245319593", "1003000120"])
+    def test_check_digit_includes_80840_prefix(self, npi):
+        # These pass a plain Luhn check over the ten digits but not the CMS one
+        assert not is_valid_npi(npi)
+
+
+class TestBatchValidation:
+    """Test cases for column and memoized batch checks."""
+
+    def test_columns(self):
+        assert validate_npis(["1234567893", "1234567890", None, "1234567893"]) == [True, False, False, True]
+        assert validate_eins(["12-3456789", "123456789", "12-345678", ""]) == [True, True, False, False]
+        assert validate_control_numbers(["0001", "1234567890", "abc", None]) == [True, False, False, False]
+
+    def test_validator_remembers_values_across_batches(self):
+        validator = IdentifierValidator()
+
+        assert validator.invalid(NPI, ["1234567893", "1234567890"] * 500) == list(range(1, 1000, 2))
+        assert validator.validate(NPI, ["1234567890", "9876543210"]) == [False, False]
+        assert validator.is_valid(EIN, "12-3456789")
+        assert validator.is_valid(CONTROL_NUMBER, "000000001")
+        assert validator.seen(NPI) == 3
+        assert not validator.validate(NPI, [["unhashable"]])[0]
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            IdentifierValidator().validate("ssn", ["123456789"])
@@ -0,0 +1,84 @@
+"""
+Unit tests for the element value symbol table.
+"""
+
+import io
+import os
+import sys
+
+from core.streaming import SegmentReader
+from core.transactions.t835.parser import Parser835
+from core.utils.interning import SymbolTable, intern_segment_id
+
+SAMPLE_835 = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data", "sample-835.edi")
+
+
+def fresh(value: str) -> str:
+    """Build an equal string that is not the same object."""
+    return "".join(list(value))
+
+
+class TestSymbolTable:
+    """Test cases for SymbolTable."""
+
+    def test_equal_values_share_one_object(self):
+        symbols = SymbolTable()
+        first = symbols.intern(fresh("99213"))
+        second = symbols.intern(fresh("99213"))
+
+        assert first is second
+        assert len(symbols) == 1
+        assert symbols.hits == 1 and symbols.misses == 1
+
+    def test_canonical_value_matches_literals(self):
+        symbols = SymbolTable()
+        assert symbols.intern(fresh("CO")) is sys.intern("CO")
+
+    def test_bounded_size(self):
+        symbols = SymbolTable(max_size=2)
+        for value in ("A", "B", "C"):
+            symbols.intern(fresh(value))
+
+        assert len(symbols) == 2
+        assert "C" not in symbols
+        value = fresh("C")
+        assert symbols.intern(value) is value
+
+    def test_long_and_empty_values_pass_through(self):
+        symbols = SymbolTable(max_length=4)
+        long_value = fresh("CLAIM-000001")
+
+        assert symbols.intern(long_value) is long_value
+        assert symbols.intern("") == ""
+        assert symbols.intern(None) is None
+        assert len(symbols) == 0
+
+    def test_segment_ids_interned_globally(self):
+        assert intern_segment_id(fresh("CLP")) is sys.intern("CLP")
+
+
+class TestParserInterning:
+    """Test cases for interning in the tokenizer and Parser835."""
+
+    def test_segment_reader_interns_segment_ids(self):
+        data = b"ISA*00*          *00*          *ZZ*A              *ZZ*B              *230101*1200*^*00501*000000001*0*P*:~CLP*1*1~CLP*2*1~"
+        segments = [segment.elements for segment in SegmentReader(io.BytesIO(data))]
+
+        assert segments[1][0] is segments[2][0] is sys.intern("CLP")
+
+    def test_repeated_codes_share_objects_across_claims(self):
+        with open(SAMPLE_835) as handle:
+            root = Parser835().parse(handle.read())
+        claims = root.interchanges[0].functional_groups[0].transactions[0].transaction_data.claims
+        adjustments = [adjustment for claim in claims for adjustment in claim.adjustments]
+
+        status_codes = {}
+        for claim in claims:
+            status_codes.setdefault(claim.status_code, set()).add(id(claim.status_code))
+        assert all(len(ids) == 1 for ids in status_codes.values())
+
+        group_codes = {}
+        for adjustment in adjustments:
+            group_codes.setdefault(adjustment.group_code, set()).add(id(adjustment.group_code))
+        assert all(len(ids) == 1 for ids in group_codes.values())
+        assert any(adjustment.group_code is sys.intern("CO") for adjustment in adjustments)
@@ -0,0 +1,109 @@
+"""
+Unit tests for fixed-point monetary amounts.
+"""
+
+from decimal import Decimal
+import json
+
+from core.transactions.t835.parser import Parser835
+from core.utils.money import Amount, format_amount, parse_amount, to_cents, to_decimal, sum_cents
+
+
+def parse_835(body: str):
+    content = (
+        "ISA*00*          *00*          *ZZ*SENDER         *ZZ*RECEIVER       "
+        "*240115*1200*^*00501*000000001*0*P*:~"
+        "GS*HP*SENDER*RECEIVER*20240115*1200*1*X*005010X221A1~"
+        f"ST*835*0001~{body}SE*2*0001~GE*1*1~IEA*1*000000001~"
+    )
+    return Parser835().parse(content).interchanges[0].functional_groups[0].transactions[0].transaction_data
+
+
+class TestParseAmount:
+    """Test cases for parse_amount."""
+
+    def test_amount_equals_float_and_carries_cents(self):
+        amount = parse_amount("123.45")
+
+        assert isinstance(amount, Amount)
+        assert amount == float("123.45")
+        assert amount.cents == 12345
+        assert parse_amount("-0.29").cents == -29
+        assert parse_amount("100").cents == 10000
+        assert parse_amount("5.5").cents == 550
+
+    def test_empty_and_invalid_return_default(self):
+        assert parse_amount("") == 0.0
+        assert parse_amount(None, None) is None
+        assert parse_amount("12.3X", None) is None
+
+    def test_sub_cent_values_fall_back_to_decimal(self):
+        amount = parse_amount("1.005")
+
+        assert amount.cents is None
+        assert to_decimal(amount) == Decimal("1.005")
+
+    def test_repeated_values_share_one_object(self):
+        assert parse_amount("25.00") is parse_amount("25.00")
+
+    def test_serializes_as_float(self):
+        assert json.dumps({"amount": parse_amount("80.10")}) == '{"amount": 80.1}'
+
+
+class TestConversions:
+    """Test cases for to_cents, to_decimal and sum_cents."""
+
+    def test_to_cents(self):
+        assert to_cents(12.34) == 1234
+        assert to_cents(7) == 700
+        assert to_cents(Decimal("0.10")) == 10
+        assert to_cents("3.21") == 321
+        assert to_cents(Decimal("0.001")) is None
+        assert to_cents(None) is None
+
+    def test_to_decimal_is_exact(self):
+        assert to_decimal(parse_amount("150.00")) == Decimal("150.00")
+        assert str(to_decimal(parse_amount("0.30"))) == "0.30"
+        assert to_decimal(1.5) == Decimal("1.5")
+
+    def test_sum_cents_is_exact(self):
+        amounts = [parse_amount("0.10")] * 3 + [None]
+
+        assert sum(a for a in amounts if a is not None) != 0.3
+        assert sum_cents(amounts) == 30
+        assert sum_cents([parse_amount("1.005")]) is None
+
+
+def test_format_amount():
+    assert format_amount(parse_amount("100")) == "100.00"
+    assert format_amount(parse_amount("-0.29")) == "-0.29"
+    assert format_amount(80.1) == "80.10"
+    assert format_amount(parse_amount("1.005")) == "1.005"
+    assert format_amount(None) == ""
+
+
+class TestParser835Balancing:
+    """Balancing in Parser835 uses exact cents."""
+
+    def test_balanced_transaction_has_zero_delta(self):
+        transaction = parse_835(
+            "BPR*I*0.30*C*ACH~"
+            "CLP*A*1*1.00*0.10*0.90~CLP*B*1*1.00*0.10*0.90~CLP*C*1*1.00*0.10*0.90~"
+        )
+
+        assert transaction.financial_information.total_paid.cents == 30
+        assert transaction.claims[0].total_paid.cents == 10
+        assert transaction.out_of_balance is False
+        assert transaction.balance_delta == 0
+
+    def test_out_of_balance_delta_in_cents(self):
+        transaction = parse_835("BPR*I*100.00*C*ACH~CLP*A*1*120.00*99.95*20.05~")
+
+        assert transaction.out_of_balance is True
+        assert transaction.balance_delta == 0.05
+
+    def test_cas_amounts_are_exact(self):
+        transaction = parse_835("BPR*I*80.00*C*ACH~CLP*A*1*100.00*80.00*20.00~CAS*PR*1*15.25**2*4.75~")
+
+        adjustments = transaction.claims[0].adjustments
+        assert [a.amount.cents for a in adjustments] == [1525, 475]
@@ -0,0 +1,216 @@
+"""
+Tests for single-pass validation with node rules.
+"""
+
+import io
+import os
+
+import pytest
+
+from core.base.parser import NodeListener
+from core.plugins.api import PluginManager
+from core.transactions.t835.parser import Parser835
+from core.validation import NodeRule, ValidationEngine, validate_stream
+from core.validation.integration import ValidationIntegrationManager
+from core.validation.streaming import NODE_CLAIM, NODE_SEGMENT, NODE_SERVICE, NODE_TRANSACTION
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test-data")
+
+
+def read(name: str) -> str:
+    with open(os.path.join(TEST_DATA, name)) as f:
+        return f.read()
+
+
+def split(text: str):
+    return [s.strip().split("*") for s in text.split("~") if s.strip()]
+
+
+class OverpaymentRule(NodeRule):
+    """Flags services and claims paid above their charge."""
+
+    def __init__(self):
+        super().__init__("overpayment", ["835"], [NODE_SERVICE, NODE_CLAIM], severity="warning")
+
+    def check_service(self, service, claim, path, context):
+        if service.paid_amount > service.charge_amount:
+            return [self.create_error("Service overpaid", "SERVICE_OVERPAID", path=path,
+                                      value=service.service_code)]
+        return []
+
+    def check_claim(self, claim, path, context):
+        if claim.total_paid > claim.total_charge:
+            return [self.create_error("Claim overpaid", "CLAIM_OVERPAID", path=path, value=claim.claim_id)]
+        return []
+
+
+class SegmentCountRule(NodeRule):
+    """Counts CAS segments and reports the count on each transaction."""
+
+    def __init__(self):
+        super().__init__("cas_count", ["835"], [NODE_SEGMENT, NODE_TRANSACTION], severity="info")
+        self.cas = 0
+
+    def check_segment(self, segment, segment_index, context):
+        if segment[0] == "CAS":
+            self.cas += 1
+        return []
+
+    def check_transaction(self, transaction, path, context):
+        return [self.create_error(f"{self.cas} CAS segments", "CAS_COUNT", path=path)]
+
+
+class RecordingListener(NodeListener):
+
+    def __init__(self):
+        self.events = []
+
+    def on_service(self, service, claim, path):
+        self.events.append(("service", path, claim.claim_id))
+
+    def on_claim(self, claim, path):
+        self.events.append(("claim", path, len(claim.services)))
+
+    def on_transaction(self, transaction, path):
+        self.events.append(("transaction", path, transaction.header["control_number"]))
+
+
+def engine_with(*rules) -> ValidationEngine:
+    engine = ValidationEngine()
+    for rule in rules:
+        engine.register_rule_plugin(rule)
+    return engine
+
+
+class TestNodeEvents:
+    """Test cases for Parser835 node events."""
+
+    def test_nodes_are_reported_as_they_close(self):
+        listener = RecordingListener()
+        Parser835(listener=listener).parse(read("sample-835.edi"))
+
+        tx = "interchange[0].functional_group[0].transaction[0]"
+        assert listener.events == [
+            ("service", f"{tx}.claims[0].services[0]", "PAT001CLAIM001"),
+            ("claim", f"{tx}.claims[0]", 1),
+            ("service", f"{tx}.claims[1].services[0]", "PAT002CLAIM002"),
+            ("service", f"{tx}.claims[1].services[1]", "PAT002CLAIM002"),
+            ("claim", f"{tx}.claims[1]", 2),
+            ("service", f"{tx}.claims[2].services[0]", "PAT003CLAIM003"),
+            ("service", f"{tx}.claims[2].services[1]", "PAT003CLAIM003"),
+            ("claim", f"{tx}.claims[2]", 2),
+            ("transaction", tx, "0001"),
+        ]
+
+    def test_unterminated_transaction_is_closed_at_end_of_input(self):
+        text = read("sample-835.edi")
+        truncated = text[:text.index("SE*")]
+        listener = RecordingListener()
+        Parser835(listener=listener).parse(truncated)
+
+        assert [event[0] for event in listener.events[-2:]] == ["claim", "transaction"]
+
+    def test_released_claims_keep_balancing(self):
+        text = read("sample-835.edi")
+        retained = Parser835().parse(text)
+        released = Parser835(retain_claims=False).parse(text)
+
+        retained_tx = retained.interchanges[0].functional_groups[0].transactions[0].transaction_data
+        released_tx = released.interchanges[0].functional_groups[0].transactions[0].transaction_data
+        assert len(retained_tx.claims) == 3
+        assert released_tx.claims == []
+        assert released_tx.out_of_balance == retained_tx.out_of_balance
+        assert released_tx.balance_delta == retained_tx.balance_delta
+
+
+class TestStreamingValidator:
+    """Test cases for single-pass validation."""
+
+    def test_single_pass_matches_tree_validation(self):
+        text = read("sample-835.edi")
+        engine = engine_with(OverpaymentRule())
+
+        tree_result = engine.validate(Parser835().parse(text))
+        stream_result = validate_stream(io.BytesIO(text.encode()), engine)
+
+        assert [(e.code, e.path, e.value) for e in stream_result.warnings] == \
+            [(e.code, e.path, e.value) for e in tree_result.warnings]
+        assert {e.code for e in stream_result.warnings} == {"SERVICE_OVERPAID", "CLAIM_OVERPAID"}
+        assert stream_result.executed_rules == ["overpayment"]
+
+    def test_segment_interest(self):
+        rule = SegmentCountRule()
+        engine = engine_with(rule)
+        validator = engine.stream_validator()
+
+        Parser835(listener=validator).parse(read("sample-835.edi"))
+        result = validator.finish()
+
+        assert validator.wants_segments
+        assert [info.message for info in result.info] == ["4 CAS segments"]
+
+    def test_failing_rule_is_reported_once(self):
+        class BrokenRule(NodeRule):
+            def __init__(self):
+                super().__init__("broken", ["835"], [NODE_CLAIM])
+
+            def check_claim(self, claim, path, context):
+                raise RuntimeError("boom")
+
+        engine = engine_with(BrokenRule(), OverpaymentRule())
+        result = validate_stream(io.BytesIO(read("sample-835.edi").encode()), engine)
+
+        assert [error.code for error in result.errors] == ["SYSTEM_ERROR"]
+        assert result.warning_count == 3
+
+    def test_disabled_and_unknown_rules(self):
+        engine = engine_with(OverpaymentRule())
+        engine.disable_rule("overpayment")
+
+        assert engine.stream_validator().rules == []
+        with pytest.raises(ValueError):
+            NodeRule("bad", ["835"], ["loop"])
+
+
+class TestBuiltinNodeRules:
+    """Test cases for the built-in 835 rules in single-pass validation."""
+
+    def test_default_rules_check_claims_and_services(self):
+        text = read("sample-835.edi").replace("CLP*", "CLP*NEG*7*-5*900*-1*12**", 1)
+        engine = ValidationIntegrationManager().validation_engine
+
+        tree_result = engine.validate(Parser835().parse(text), {"strict_mode": True})
+        stream_result = validate_stream(io.BytesIO(text.encode()), engine, {"strict_mode": True})
+
+        def findings(result):
+            return sorted((e.rule_name, e.code, e.path) for e in result.errors + result.warnings + result.info)
+
+        codes = {code for _, code, _ in findings(stream_result)}
+        assert {"835_NEGATIVE_CLAIM_CHARGE", "835_NEGATIVE_PATIENT_RESP", "835_INVALID_CLAIM_STATUS",
+                "835_SERVICE_OVERPAYMENT", "835_CLAIM_BALANCE_ERROR"} <= codes
+        # Claims are released as they close, so only the payment total check is left out
+        assert findings(stream_result) == [finding for finding in findings(tree_result)
+                                           if finding[1] != "835_PAYMENT_TOTAL_MISMATCH"]
+
+    def test_valid_status_codes_are_accepted(self):
+        engine = ValidationIntegrationManager().validation_engine
+        result = validate_stream(io.BytesIO(read("sample-835.edi").encode()), engine)
+
+        assert "835_INVALID_CLAIM_STATUS" not in {e.code for e in result.warnings}
+
+
+class TestSinglePassIntegration:
+    """Test cases for parse_and_validate(single_pass=True)."""
+
+    def test_node_and_tree_rules_run_together(self):
+        manager = ValidationIntegrationManager(PluginManager())
+        manager.plugin_manager.load_builtin_plugins()
+        manager.add_validation_rule(OverpaymentRule())
+        segments = split(read("sample-835.edi"))
+
+        two_pass = manager.parse_and_validate(segments)['validation_result']
+        single_pass = manager.parse_and_validate(segments, single_pass=True)['validation_result']
+
+        assert sorted(e.code for e in single_pass.warnings + single_pass.info) == \
+            sorted(e.code for e in two_pass.warnings + two_pass.info)
+        assert sorted(single_pass.executed_rules) == sorted(two_pass.executed_rules)